@@ -36,10 +36,10 @@ from datetime import datetime
 # Add src directory to Python path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+# Only the lightweight package is imported up front; the orchestrator and
+# results board are loaded on demand so --results/--system-info start fast
 try:
-    from src.benchmark_orchestrator import RTOSBenchmarkOrchestrator
-    from src.results_board import ResultsBoard
-    from src.platform_compat import platform_compat
+    from src import platform_compat
 except ImportError as e:
     print(f"❌ Import error: {e}")
     print("Please ensure you're running from the rtos_benchmark directory")
@@ -73,6 +73,7 @@ def print_system_overview():
     print(f"Memory: {system_info.get('memory_gb', 'Unknown')} GB")
     print(f"Python: {system_info.get('python_version', 'Unknown')}")
     print(f"Architecture: {system_info.get('architecture', 'Unknown')}")
+    print(f"Fingerprint: {system_info.get('fingerprint', 'Unknown')}")
     
     # RT capabilities
     rt_capable = platform_compat.supports_rt_scheduling()
@@ -83,15 +84,18 @@ def print_system_overview():
     print()
 
 
-def run_full_benchmark():
-    """Run the complete benchmark suite"""
+def run_full_benchmark(config_overrides=None, resume_run_id=None):
+    """Run the complete benchmark suite (or resume an interrupted run)"""
     print("🚀 Running Full Benchmark Suite")
     print("=" * 50)
     print("This will take approximately 2-3 minutes...")
     print()
     
+    from src import RTOSBenchmarkOrchestrator
     orchestrator = RTOSBenchmarkOrchestrator()
-    results = orchestrator.run_comprehensive_benchmark()
+    config = orchestrator.default_config.copy()
+    config.update(config_overrides or {})
+    results = orchestrator.run_comprehensive_benchmark(config, resume_run_id=resume_run_id)
     
     # Generate and display comprehensive report
     print("\n" + "=" * 60)
@@ -101,15 +105,109 @@ def run_full_benchmark():
     return results
 
 
-def run_quick_benchmark():
+def run_budgeted_benchmark(budget, config_overrides=None):
+    """Run the most thorough benchmark that fits in the given time budget"""
+    from src.budget import format_budget_plan, parse_budget
+    try:
+        budget_s = parse_budget(budget)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return None
+    
+    print("⏱️  Running Time-Budgeted Benchmark")
+    print("=" * 50)
+    
+    from src import RTOSBenchmarkOrchestrator
+    orchestrator = RTOSBenchmarkOrchestrator()
+    config = orchestrator.default_config.copy()
+    config.update(config_overrides or {})
+    plan = orchestrator.plan_time_budget(budget_s, config)
+    print(format_budget_plan(plan))
+    print()
+    if not plan['success']:
+        return None
+    
+    config.update(plan['overrides'])
+    results = orchestrator.run_comprehensive_benchmark(config)
+    
+    print("\n" + "=" * 60)
+    print(orchestrator.generate_comprehensive_report(results))
+    return results
+
+
+def run_soak(args):
+    """Run the long-running soak mode until its duration elapses or it is stopped"""
+    from src.budget import parse_budget
+    from src.soak import SoakRunner
+    try:
+        config = {
+            'soak_duration_s': parse_budget(args.soak) if args.soak != 'forever' else None,
+            'snapshot_interval_s': parse_budget(args.snapshot_interval) if args.snapshot_interval else None,
+            'soak_dir': args.soak_dir,
+            'soak_max_mb': args.soak_max_mb,
+            'soak_loads': [name.strip() for name in args.soak_loads.split(',')] if args.soak_loads else None,
+            'soak_probe': args.soak_probe,
+            'metrics_textfile': args.metrics_file
+        }
+        result = SoakRunner(config).run()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    
+    if not result['success']:
+        print(f"❌ {result['error']}")
+        return False
+    soak = result['results']['soak']
+    latency = result['results']['cyclictest_results']
+    print(f"\n✅ Soak {soak['status']} after {soak['elapsed_s']:.0f}s, {soak['snapshots']} snapshot(s); "
+          f"max {latency.get('max_latency_us')}μs over {latency.get('samples', 0):,} samples")
+    print(f"   Summary: {result['summary_file']}")
+    return True
+
+
+def parse_tcp_address(text):
+    """(host, port) from 'HOST:PORT' or 'PORT' (host defaults to 127.0.0.1)"""
+    host, _, port = text.rpartition(':')
+    return (host or '127.0.0.1', int(port))
+
+
+def serve_control_api(args):
+    """Run the JSON-RPC control server"""
+    from src.control_server import serve
+    tcp_address = parse_tcp_address(args.tcp) if args.tcp else None
+    if tcp_address and tcp_address[0] not in ('127.0.0.1', 'localhost', '::1'):
+        print(f"⚠️  The control API has no authentication; {tcp_address[0]} is reachable from the network")
+    serve(args.serve, tcp_address, args.store or 'rtos_results.db', benchmark_overrides(args))
+
+
+def call_control_api(args):
+    """Call one control API method and print the JSON result"""
+    import json
+    from src.control_server import ControlClient, RpcError
+    tcp_address = parse_tcp_address(args.tcp) if args.tcp else None
+    try:
+        params = json.loads(args.rpc_params) if args.rpc_params else {}
+        result = ControlClient(args.socket, tcp_address).call(args.rpc, **params)
+    except RpcError as e:
+        print(f"❌ {e.message}" + (f" ({json.dumps(e.data)})" if e.data else ''))
+        return False
+    except (OSError, ValueError) as e:
+        print(f"❌ Control API call failed: {e}")
+        return False
+    print(json.dumps(result, indent=2, default=str))
+    return True
+
+
+def run_quick_benchmark(config_overrides=None):
     """Run a quick benchmark"""
     print("⚡ Running Quick Benchmark")
     print("=" * 50)
     print("This will take approximately 30 seconds...")
     print()
     
+    from src import RTOSBenchmarkOrchestrator, ResultsBoard
     orchestrator = RTOSBenchmarkOrchestrator()
-    results = orchestrator.run_quick_benchmark()
+    results = orchestrator.run_quick_benchmark(config_overrides)
     
     # Display basic results
     print("\n" + "=" * 40)
@@ -133,34 +231,190 @@ def run_quick_benchmark():
     return results
 
 
-def show_recent_results():
-    """Show recent benchmark results"""
+def show_recent_results(results_dirs=None, store_path=None):
+    """Show recent benchmark results
+    
+    Result files are ingested incrementally into the SQLite results store
+    (unchanged files are skipped), and the listing is a single SQL query.
+    """
     print("📊 Recent Benchmark Results")
     print("=" * 50)
     
-    # Look for recent result files
-    import glob
-    result_files = glob.glob("rtos_full_board_results_*.json")
-    result_files.sort(reverse=True)  # Most recent first
+    from src.results_store import ResultsStore, DEFAULT_STORE_PATH
+    from src import ResultsBoard
+    
+    with ResultsStore(store_path or DEFAULT_STORE_PATH) as store:
+        store.ingest_paths(results_dirs or ['.'])
+        store.prune_missing()
+        recent_results = store.recent(limit=5)  # Show up to 5 recent results
     
-    if not result_files:
+    if not recent_results:
         print("No previous benchmark results found.")
         return
     
     results_board = ResultsBoard()
+    leaderboard = results_board.generate_leaderboard(recent_results)
+    print(leaderboard)
+
+
+def detect_regressions(results_dirs=None, store_path=None, confidence=0.95):
+    """Run changepoint detection over each profile's results history
+    
+    Returns the number of regressions found (used as the exit status).
+    """
+    print("📉 Scanning Results History for Regressions")
+    print("=" * 50)
+    
+    from src.results_store import ResultsStore, DEFAULT_STORE_PATH
+    from src.regression import detect_regressions as run_detection, format_regression_report
+    
+    with ResultsStore(store_path or DEFAULT_STORE_PATH) as store:
+        store.ingest_paths(results_dirs or ['.'], recursive=True)
+        store.prune_missing()
+        report = run_detection(store, confidence=confidence)
+    
+    print(format_regression_report(report))
+    return report['regressions']
+
+
+def generate_matrix(root, output_prefix=None):
+    """Regenerate the cross-profile comparison matrix (Markdown + CSV)"""
+    print("🧮 Generating Cross-Profile Comparison Matrix")
+    print("=" * 50)
     
-    # Load and display recent results
-    recent_results = []
-    for filename in result_files[:5]:  # Show up to 5 recent results
-        result_data = results_board.load_results_from_file(filename)
-        if result_data:
-            recent_results.append(result_data)
+    from src.profile_matrix import generate_matrix_report
+    report = generate_matrix_report(root, output_prefix)
     
-    if recent_results:
-        leaderboard = results_board.generate_leaderboard(recent_results)
-        print(leaderboard)
+    if report['success']:
+        print(f"✅ {report['groups']} profile group(s) written to:")
+        print(f"   • {report['markdown_path']}")
+        print(f"   • {report['csv_path']}")
     else:
-        print("Could not load recent results.")
+        print(f"❌ Matrix generation failed: {report['error']}")
+    return report['success']
+
+
+def aggregate_fleet_results(paths, output_prefix=None, workers=None):
+    """Merge results from many boards into a per-fingerprint fleet summary"""
+    print("🛰️  Aggregating Fleet Results")
+    print("=" * 50)
+    
+    from src.fleet import DEFAULT_OUTPUT_PREFIX, aggregate_fleet
+    report = aggregate_fleet(paths, output_prefix or DEFAULT_OUTPUT_PREFIX, workers)
+    
+    if not report['success']:
+        print(f"❌ {report['error']}")
+        return False
+    summary = report['summary']
+    print(f"✅ {summary['runs']} run(s) across {summary['fingerprints']} fingerprint(s) written to:")
+    for path in report['files']:
+        print(f"   • {path}")
+    if summary['duplicates_skipped']:
+        print(f"   {summary['duplicates_skipped']} duplicate run(s) skipped")
+    for error in summary['errors'][:5]:
+        print(f"⚠️  Skipped {error['source']}: {error['error']}")
+    return True
+
+
+def render_html_report(results_file, output=None):
+    """Render an HTML report from a stored results file"""
+    print("🖼️  Rendering HTML Report")
+    print("=" * 50)
+    
+    import os
+    from src import ResultsBoard
+    from src.html_report import write_html_report
+    
+    results = ResultsBoard().load_results_from_file(results_file, load_series=True)
+    if not results:
+        print(f"❌ Could not load {results_file}")
+        return False
+    
+    output = output or os.path.splitext(results_file)[0] + '.html'
+    report = write_html_report(results, output, title=f"RTOS Benchmark Report — {os.path.basename(results_file)}")
+    if report['success']:
+        print(f"✅ Report written to {report['path']}")
+    else:
+        print(f"❌ Report generation failed: {report['error']}")
+    return report['success']
+
+
+def set_score_baseline(results_file, baselines_path=None):
+    """Store a results file as the score reference for its board class"""
+    from src import ResultsBoard
+    from src.scoring import DEFAULT_BASELINES_PATH, save_baseline
+    
+    results = ResultsBoard().load_results_from_file(results_file, load_series=True)
+    if not results:
+        print(f"❌ Could not load {results_file}")
+        return False
+    
+    board_class = save_baseline(results, baselines_path or DEFAULT_BASELINES_PATH, source=results_file)
+    print(f"✅ {results_file} is now the score reference for {board_class}")
+    return True
+
+
+def compare_result_files(baseline_files, candidate_files, confidence=None):
+    """Compare N baseline result files against N candidate result files"""
+    print("🔍 Comparing Benchmark Results")
+    print("=" * 50)
+    
+    from src import ResultsBoard
+    results_board = ResultsBoard()
+    
+    baseline = [results_board.load_results_from_file(f, load_series=True) for f in baseline_files]
+    candidate = [results_board.load_results_from_file(f, load_series=True) for f in candidate_files]
+    baseline = [r for r in baseline if r]
+    candidate = [r for r in candidate if r]
+    
+    if not baseline or not candidate:
+        print("❌ Need at least one readable result file on each side.")
+        return
+    
+    print(results_board.compare_results(baseline, candidate, confidence))
+
+
+def workload_list(text):
+    """argparse type for --workloads: comma-separated opt-in workload phases"""
+    from src.benchmark_orchestrator import RTOSBenchmarkOrchestrator
+    names = [name.strip() for name in text.split(',') if name.strip()]
+    unknown = [name for name in names if name not in RTOSBenchmarkOrchestrator.OPTIONAL_WORKLOADS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown workload(s): {', '.join(unknown)} "
+            f"(available: {', '.join(RTOSBenchmarkOrchestrator.OPTIONAL_WORKLOADS)})")
+    return names
+
+
+def load_name(text):
+    """argparse type for --loaded-load: a registered background load"""
+    from src.background_loads import LOAD_WORKERS
+    if text not in LOAD_WORKERS:
+        raise argparse.ArgumentTypeError(f"unknown load '{text}' (available: {', '.join(sorted(LOAD_WORKERS))})")
+    return text
+
+
+def benchmark_overrides(args):
+    """Benchmark configuration overrides taken from the command line"""
+    overrides = {}
+    if args.metrics_file:
+        overrides['metrics_textfile'] = args.metrics_file
+    if args.store:
+        overrides['results_store'] = args.store
+    if args.score_version:
+        overrides['score_version'] = args.score_version
+    if args.only:
+        overrides['phases_only'] = [name.strip() for name in args.only.split(',') if name.strip()]
+    if args.skip:
+        overrides['phases_skip'] = [name.strip() for name in args.skip.split(',') if name.strip()]
+    for name in args.workloads or []:
+        overrides[name] = True
+    if args.loaded_load:
+        overrides['loaded_latency_load'] = args.loaded_load
+    if args.task_set:
+        overrides['rt_task_set'] = True
+        overrides['rt_task_set_file'] = args.task_set
+    return overrides
 
 
 def main():
@@ -174,6 +428,23 @@ Examples:
   python main.py --quick         Run quick benchmark (30 seconds)
   python main.py --results       Show recent results
   python main.py --system-info   Show detailed system information
+  python main.py --detect-regressions --results-dir system-tests
+                                 Find steps in result history (exit 1 on regression)
+  python main.py --matrix        Regenerate system-tests/RESULTS_MATRIX.{md,csv}
+  python main.py --html-report results.json
+                                 Render results.html with inline SVG plots
+  python main.py --soak 24h --soak-loads none,cpu --metrics-file /var/lib/node_exporter/rtos.prom
+                                 Day-long soak with rotating load and live metrics
+  python main.py --serve          Control API on ./rtos_bench.sock
+  python main.py --rpc start_run --rpc-params '{"kind": "quick"}'
+                                 Drive a served board (see also status, join)
+  python main.py --budget 5m     Best benchmark that fits in five minutes
+  python main.py --only baseline_latency,algorithms
+                                 Run selected phases (dependencies included)
+  python main.py --resume 20251015_232256_a1b2c3
+                                 Continue an interrupted run
+  python main.py --compare a1.json a2.json --against b1.json b2.json
+                                 Significance-tested comparison of runs
 
 For more information, visit: https://github.com/your-repo/rtos-benchmark
         """
@@ -187,6 +458,164 @@ For more information, visit: https://github.com/your-repo/rtos-benchmark
                        action='store_true', 
                        help='Show recent benchmark results')
     
+    parser.add_argument('--results-dir',
+                       action='append',
+                       metavar='DIR',
+                       help='Directory to ingest result files from (repeatable, default: current directory)')
+    
+    parser.add_argument('--store',
+                       metavar='PATH',
+                       help='SQLite results store path (default: rtos_results.db)')
+    
+    parser.add_argument('--detect-regressions',
+                       action='store_true',
+                       help='Run changepoint detection on the results history; exit non-zero on regressions')
+    
+    parser.add_argument('--matrix',
+                       nargs='?',
+                       const='system-tests',
+                       metavar='DIR',
+                       help='Build the cross-profile comparison matrix from DIR/*/ snapshots (default: system-tests)')
+    
+    parser.add_argument('--matrix-output',
+                       metavar='PREFIX',
+                       help='Output path prefix for --matrix (default: DIR/RESULTS_MATRIX)')
+    
+    parser.add_argument('--aggregate',
+                       nargs='+',
+                       metavar='PATH',
+                       help='Merge results from directories, tarballs and .db stores into a fleet summary')
+    
+    parser.add_argument('--aggregate-output',
+                       metavar='PREFIX',
+                       help='Output path prefix for --aggregate (default: fleet_summary)')
+    
+    parser.add_argument('--workers',
+                       type=int,
+                       metavar='N',
+                       help='Parser processes for --aggregate (default: CPU count)')
+    
+    parser.add_argument('--html-report',
+                       metavar='FILE',
+                       help='Render a self-contained HTML report from a stored results file')
+    
+    parser.add_argument('--html-output',
+                       metavar='PATH',
+                       help='Output path for --html-report (default: alongside the results file)')
+    
+    parser.add_argument('--budget',
+                       metavar='TIME',
+                       help='Fit the full benchmark into TIME (e.g. 90s, 5m, 1h); phase costs are '
+                            'learned from earlier runs on this machine')
+    
+    parser.add_argument('--soak',
+                       nargs='?',
+                       const='forever',
+                       metavar='DURATION',
+                       help='Long-running soak mode with periodic snapshots (e.g. 12h; default: until stopped)')
+    
+    parser.add_argument('--snapshot-interval',
+                       metavar='TIME',
+                       help='Soak snapshot interval (default: 5m)')
+    
+    parser.add_argument('--soak-loads',
+                       metavar='LOADS',
+                       help='Comma-separated background loads rotated per snapshot (none, cpu, memory, cache_thrash, io)')
+    
+    parser.add_argument('--soak-probe',
+                       choices=['auto', 'cyclictest', 'python'],
+                       help='Soak latency probe (default: cyclictest when installed)')
+    
+    parser.add_argument('--soak-dir',
+                       metavar='DIR',
+                       help='Soak snapshot directory (default: rtos_soak)')
+    
+    parser.add_argument('--soak-max-mb',
+                       type=float,
+                       metavar='MB',
+                       help='Disk budget per soak run; oldest snapshots are rotated out (default: 50)')
+    
+    parser.add_argument('--serve',
+                       nargs='?',
+                       const='rtos_bench.sock',
+                       metavar='SOCKET',
+                       help='Serve the JSON-RPC control API on a Unix socket (default: rtos_bench.sock)')
+    
+    parser.add_argument('--tcp',
+                       metavar='HOST:PORT',
+                       help='Also serve (or, with --rpc, connect to) the control API over TCP')
+    
+    parser.add_argument('--rpc',
+                       metavar='METHOD',
+                       help='Call a control API method (status, start_run, join, live_stats, ...)')
+    
+    parser.add_argument('--rpc-params',
+                       metavar='JSON',
+                       help='JSON object of parameters for --rpc')
+    
+    parser.add_argument('--socket',
+                       default='rtos_bench.sock',
+                       metavar='PATH',
+                       help='Control API socket for --rpc (default: rtos_bench.sock)')
+    
+    parser.add_argument('--resume',
+                       metavar='RUN_ID',
+                       help='Resume an interrupted full benchmark run from its last completed phase')
+    
+    parser.add_argument('--only',
+                       metavar='PHASES',
+                       help='Comma-separated phases to run (dependencies are added): env_setup, '
+                            'baseline_latency, algorithms, loaded_latency, stress, monitoring, '
+                            'or an opt-in workload (see --workloads)')
+    
+    parser.add_argument('--workloads',
+                       type=workload_list,
+                       metavar='NAMES',
+                       help='Comma-separated opt-in workloads added to the run: ipc_latency, wakeup_latency, '
+                            'memory_hierarchy, syscall_bench, io_latency, loop_lag, rt_task_set')
+    
+    parser.add_argument('--task-set',
+                       metavar='FILE',
+                       help='JSON task set (period_ms, wcet_ms, priority, cpu, algorithm per task) '
+                            'run by the rt_task_set workload; implies --workloads rt_task_set')
+    
+    parser.add_argument('--loaded-load',
+                       type=load_name,
+                       metavar='LOAD',
+                       help='Background load for the loaded-latency phase: cpu, memory, cache_thrash, io '
+                            '(default: multicore stress threads)')
+    
+    parser.add_argument('--skip',
+                       metavar='PHASES',
+                       help='Comma-separated phases to leave out')
+    
+    parser.add_argument('--score-version',
+                       choices=['v1', 'v2'],
+                       help='Composite score formula version (default: v2)')
+    
+    parser.add_argument('--set-score-baseline',
+                       metavar='FILE',
+                       help='Use a results file as the score reference run for its board class')
+    
+    parser.add_argument('--compare',
+                       nargs='+',
+                       metavar='FILE',
+                       help='Baseline result files to compare (use with --against)')
+    
+    parser.add_argument('--against',
+                       nargs='+',
+                       metavar='FILE',
+                       help='Candidate result files compared with --compare')
+    
+    parser.add_argument('--confidence',
+                       type=float,
+                       default=0.95,
+                       help='Confidence level for --compare and --detect-regressions (default: 0.95)')
+    
+    parser.add_argument('--metrics-file',
+                       metavar='PATH',
+                       help='Write OpenMetrics text to PATH after each phase (node_exporter textfile collector)')
+    
     parser.add_argument('--system-info', '-s',
                        action='store_true',
                        help='Show detailed system information')
@@ -210,6 +639,7 @@ For more information, visit: https://github.com/your-repo/rtos-benchmark
             print_system_overview()
             
             # Additional detailed system info
+            from src import RTOSBenchmarkOrchestrator
             orchestrator = RTOSBenchmarkOrchestrator()
             validation = orchestrator.validate_system_requirements()
             
@@ -225,21 +655,66 @@ For more information, visit: https://github.com/your-repo/rtos-benchmark
                     print(f"   • {rec}")
                 print()
         
+        elif args.set_score_baseline:
+            if not set_score_baseline(args.set_score_baseline):
+                sys.exit(1)
+        
+        elif args.html_report:
+            if not render_html_report(args.html_report, args.html_output):
+                sys.exit(1)
+        
+        elif args.aggregate:
+            if not aggregate_fleet_results(args.aggregate, args.aggregate_output, args.workers):
+                sys.exit(1)
+        
+        elif args.matrix:
+            if not generate_matrix(args.matrix, args.matrix_output):
+                sys.exit(1)
+        
+        elif args.detect_regressions:
+            if detect_regressions(args.results_dir, args.store, args.confidence):
+                sys.exit(1)
+        
+        elif args.compare:
+            if not args.against:
+                parser.error('--compare requires --against')
+            compare_result_files(args.compare, args.against, args.confidence)
+        
         elif args.results:
-            show_recent_results()
+            show_recent_results(args.results_dir, args.store)
+        
+        elif args.serve:
+            serve_control_api(args)
+        
+        elif args.rpc:
+            if not call_control_api(args):
+                sys.exit(1)
+        
+        elif args.soak:
+            if not run_soak(args):
+                sys.exit(1)
+        
+        elif args.budget:
+            print_system_overview()
+            results = run_budgeted_benchmark(args.budget, benchmark_overrides(args))
+            if results is None:
+                sys.exit(1)
+        
+        elif args.resume:
+            results = run_full_benchmark(benchmark_overrides(args), resume_run_id=args.resume)
         
         elif args.quick:
             print_system_overview()
-            results = run_quick_benchmark()
+            results = run_quick_benchmark(benchmark_overrides(args))
             
         else:
             # Default: run full benchmark
             print_system_overview()
-            results = run_full_benchmark()
+            results = run_full_benchmark(benchmark_overrides(args))
     
     except KeyboardInterrupt:
         print("\n\n⚠️  Benchmark interrupted by user.")
-        print("Partial results may be available in JSON files.")
+        print("Completed phases are checkpointed; continue with: python main.py --resume <run-id>")
         sys.exit(130)
     
     except Exception as e:
@@ -14,6 +14,31 @@ Modules:
 - results_board: Results formatting, display, and management
 - multicore: Multicore management and CPU affinity
 - benchmark_orchestrator: Main benchmark coordination and orchestration
+- perf_counters: perf_event_open hardware/software counter groups
+- system_fingerprint: Cached board and kernel fingerprinting
+- preemption: Kernel preemption model detection (none/voluntary/full/rt)
+- results_store: Indexed SQLite store of benchmark result files
+- series_archive: Columnar archive for bulk latency/timing series
+- significance: Significance tests for comparing groups of runs
+- regression: Changepoint-based regression detection over results history
+- profile_matrix: Cross-profile comparison matrix (Markdown/CSV)
+- metrics_exporter: OpenMetrics textfile exporter for node_exporter
+- html_report: Self-contained HTML report with inline SVG plots
+- scoring: Versioned composite score (v1 legacy, v2 board-relative)
+- phases: Phase DAG scheduler with per-phase checkpoints and resume
+- budget: Time-budget planner (phase costs learned from earlier runs)
+- background_loads: Antagonist workloads in worker processes
+- soak: Long-running soak mode with periodic snapshots
+- control_server: JSON-RPC control API over a Unix socket (or TCP)
+- fleet: Fleet-wide aggregation of results from many boards
+- quantile_sketch: Mergeable DDSketch for latency and timing percentiles
+- ipc_latency: Ping-pong round-trip latency over pipes, sockets, eventfd and shared memory
+- wakeup_latency: Wake-to-run latency of a sleeper on the RT core
+- memory_workloads: Memory bandwidth, cache-hierarchy latency and memory-bound antagonists
+- syscall_bench: ns per call of clock reads and null syscalls, nanosleep oversleep
+- io_latency: fsync, O_DIRECT and mmap page-fault latency; storage antagonist
+- loop_lag: asyncio call_at() lateness per loop, scheduling policy and competing load
+- task_set: Periodic SCHED_FIFO task set with deadline-miss accounting vs rate-monotonic analysis
 
 Usage:
 ------
@@ -29,11 +54,34 @@ Author: RTOS Benchmark Suite Team
 __version__ = "2.0.0"
 __author__ = "RTOS Benchmark Suite Team"
 
-# Import main components for easier access
-from .benchmark_orchestrator import RTOSBenchmarkOrchestrator
-from .results_board import ResultsBoard
+import importlib
+
+# platform_compat shares its name with its submodule, so bind the instance
+# eagerly (cheap: PlatformCompat defers all probing to first use)
 from .platform_compat import platform_compat
 
+# Heavier components are loaded on first attribute access (PEP 562) so
+# that "import src" does not pull in every benchmark module
+_LAZY_ATTRIBUTES = {
+    'RTOSBenchmarkOrchestrator': '.benchmark_orchestrator',
+    'ResultsBoard': '.results_board',
+}
+
+
+def __getattr__(name):
+    """Import lazily exported components on first access"""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so __getattr__ is not hit again
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 # Define what gets imported with "from src import *"
 __all__ = [
     'RTOSBenchmarkOrchestrator',
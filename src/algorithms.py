@@ -42,6 +42,12 @@ Created for: RTOS Benchmark Suite - Educational Edition
 import random
 import time
 import math
+from .perf_counters import PerfCounterGroup
+from .quantile_sketch import DDSketch
+from .syscall_bench import timer_overhead_s
+
+# Per-iteration times kept verbatim in results; the timing sketch covers every iteration
+MAX_RECORDED_TIMES = 1000
 
 
 class RTOSSortingAlgorithms:
@@ -78,6 +84,9 @@ class RTOSSortingAlgorithms:
         """
         self.algorithm_stats = {}
         
+        # 🔬 Hardware/software counter group, opened once on first use
+        self.perf_counters = PerfCounterGroup()
+        
         # 📊 Store algorithm characteristics for educational purposes
         self.algorithm_info = {
             'bubble_sort': {
@@ -406,33 +415,34 @@ class RTOSSortingAlgorithms:
         Returns:
             dict: Performance metrics
         """
-        times = []
+        # 📊 A DDSketch keeps memory constant however many iterations run
+        times = DDSketch()
+        counter_totals = {}
+        counters = self.perf_counters
+        # ⏱️ Cost of the perf_counter() bracket itself (calibrated once)
+        overhead = timer_overhead_s()
         
         for _ in range(iterations):
             data_copy = test_data.copy()
+            # 🔬 Single read() of the whole counter group on each side
+            counts_before = counters.read()
             start_time = time.perf_counter()
             algorithm_func(data_copy)
             end_time = time.perf_counter()
-            times.append(end_time - start_time)
-        
-        # Calculate statistics
-        avg_time = sum(times) / len(times)
-        min_time = min(times)
-        max_time = max(times)
-        
-        # Calculate median
-        sorted_times = sorted(times)
-        n = len(sorted_times)
-        median_time = (sorted_times[n//2] + sorted_times[(n-1)//2]) / 2
+            counts_after = counters.read()
+            times.add(max(end_time - start_time - overhead, 0.0))
+            counters.accumulate(counter_totals, counters.delta(counts_before, counts_after))
         
         return {
-            'average_time': avg_time,
-            'median_time': median_time,
-            'min_time': min_time,
-            'max_time': max_time,
+            'average_time': times.mean,
+            'median_time': times.quantile(0.5),
+            'min_time': times.min,
+            'max_time': times.max,
             'iterations': iterations,
-            'total_time': sum(times),
-            'data_size': len(test_data)
+            'total_time': times.sum,
+            'data_size': len(test_data),
+            'timer_overhead_ns': round(overhead * 1e9, 2),
+            'perf_counters': counters.summarize(counter_totals, iterations)
         }
     
     def generate_test_data(self, size, data_type="random"):
@@ -480,6 +490,27 @@ class AlgorithmBenchmark:
         """Initialize algorithm benchmark"""
         self.sorting_algorithms = RTOSSortingAlgorithms()
         self.test_results = {}
+        # Share one counter group with the sorting collection
+        self.perf_counters = self.sorting_algorithms.perf_counters
+    
+    @staticmethod
+    def _record_time(elapsed_ms, execution_times, timing_sketch):
+        """Add one iteration time to the sketch (and the capped raw list)"""
+        timing_sketch.add(elapsed_ms)
+        if len(execution_times) < MAX_RECORDED_TIMES:
+            execution_times.append(elapsed_ms)
+    
+    @staticmethod
+    def _timing_summary(execution_times, timing_sketch):
+        """Result fields shared by every algorithm benchmark"""
+        return {
+            'execution_time_ms': round(timing_sketch.mean, 3),
+            'min_time_ms': round(timing_sketch.min, 3),
+            'max_time_ms': round(timing_sketch.max, 3),
+            'percentiles_ms': timing_sketch.percentiles((50, 90, 99)),
+            'all_times': execution_times,
+            'timing_sketch': timing_sketch.to_dict()
+        }
     
     def run_algorithm_test(self, algorithm_name, data_size=1000, iterations=5):
         """Run a specific algorithm test with timing and performance analysis"""
@@ -519,30 +550,31 @@ class AlgorithmBenchmark:
         
         algorithm_func = algorithms[algorithm_name]
         execution_times = []
+        timing_sketch = DDSketch()
+        counter_totals = {}
+        counters = self.perf_counters
         
         for i in range(iterations):
             # Generate test data
             test_data = self.sorting_algorithms.generate_test_data(data_size, 'random')
+            data_copy = test_data.copy()
             
-            # Time the algorithm
+            # Time the algorithm (counters read just outside the timed region)
+            counts_before = counters.read()
             start_time = time.perf_counter()
-            algorithm_func(test_data.copy())
+            algorithm_func(data_copy)
             end_time = time.perf_counter()
+            counts_after = counters.read()
             
-            execution_times.append((end_time - start_time) * 1000)  # Convert to ms
-        
-        avg_time = sum(execution_times) / len(execution_times)
-        min_time = min(execution_times)
-        max_time = max(execution_times)
+            self._record_time((end_time - start_time) * 1000, execution_times, timing_sketch)  # ms
+            counters.accumulate(counter_totals, counters.delta(counts_before, counts_after))
         
         return {
             'algorithm': algorithm_name,
             'data_size': data_size,
             'iterations': iterations,
-            'execution_time_ms': round(avg_time, 3),
-            'min_time_ms': round(min_time, 3),
-            'max_time_ms': round(max_time, 3),
-            'all_times': execution_times,
+            **self._timing_summary(execution_times, timing_sketch),
+            'perf_counters': counters.summarize(counter_totals, iterations),
             'success': True
         }
     
@@ -566,6 +598,9 @@ class AlgorithmBenchmark:
             return result
         
         execution_times = []
+        timing_sketch = DDSketch()
+        counter_totals = {}
+        counters = self.perf_counters
         
         for i in range(iterations):
             # Generate random matrices
@@ -573,20 +608,22 @@ class AlgorithmBenchmark:
             matrix_b = [[random.randint(1, 100) for _ in range(matrix_size)] for _ in range(matrix_size)]
             
             # Time the multiplication
+            counts_before = counters.read()
             start_time = time.perf_counter()
             result = matrix_multiply(matrix_a, matrix_b)
             end_time = time.perf_counter()
+            counts_after = counters.read()
             
-            execution_times.append((end_time - start_time) * 1000)  # Convert to ms
-        
-        avg_time = sum(execution_times) / len(execution_times)
+            self._record_time((end_time - start_time) * 1000, execution_times, timing_sketch)  # ms
+            counters.accumulate(counter_totals, counters.delta(counts_before, counts_after))
         
         return {
             'algorithm': 'matrix_multiplication',
             'matrix_size': matrix_size,
             'iterations': iterations,
-            'execution_time_ms': round(avg_time, 3),
+            **self._timing_summary(execution_times, timing_sketch),
             'operations': matrix_size ** 3,  # Approximate operation count
+            'perf_counters': counters.summarize(counter_totals, iterations),
             'success': True
         }
     
@@ -605,6 +642,9 @@ class AlgorithmBenchmark:
             return result
         
         execution_times = []
+        timing_sketch = DDSketch()
+        counter_totals = {}
+        counters = self.perf_counters
         
         for i in range(iterations):
             # Generate test signal
@@ -613,20 +653,22 @@ class AlgorithmBenchmark:
                         for i in range(data_size)]
             
             # Time the FFT simulation
+            counts_before = counters.read()
             start_time = time.perf_counter()
             result = simple_dft(test_data)
             end_time = time.perf_counter()
+            counts_after = counters.read()
             
-            execution_times.append((end_time - start_time) * 1000)  # Convert to ms
-        
-        avg_time = sum(execution_times) / len(execution_times)
+            self._record_time((end_time - start_time) * 1000, execution_times, timing_sketch)  # ms
+            counters.accumulate(counter_totals, counters.delta(counts_before, counts_after))
         
         return {
             'algorithm': 'fft_simulation',
             'data_size': data_size,
             'iterations': iterations,
-            'execution_time_ms': round(avg_time, 3),
+            **self._timing_summary(execution_times, timing_sketch),
             'complexity': 'O(n²) - Simplified DFT',
+            'perf_counters': counters.summarize(counter_totals, iterations),
             'success': True
         }
 
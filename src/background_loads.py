@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Background Load Generators
+==========================
+
+This module runs antagonist workloads in separate processes while a
+latency measurement runs, so "latency under load" does not depend on
+the GIL-bound stress threads in multicore.py.
+
+Features:
+---------
+- Named load kinds in a registry (LOAD_WORKERS / register_load)
+- CPU, memory-bandwidth, cache-thrash and storage antagonists (see
+  memory_workloads and io_latency)
+- One worker process per CPU, kept off the RT core when possible
+- Workers drop inherited SCHED_FIFO and run at normal priority
+- Prompt start/stop via a shared event; usable as a context manager
+- Per-run worker settings (e.g. the 'io' load's directory) from the run
+  config
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import functools
+import multiprocessing
+import os
+import signal
+from .io_latency import io_antagonist
+from .memory_workloads import cache_thrash_antagonist, memory_antagonist
+
+# Core the RT environment pins the measurement to (see RTOSEnvironment)
+RT_CORE = 3
+
+
+def cpu_antagonist(stop_event):
+    """Integer/float arithmetic spin (same mix as cpu_stress_worker)"""
+    operations = 0
+    while not stop_event.is_set():
+        for i in range(10000):
+            _ = i * i + i / 2
+        operations += 10000
+    return operations
+
+
+# Load kind -> worker(stop_event); 'none' means no antagonist
+LOAD_WORKERS = {
+    'cpu': cpu_antagonist,
+    'memory': memory_antagonist,
+    'cache_thrash': cache_thrash_antagonist,
+    'io': io_antagonist,
+}
+
+
+# Load kind -> {worker keyword: run config key} bound in when the load is built
+LOAD_CONFIG_KEYS = {
+    'io': {'directory': 'io_dir'},
+}
+
+
+def register_load(name, worker):
+    """Make a worker(stop_event) available as a named background load"""
+    LOAD_WORKERS[name] = worker
+
+
+def available_loads():
+    return ['none'] + sorted(LOAD_WORKERS)
+
+
+def load_cpus(rt_core=RT_CORE):
+    """CPUs for antagonist workers: every CPU except the RT core"""
+    try:
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else None
+    except OSError:
+        cpus = None
+    cpus = list(range(os.cpu_count() or 1)) if not cpus or len(cpus) <= 1 else cpus
+    others = [cpu for cpu in cpus if cpu != rt_core]
+    return others or cpus
+
+
+def _worker_main(worker, cpu, stop_event):
+    # Ctrl+C is handled by the parent, which stops the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Children inherit the parent's RT policy and pinning; undo both
+    try:
+        if hasattr(os, 'sched_setscheduler'):
+            os.sched_setscheduler(0, os.SCHED_OTHER, os.sched_param(0))
+    except (OSError, AttributeError):
+        pass
+    try:
+        if cpu is not None and hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, {cpu})
+    except OSError:
+        pass
+    worker(stop_event)
+
+
+class BackgroundLoad:
+    """A named antagonist running in worker processes"""
+
+    def __init__(self, name, workers=None, rt_core=RT_CORE, config=None):
+        """Initialize a load ('none' or a key of LOAD_WORKERS)
+
+        Settings the worker takes from the run config (LOAD_CONFIG_KEYS,
+        e.g. io_dir for 'io') are bound into it here.
+        """
+        if name != 'none' and name not in LOAD_WORKERS:
+            raise ValueError(f"Unknown background load '{name}' (available: {', '.join(available_loads())})")
+        self.name = name
+        options = {arg: (config or {})[key] for arg, key in LOAD_CONFIG_KEYS.get(name, {}).items()
+                   if (config or {}).get(key) is not None}
+        self.worker = functools.partial(LOAD_WORKERS[name], **options) if name != 'none' else None
+        self.cpus = load_cpus(rt_core)
+        self.workers = workers or len(self.cpus)
+        self.processes = []
+        self.stop_event = None
+
+    def start(self):
+        """Start the worker processes (no-op for 'none')"""
+        if self.name == 'none' or self.processes:
+            return self
+        self.stop_event = multiprocessing.Event()
+        for index in range(self.workers):
+            cpu = self.cpus[index % len(self.cpus)]
+            process = multiprocessing.Process(target=_worker_main,
+                                              args=(self.worker, cpu, self.stop_event),
+                                              name=f'rtos-load-{self.name}-{index}', daemon=True)
+            process.start()
+            self.processes.append(process)
+        return self
+
+    def stop(self, timeout=5.0):
+        """Signal the workers to stop and reap them"""
+        if self.stop_event is not None:
+            self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join(1.0)
+        self.processes = []
+
+    @property
+    def running(self):
+        return any(process.is_alive() for process in self.processes)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
@@ -17,19 +17,54 @@ Author: RTOS Benchmark Suite Team
 """
 
 import json
+import threading
 import time
 from datetime import datetime
 from .platform_compat import platform_compat
 from .algorithms import RTOSSortingAlgorithms, AlgorithmBenchmark
 from .rtos_env import RTOSEnvironment
 from .cyclictest import CyclicTestIntegration
+from .background_loads import BackgroundLoad
+from .io_latency import run_io_suite
+from .ipc_latency import run_ipc_suite
+from .loop_lag import run_loop_lag_suite
+from .memory_workloads import run_memory_suite
+from .syscall_bench import run_syscall_suite
+from .task_set import run_task_set_suite
+from .wakeup_latency import run_wakeup_suite
 from .results_board import ResultsBoard
+from .results_store import ResultsStore, DEFAULT_STORE_PATH
+from .budget import (FINALIZE_RESERVE_S, MIN_UNITS, WORKLOAD_UNITS, estimate_costs, format_duration, phase_cost,
+                     plan_budget)
 from .multicore import MulticoreManager
+from .phases import DEFAULT_CHECKPOINT_DIR, Phase, PhaseScheduler, RunCheckpoint
+from .scoring import DEFAULT_BASELINES_PATH, DEFAULT_SCORE_VERSION, compute_score, load_baselines
+from .soak import ThermalSampler
+from .system_fingerprint import fingerprint_of
+
+# Temperature/frequency sampling period while the phases run
+THERMAL_TRACE_INTERVAL_S = 1.0
+
+
+class _DeadlineStop:
+    """Stop flag for workload suites: set on a stop request or once the deadline passes"""
+
+    def __init__(self, stop_event, deadline):
+        self.stop_event = stop_event
+        self.deadline = deadline
+
+    def is_set(self):
+        return self.stop_event.is_set() or time.time() >= self.deadline
 
 
 class RTOSBenchmarkOrchestrator:
     """Main benchmark orchestration and coordination"""
     
+    BENCHMARK_ALGORITHMS = ('quick_sort', 'merge_sort', 'matrix_multiplication', 'fft_simulation')
+    # Opt-in workload phases: enabled by config[name] or by naming them in phases_only
+    OPTIONAL_WORKLOADS = ('ipc_latency', 'wakeup_latency', 'memory_hierarchy', 'syscall_bench',
+                          'io_latency', 'loop_lag', 'rt_task_set')
+    
     def __init__(self):
         """Initialize benchmark orchestrator"""
         self.platform = platform_compat
@@ -38,6 +73,12 @@ class RTOSBenchmarkOrchestrator:
         self.cyclictest = CyclicTestIntegration()
         self.results_board = ResultsBoard()
         self.multicore = MulticoreManager()
+        self.current_run_id = None
+        self.current_checkpoint = None
+        self.current_results = None
+        self.stop_event = threading.Event()
+        self.deadline = None
+        self.phase_costs = {}
         
         # Default test configuration
         self.default_config = {
@@ -47,6 +88,44 @@ class RTOSBenchmarkOrchestrator:
             'multicore_tests': True,
             'environment_monitoring': True,
             'save_results': True,
+            'results_store': DEFAULT_STORE_PATH,
+            'metrics_textfile': None,
+            'score_version': DEFAULT_SCORE_VERSION,
+            'score_baselines': DEFAULT_BASELINES_PATH,
+            'checkpoint_dir': DEFAULT_CHECKPOINT_DIR,
+            'loaded_latency': True,
+            'loaded_latency_load': None,
+            'algorithm_iterations': 5,
+            'stress_duration': 5,
+            'time_budget_s': None,
+            'ipc_latency': False,
+            'ipc_iterations': 5000,
+            'ipc_transports': None,
+            'ipc_load': 'cpu',
+            'wakeup_latency': False,
+            'wakeup_iterations': 1000,
+            'wakeup_mechanisms': None,
+            'wakeup_load': 'cpu',
+            'memory_hierarchy': False,
+            'memory_buffer_mb': 64,
+            'memory_working_sets_kb': None,
+            'memory_chase_steps': 200000,
+            'syscall_bench': False,
+            'syscall_batch': 100000,
+            'syscall_batches': 10,
+            'io_latency': False,
+            'io_iterations': 200,
+            'io_dir': None,
+            'io_load': 'cpu',
+            'loop_lag': False,
+            'loop_lag_samples': 1000,
+            'loop_lag_period_us': 1000,
+            'loop_lag_loops': None,
+            'rt_task_set': False,
+            'rt_task_set_tasks': None,
+            'rt_task_set_file': None,
+            'rt_task_set_duration': 5,
+            'rt_task_set_mode': 'process',
             'show_progress': True
         }
     
@@ -93,14 +172,77 @@ class RTOSBenchmarkOrchestrator:
         
         return validation_results
     
-    def run_comprehensive_benchmark(self, config=None):
-        """Run the complete RTOS benchmark suite"""
+    def build_phases(self):
+        """The benchmark as a DAG of named phases"""
+        multicore_enabled = lambda config: config.get('multicore_tests', True) and self.multicore.cpu_count > 1
+        workload_enabled = lambda name: lambda config: (
+            bool(config.get(name)) or name in (config.get('phases_only') or ()))
+        return [
+            Phase('env_setup', self._phase_env_setup, description='Environment setup', rerun_on_resume=True),
+            Phase('baseline_latency', self._phase_baseline_latency, ('env_setup',),
+                  description='Baseline latency', unit_key='duration',
+                  measure=lambda output, config: output['cyclictest_results'].get('duration')),
+            Phase('algorithms', self._phase_algorithms, ('env_setup',), description='Algorithm benchmarks',
+                  enabled=lambda config: config.get('algorithm_tests', True), unit_key='algorithm_iterations',
+                  measure=lambda output, config: sum(
+                      result.get('iterations', 0) for result in output['algorithm_results'].values()
+                  ) / len(self.BENCHMARK_ALGORITHMS)),
+            Phase('loaded_latency', self._phase_loaded_latency, ('baseline_latency',),
+                  description='Loaded latency', unit_key='duration',
+                  enabled=lambda config: multicore_enabled(config) and config.get('loaded_latency', True),
+                  measure=lambda output, config: output['loaded_latency_results'].get('duration')),
+            Phase('stress', self._phase_stress, ('env_setup',), description='Multicore stress',
+                  enabled=multicore_enabled, unit_key='stress_duration',
+                  measure=lambda output, config: output['multicore_stress'].get('test_duration')),
+            Phase('ipc_latency', self._phase_ipc_latency, ('env_setup',), description='IPC round-trip latency',
+                  enabled=workload_enabled('ipc_latency')),
+            Phase('wakeup_latency', self._phase_wakeup_latency, ('env_setup',), description='Wakeup latency',
+                  enabled=workload_enabled('wakeup_latency')),
+            Phase('memory_hierarchy', self._phase_memory_hierarchy, ('env_setup',),
+                  description='Memory bandwidth and access latency', enabled=workload_enabled('memory_hierarchy')),
+            Phase('syscall_bench', self._phase_syscall_bench, ('env_setup',),
+                  description='Syscall and timer costs', enabled=workload_enabled('syscall_bench')),
+            Phase('io_latency', self._phase_io_latency, ('env_setup',), description='Storage I/O latency',
+                  enabled=workload_enabled('io_latency')),
+            Phase('loop_lag', self._phase_loop_lag, ('env_setup',), description='asyncio event-loop lag',
+                  enabled=workload_enabled('loop_lag')),
+            Phase('rt_task_set', self._phase_rt_task_set, ('env_setup',), description='Periodic RT task set',
+                  enabled=workload_enabled('rt_task_set')),
+            Phase('monitoring', self._phase_monitoring, description='Environment monitoring',
+                  enabled=lambda config: config.get('environment_monitoring', True)),
+        ]
+    
+    def run_comprehensive_benchmark(self, config=None, resume_run_id=None):
+        """Run the complete RTOS benchmark suite
+        
+        Phases run in dependency order and each one's output is
+        checkpointed under config['checkpoint_dir'] as it completes.
+        config['phases_only'] / config['phases_skip'] select phases by
+        name. With resume_run_id the stored config of that run is reused
+        and its completed phases are restored instead of re-run.
+        config['time_budget_s'] sets a deadline: phases are shortened or
+        skipped rather than overrunning it (see plan_time_budget).
+        """
         if config is None:
             config = self.default_config.copy()
+        started = time.time()
+        checkpoint_dir = config.get('checkpoint_dir', DEFAULT_CHECKPOINT_DIR)
+        only, skip = config.get('phases_only'), config.get('phases_skip')
         
         print("🚀 Starting RTOS Benchmark Suite...")
         print("=" * 50)
         
+        if resume_run_id:
+            checkpoint = RunCheckpoint.load(resume_run_id, checkpoint_dir)
+            config = checkpoint.state['config']
+            print(f"🔁 Resuming run {checkpoint.run_id}")
+        else:
+            checkpoint = RunCheckpoint.create(config, checkpoint_dir)
+            print(f"🆔 Run ID: {checkpoint.run_id} (resume with --resume {checkpoint.run_id})")
+        self.current_run_id = checkpoint.run_id
+        self.current_checkpoint = checkpoint
+        self.stop_event.clear()
+        
         # Validate system
         validation = self.validate_system_requirements()
         if validation['warnings']:
@@ -113,15 +255,122 @@ class RTOSBenchmarkOrchestrator:
             for rec in validation['recommendations']:
                 print(f"   • {rec}")
         
-        print("\n🔧 Preparing test environment...")
-        
         # Initialize test results structure
         results = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': checkpoint.state['created'],
+            'run_id': checkpoint.run_id,
             'test_config': config,
             'system_info': validation['system_info'],
             'validation': validation
         }
+        self.current_results = results
+        
+        checkpoint.state['fingerprint'] = fingerprint_of(results)
+        checkpoint.save()
+        
+        phases = self.build_phases()
+        scheduler = PhaseScheduler(phases)
+        self.deadline, min_cost = None, None
+        if config.get('time_budget_s'):
+            self.deadline = started + config['time_budget_s'] - FINALIZE_RESERVE_S
+            self.phase_costs = estimate_costs(phases, checkpoint.state['fingerprint'], checkpoint_dir)
+            min_cost = lambda name: phase_cost(scheduler.phases[name], self.phase_costs[name],
+                                               MIN_UNITS.get(scheduler.phases[name].unit_key, 0))
+        thermal = ThermalSampler(THERMAL_TRACE_INTERVAL_S, started).start()
+        try:
+            summary = scheduler.run(
+                results, config, checkpoint, only=only, skip=skip,
+                on_phase_complete=lambda name: self.export_phase_metrics(results, config, name),
+                show_progress=config.get('show_progress', True), deadline=self.deadline, min_cost=min_cost,
+                stop_event=self.stop_event)
+        finally:
+            # Cleanup environment (also on interrupt)
+            results['cleanup'] = self.rtos_env.cleanup_rt_environment()
+            thermal.stop()
+        results.setdefault('environment_info', {})['thermal_trace'] = thermal.take()
+        results['phases'] = summary
+        
+        # Calculate composite performance score
+        composite_score = self.calculate_composite_score(results, config)
+        results['composite_score'] = composite_score
+        self.export_phase_metrics(results, config, 'scoring')
+        
+        # Save results to file
+        filename = None
+        if config.get('save_results', True):
+            timestamp_str = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"rtos_full_board_results_{timestamp_str}.json"
+            if self.results_board.save_results_to_file(results, filename) and config.get('results_store'):
+                # Index the new run so leaderboards never need to re-parse it
+                try:
+                    with ResultsStore(config['results_store']) as store:
+                        store.ingest_file(filename, results=results)
+                except Exception as e:
+                    print(f"⚠️  Could not index results in {config['results_store']}: {e}")
+        
+        failed = [name for name, status in summary.items() if status in ('failed', 'blocked', 'skipped_budget', 'cancelled')]
+        checkpoint.finish('incomplete' if failed else 'completed', filename)
+        
+        if failed:
+            print(f"\n⚠️  Phases not completed: {', '.join(failed)} (retry with --resume {checkpoint.run_id})")
+        if config.get('time_budget_s'):
+            print(f"⏱️  Finished in {format_duration(time.time() - started)} "
+                  f"of a {format_duration(config['time_budget_s'])} budget")
+        print("\n🎯 Benchmark completed!")
+        print("=" * 50)
+        
+        return results
+    
+    def request_stop(self):
+        """Cancel the running benchmark after its current phase (resumable)"""
+        self.stop_event.set()
+    
+    def plan_time_budget(self, budget_s, config=None):
+        """Config overrides that fit a full run into budget_s seconds
+        
+        Phase costs are estimated from earlier checkpointed runs with the
+        same fingerprint (see budget.plan_budget).
+        """
+        config = config or self.default_config
+        try:
+            phases = self.build_phases()
+            system_info = self.validate_system_requirements()['system_info']
+            costs = estimate_costs(phases, fingerprint_of({'system_info': system_info}),
+                                   config.get('checkpoint_dir', DEFAULT_CHECKPOINT_DIR))
+            return plan_budget(budget_s, phases, costs, config)
+        except Exception as e:
+            return {'success': False, 'error': f'Budget planning failed: {e}', 'budget_s': budget_s}
+    
+    def _units_within_budget(self, phase, requested, minimum):
+        """Cap a phase's unit count so it ends before the deadline"""
+        cost = self.phase_costs.get(phase)
+        if not self.deadline or not cost or cost['per_unit_s'] <= 0:
+            return requested
+        affordable = int((self.deadline - time.time() - cost['overhead_s']) / cost['per_unit_s'])
+        return max(minimum, min(requested, affordable))
+    
+    def _run_workload(self, phase, suite, config):
+        """Run an opt-in workload suite so it ends by the deadline
+        
+        The phase's unit count (WORKLOAD_UNITS) is scaled by the share of
+        its estimated cost that still fits, and the suite treats the
+        deadline like a stop request.
+        """
+        if not self.deadline:
+            return suite(config, self.stop_event)
+        key, minimum = WORKLOAD_UNITS[phase]
+        cost = self.phase_costs.get(phase)
+        requested = config.get(key)
+        if cost and cost['overhead_s'] > 0 and requested:
+            fraction = (self.deadline - time.time()) / cost['overhead_s']
+            if fraction < 1:
+                config = dict(config, **{key: type(requested)(max(minimum, requested * fraction))})
+        return suite(config, _DeadlineStop(self.stop_event, self.deadline))
+    
+    def _phase_env_setup(self, results, config):
+        """Apply the RT environment and multicore optimizations"""
+        print("\n🔧 Preparing test environment...")
+        output = {}
         
         # Setup RTOS environment
         env_setup = self.rtos_env.setup_rt_environment(
@@ -129,7 +378,7 @@ class RTOSBenchmarkOrchestrator:
             set_priority=config.get('set_priority', True),
             target_priority=config.get('priority', 99)
         )
-        results['environment_setup'] = env_setup
+        output['environment_setup'] = env_setup
         
         if config.get('show_progress', True):
             print(f"✅ Environment setup completed")
@@ -139,176 +388,178 @@ class RTOSBenchmarkOrchestrator:
         
         # Optimize for multicore if available
         if config.get('multicore_tests', True) and self.multicore.cpu_count > 1:
-            multicore_opt = self.multicore.optimize_for_rt_workload()
-            results['multicore_optimization'] = multicore_opt
+            output['multicore_optimization'] = self.multicore.optimize_for_rt_workload()
             if config.get('show_progress', True):
                 print(f"✅ Multicore optimization applied")
         
-        # Run cyclictest benchmark
-        print("\n📊 Running real-time latency tests...")
-        cyclictest_results = self.cyclictest.run_cyclictest(
-            duration=config.get('duration', 15),
-            priority=config.get('priority', 99)
-        )
-        results['cyclictest_results'] = cyclictest_results
-        
+        return output
+    
+    def _report_latency(self, label, cyclictest_results, config):
         if config.get('show_progress', True):
             if cyclictest_results.get('success'):
                 max_lat = cyclictest_results.get('max_latency_us', 'N/A')
                 avg_lat = cyclictest_results.get('avg_latency_us', 'N/A')
-                print(f"✅ Latency test completed - Max: {max_lat}μs, Avg: {avg_lat}μs")
+                print(f"✅ {label} completed - Max: {max_lat}μs, Avg: {avg_lat}μs")
             else:
-                print(f"⚠️  Latency test had issues: {cyclictest_results.get('error', 'Unknown error')}")
-        
-        # Run algorithm benchmarks
-        if config.get('algorithm_tests', True):
-            print("\n🧮 Running algorithm benchmarks...")
-            algorithm_results = {}
-            
-            algorithms_to_test = ['quick_sort', 'merge_sort', 'matrix_multiplication', 'fft_simulation']
-            
-            for algorithm in algorithms_to_test:
-                if config.get('show_progress', True):
-                    print(f"   Running {algorithm}...")
-                
-                alg_result = self.algorithm_bench.run_algorithm_test(algorithm)
-                algorithm_results[algorithm] = alg_result
-                
-                if config.get('show_progress', True) and alg_result.get('success'):
-                    exec_time = alg_result.get('execution_time_ms', 'N/A')
-                    print(f"   ✅ {algorithm}: {exec_time} ms")
-            
-            results['algorithm_results'] = algorithm_results
-        
-        # Run multicore stress test
-        if config.get('multicore_tests', True) and self.multicore.cpu_count > 1:
-            print("\n⚡ Running multicore stress test...")
-            stress_results = self.multicore.run_multicore_stress_test(duration=5)
-            results['multicore_stress'] = stress_results
-            
+                print(f"⚠️  {label} had issues: {cyclictest_results.get('error', 'Unknown error')}")
+    
+    def _phase_baseline_latency(self, results, config):
+        """cyclictest on an otherwise idle system"""
+        print("\n📊 Running real-time latency tests...")
+        duration = self._units_within_budget('baseline_latency', config.get('duration', 15), MIN_UNITS['duration'])
+        cyclictest_results = self.cyclictest.run_cyclictest(
+            duration=duration,
+            priority=config.get('priority', 99)
+        )
+        cyclictest_results['duration'] = duration
+        self._report_latency('Latency test', cyclictest_results, config)
+        return {'cyclictest_results': cyclictest_results}
+    
+    def _phase_loaded_latency(self, results, config):
+        """cyclictest while a background load runs
+
+        The load is the multicore stress threads unless loaded_latency_load
+        names a background_loads kind (e.g. 'memory' or 'cache_thrash').
+        """
+        print("\n📊 Running latency tests under load...")
+        duration = self._units_within_budget('loaded_latency', config.get('duration', 15), MIN_UNITS['duration'])
+        load_name = config.get('loaded_latency_load')
+        if load_name:
+            with BackgroundLoad(load_name, config=config) as background:
+                time.sleep(1)  # Let the load ramp up before measuring
+                cyclictest_results = self.cyclictest.run_cyclictest(duration=duration,
+                                                                    priority=config.get('priority', 99))
+                cyclictest_results['load'] = {'name': load_name, 'workers': background.workers,
+                                              'success': background.running}
+            cyclictest_results['duration'] = duration
+            self._report_latency('Loaded latency test', cyclictest_results, config)
+            return {'loaded_latency_results': cyclictest_results}
+
+        load = {}
+        stress_thread = threading.Thread(
+            target=lambda: load.update(self.multicore.run_multicore_stress_test(duration=duration + 2)),
+            daemon=True)
+        stress_thread.start()
+        time.sleep(1)  # Let the load ramp up before measuring
+        
+        cyclictest_results = self.cyclictest.run_cyclictest(duration=duration, priority=config.get('priority', 99))
+        cyclictest_results['duration'] = duration
+        stress_thread.join()
+        cyclictest_results['load'] = {key: load.get(key) for key in
+                                      ('total_cores_tested', 'total_operations', 'success')}
+        
+        self._report_latency('Loaded latency test', cyclictest_results, config)
+        return {'loaded_latency_results': cyclictest_results}
+    
+    def _phase_algorithms(self, results, config):
+        """Timed algorithm benchmarks"""
+        print("\n🧮 Running algorithm benchmarks...")
+        algorithm_results = {}
+        iterations = self._units_within_budget('algorithms', config.get('algorithm_iterations', 5),
+                                               MIN_UNITS['algorithm_iterations'])
+        
+        for algorithm in self.BENCHMARK_ALGORITHMS:
+            if self.deadline and time.time() >= self.deadline:
+                print(f"   ⏱️  Time budget reached - skipping remaining algorithms")
+                break
             if config.get('show_progress', True):
-                if stress_results.get('success'):
-                    cores_tested = stress_results.get('total_cores_tested', 0)
-                    total_ops = stress_results.get('total_operations', 0)
-                    print(f"✅ Stress test completed - {cores_tested} cores, {total_ops:,} operations")
-        
-        # Collect environment information
-        if config.get('environment_monitoring', True):
-            print("\n🌡️  Collecting environment data...")
-            env_info = self.rtos_env.get_system_info()
-            results['environment_info'] = env_info
+                print(f"   Running {algorithm}...")
             
-            if config.get('show_progress', True):
-                temp = env_info.get('cpu_temperature_c')
-                if temp:
-                    print(f"✅ Environment data collected - CPU temp: {temp}°C")
-                else:
-                    print(f"✅ Environment data collected")
+            alg_result = self.algorithm_bench.run_algorithm_test(algorithm, iterations=iterations)
+            algorithm_results[algorithm] = alg_result
+            
+            if config.get('show_progress', True) and alg_result.get('success'):
+                exec_time = alg_result.get('execution_time_ms', 'N/A')
+                print(f"   ✅ {algorithm}: {exec_time} ms")
         
-        # Calculate composite performance score
-        composite_score = self.calculate_composite_score(results)
-        results['composite_score'] = composite_score
+        return {'algorithm_results': algorithm_results}
+    
+    def _phase_ipc_latency(self, results, config):
+        """Ping-pong latency between two pinned processes per IPC transport"""
+        print("\n📡 Running IPC round-trip latency tests...")
+        return {'ipc_latency': self._run_workload('ipc_latency', run_ipc_suite, config)}
+    
+    def _phase_wakeup_latency(self, results, config):
+        """Wake-to-run latency of a sleeper on the RT core woken from another core"""
+        print("\n⏰ Running wakeup latency tests...")
+        return {'wakeup_latency': self._run_workload('wakeup_latency', run_wakeup_suite, config)}
+    
+    def _phase_memory_hierarchy(self, results, config):
+        """Sequential bandwidth and pointer-chasing latency across working sets"""
+        print("\n🧠 Running memory bandwidth and cache-hierarchy tests...")
+        return {'memory_hierarchy': self._run_workload('memory_hierarchy', run_memory_suite, config)}
+    
+    def _phase_syscall_bench(self, results, config):
+        """ns per call of clock reads and null syscalls, and nanosleep oversleep"""
+        print("\n🔁 Running syscall and timer microbenchmarks...")
+        return {'syscall_bench': self._run_workload('syscall_bench', run_syscall_suite, config)}
+    
+    def _phase_io_latency(self, results, config):
+        """fsync, O_DIRECT and page-fault latency in a temp dir on the target filesystem"""
+        print("\n💾 Running storage I/O latency tests...")
+        return {'io_latency': self._run_workload('io_latency', run_io_suite, config)}
+    
+    def _phase_loop_lag(self, results, config):
+        """Lateness of periodic call_at() callbacks per loop, policy and competing load"""
+        print("\n🌀 Running asyncio event-loop lag tests...")
+        return {'loop_lag': self._run_workload('loop_lag', run_loop_lag_suite, config)}
+    
+    def _phase_rt_task_set(self, results, config):
+        """Periodic SCHED_FIFO task set: deadline misses vs rate-monotonic analysis"""
+        print("\n📋 Running periodic RT task set...")
+        return {'rt_task_set': self._run_workload('rt_task_set', run_task_set_suite, config)}
+    
+    def _phase_stress(self, results, config):
+        """Multicore stress throughput"""
+        print("\n⚡ Running multicore stress test...")
+        duration = self._units_within_budget('stress', config.get('stress_duration', 5), MIN_UNITS['stress_duration'])
+        stress_results = self.multicore.run_multicore_stress_test(duration=duration)
         
-        # Cleanup environment
-        cleanup_result = self.rtos_env.cleanup_rt_environment()
-        results['cleanup'] = cleanup_result
+        if config.get('show_progress', True):
+            if stress_results.get('success'):
+                cores_tested = stress_results.get('total_cores_tested', 0)
+                total_ops = stress_results.get('total_operations', 0)
+                print(f"✅ Stress test completed - {cores_tested} cores, {total_ops:,} operations")
         
-        # Save results to file
-        if config.get('save_results', True):
-            timestamp_str = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"rtos_full_board_results_{timestamp_str}.json"
-            self.results_board.save_results_to_file(results, filename)
+        return {'multicore_stress': stress_results}
+    
+    def _phase_monitoring(self, results, config):
+        """Environment (temperature etc.) snapshot"""
+        print("\n🌡️  Collecting environment data...")
+        env_info = self.rtos_env.get_system_info()
         
-        print("\n🎯 Benchmark completed!")
-        print("=" * 50)
+        if config.get('show_progress', True):
+            temp = env_info.get('cpu_temperature_c')
+            if temp:
+                print(f"✅ Environment data collected - CPU temp: {temp}°C")
+            else:
+                print(f"✅ Environment data collected")
         
-        return results
+        return {'environment_info': env_info}
+    
+    def export_phase_metrics(self, results, config, phase, soak_stats=None):
+        """Rewrite the OpenMetrics textfile after a phase (if configured)"""
+        path = config.get('metrics_textfile')
+        if not path:
+            return None
+        
+        from .metrics_exporter import OpenMetricsExporter
+        export = OpenMetricsExporter(path).write(results, phase=phase, soak_stats=soak_stats)
+        if not export['success']:
+            print(f"⚠️  Could not write metrics to {path}: {export['error']}")
+        return export
     
-    def calculate_composite_score(self, results):
-        """Calculate a composite performance score"""
+    def calculate_composite_score(self, results, config=None):
+        """Calculate a composite performance score
+        
+        The formula version comes from config['score_version'] (default
+        v2, relative to the board-class reference run) and is recorded in
+        the returned dict.
+        """
+        config = config or self.default_config
         try:
-            score_components = {}
-            total_score = 0
-            weight_sum = 0
-            
-            # Real-time latency score (40% weight)
-            cyclictest = results.get('cyclictest_results', {})
-            if cyclictest.get('success') and cyclictest.get('max_latency_us'):
-                max_latency = cyclictest['max_latency_us']
-                avg_latency = cyclictest.get('avg_latency_us', max_latency)
-                
-                # Lower latency = better score (invert and normalize)
-                latency_score = 100 / (1 + max_latency / 10 + avg_latency / 20)
-                score_components['latency'] = latency_score
-                total_score += latency_score * 0.4
-                weight_sum += 0.4
-            
-            # Algorithm performance score (30% weight)
-            algorithms = results.get('algorithm_results', {})
-            if algorithms:
-                alg_scores = []
-                for alg_name, alg_result in algorithms.items():
-                    if alg_result.get('success') and alg_result.get('execution_time_ms'):
-                        # Normalize based on expected performance
-                        exec_time = alg_result['execution_time_ms']
-                        # Lower execution time = better score
-                        alg_score = 100 / (1 + exec_time / 50)
-                        alg_scores.append(alg_score)
-                
-                if alg_scores:
-                    avg_alg_score = sum(alg_scores) / len(alg_scores)
-                    score_components['algorithms'] = avg_alg_score
-                    total_score += avg_alg_score * 0.3
-                    weight_sum += 0.3
-            
-            # System capability score (20% weight)
-            system_score = 50  # Base score
-            
-            # Bonus for RT capabilities
-            if results.get('system_info', {}).get('rt_kernel_capable'):
-                system_score += 20
-            
-            # Bonus for multicore
-            cpu_count = results.get('system_info', {}).get('cpu_count', 1)
-            system_score += min(20, cpu_count * 2)
-            
-            # Memory bonus
-            memory_gb = results.get('system_info', {}).get('memory_gb', 0)
-            system_score += min(10, memory_gb)
-            
-            score_components['system'] = system_score
-            total_score += system_score * 0.2
-            weight_sum += 0.2
-            
-            # Environment score (10% weight)
-            env_score = 50  # Base score
-            
-            # Temperature penalty (if available)
-            temp = results.get('environment_info', {}).get('cpu_temperature_c')
-            if temp:
-                if temp > 80:
-                    env_score -= 20
-                elif temp > 70:
-                    env_score -= 10
-                elif temp < 50:
-                    env_score += 10
-            
-            score_components['environment'] = env_score
-            total_score += env_score * 0.1
-            weight_sum += 0.1
-            
-            # Normalize final score
-            if weight_sum > 0:
-                final_score = total_score / weight_sum
-            else:
-                final_score = 50  # Default score
-            
-            return {
-                'composite_score': round(final_score, 2),
-                'components': score_components,
-                'methodology': 'Weighted average: Latency(40%) + Algorithms(30%) + System(20%) + Environment(10%)'
-            }
-            
+            baselines = load_baselines(config.get('score_baselines', DEFAULT_BASELINES_PATH))
+            return compute_score(results, config.get('score_version', DEFAULT_SCORE_VERSION), baselines)
         except Exception as e:
             return {
                 'composite_score': 0,
@@ -316,7 +567,7 @@ class RTOSBenchmarkOrchestrator:
                 'components': {}
             }
     
-    def run_quick_benchmark(self):
+    def run_quick_benchmark(self, overrides=None):
         """Run a quick benchmark with minimal configuration"""
         quick_config = {
             'duration': 5,
@@ -325,19 +576,30 @@ class RTOSBenchmarkOrchestrator:
             'multicore_tests': False,
             'environment_monitoring': True,
             'save_results': False,
+            'loaded_latency': False,
             'show_progress': True
         }
+        quick_config.update(overrides or {})
         
         return self.run_comprehensive_benchmark(quick_config)
     
-    def compare_with_previous_results(self, current_results, previous_results_file):
-        """Compare current results with previous benchmark results"""
-        previous_results = self.results_board.load_results_from_file(previous_results_file)
-        
+    def compare_with_previous_results(self, current_results, previous_results_file, confidence=None):
+        """Compare current results with previous benchmark results
+
+        previous_results_file may be a single path or a list of paths
+        (N baseline runs).
+        """
+        if isinstance(previous_results_file, str):
+            previous_results_file = [previous_results_file]
+
+        previous_results = [self.results_board.load_results_from_file(f, load_series=True)
+                            for f in previous_results_file]
+        previous_results = [r for r in previous_results if r]
+
         if not previous_results:
             return "No previous results found for comparison."
-        
-        comparison = self.results_board.compare_results(previous_results, current_results)
+
+        comparison = self.results_board.compare_results(previous_results, current_results, confidence)
         return comparison
     
     def generate_comprehensive_report(self, results):
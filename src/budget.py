@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Time-Budget Planning
+====================
+
+This module sizes a benchmark run to fit a wall-clock budget
+(``python main.py --budget 5m``). Phase costs are learned from the
+checkpoints of earlier runs on the same fingerprint; the time left after
+fixed overheads is split between latency duration, algorithm iterations
+and stress duration so that the overall confidence is highest.
+
+Features:
+---------
+- Budget strings such as '90s', '5m', '1h30m' (a bare number is minutes)
+- Per-phase cost model (overhead + cost per unit) fitted from history
+- Optional phases dropped by priority when their minimum does not fit
+- Allocation minimising the summed 1/sqrt(n) confidence-interval width
+- Plan overrides consumed by the orchestrator, which enforces the deadline
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import glob
+import json
+import math
+import os
+import re
+
+from .phases import DEFAULT_CHECKPOINT_DIR, STATE_FILE, PhaseScheduler
+
+# Share of the budget the plan may use (the rest absorbs estimate error)
+SAFETY_MARGIN = 0.9
+# Scoring, saving and cleanup after the last phase
+FINALIZE_RESERVE_S = 2.0
+
+# Default (overhead_s, seconds per unit) for runs without history
+DEFAULT_PHASE_COSTS = {
+    'env_setup': (0.5, 0.0),
+    'baseline_latency': (0.5, 1.0),
+    'algorithms': (0.2, 0.25),
+    'loaded_latency': (3.0, 1.0),
+    'stress': (0.5, 1.0),
+    'monitoring': (0.3, 0.0),
+    'ipc_latency': (10.0, 0.0),
+    'wakeup_latency': (12.0, 0.0),
+    'memory_hierarchy': (15.0, 0.0),
+    'syscall_bench': (10.0, 0.0),
+    'io_latency': (10.0, 0.0),
+    'loop_lag': (16.0, 0.0),
+    'rt_task_set': (7.0, 0.0),
+}
+GENERIC_PHASE_COST = (1.0, 1.0)
+
+# Phases are kept in this order when the budget is tight
+PHASE_PRIORITY = ('env_setup', 'baseline_latency', 'algorithms', 'monitoring', 'stress', 'loaded_latency')
+
+# Per-unit limits and relative importance (mirrors the v2 score weights)
+MIN_UNITS = {'duration': 1, 'algorithm_iterations': 3, 'stress_duration': 1}
+MAX_UNITS = {'duration': 300, 'algorithm_iterations': 200, 'stress_duration': 60}
+CONFIDENCE_WEIGHTS = {'duration': 0.50, 'algorithm_iterations': 0.35, 'stress_duration': 0.15}
+
+# Opt-in workloads: the config key scaled down when the phase would run past
+# the deadline, and its floor
+WORKLOAD_UNITS = {
+    'ipc_latency': ('ipc_iterations', 100),
+    'wakeup_latency': ('wakeup_iterations', 100),
+    'memory_hierarchy': ('memory_chase_steps', 10000),
+    'syscall_bench': ('syscall_batches', 2),
+    'io_latency': ('io_iterations', 10),
+    'loop_lag': ('loop_lag_samples', 100),
+    'rt_task_set': ('rt_task_set_duration', 1),
+}
+
+
+def parse_budget(text):
+    """Seconds in a budget string ('300', '5m', '90s', '1h30m')"""
+    text = re.sub(r'\s+', '', str(text).lower())
+    if re.fullmatch(r'\d+(\.\d+)?', text):
+        return float(text) * 60
+    if not re.fullmatch(r'(\d+(\.\d+)?[hms])+', text):
+        raise ValueError(f"Invalid time budget '{text}' (use e.g. 90s, 5m, 1h30m)")
+    scale = {'h': 3600, 'm': 60, 's': 1}
+    return sum(float(number) * scale[unit] for number, unit in re.findall(r'(\d+(?:\.\d+)?)([hms])', text))
+
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    return f"{minutes}m {seconds:02d}s" if minutes else f"{seconds}s"
+
+
+def load_cost_history(fingerprint, checkpoint_dir=DEFAULT_CHECKPOINT_DIR):
+    """{phase: [(units, seconds), ...]} from completed phases of earlier runs"""
+    history = {}
+    for path in glob.glob(os.path.join(checkpoint_dir, '*', STATE_FILE)):
+        try:
+            with open(path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if fingerprint and state.get('fingerprint') != fingerprint:
+            continue
+        for name, phase in (state.get('phases') or {}).items():
+            if phase.get('status') == 'completed' and phase.get('duration_s') is not None:
+                history.setdefault(name, []).append((phase.get('units') or 0, phase['duration_s']))
+    return history
+
+
+def fit_cost_model(samples, default=GENERIC_PHASE_COST):
+    """(overhead_s, seconds per unit) fitted to (units, seconds) samples
+
+    Least squares when the samples cover more than one unit count;
+    otherwise the default model is rescaled to the observed mean.
+    """
+    if not samples:
+        return default
+    units = [u for u, _ in samples]
+    seconds = [s for _, s in samples]
+    n = len(samples)
+    mean_u, mean_s = sum(units) / n, sum(seconds) / n
+
+    spread = sum((u - mean_u) ** 2 for u in units)
+    if spread > 0:
+        per_unit = sum((u - mean_u) * (s - mean_s) for u, s in samples) / spread
+        overhead = mean_s - per_unit * mean_u
+        if per_unit >= 0 and overhead >= 0:
+            return (overhead, per_unit)
+
+    expected = default[0] + default[1] * mean_u
+    if expected <= 0:
+        return (mean_s, default[1])
+    factor = mean_s / expected
+    return (default[0] * factor, default[1] * factor)
+
+
+def estimate_costs(phases, fingerprint=None, checkpoint_dir=DEFAULT_CHECKPOINT_DIR):
+    """{phase: {'overhead_s', 'per_unit_s', 'samples'}} for the given phases"""
+    history = load_cost_history(fingerprint, checkpoint_dir)
+    costs = {}
+    for phase in phases:
+        samples = history.get(phase.name, [])
+        overhead, per_unit = fit_cost_model(samples, DEFAULT_PHASE_COSTS.get(phase.name, GENERIC_PHASE_COST))
+        costs[phase.name] = {'overhead_s': overhead, 'per_unit_s': per_unit, 'samples': len(samples)}
+    return costs
+
+
+def phase_cost(phase, cost, units=None):
+    """Estimated seconds for a phase run with the given unit count"""
+    if not phase.unit_key:
+        return cost['overhead_s']
+    return cost['overhead_s'] + cost['per_unit_s'] * (units if units is not None else 0)
+
+
+def _allocate(budget_s, unit_costs):
+    """Units per key minimising sum(w / sqrt(u)) with sum(c * u) <= budget
+
+    The optimum is u ∝ (w / c)^(2/3); keys pinned at their limits are
+    fixed and the rest re-scaled until no limit is violated.
+    """
+    units = {key: MAX_UNITS[key] for key, cost in unit_costs.items() if cost <= 0}
+    free = {key: cost for key, cost in unit_costs.items() if cost > 0}
+    while free:
+        left = budget_s - sum(unit_costs[key] * units[key] for key in units)
+        shares = {key: (CONFIDENCE_WEIGHTS[key] / cost) ** (2 / 3) for key, cost in free.items()}
+        scale = max(left, 0) / sum(free[key] * shares[key] for key in free)
+        pinned = {key: min(max(shares[key] * scale, MIN_UNITS[key]), MAX_UNITS[key]) for key in free
+                  if not MIN_UNITS[key] < shares[key] * scale < MAX_UNITS[key]}
+        if not pinned:
+            units.update({key: shares[key] * scale for key in free})
+            break
+        units.update(pinned)
+        free = {key: cost for key, cost in free.items() if key not in pinned}
+    return {key: max(MIN_UNITS[key], int(math.floor(value))) for key, value in units.items()}
+
+
+def plan_budget(budget_s, phases, costs, config):
+    """Phase selection and unit counts that fit budget_s
+
+    Returns a dict whose 'overrides' are merged into the run config.
+    """
+    usable = budget_s * SAFETY_MARGIN - FINALIZE_RESERVE_S
+    by_name = {phase.name: phase for phase in phases}
+    user_skip = list(config.get('phases_skip') or [])
+    allowed = PhaseScheduler(phases).select(config.get('phases_only'), user_skip)
+    order = [name for name in PHASE_PRIORITY if name in by_name]
+    order += [phase.name for phase in phases if phase.name not in order]
+
+    selected, dropped, minimum_total, overhead_total = [], [], 0.0, 0.0
+    for name in order:
+        phase = by_name[name]
+        if name not in allowed or not phase.enabled(config):
+            continue
+        minimum = phase_cost(phase, costs[name], MIN_UNITS.get(phase.unit_key, 0))
+        if any(dep not in selected for dep in phase.depends_on) or minimum_total + minimum > usable:
+            dropped.append(name)
+            continue
+        selected.append(name)
+        minimum_total += minimum
+        overhead_total += phase_cost(phase, costs[name], 0)
+
+    if not selected or ('baseline_latency' in allowed and 'baseline_latency' not in selected):
+        return {
+            'success': False,
+            'error': f"Budget of {format_duration(budget_s)} is too short for even a minimal latency run",
+            'budget_s': budget_s
+        }
+
+    unit_costs = {}
+    for name in selected:
+        key = by_name[name].unit_key
+        if key:
+            unit_costs[key] = unit_costs.get(key, 0.0) + costs[name]['per_unit_s']
+    units = _allocate(usable - overhead_total, unit_costs)
+
+    estimates = {name: round(phase_cost(by_name[name], costs[name], units.get(by_name[name].unit_key)), 1)
+                 for name in selected}
+    overrides = dict(units)
+    overrides['time_budget_s'] = budget_s
+    overrides['phases_skip'] = user_skip + dropped
+    return {
+        'success': True,
+        'budget_s': budget_s,
+        'estimated_s': round(sum(estimates.values()) + FINALIZE_RESERVE_S, 1),
+        'phases': estimates,
+        'dropped': dropped,
+        'history_samples': {name: costs[name]['samples'] for name in selected},
+        'overrides': overrides
+    }
+
+
+def format_budget_plan(plan):
+    """Human-readable summary of a plan"""
+    if not plan.get('success'):
+        return f"❌ {plan.get('error', 'No plan')}"
+    overrides = plan['overrides']
+    lines = [f"⏱️  Time budget: {format_duration(plan['budget_s'])} "
+             f"(planned: {format_duration(plan['estimated_s'])})"]
+    for name, seconds in plan['phases'].items():
+        samples = plan['history_samples'].get(name, 0)
+        source = f"{samples} previous run(s)" if samples else 'default estimate'
+        lines.append(f"   • {name:<17} ~{format_duration(seconds):>7}  ({source})")
+    settings = [f"{key}={overrides[key]}" for key in ('duration', 'algorithm_iterations', 'stress_duration')
+                if key in overrides]
+    if settings:
+        lines.append(f"   Settings: {', '.join(settings)}")
+    if plan['dropped']:
+        lines.append(f"   Dropped (does not fit): {', '.join(plan['dropped'])}")
+    return '\n'.join(lines)
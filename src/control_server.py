@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Local Control API
+=================
+
+This module serves a small JSON-RPC 2.0 API so a board can be driven
+without an interactive shell: start and stop runs, watch live status and
+fetch result summaries. Requests are newline-delimited JSON over a Unix
+domain socket (optionally TCP).
+
+Features:
+---------
+- asyncio server; every request runs as its own task, so a long
+  'join' never blocks 'status' (even on the same connection)
+- One benchmark at a time (runs would disturb each other's latency);
+  a second client joins the run in progress instead of starting another
+- Full, quick, budgeted and soak runs on top of the orchestrator
+- Cooperative stop (full runs stop after the current phase and stay
+  resumable; soaks flush their snapshot)
+- Result summaries straight from the results store
+- Per-run config limited to tuning keys (RUN_CONFIG_KEYS); paths and
+  output locations are fixed by whoever started the server
+- Blocking ControlClient for scripts and the --rpc command
+
+Methods:
+--------
+    ping, methods, status, start_run, stop_run, join, live_stats,
+    recent_results, get_result
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from .results_store import ResultsStore, DEFAULT_STORE_PATH
+
+DEFAULT_SOCKET_PATH = 'rtos_bench.sock'
+RUN_KINDS = ('full', 'quick', 'budget', 'soak')
+# Runs kept in memory for status/join after they finish
+MAX_FINISHED_RUNS = 20
+# Config keys a client may set per run: durations, iterations and workload
+# selection. Paths and outputs (checkpoint_dir, results_store, soak_dir, ...)
+# come only from the server's own base config.
+RUN_CONFIG_KEYS = frozenset((
+    'duration', 'priority', 'budget', 'score_version', 'show_progress', 'phases_only', 'phases_skip',
+    'algorithm_tests', 'algorithm_iterations', 'multicore_tests', 'stress_duration',
+    'environment_monitoring', 'loaded_latency', 'loaded_latency_load',
+    'ipc_latency', 'ipc_iterations', 'ipc_transports', 'ipc_load',
+    'wakeup_latency', 'wakeup_iterations', 'wakeup_mechanisms', 'wakeup_load',
+    'memory_hierarchy', 'memory_buffer_mb', 'memory_working_sets_kb', 'memory_chase_steps',
+    'syscall_bench', 'syscall_batch', 'syscall_batches',
+    'io_latency', 'io_iterations', 'io_load',
+    'loop_lag', 'loop_lag_samples', 'loop_lag_period_us', 'loop_lag_loops',
+    'rt_task_set', 'rt_task_set_tasks', 'rt_task_set_duration', 'rt_task_set_mode',
+    'soak_duration_s', 'snapshot_interval_s', 'soak_loads', 'soak_probe', 'histogram_max_us',
+))
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+RUN_ACTIVE = -32001
+UNKNOWN_RUN = -32002
+
+
+class RpcError(Exception):
+    """Error returned to the client as a JSON-RPC error object"""
+
+    def __init__(self, code, message, data=None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+def _compact_latency(cyclictest):
+    """Latency stats without bulky series (histograms, samples)"""
+    return {key: value for key, value in (cyclictest or {}).items()
+            if key not in ('histogram_us', 'latency_samples_us', 'latency_sketch', 'per_thread', 'raw_output')}
+
+
+class BenchmarkRun:
+    """One run started through the API"""
+
+    def __init__(self, kind, config):
+        self.run_id = f"{kind}-{datetime.now().strftime('%Y%m%d_%H%M%S')}-{uuid.uuid4().hex[:4]}"
+        self.kind = kind
+        self.config = config
+        self.state = 'starting'
+        self.started = time.time()
+        self.finished = None
+        self.error = None
+        self.summary = None
+        self.runner = None
+        self.done = None
+
+    def stop(self):
+        if self.runner is not None:
+            self.runner.request_stop()
+
+    def describe(self):
+        info = {
+            'run_id': self.run_id,
+            'kind': self.kind,
+            'state': self.state,
+            'started': datetime.fromtimestamp(self.started).isoformat(),
+            'elapsed_s': round((self.finished or time.time()) - self.started, 1),
+        }
+        if self.finished:
+            info['finished'] = datetime.fromtimestamp(self.finished).isoformat()
+        if self.error:
+            info['error'] = self.error
+        if self.summary:
+            info['summary'] = self.summary
+        checkpoint = getattr(self.runner, 'current_checkpoint', None)
+        if checkpoint is not None:
+            info['checkpoint_run_id'] = checkpoint.run_id
+            info['phases'] = {name: phase.get('status') for name, phase in checkpoint.state['phases'].items()}
+        return info
+
+    def live_stats(self):
+        """Rolling statistics of the run so far"""
+        stats = self.describe()
+        if self.kind == 'soak':
+            summary = getattr(self.runner, 'summary', None) or {}
+            stats['soak'] = summary.get('soak')
+            stats['latency'] = _compact_latency(summary.get('cyclictest_results'))
+            trace = (summary.get('environment_info') or {}).get('thermal_trace') or []
+            stats['thermal'] = trace[-1] if trace else None
+        else:
+            results = getattr(self.runner, 'current_results', None) or {}
+            stats['latency'] = _compact_latency(results.get('cyclictest_results'))
+            if results.get('loaded_latency_results'):
+                stats['loaded_latency'] = _compact_latency(results['loaded_latency_results'])
+            stats['algorithms_ms'] = {name: data.get('execution_time_ms')
+                                      for name, data in (results.get('algorithm_results') or {}).items()
+                                      if isinstance(data, dict)}
+            score = results.get('composite_score')
+            if isinstance(score, dict):
+                stats['composite_score'] = score.get('composite_score')
+        return stats
+
+
+def _summarize_results(results, checkpoint=None):
+    score = results.get('composite_score')
+    summary = {
+        'composite_score': score.get('composite_score') if isinstance(score, dict) else score,
+        'latency': _compact_latency(results.get('cyclictest_results')),
+    }
+    if checkpoint is not None:
+        summary['results_file'] = checkpoint.state.get('results_file')
+    return summary
+
+
+class ControlServer:
+    """asyncio JSON-RPC server driving the orchestrator"""
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, tcp_address=None, store_path=DEFAULT_STORE_PATH,
+                 base_config=None):
+        """Initialize server (tcp_address is an optional (host, port))"""
+        self.socket_path = socket_path
+        self.tcp_address = tcp_address
+        self.store_path = store_path
+        self.base_config = base_config or {}
+        self.runs = {}
+        self.active = None
+        self.started = time.time()
+        self.servers = []
+        self.shutdown_event = None
+        # Benchmarks run one at a time; store queries use the default executor
+        self.run_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rtos-run')
+        self.methods = {
+            'ping': self.rpc_ping,
+            'methods': self.rpc_methods,
+            'status': self.rpc_status,
+            'start_run': self.rpc_start_run,
+            'stop_run': self.rpc_stop_run,
+            'join': self.rpc_join,
+            'live_stats': self.rpc_live_stats,
+            'recent_results': self.rpc_recent_results,
+            'get_result': self.rpc_get_result,
+        }
+
+    # -- RPC methods -----------------------------------------------------
+
+    async def rpc_ping(self):
+        return {'pong': True, 'time': datetime.now().isoformat()}
+
+    async def rpc_methods(self):
+        return sorted(self.methods)
+
+    async def rpc_status(self, run_id=None):
+        if run_id:
+            return self._get_run(run_id).describe()
+        return {
+            'uptime_s': round(time.time() - self.started, 1),
+            'pid': os.getpid(),
+            'active_run': self.active.describe() if self.active else None,
+            'runs': [run.describe() for run in self.runs.values()],
+        }
+
+    async def rpc_start_run(self, kind='full', config=None, join_active=False):
+        """Start a run; with join_active an active run is returned instead of an error"""
+        if kind not in RUN_KINDS:
+            raise RpcError(INVALID_PARAMS, f"Unknown run kind '{kind}'", {'kinds': list(RUN_KINDS)})
+        if config is not None and not isinstance(config, dict):
+            raise RpcError(INVALID_PARAMS, 'config must be an object')
+        rejected = sorted(key for key in (config or {}) if key not in RUN_CONFIG_KEYS)
+        if rejected:
+            raise RpcError(INVALID_PARAMS, f"Config key(s) not settable over the API: {', '.join(rejected)}",
+                           {'allowed': sorted(RUN_CONFIG_KEYS)})
+        if self.active is not None:
+            if join_active:
+                return {'run_id': self.active.run_id, 'joined': True, 'state': self.active.state}
+            raise RpcError(RUN_ACTIVE, 'A run is already in progress; join it instead',
+                           {'active_run_id': self.active.run_id})
+
+        run = BenchmarkRun(kind, dict(self.base_config, **(config or {})))
+        run.done = asyncio.get_running_loop().create_future()
+        self.runs[run.run_id] = run
+        self.active = run
+        self._forget_old_runs()
+        asyncio.create_task(self._execute(run))
+        return {'run_id': run.run_id, 'joined': False, 'state': run.state}
+
+    async def rpc_stop_run(self, run_id=None):
+        run = self._get_run(run_id) if run_id else self.active
+        if run is None or run.state not in ('starting', 'running'):
+            raise RpcError(UNKNOWN_RUN, 'No active run to stop')
+        run.state = 'stopping'
+        run.stop()
+        return {'run_id': run.run_id, 'state': run.state}
+
+    async def rpc_join(self, run_id=None, timeout=None):
+        """Wait for a run to finish (or `timeout` seconds) and describe it"""
+        run = self._get_run(run_id) if run_id else self.active
+        if run is None:
+            raise RpcError(UNKNOWN_RUN, 'No active run to join')
+        try:
+            await asyncio.wait_for(asyncio.shield(run.done), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return run.describe()
+
+    async def rpc_live_stats(self, run_id=None):
+        run = self._get_run(run_id) if run_id else self.active
+        if run is None:
+            raise RpcError(UNKNOWN_RUN, 'No active run')
+        return run.live_stats()
+
+    async def rpc_recent_results(self, limit=5, profile=None):
+        def query():
+            with ResultsStore(self.store_path) as store:
+                return [{
+                    'id': result['run_id'],
+                    'timestamp': result['timestamp'],
+                    'profile': result['profile'],
+                    'source_path': result['source_path'],
+                    'fingerprint': result['system_info'].get('fingerprint'),
+                    'composite_score': (result.get('composite_score') or {}).get('composite_score')
+                    if isinstance(result.get('composite_score'), dict) else result.get('composite_score'),
+                    'latency': _compact_latency(result.get('cyclictest_results')),
+                } for result in store.recent(limit=int(limit), profile=profile)]
+        return await asyncio.get_running_loop().run_in_executor(None, query)
+
+    async def rpc_get_result(self, id):
+        def query():
+            with ResultsStore(self.store_path) as store:
+                return store.get_run(int(id))
+        result = await asyncio.get_running_loop().run_in_executor(None, query)
+        if result is None:
+            raise RpcError(UNKNOWN_RUN, f'No stored result with id {id}')
+        return result
+
+    # -- Run execution ---------------------------------------------------
+
+    def _get_run(self, run_id):
+        if run_id not in self.runs:
+            raise RpcError(UNKNOWN_RUN, f'Unknown run {run_id}')
+        return self.runs[run_id]
+
+    def _forget_old_runs(self):
+        finished = [run_id for run_id, run in self.runs.items() if run.finished]
+        for run_id in finished[:max(0, len(self.runs) - MAX_FINISHED_RUNS)]:
+            del self.runs[run_id]
+
+    def _create_runner(self, run):
+        if run.kind == 'soak':
+            from .soak import SoakRunner
+            return SoakRunner(run.config)
+        from .benchmark_orchestrator import RTOSBenchmarkOrchestrator
+        return RTOSBenchmarkOrchestrator()
+
+    def _run_blocking(self, run):
+        """Body of a run (executes in the run thread)"""
+        runner = run.runner
+        if run.kind == 'soak':
+            result = runner.run()
+            if not result['success']:
+                raise RuntimeError(result['error'])
+            soak = result['results']
+            return {'soak': soak['soak'], 'latency': _compact_latency(soak['cyclictest_results']),
+                    'summary_file': result['summary_file']}
+
+        if run.kind == 'quick':
+            results = runner.run_quick_benchmark(run.config)
+            return _summarize_results(results, runner.current_checkpoint)
+
+        config = runner.default_config.copy()
+        config.update(run.config)
+        if run.kind == 'budget':
+            from .budget import parse_budget
+            plan = runner.plan_time_budget(parse_budget(config.pop('budget', '5m')), config)
+            if not plan['success']:
+                raise RuntimeError(plan['error'])
+            config.update(plan['overrides'])
+        results = runner.run_comprehensive_benchmark(config, resume_run_id=config.pop('resume_run_id', None))
+        return _summarize_results(results, runner.current_checkpoint)
+
+    async def _execute(self, run):
+        loop = asyncio.get_running_loop()
+        try:
+            run.runner = self._create_runner(run)
+            if run.state == 'starting':
+                run.state = 'running'
+            run.summary = await loop.run_in_executor(self.run_executor, self._run_blocking, run)
+            run.state = 'stopped' if run.state == 'stopping' else 'completed'
+        except Exception as e:
+            run.state = 'failed'
+            run.error = str(e)
+        finally:
+            run.finished = time.time()
+            if self.active is run:
+                self.active = None
+            if not run.done.done():
+                run.done.set_result(run.state)
+
+    # -- Transport -------------------------------------------------------
+
+    async def _dispatch(self, request):
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+                raise RpcError(INVALID_REQUEST, 'Invalid request')
+            method = self.methods.get(request['method'])
+            if method is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+            params = request.get('params') or {}
+            if not isinstance(params, (dict, list)):
+                raise RpcError(INVALID_PARAMS, 'params must be an object or an array')
+            # Only a signature mismatch is the client's fault; TypeErrors raised
+            # inside the method are server errors like any other exception
+            try:
+                signature = inspect.signature(method)
+                bound = signature.bind(**params) if isinstance(params, dict) else signature.bind(*params)
+            except TypeError as e:
+                raise RpcError(INVALID_PARAMS, str(e))
+            result = await method(*bound.args, **bound.kwargs)
+            response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+        except RpcError as e:
+            error = {'code': e.code, 'message': e.message}
+            if e.data is not None:
+                error['data'] = e.data
+            response = {'jsonrpc': '2.0', 'id': request_id, 'error': error}
+        except Exception as e:
+            response = {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': SERVER_ERROR, 'message': str(e)}}
+        return response
+
+    async def _handle_request(self, line, writer, write_lock):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            response = {'jsonrpc': '2.0', 'id': None, 'error': {'code': PARSE_ERROR, 'message': 'Parse error'}}
+        else:
+            response = await self._dispatch(request)
+            if isinstance(request, dict) and 'id' not in request:
+                return  # Notification: no response
+        async with write_lock:
+            writer.write(json.dumps(response, default=str).encode() + b'\n')
+            await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.create_task(self._handle_request(line, writer, write_lock))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        """Start listening (Unix socket and/or TCP)"""
+        self.shutdown_event = asyncio.Event()
+        if self.socket_path:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            server = await asyncio.start_unix_server(self.handle_connection, path=self.socket_path)
+            os.chmod(self.socket_path, 0o660)
+            self.servers.append(server)
+        if self.tcp_address:
+            host, port = self.tcp_address
+            self.servers.append(await asyncio.start_server(self.handle_connection, host, port))
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.shutdown_event.wait()
+        finally:
+            await self.close()
+
+    async def close(self):
+        if self.active is not None:
+            self.active.stop()
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+        self.servers = []
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.run_executor.shutdown(wait=False)
+
+    def request_shutdown(self):
+        if self.shutdown_event is not None:
+            self.shutdown_event.set()
+
+
+def serve(socket_path=DEFAULT_SOCKET_PATH, tcp_address=None, store_path=DEFAULT_STORE_PATH, base_config=None):
+    """Run the control server until SIGTERM/SIGINT"""
+    import signal
+
+    async def main():
+        server = ControlServer(socket_path, tcp_address, store_path, base_config)
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, server.request_shutdown)
+            except (NotImplementedError, RuntimeError):
+                pass
+        await server.start()
+        endpoints = [path for path in [socket_path] if path]
+        if tcp_address:
+            endpoints.append(f"tcp://{tcp_address[0]}:{tcp_address[1]}")
+        print(f"🛰️  Control API listening on {', '.join(endpoints)} (Ctrl+C to stop)")
+        try:
+            await server.shutdown_event.wait()
+        finally:
+            await server.close()
+
+    asyncio.run(main())
+
+
+class ControlClient:
+    """Blocking JSON-RPC client for the control API"""
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, tcp_address=None, timeout=None):
+        """Initialize client for a Unix socket path or (host, port)"""
+        self.socket_path = socket_path
+        self.tcp_address = tcp_address
+        self.timeout = timeout
+        self._ids = 0
+        self._lock = threading.Lock()
+
+    def call(self, method, **params):
+        """Call a method; raises RpcError on an error response"""
+        with self._lock:
+            self._ids += 1
+            request_id = self._ids
+        if self.tcp_address:
+            sock = socket.create_connection(self.tcp_address, timeout=self.timeout)
+        else:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+        with sock:
+            request = {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}
+            sock.sendall(json.dumps(request).encode() + b'\n')
+            with sock.makefile('rb') as stream:
+                line = stream.readline()
+        if not line:
+            raise RpcError(SERVER_ERROR, 'Connection closed without a response')
+        response = json.loads(line)
+        if 'error' in response:
+            error = response['error']
+            raise RpcError(error.get('code'), error.get('message'), error.get('data'))
+        return response.get('result')
@@ -11,15 +11,53 @@ Features:
 - Cyclictest command execution with multiple fallbacks
 - Output parsing and latency analysis
 - Simulation mode for non-Linux systems
-- Statistical analysis of latency data
+- Statistical analysis of latency data (mergeable DDSketch summaries)
+- Histogram mode (-h) parsing and histogram percentiles
+- Every run records a histogram with one pinned thread per CPU (-S)
+- Interruptible histogram runs for long soak measurements
 
 Author: RTOS Benchmark Suite Team
 """
 
 import random
+import re
+import signal
 import statistics
 import subprocess
+import time
 from .platform_compat import platform_compat
+from .quantile_sketch import DDSketch, merge_sketches
+
+# Histogram bucket limit (-h); longer latencies count as overflows
+DEFAULT_HISTOGRAM_MAX_US = 1000
+HISTOGRAM_LINE = re.compile(r'^(\d+)((?:\s+\d+)+)$')
+HISTOGRAM_SUMMARY = re.compile(r'^#\s*(Min|Avg|Max) Latencies:((?:\s+\d+)+)')
+HISTOGRAM_OVERFLOWS = re.compile(r'^#\s*Histogram Overflows:((?:\s+\d+)+)')
+
+
+def histogram_percentiles(histogram, percentiles=(50, 99, 99.9)):
+    """{'p50': us, ...} from a {latency_us: count} histogram"""
+    buckets = sorted((int(us), count) for us, count in histogram.items() if count)
+    total = sum(count for _, count in buckets)
+    result = {}
+    if not total:
+        return result
+    for percentile in percentiles:
+        rank = percentile / 100 * total
+        seen = 0
+        for us, count in buckets:
+            seen += count
+            if seen >= rank:
+                result[f"p{percentile:g}"] = us
+                break
+    return result
+
+
+def merge_histograms(target, histogram):
+    """Add a {latency_us: count} histogram into target (keys as ints)"""
+    for us, count in histogram.items():
+        target[int(us)] = target.get(int(us), 0) + count
+    return target
 
 
 class CyclicTestIntegration:
@@ -43,32 +81,72 @@ class CyclicTestIntegration:
             }
             
             # Look for summary line like: "T: 0 (12345) P:99 I:100 C: 10000 Min:    5 Act:   12 Avg:   15 Max:   85"
+            # (one per measurement thread; run_cyclictest pins one thread to each CPU with -S)
             lines = output.split('\n')
+            per_thread = []
+            histogram = {}
+            histogram_summary = {}
             
             for line in lines:
                 line = line.strip()
                 
-                # Parse the main data line
+                # Parse the main data lines
                 if line.startswith('T:') and 'Min:' in line and 'Max:' in line:
                     try:
                         # Extract numeric values using string parsing
                         parts = line.split()
+                        thread = {'thread': int(parts[1])}
                         
                         for i, part in enumerate(parts):
                             if part == 'Min:' and i + 1 < len(parts):
-                                latency_data['min_latency_us'] = int(parts[i + 1])
+                                thread['min_latency_us'] = int(parts[i + 1])
                             elif part == 'Avg:' and i + 1 < len(parts):
-                                latency_data['avg_latency_us'] = int(parts[i + 1])
+                                thread['avg_latency_us'] = int(parts[i + 1])
                             elif part == 'Max:' and i + 1 < len(parts):
-                                latency_data['max_latency_us'] = int(parts[i + 1])
-                        
-                        # Calculate jitter (max - min)
-                        if latency_data['max_latency_us'] and latency_data['min_latency_us']:
-                            latency_data['jitter_us'] = latency_data['max_latency_us'] - latency_data['min_latency_us']
+                                thread['max_latency_us'] = int(parts[i + 1])
                         
-                        break
+                        if 'max_latency_us' in thread:
+                            per_thread.append(thread)
                     except (ValueError, IndexError) as e:
                         continue
+                
+                # Histogram mode (-h): "000012 000345 000301" = bucket, count per thread
+                elif HISTOGRAM_LINE.match(line):
+                    bucket, counts = HISTOGRAM_LINE.match(line).groups()
+                    count = sum(int(c) for c in counts.split())
+                    if count:
+                        histogram[int(bucket)] = histogram.get(int(bucket), 0) + count
+                elif HISTOGRAM_SUMMARY.match(line):
+                    stat, values = HISTOGRAM_SUMMARY.match(line).groups()
+                    histogram_summary[stat.lower()] = [int(v) for v in values.split()]
+                elif HISTOGRAM_OVERFLOWS.match(line):
+                    latency_data['histogram_overflows'] = sum(
+                        int(v) for v in HISTOGRAM_OVERFLOWS.match(line).group(1).split())
+            
+            if histogram:
+                latency_data['histogram_us'] = histogram
+                latency_data['percentiles_us'] = histogram_percentiles(histogram)
+            if not per_thread and 'max' in histogram_summary:
+                # Histogram mode without the final status line
+                per_thread = [{'thread': i,
+                               'min_latency_us': histogram_summary.get('min', [0] * (i + 1))[i],
+                               'avg_latency_us': histogram_summary.get('avg', [0] * (i + 1))[i],
+                               'max_latency_us': max_us}
+                              for i, max_us in enumerate(histogram_summary['max'])]
+            
+            if per_thread:
+                latency_data['min_latency_us'] = min(t.get('min_latency_us', 0) for t in per_thread)
+                latency_data['max_latency_us'] = max(t['max_latency_us'] for t in per_thread)
+                avgs = [t['avg_latency_us'] for t in per_thread if 'avg_latency_us' in t]
+                if avgs:
+                    latency_data['avg_latency_us'] = round(statistics.mean(avgs))
+                
+                # Calculate jitter (max - min)
+                if latency_data['max_latency_us'] and latency_data['min_latency_us']:
+                    latency_data['jitter_us'] = latency_data['max_latency_us'] - latency_data['min_latency_us']
+                
+                if len(per_thread) > 1:
+                    latency_data['per_thread'] = per_thread
             
             # Validate that we got meaningful data
             if latency_data['max_latency_us'] is None:
@@ -111,8 +189,13 @@ class CyclicTestIntegration:
         }
     
     @staticmethod
-    def run_cyclictest(duration=15, priority=99):
-        """Run cyclictest command with fallback simulation"""
+    def run_cyclictest(duration=15, priority=99, histogram_max_us=DEFAULT_HISTOGRAM_MAX_US):
+        """Run cyclictest command with fallback simulation
+        
+        The run locks memory (-m), measures with one thread pinned to
+        each CPU (-S) and records a latency histogram (-h), so results
+        carry histogram_us, percentiles_us and per_thread.
+        """
         
         # Check if cyclictest is available and if we're on a supported platform
         if not platform_compat.is_linux:
@@ -125,12 +208,13 @@ class CyclicTestIntegration:
         
         try:
             # Try different command variations for better compatibility
+            histogram = ['-m', '-S', '-h', str(histogram_max_us)]
             cmd_variations = [
                 # Standard high-priority command
-                ['cyclictest', '-t', '1', '-p', str(priority), '-i', '100', '-q', '-l', str(duration * 1000)],
+                ['cyclictest', *histogram, '-p', str(priority), '-i', '100', '-q', '-l', str(duration * 1000)],
                 # Lower priority without RT scheduling
-                ['cyclictest', '-t', '1', '-p', '50', '-i', '100', '-q', '-l', str(duration * 1000)],
-                # Minimal command
+                ['cyclictest', *histogram, '-p', '50', '-i', '100', '-q', '-l', str(duration * 1000)],
+                # Minimal command (no memory locking, pinning or histogram)
                 ['cyclictest', '-t', '1', '-i', '100', '-q', '-l', str(duration * 500)]
             ]
             
@@ -158,45 +242,76 @@ class CyclicTestIntegration:
             print("⚠️  cyclictest not available or no RT privileges, using simulation...")
             return CyclicTestIntegration.simulate_cyclictest_fallback()
     
+    @staticmethod
+    def run_cyclictest_histogram(duration, priority=99, interval_us=1000,
+                                 histogram_max_us=DEFAULT_HISTOGRAM_MAX_US, stop_event=None):
+        """One histogram-mode cyclictest run of up to `duration` seconds
+        
+        Setting stop_event ends the run early: cyclictest gets SIGINT and
+        still prints the histogram it has collected so far.
+        """
+        cmd = ['cyclictest', '-m', '-t', '1', '-p', str(priority), '-i', str(interval_us),
+               '-h', str(histogram_max_us), '-q', '-D', f'{int(max(1, duration))}s']
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        except OSError as e:
+            return {'success': False, 'error': f'Could not start cyclictest: {e}'}
+        
+        start = time.time()
+        while proc.poll() is None:
+            if stop_event is not None and stop_event.is_set():
+                proc.send_signal(signal.SIGINT)
+                break
+            if time.time() - start > duration + 10:
+                proc.kill()
+                break
+            time.sleep(0.2)
+        
+        stdout, stderr = proc.communicate()
+        results = CyclicTestIntegration.parse_cyclictest_output(stdout)
+        results['duration'] = round(time.time() - start, 3)
+        if not results.get('success') and stderr:
+            results['error'] = f"{results.get('error')}: {stderr.strip()[:200]}"
+        return results
+    
     def analyze_latency_distribution(self, results_list):
-        """Analyze latency distribution across multiple test runs"""
+        """Analyze latency distribution across multiple test runs
+        
+        Per-run statistics are summarised with DDSketches, and the runs'
+        latency histograms (or sketches) are merged into one distribution
+        with bounded memory however many runs are given.
+        """
         if not results_list:
             return {}
         
-        # Extract latency values
-        max_latencies = [r.get('max_latency_us', 0) for r in results_list if r.get('success')]
-        avg_latencies = [r.get('avg_latency_us', 0) for r in results_list if r.get('success')]
-        jitter_values = [r.get('jitter_us', 0) for r in results_list if r.get('success')]
-        
-        if not max_latencies:
+        successful = [r for r in results_list if r.get('success')]
+        if not successful:
             return {'error': 'No valid latency data available'}
         
+        def stats_of(key):
+            sketch = DDSketch().update(r.get(key) or 0 for r in successful)
+            return {
+                'mean': sketch.mean,
+                'median': sketch.quantile(0.5),
+                'stdev': sketch.stdev,
+                'min': sketch.min,
+                'max': sketch.max
+            }
+        
         analysis = {
-            'max_latency_stats': {
-                'mean': statistics.mean(max_latencies),
-                'median': statistics.median(max_latencies),
-                'stdev': statistics.stdev(max_latencies) if len(max_latencies) > 1 else 0,
-                'min': min(max_latencies),
-                'max': max(max_latencies)
-            },
-            'avg_latency_stats': {
-                'mean': statistics.mean(avg_latencies),
-                'median': statistics.median(avg_latencies),
-                'stdev': statistics.stdev(avg_latencies) if len(avg_latencies) > 1 else 0,
-                'min': min(avg_latencies),
-                'max': max(avg_latencies)
-            },
-            'jitter_stats': {
-                'mean': statistics.mean(jitter_values),
-                'median': statistics.median(jitter_values),
-                'stdev': statistics.stdev(jitter_values) if len(jitter_values) > 1 else 0,
-                'min': min(jitter_values),
-                'max': max(jitter_values)
-            },
+            'max_latency_stats': stats_of('max_latency_us'),
+            'avg_latency_stats': stats_of('avg_latency_us'),
+            'jitter_stats': stats_of('jitter_us'),
             'test_count': len(results_list),
-            'success_rate': len(max_latencies) / len(results_list) * 100
+            'success_rate': len(successful) / len(results_list) * 100
         }
         
+        merged = merge_sketches(r.get('latency_sketch') or r.get('histogram_us') or r.get('latency_samples_us')
+                                for r in successful)
+        if merged is not None:
+            analysis['latency_sketch'] = merged.to_dict()
+            analysis['percentiles_us'] = merged.percentiles()
+        
         return analysis
     
     def get_rt_performance_rating(self, max_latency_us, avg_latency_us):
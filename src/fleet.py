@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Fleet Result Aggregation
+========================
+
+This module merges benchmark results from many boards into fleet-level
+distributions per fingerprint (board + kernel). Inputs can be directory
+trees, tarballs of result files and SQLite results stores, in any mix.
+
+Features:
+---------
+- Streaming: results are reduced to compact records as they are read,
+  so memory grows with the number of fingerprints, not result files
+- Per-metric distributions and latency/timing percentiles kept as
+  mergeable DDSketches (1% relative error, bounded memory)
+- JSON parsing in a process pool with a bounded number of jobs in flight
+- Tarballs read as streams (.tar, .tar.gz, .tgz, .tar.bz2, .tar.xz)
+- Samples in .rtsa sidecar archives read back, also from inside tarballs
+- Latency histograms summed bucket-wise (no raw samples needed)
+- Results stores contribute their stored per-run sketches
+- Runs seen through several inputs counted once
+- Fleet summary as JSON and Markdown
+
+Usage:
+------
+    python main.py --aggregate boards/ archive.tar.gz rtos_results.db
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import fnmatch
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from .cyclictest import histogram_percentiles, merge_histograms
+from .quantile_sketch import DDSketch
+from .results_store import RESULTS_FILE_PATTERN, ResultsStore, extract_run_row, extract_run_sketches
+from .scoring import board_class_of
+from .series_archive import ARCHIVE_EXTENSION, resolve_series
+
+# Result files picked up from directories and tarballs
+RESULT_PATTERNS = (RESULTS_FILE_PATTERN, 'soak_summary.json')
+TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+STORE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+# Parse jobs queued per worker before the reader waits
+JOBS_PER_WORKER = 8
+DEFAULT_OUTPUT_PREFIX = 'fleet_summary'
+
+# Per-run metrics whose fleet distribution is reported
+LATENCY_METRICS = ('min_latency_us', 'avg_latency_us', 'max_latency_us', 'jitter_us',
+                   'p50_latency_us', 'p99_latency_us', 'p999_latency_us')
+OTHER_METRICS = ('stress_ops_per_core', 'composite_score')
+
+
+def _is_result_name(name):
+    base = os.path.basename(name)
+    return any(fnmatch.fnmatch(base, pattern) for pattern in RESULT_PATTERNS)
+
+
+def _histogram_from_samples(samples):
+    histogram = {}
+    for value in samples:
+        if isinstance(value, (int, float)):
+            histogram[int(value)] = histogram.get(int(value), 0) + 1
+    return histogram
+
+
+def record_from_results(results, source, base_dir=None):
+    """Compact per-run record (metrics, algorithm times, histogram, sketches)
+
+    Series moved to a sidecar archive are read back from base_dir first.
+    """
+    if results.get('series_archive') and base_dir:
+        try:
+            results = resolve_series(results, base_dir)
+        except (OSError, ValueError):
+            pass  # Sidecar missing or unreadable: the JSON summaries still count
+    row = extract_run_row(results, source)
+    cyclictest = results.get('cyclictest_results', {}) or {}
+
+    samples = cyclictest.get('latency_samples_us')
+    histogram = cyclictest.get('histogram_us')
+    if not histogram and isinstance(samples, list):
+        histogram = _histogram_from_samples(samples)
+
+    return {
+        'source': source,
+        'row': row,
+        'board_class': board_class_of(results),
+        'algorithms': {name: data.get('execution_time_ms')
+                       for name, data in (results.get('algorithm_results') or {}).items()
+                       if isinstance(data, dict) and data.get('execution_time_ms') is not None},
+        'histogram_us': {int(us): count for us, count in (histogram or {}).items() if count},
+        'sketches': extract_run_sketches(results),
+    }
+
+
+def parse_result(payload, source, base_dir=None):
+    """Worker entry point: payload is a file path or the file's bytes
+
+    For bytes, base_dir is where the run's sidecar archive was extracted.
+    """
+    try:
+        if isinstance(payload, bytes):
+            results = json.loads(payload)
+        else:
+            with open(payload, 'r') as f:
+                results = json.load(f)
+            base_dir = os.path.dirname(os.path.abspath(payload))
+        return record_from_results(results, source, base_dir)
+    except Exception as e:
+        return {'source': source, 'error': str(e)}
+
+
+def _iter_tar(path):
+    """Result members of a tarball, read as a stream
+
+    Sidecar archives are extracted to a temporary directory as they pass;
+    runs that point at one are parsed here once the whole tarball has
+    been read, since the sidecar may come after the JSON.
+    """
+    with tempfile.TemporaryDirectory(prefix='rtos_fleet_') as sidecars, \
+            tarfile.open(path, mode='r|*') as archive:
+        sidecar_dirs = {}
+        pending = []
+        for member in archive:
+            if not member.isfile():
+                continue
+            member_dir, name = os.path.split(member.name)
+            if name.endswith(ARCHIVE_EXTENSION):
+                target_dir = sidecar_dirs.setdefault(member_dir, os.path.join(sidecars, str(len(sidecar_dirs))))
+                os.makedirs(target_dir, exist_ok=True)
+                with open(os.path.join(target_dir, name), 'wb') as f:
+                    shutil.copyfileobj(archive.extractfile(member), f)
+            elif _is_result_name(name):
+                payload = archive.extractfile(member).read()
+                if b'"series_archive"' in payload:
+                    pending.append((member_dir, payload, f"{path}!{member.name}"))
+                else:
+                    yield ('payload', payload, f"{path}!{member.name}")
+        for member_dir, payload, source in pending:
+            record = parse_result(payload, source, sidecar_dirs.get(member_dir))
+            yield ('record', record, source)
+
+
+def _iter_store(path):
+    with ResultsStore(path) as store:
+        for results in store.iter_runs():
+            record = record_from_results(results, results.get('source_path') or path)
+            yield ('record', record, record['source'])
+
+
+def iter_inputs(paths):
+    """Yield ('payload', path-or-bytes, source) and ('record', record, source)"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    full = os.path.join(root, name)
+                    if name.endswith(TAR_SUFFIXES):
+                        yield from _iter_tar(full)
+                    elif _is_result_name(name):
+                        yield ('payload', full, full)
+        elif path.endswith(TAR_SUFFIXES):
+            yield from _iter_tar(path)
+        elif path.endswith(STORE_SUFFIXES):
+            yield from _iter_store(path)
+        else:
+            yield ('payload', path, path)
+
+
+def _distribution(sketch):
+    return {
+        'count': sketch.count,
+        'min': sketch.min,
+        'p50': round(sketch.quantile(0.5), 3),
+        'p90': round(sketch.quantile(0.9), 3),
+        'max': sketch.max,
+        'mean': round(sketch.mean, 3),
+    }
+
+
+class FleetGroup:
+    """Runs sharing one fingerprint"""
+
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+        self.runs = 0
+        self.simulated_runs = 0
+        self.boards = set()
+        self.profiles = set()
+        self.info = {}
+        self.first = None
+        self.last = None
+        self.metrics = {}
+        self.histogram = {}
+        self.histogram_runs = 0
+        self.sketches = {}
+
+    def add(self, record):
+        row = record['row']
+        self.runs += 1
+        if row.get('board_fingerprint'):
+            self.boards.add(row['board_fingerprint'])
+        if row.get('profile'):
+            self.profiles.add(row['profile'])
+        for key in ('cpu_info', 'cpu_count', 'kernel_release', 'preemption_model'):
+            if row.get(key) is not None:
+                self.info.setdefault(key, row[key])
+        self.info.setdefault('board_class', record.get('board_class'))
+
+        timestamp = row.get('timestamp')
+        if timestamp:
+            self.first = min(self.first or timestamp, timestamp)
+            self.last = max(self.last or timestamp, timestamp)
+
+        names = OTHER_METRICS
+        if row.get('simulated'):
+            self.simulated_runs += 1
+        else:
+            names = LATENCY_METRICS + OTHER_METRICS
+            if record['histogram_us']:
+                merge_histograms(self.histogram, record['histogram_us'])
+                self.histogram_runs += 1
+        for name in names:
+            if row.get(name) is not None:
+                self.metrics.setdefault(name, DDSketch()).add(row[name])
+        for name, value in record['algorithms'].items():
+            self.metrics.setdefault(f'algorithm:{name}', DDSketch()).add(value)
+        for metric, data in record['sketches'].items():
+            sketch = DDSketch.from_dict(data)
+            if metric not in self.sketches:
+                self.sketches[metric] = DDSketch(sketch.relative_accuracy)
+            self.sketches[metric].merge(sketch)
+
+    def to_dict(self):
+        summary = {
+            'fingerprint': self.fingerprint,
+            'runs': self.runs,
+            'simulated_runs': self.simulated_runs,
+            'boards': len(self.boards) or None,
+            'profiles': sorted(self.profiles),
+            'first_run': self.first,
+            'last_run': self.last,
+            'metrics': {name: _distribution(sketch) for name, sketch in sorted(self.metrics.items())},
+            'timings_ms': {name[len('algorithm:'):]: sketch.summary((50, 90, 99))
+                           for name, sketch in sorted(self.sketches.items()) if name.startswith('algorithm:')},
+        }
+        summary.update(self.info)
+        latency = self.sketches.get('latency_us')
+        if latency is not None:
+            summary['latency_distribution'] = {
+                'samples': latency.count,
+                'min_us': latency.min,
+                'max_us': latency.max,
+                'percentiles_us': latency.percentiles((50, 90, 99, 99.9, 99.99), digits=1),
+                'sketch': latency.to_dict(),
+            }
+        if self.histogram:
+            summary['latency_histogram'] = {
+                'runs': self.histogram_runs,
+                'samples': sum(self.histogram.values()),
+                'percentiles_us': histogram_percentiles(self.histogram, (50, 90, 99, 99.9, 99.99)),
+                'histogram_us': dict(sorted(self.histogram.items())),
+            }
+        return summary
+
+
+class FleetAggregator:
+    """Streaming merge of many runs into per-fingerprint groups"""
+
+    def __init__(self):
+        self.groups = {}
+        self.seen = set()
+        self.duplicates = 0
+        self.errors = []
+        self.records = 0
+
+    def add(self, record):
+        if 'error' in record:
+            self.errors.append({'source': record['source'], 'error': record['error']})
+            return
+        row = record['row']
+        # The same run may arrive as a file, inside a tarball and from a store
+        key = (row.get('fingerprint'), row.get('timestamp'), row.get('max_latency_us'), row.get('composite_score'))
+        if row.get('timestamp') and key in self.seen:
+            self.duplicates += 1
+            return
+        self.seen.add(key)
+        self.records += 1
+        fingerprint = row.get('fingerprint') or 'unknown'
+        if fingerprint not in self.groups:
+            self.groups[fingerprint] = FleetGroup(fingerprint)
+        self.groups[fingerprint].add(record)
+
+    def ingest(self, paths, workers=None):
+        """Read and merge every result found under paths"""
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1:
+            for kind, item, source in iter_inputs(paths):
+                self.add(item if kind == 'record' else parse_result(item, source))
+            return self
+
+        pending = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for kind, item, source in iter_inputs(paths):
+                if kind == 'record':
+                    self.add(item)
+                    continue
+                pending.append(pool.submit(parse_result, item, source))
+                if len(pending) >= workers * JOBS_PER_WORKER:
+                    # Bound memory: merge the oldest half before reading on
+                    half = len(pending) // 2
+                    for future in pending[:half]:
+                        self.add(future.result())
+                    pending = pending[half:]
+            for future in pending:
+                self.add(future.result())
+        return self
+
+    def summary(self):
+        groups = sorted((group.to_dict() for group in self.groups.values()),
+                        key=lambda group: (-group['runs'], group['fingerprint']))
+        return {
+            'generated': datetime.now().isoformat(),
+            'runs': self.records,
+            'fingerprints': len(groups),
+            'duplicates_skipped': self.duplicates,
+            'errors': self.errors,
+            'groups': groups,
+        }
+
+
+def _fmt(value, digits=1):
+    if value is None:
+        return '—'
+    return f"{value:.{digits}f}" if isinstance(value, float) else str(value)
+
+
+def render_fleet_markdown(summary):
+    """Markdown overview of a fleet summary"""
+    lines = [
+        '# Fleet Summary',
+        '',
+        f"Generated {summary['generated']} from {summary['runs']} run(s) across "
+        f"{summary['fingerprints']} fingerprint(s)"
+        + (f"; {summary['duplicates_skipped']} duplicate(s) skipped" if summary['duplicates_skipped'] else '')
+        + (f"; {len(summary['errors'])} file(s) unreadable" if summary['errors'] else '') + '.',
+        '',
+        '| Fingerprint | Board class | Kernel | Preemption | Runs | Max latency p50 / worst (µs) '
+        '| Fleet p99 / p99.9 (µs) | Score p50 |',
+        '|---|---|---|---|---|---|---|---|',
+    ]
+    for group in summary['groups']:
+        metrics = group['metrics']
+        max_latency = metrics.get('max_latency_us') or {}
+        score = metrics.get('composite_score') or {}
+        percentiles = (group.get('latency_distribution') or {}).get('percentiles_us', {})
+        runs = f"{group['runs']}" + (f" ({group['simulated_runs']} sim)" if group['simulated_runs'] else '')
+        lines.append(
+            f"| `{group['fingerprint']}` | {group.get('board_class') or '—'} | {group.get('kernel_release') or '—'} "
+            f"| {group.get('preemption_model') or '—'} | {runs} "
+            f"| {_fmt(max_latency.get('p50'))} / {_fmt(max_latency.get('max'))} "
+            f"| {_fmt(percentiles.get('p99'))} / {_fmt(percentiles.get('p99.9'))} | {_fmt(score.get('p50'), 2)} |")
+    lines.append('')
+    lines.append('Fleet percentiles come from merged per-run latency sketches (within 1%); '
+                 'simulated runs are excluded from latency statistics.')
+    return '\n'.join(lines) + '\n'
+
+
+def aggregate_fleet(paths, output_prefix=DEFAULT_OUTPUT_PREFIX, workers=None):
+    """Merge results under paths and write <prefix>.json and <prefix>.md"""
+    try:
+        summary = FleetAggregator().ingest(paths, workers).summary()
+        with open(f"{output_prefix}.json", 'w') as f:
+            json.dump(summary, f, indent=2)
+        with open(f"{output_prefix}.md", 'w') as f:
+            f.write(render_fleet_markdown(summary))
+        return {'success': True, 'summary': summary,
+                'files': [f"{output_prefix}.json", f"{output_prefix}.md"]}
+    except Exception as e:
+        return {'success': False, 'error': f'Fleet aggregation failed: {e}'}
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+HTML Report Renderer
+====================
+
+This module renders a stored results dict as a single self-contained
+HTML page with inline SVG plots, so distributions can be inspected
+without re-running the benchmark.
+
+Features:
+---------
+- Latency histogram on a log-scaled count axis
+- Per-thread / per-core latency and per-core stress throughput
+- Iteration-time series for every algorithm
+- Temperature and CPU frequency over time
+- No external dependencies (no JavaScript, fonts or CDNs)
+
+Data used when present:
+-----------------------
+- cyclictest_results['histogram_us'] ({latency_us: count}) or ['latency_samples_us']
+- cyclictest_results['per_thread'] (list of min/avg/max dicts)
+- algorithm_results[name]['all_times']
+- multicore_stress['individual_results']
+- environment_info['thermal_trace'] (list of {elapsed_s, temperature_c, frequency_mhz})
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import html
+import math
+from collections import Counter
+
+PLOT_WIDTH = 640
+PLOT_HEIGHT = 260
+MARGIN = {'left': 64, 'right': 16, 'top': 16, 'bottom': 40}
+SERIES_COLORS = ('#1f77b4', '#d62728', '#2ca02c', '#ff7f0e', '#9467bd', '#8c564b', '#17becf')
+
+STYLE = """
+body { font-family: system-ui, sans-serif; margin: 2em auto; max-width: 960px; color: #222; }
+h1 { border-bottom: 2px solid #444; padding-bottom: .3em; }
+h2 { margin-top: 2em; }
+table { border-collapse: collapse; margin: 1em 0; }
+td, th { border: 1px solid #ccc; padding: .3em .8em; text-align: right; }
+th { background: #f3f3f3; }
+td:first-child, th:first-child { text-align: left; }
+.note { color: #777; font-style: italic; }
+svg { background: #fcfcfc; border: 1px solid #ddd; }
+svg text { font-size: 11px; fill: #333; }
+"""
+
+
+def _nice_ticks(low, high, count=5):
+    """Evenly spaced round tick values covering [low, high]"""
+    if high <= low:
+        high = low + 1
+    raw_step = (high - low) / count
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw_step)
+    first = math.floor(low / step) * step
+    ticks = []
+    value = first
+    while value <= high + step * 1e-9:
+        ticks.append(round(value, 10))
+        value += step
+    return ticks
+
+
+def _label(value):
+    if abs(value) >= 1e6:
+        return f"{value / 1e6:g}M"
+    if abs(value) >= 1e3:
+        return f"{value / 1e3:g}k"
+    return f"{value:g}"
+
+
+class SvgPlot:
+    """Minimal SVG plot canvas with linear or log10 y axis"""
+
+    def __init__(self, x_range, y_range, x_label='', y_label='', log_y=False,
+                 width=PLOT_WIDTH, height=PLOT_HEIGHT):
+        self.width, self.height = width, height
+        self.log_y = log_y
+        self.x_min, self.x_max = x_range
+        y_min, y_max = y_range
+        if log_y:
+            y_min, y_max = math.log10(max(y_min, 1)), math.log10(max(y_max, 10))
+            y_min = math.floor(y_min)
+            y_max = math.ceil(y_max) if y_max > y_min else y_min + 1
+        if self.x_max <= self.x_min:
+            self.x_max = self.x_min + 1
+        if y_max <= y_min:
+            y_max = y_min + 1
+        self.y_min, self.y_max = y_min, y_max
+        self.x_label, self.y_label = x_label, y_label
+        self.elements = []
+
+    def x(self, value):
+        span = self.width - MARGIN['left'] - MARGIN['right']
+        return MARGIN['left'] + (value - self.x_min) / (self.x_max - self.x_min) * span
+
+    def y(self, value):
+        if self.log_y:
+            value = math.log10(max(value, 10 ** self.y_min))
+        span = self.height - MARGIN['top'] - MARGIN['bottom']
+        return self.height - MARGIN['bottom'] - (value - self.y_min) / (self.y_max - self.y_min) * span
+
+    def bar(self, x0, x1, value, color=SERIES_COLORS[0], title=None):
+        top = self.y(value)
+        bottom = self.height - MARGIN['bottom']
+        tooltip = f"<title>{html.escape(title)}</title>" if title else ''
+        self.elements.append(
+            f'<rect x="{self.x(x0):.1f}" y="{top:.1f}" width="{max(self.x(x1) - self.x(x0) - 1, 1):.1f}" '
+            f'height="{max(bottom - top, 0):.1f}" fill="{color}">{tooltip}</rect>')
+
+    def line(self, points, color=SERIES_COLORS[0]):
+        if not points:
+            return
+        path = ' '.join(f"{self.x(px):.1f},{self.y(py):.1f}" for px, py in points)
+        self.elements.append(f'<polyline points="{path}" fill="none" stroke="{color}" stroke-width="1.5"/>')
+        if len(points) <= 50:
+            self.elements.extend(f'<circle cx="{self.x(px):.1f}" cy="{self.y(py):.1f}" r="2.5" fill="{color}"/>'
+                                 for px, py in points)
+
+    def legend(self, entries):
+        for i, (name, color) in enumerate(entries):
+            y = MARGIN['top'] + 12 + i * 14
+            x = self.width - MARGIN['right'] - 150
+            self.elements.append(f'<rect x="{x}" y="{y - 9}" width="10" height="10" fill="{color}"/>')
+            self.elements.append(f'<text x="{x + 14}" y="{y}">{html.escape(name)}</text>')
+
+    def _axes(self):
+        parts = []
+        left, bottom = MARGIN['left'], self.height - MARGIN['bottom']
+        right, top = self.width - MARGIN['right'], MARGIN['top']
+        parts.append(f'<line x1="{left}" y1="{bottom}" x2="{right}" y2="{bottom}" stroke="#444"/>')
+        parts.append(f'<line x1="{left}" y1="{top}" x2="{left}" y2="{bottom}" stroke="#444"/>')
+
+        for tick in _nice_ticks(self.x_min, self.x_max):
+            if self.x_min <= tick <= self.x_max:
+                x = self.x(tick)
+                parts.append(f'<line x1="{x:.1f}" y1="{bottom}" x2="{x:.1f}" y2="{bottom + 4}" stroke="#444"/>')
+                parts.append(f'<text x="{x:.1f}" y="{bottom + 16}" text-anchor="middle">{_label(tick)}</text>')
+
+        if self.log_y:
+            y_ticks = [10 ** e for e in range(int(self.y_min), int(self.y_max) + 1)]
+        else:
+            y_ticks = [t for t in _nice_ticks(self.y_min, self.y_max) if self.y_min <= t <= self.y_max]
+        for tick in y_ticks:
+            y = self.y(tick)
+            parts.append(f'<line x1="{left}" y1="{y:.1f}" x2="{right}" y2="{y:.1f}" stroke="#eee"/>')
+            parts.append(f'<text x="{left - 6}" y="{y + 4:.1f}" text-anchor="end">{_label(tick)}</text>')
+
+        parts.append(f'<text x="{(left + right) / 2:.1f}" y="{self.height - 6}" text-anchor="middle">'
+                     f'{html.escape(self.x_label)}</text>')
+        parts.append(f'<text transform="translate(14,{(top + bottom) / 2:.1f}) rotate(-90)" '
+                     f'text-anchor="middle">{html.escape(self.y_label)}</text>')
+        return parts
+
+    def render(self):
+        body = self._axes() + self.elements
+        return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" '
+                f'viewBox="0 0 {self.width} {self.height}">' + ''.join(body) + '</svg>')
+
+
+def latency_histogram(cyclictest):
+    """{latency_us: count} from a stored histogram or raw samples"""
+    histogram = cyclictest.get('histogram_us')
+    if isinstance(histogram, dict) and histogram:
+        return {float(k): int(v) for k, v in histogram.items() if int(v) > 0}
+    samples = cyclictest.get('latency_samples_us')
+    if isinstance(samples, (list, tuple)) or hasattr(samples, 'tolist'):
+        return dict(Counter(float(round(v)) for v in samples))
+    return {}
+
+
+def plot_latency_histogram(cyclictest):
+    histogram = latency_histogram(cyclictest)
+    if not histogram:
+        return None
+    buckets = sorted(histogram)
+    plot = SvgPlot((buckets[0], buckets[-1] + 1), (1, max(histogram.values())),
+                   x_label='Latency (μs)', y_label='Samples (log)', log_y=True)
+    for bucket in buckets:
+        plot.bar(bucket, bucket + 1, histogram[bucket], title=f"{bucket:g} μs: {histogram[bucket]}")
+    return plot.render()
+
+
+def plot_per_thread_latency(cyclictest):
+    threads = cyclictest.get('per_thread') or []
+    if not threads:
+        return None
+    top = max(t.get('max_latency_us', 0) for t in threads)
+    plot = SvgPlot((0, len(threads)), (0, top), x_label='Thread / CPU', y_label='Latency (μs)')
+    for i, thread in enumerate(threads):
+        label = f"T{thread.get('thread', i)}"
+        plot.bar(i + 0.1, i + 0.9, thread.get('max_latency_us', 0), SERIES_COLORS[1], f"{label} max")
+        plot.bar(i + 0.1, i + 0.9, thread.get('avg_latency_us', 0), SERIES_COLORS[0], f"{label} avg")
+    plot.legend([('max', SERIES_COLORS[1]), ('avg', SERIES_COLORS[0])])
+    return plot.render()
+
+
+def plot_per_core_throughput(stress):
+    cores = [c for c in (stress.get('individual_results') or []) if c.get('success')]
+    if not cores:
+        return None
+    plot = SvgPlot((0, len(cores)), (0, max(c.get('ops_per_second', 0) for c in cores)),
+                   x_label='Core', y_label='Ops / second')
+    for i, core in enumerate(cores):
+        plot.bar(i + 0.1, i + 0.9, core.get('ops_per_second', 0), SERIES_COLORS[2],
+                 f"core {core.get('core_id', i)}: {core.get('ops_per_second', 0):,.0f} ops/s")
+    return plot.render()
+
+
+def plot_iteration_times(algorithm_results):
+    series = []
+    for name, data in (algorithm_results or {}).items():
+        times = data.get('all_times') if isinstance(data, dict) else None
+        if isinstance(times, (list, tuple)) and times:
+            series.append((name, list(times)))
+    if not series:
+        return []
+
+    plots = []
+    for name, times in series:
+        plot = SvgPlot((1, max(len(times), 2)), (0, max(times) * 1.1),
+                       x_label='Iteration', y_label='Time (ms)')
+        plot.line([(i + 1, t) for i, t in enumerate(times)])
+        plots.append((name, plot.render()))
+    return plots
+
+
+def plot_thermal_trace(environment):
+    trace = (environment or {}).get('thermal_trace') or []
+    plots = []
+    for key, label, color in (('temperature_c', 'Temperature (°C)', SERIES_COLORS[1]),
+                              ('frequency_mhz', 'CPU frequency (MHz)', SERIES_COLORS[0])):
+        points = [(p['elapsed_s'], p[key]) for p in trace if p.get(key) is not None and 'elapsed_s' in p]
+        if len(points) < 2:
+            continue
+        values = [v for _, v in points]
+        plot = SvgPlot((points[0][0], points[-1][0]), (min(values) * 0.95, max(values) * 1.05),
+                       x_label='Elapsed (s)', y_label=label)
+        plot.line(points, color)
+        plots.append((label, plot.render()))
+    return plots
+
+
+def _table(rows, header):
+    parts = ['<table><tr>' + ''.join(f'<th>{html.escape(str(h))}</th>' for h in header) + '</tr>']
+    for row in rows:
+        parts.append('<tr>' + ''.join(f'<td>{html.escape(str(cell))}</td>' for cell in row) + '</tr>')
+    parts.append('</table>')
+    return ''.join(parts)
+
+
+def _section(title, content):
+    return f'<h2>{html.escape(title)}</h2>{content}'
+
+
+def _missing(what):
+    return f'<p class="note">No {html.escape(what)} recorded in these results.</p>'
+
+
+def render_html_report(results, title="RTOS Benchmark Report"):
+    """Render one results dict as a standalone HTML document"""
+    system_info = results.get('system_info', {}) or {}
+    cyclictest = results.get('cyclictest_results', {}) or {}
+    algorithms = results.get('algorithm_results', {}) or {}
+    stress = results.get('multicore_stress', {}) or {}
+    score = results.get('composite_score')
+    score_value = score.get('composite_score') if isinstance(score, dict) else score
+
+    sections = []
+    sections.append(_table([
+        ('Timestamp', results.get('timestamp', 'Unknown')),
+        ('System', system_info.get('os_info', 'Unknown')),
+        ('CPU', f"{system_info.get('cpu_info', 'Unknown')} ({system_info.get('cpu_count', '?')} cores)"),
+        ('Memory', f"{system_info.get('memory_gb', '?')} GB"),
+        ('Preemption model', system_info.get('preemption_model', 'unknown')),
+        ('Fingerprint', system_info.get('fingerprint', 'Unknown')),
+        ('Composite score', f"{score_value:.2f}" if isinstance(score_value, (int, float)) else 'N/A'),
+    ], ('Field', 'Value')))
+
+    latency_rows = [(key.replace('_', ' '), cyclictest.get(key)) for key in
+                    ('min_latency_us', 'avg_latency_us', 'max_latency_us', 'jitter_us')
+                    if cyclictest.get(key) is not None]
+    latency_rows += [(f"{q} latency us", v) for q, v in (cyclictest.get('percentiles_us') or {}).items()]
+    latency_html = _table(latency_rows, ('Statistic', 'μs')) if latency_rows else ''
+    if cyclictest.get('simulated'):
+        latency_html += '<p class="note">Latency values were simulated (cyclictest unavailable).</p>'
+    latency_html += plot_latency_histogram(cyclictest) or _missing('latency distribution')
+    sections.append(_section('Real-time Latency', latency_html))
+
+    per_core = []
+    thread_plot = plot_per_thread_latency(cyclictest)
+    if thread_plot:
+        per_core.append('<h3>Latency per measurement thread</h3>' + thread_plot)
+    throughput_plot = plot_per_core_throughput(stress)
+    if throughput_plot:
+        per_core.append('<h3>Stress throughput per core</h3>' + throughput_plot)
+    sections.append(_section('Per-core Behaviour', ''.join(per_core) or _missing('per-core data')))
+
+    algorithm_rows = [(name, data.get('execution_time_ms'), data.get('min_time_ms'), data.get('max_time_ms'))
+                      for name, data in algorithms.items() if isinstance(data, dict)]
+    algorithm_html = _table(algorithm_rows, ('Algorithm', 'Mean ms', 'Min ms', 'Max ms')) if algorithm_rows else ''
+    for name, svg in plot_iteration_times(algorithms):
+        algorithm_html += f'<h3>{html.escape(name)} iteration times</h3>{svg}'
+    sections.append(_section('Algorithm Benchmarks', algorithm_html or _missing('algorithm results')))
+
+    thermal_html = ''.join(f'<h3>{html.escape(label)}</h3>{svg}'
+                           for label, svg in plot_thermal_trace(results.get('environment_info')))
+    sections.append(_section('Thermal and Frequency', thermal_html or _missing('temperature/frequency trace')))
+
+    return ('<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+            f'<title>{html.escape(title)}</title><style>{STYLE}</style></head><body>'
+            f'<h1>{html.escape(title)}</h1>' + ''.join(sections) + '</body></html>\n')
+
+
+def write_html_report(results, path, title="RTOS Benchmark Report"):
+    """Write the HTML report; returns {'success', 'path'} or an error"""
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render_html_report(results, title))
+        return {'success': True, 'path': path}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Storage I/O Latency Workload
+============================
+
+This module measures storage latency as an RT process logging to disk
+sees it, and provides an I/O antagonist for latency-under-load runs.
+SD cards and NVMe can stall for milliseconds on fsync; this shows how
+long.
+
+Features:
+---------
+- Buffered write+fsync and write+fdatasync latency
+- O_DIRECT aligned writes and reads (page-aligned mmap buffers) where the
+  filesystem supports them
+- mmap first-touch page-fault latency, file-backed and anonymous
+- Runs in a temporary directory on the target filesystem (default: the
+  working directory, where results are written), removed afterwards
+- 'io' background load: 1 MiB writes with fsync in a loop, in io_dir
+
+Usage:
+------
+    python main.py --workloads io_latency
+    python main.py --loaded-load io        # cyclictest while the disk is busy
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import mmap
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from .quantile_sketch import LatencyRecorder
+
+DEFAULT_ITERATIONS = 200
+DEFAULT_BLOCK_SIZE = 4096
+DEFAULT_IO_DIR = '.'
+DEFAULT_TESTS = ('write_fsync', 'write_fdatasync', 'odirect_write', 'odirect_read',
+                 'mmap_fault_file', 'mmap_fault_anon')
+# O_DIRECT file size: offsets are drawn from here so reads miss the drive cache;
+# the file is written out in full so reads hit allocated blocks, not holes
+DIRECT_FILE_SIZE = 16 * 1024 * 1024
+WRITE_CHUNK = 1024 * 1024
+ANTAGONIST_FILE_SIZE = 64 * 1024 * 1024
+TEMP_PREFIX = 'rtos_io_'
+
+
+def _timed(recorder, operation):
+    start = time.perf_counter_ns()
+    operation()
+    recorder.add_ns(time.perf_counter_ns() - start)
+
+
+def _sync_latency(sync):
+    def measure(directory, iterations, block_size, stop_event=None):
+        recorder = LatencyRecorder()
+        block = os.urandom(block_size)
+        fd = os.open(os.path.join(directory, f'{sync.__name__}.log'), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        try:
+            for _ in range(iterations):
+                if stop_event is not None and stop_event.is_set():
+                    break
+                _timed(recorder, lambda: (os.write(fd, block), sync(fd)))
+        finally:
+            os.close(fd)
+        return recorder
+    return measure
+
+
+def _aligned_buffer(size):
+    """Page-aligned, size-rounded buffer (anonymous mmap) for O_DIRECT"""
+    return mmap.mmap(-1, max(mmap.PAGESIZE, -(-size // mmap.PAGESIZE) * mmap.PAGESIZE))
+
+
+def _open_direct(directory, flags):
+    path = os.path.join(directory, 'direct.dat')
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            for _ in range(DIRECT_FILE_SIZE // WRITE_CHUNK):
+                f.write(os.urandom(WRITE_CHUNK))
+            os.fsync(f.fileno())
+    return os.open(path, flags | os.O_DIRECT)
+
+
+def _direct_latency(write):
+    def measure(directory, iterations, block_size, stop_event=None):
+        recorder = LatencyRecorder()
+        buffer = _aligned_buffer(block_size)
+        buffer.write(os.urandom(len(buffer)))
+        blocks = DIRECT_FILE_SIZE // len(buffer)
+        rng = random.Random(0)
+        fd = _open_direct(directory, os.O_RDWR)
+        try:
+            for _ in range(iterations):
+                if stop_event is not None and stop_event.is_set():
+                    break
+                offset = rng.randrange(blocks) * len(buffer)
+                if write:
+                    _timed(recorder, lambda: os.pwrite(fd, buffer, offset))
+                else:
+                    _timed(recorder, lambda: os.preadv(fd, [buffer], offset))
+        finally:
+            os.close(fd)
+            buffer.close()
+        return recorder
+    return measure
+
+
+def _fault_latency(file_backed):
+    def measure(directory, iterations, block_size, stop_event=None):
+        recorder = LatencyRecorder()
+        size = iterations * mmap.PAGESIZE
+        if file_backed:
+            fd = os.open(os.path.join(directory, 'faults.dat'), os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.ftruncate(fd, size)
+            region = mmap.mmap(fd, size)
+            os.close(fd)
+        else:
+            region = mmap.mmap(-1, size)
+        try:
+            clock = time.perf_counter_ns
+            for page in range(iterations):
+                if stop_event is not None and stop_event.is_set():
+                    break
+                offset = page * mmap.PAGESIZE
+                # First write to each page: one page fault (plus page-cache allocation for files)
+                start = clock()
+                region[offset] = 1
+                recorder.add_ns(clock() - start)
+        finally:
+            region.close()
+        return recorder
+    return measure
+
+
+# Test name -> (measure(directory, iterations, block_size, stop_event), unavailable reason or None)
+IO_TESTS = {
+    'write_fsync': (_sync_latency(os.fsync), None),
+    'write_fdatasync': (_sync_latency(getattr(os, 'fdatasync', os.fsync)),
+                        None if hasattr(os, 'fdatasync') else 'os.fdatasync not available'),
+    'odirect_write': (_direct_latency(write=True), None if hasattr(os, 'O_DIRECT') else 'O_DIRECT not available'),
+    'odirect_read': (_direct_latency(write=False), None if hasattr(os, 'O_DIRECT') else 'O_DIRECT not available'),
+    'mmap_fault_file': (_fault_latency(file_backed=True), None),
+    'mmap_fault_anon': (_fault_latency(file_backed=False), None),
+}
+
+
+def io_antagonist(stop_event, directory=DEFAULT_IO_DIR):
+    """Sequential 1 MiB writes with fsync, wrapping at ANTAGONIST_FILE_SIZE"""
+    temp_dir = tempfile.mkdtemp(prefix=TEMP_PREFIX, dir=directory)
+    chunk = os.urandom(WRITE_CHUNK)
+    writes = 0
+    try:
+        fd = os.open(os.path.join(temp_dir, 'antagonist.dat'), os.O_WRONLY | os.O_CREAT, 0o600)
+        try:
+            while not stop_event.is_set():
+                os.pwrite(fd, chunk, (writes * WRITE_CHUNK) % ANTAGONIST_FILE_SIZE)
+                os.fsync(fd)
+                writes += 1
+        finally:
+            os.close(fd)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return writes
+
+
+def run_io_suite(config=None, stop_event=None):
+    """Results for the 'io_latency' phase ({test: {condition: latency summary}})"""
+    # background_loads registers io_antagonist, so it is imported here, not at the top
+    from .background_loads import BackgroundLoad
+    config = config or {}
+    show_progress = config.get('show_progress', True)
+    iterations = config.get('io_iterations', DEFAULT_ITERATIONS)
+    block_size = config.get('io_block_size', DEFAULT_BLOCK_SIZE)
+    names = config.get('io_tests') or list(DEFAULT_TESTS)
+    conditions = config.get('io_conditions') or ['idle']
+    load_name = config.get('io_load', 'cpu')
+
+    unknown = [name for name in names if name not in IO_TESTS]
+    if unknown:
+        return {'success': False,
+                'error': f"Unknown I/O test(s): {', '.join(unknown)} (available: {', '.join(IO_TESTS)})"}
+
+    try:
+        temp_dir = tempfile.mkdtemp(prefix=TEMP_PREFIX, dir=config.get('io_dir') or DEFAULT_IO_DIR)
+    except OSError as e:
+        return {'success': False, 'error': f'Cannot create I/O test directory: {e}'}
+
+    results = {
+        'success': True,
+        'iterations': iterations,
+        'block_size': block_size,
+        'directory': os.path.dirname(os.path.abspath(temp_dir)),
+        'load': load_name,
+        'metric': 'io_latency',
+        'latency': {},
+        'unavailable': {name: IO_TESTS[name][1] for name in names if IO_TESTS[name][1]},
+    }
+    runnable = [name for name in names if name not in results['unavailable']]
+    try:
+        for condition in conditions:
+            with BackgroundLoad(load_name if condition == 'loaded' else 'none', config=config) as load:
+                if load.processes:
+                    time.sleep(0.5)  # Let the antagonists ramp up
+                for name in runnable:
+                    if stop_event is not None and stop_event.is_set():
+                        results['cancelled'] = True
+                        return results
+                    try:
+                        summary = IO_TESTS[name][0](temp_dir, iterations, block_size, stop_event).summary()
+                    except OSError as e:
+                        # e.g. EINVAL from O_DIRECT on tmpfs
+                        results['unavailable'][name] = f'{e.strerror or e}'
+                        continue
+                    results['latency'].setdefault(name, {})[condition] = summary
+                    if show_progress and summary.get('success'):
+                        print(f"   ✅ {name} ({condition}): p50 {summary['percentiles_us']['p50']}μs, "
+                              f"p99 {summary['percentiles_us']['p99']}μs, max {summary['max_latency_us']}μs")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    results['success'] = any(summary.get('success') for by_condition in results['latency'].values()
+                             for summary in by_condition.values())
+    if not results['success']:
+        results['error'] = 'No I/O test could be measured'
+    return results
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Inter-Process Communication Latency
+===================================
+
+This module measures ping-pong round-trip latency between two processes
+pinned to chosen cores, over the IPC mechanisms RT applications use to
+talk to each other.
+
+Features:
+---------
+- Transports: pipe, Unix socketpair, UDP loopback, eventfd, and shared
+  memory with either a spin (sched_yield) or a futex handoff
+- Client and echo server pinned to separate cores; the server inherits
+  the caller's scheduling policy (SCHED_FIFO after environment setup)
+- Warm-up round trips discarded before measuring
+- Idle and loaded conditions (background load from background_loads)
+- Per-transport latency histogram, percentiles and mergeable sketch
+- Watchdog so a dead echo server can never hang the benchmark
+
+Usage:
+------
+    results = run_ipc_suite({'ipc_iterations': 5000, 'ipc_transports': ['pipe', 'eventfd']})
+    results['latency']['pipe']['idle']['percentiles_us']
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import ctypes
+import ctypes.util
+import multiprocessing
+import os
+import platform
+import signal
+import socket
+import struct
+import threading
+import time
+
+from .background_loads import RT_CORE, BackgroundLoad
+from .quantile_sketch import LatencyRecorder
+
+DEFAULT_ITERATIONS = 5000
+WARMUP_ITERATIONS = 200
+# Seconds without progress before the echo server is considered dead
+WATCHDOG_TIMEOUT_S = 10.0
+CONDITIONS = ('idle', 'loaded')
+
+# futex(2) syscall numbers (not exposed by Python)
+SYS_FUTEX = {'x86_64': 202, 'amd64': 202, 'aarch64': 98, 'arm64': 98, 'riscv64': 98,
+             'armv7l': 240, 'armv6l': 240, 'i686': 240, 'i386': 240}
+FUTEX_WAIT = 0
+FUTEX_WAKE = 1
+_libc = None
+
+
+def futex_unavailable_reason():
+    """Why futex(2) cannot be called here (None when it can)"""
+    if platform.system() != 'Linux':
+        return 'futex is Linux-only'
+    if platform.machine().lower() not in SYS_FUTEX:
+        return f'futex syscall number unknown for {platform.machine()}'
+    return None
+
+
+def futex(word, op, value):
+    """futex(2) on a ctypes.c_uint32 that lives in shared memory"""
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    _libc.syscall(SYS_FUTEX[platform.machine().lower()], ctypes.c_void_p(ctypes.addressof(word)),
+                  op, value, None, None, 0)
+
+
+class TransportAborted(Exception):
+    """The round trip was abandoned (echo server gone or timed out)"""
+
+
+class Transport:
+    """One ping-pong channel, created before the echo server forks"""
+
+    name = None
+
+    @classmethod
+    def unavailable_reason(cls):
+        """Why this transport cannot run here (None when it can)"""
+        return None
+
+    def after_fork_client(self):
+        """Close the server's ends in the client"""
+
+    def after_fork_server(self):
+        """Close the client's ends in the server"""
+
+    def ping(self):
+        raise NotImplementedError
+
+    def pong(self):
+        raise NotImplementedError
+
+    def abort(self):
+        """Unblock a pending ping() so the client can give up"""
+
+    def close(self):
+        """Release the channel"""
+
+
+class PipeTransport(Transport):
+    name = 'pipe'
+
+    def __init__(self):
+        self.ping_r, self.ping_w = os.pipe()
+        self.pong_r, self.pong_w = os.pipe()
+
+    def after_fork_client(self):
+        os.close(self.ping_r)
+        os.close(self.pong_w)
+        self.ping_r = self.pong_w = None
+
+    def after_fork_server(self):
+        os.close(self.ping_w)
+        os.close(self.pong_r)
+        self.ping_w = self.pong_r = None
+
+    def ping(self):
+        os.write(self.ping_w, b'x')
+        if not os.read(self.pong_r, 1):
+            raise TransportAborted('echo server closed the pipe')
+
+    def pong(self):
+        if not os.read(self.ping_r, 1):
+            raise TransportAborted('client closed the pipe')
+        os.write(self.pong_w, b'x')
+
+    def close(self):
+        for fd in (self.ping_r, self.ping_w, self.pong_r, self.pong_w):
+            if fd is not None:
+                os.close(fd)
+
+
+class SocketpairTransport(Transport):
+    name = 'socketpair'
+
+    def __init__(self):
+        self.client, self.server = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    def after_fork_client(self):
+        self.server.close()
+
+    def after_fork_server(self):
+        self.client.close()
+
+    def ping(self):
+        self.client.send(b'x')
+        if not self.client.recv(1):
+            raise TransportAborted('echo server closed the socket')
+
+    def pong(self):
+        if not self.server.recv(1):
+            raise TransportAborted('client closed the socket')
+        self.server.send(b'x')
+
+    def close(self):
+        self.client.close()
+        self.server.close()
+
+
+class UdpTransport(Transport):
+    name = 'udp'
+
+    def __init__(self):
+        self.client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.client.bind(('127.0.0.1', 0))
+        self.server.bind(('127.0.0.1', 0))
+        self.client.connect(self.server.getsockname())
+        self.server.connect(self.client.getsockname())
+        # Datagrams give no EOF when the peer dies
+        self.client.settimeout(WATCHDOG_TIMEOUT_S)
+        self.server.settimeout(WATCHDOG_TIMEOUT_S)
+
+    def after_fork_client(self):
+        self.server.close()
+
+    def after_fork_server(self):
+        self.client.close()
+
+    def ping(self):
+        self.client.send(b'x')
+        try:
+            self.client.recv(16)
+        except socket.timeout:
+            raise TransportAborted('no reply from the echo server')
+
+    def pong(self):
+        try:
+            self.server.recv(16)
+        except socket.timeout:
+            raise TransportAborted('no ping from the client')
+        self.server.send(b'x')
+
+    def close(self):
+        self.client.close()
+        self.server.close()
+
+
+class EventfdTransport(Transport):
+    name = 'eventfd'
+
+    @classmethod
+    def unavailable_reason(cls):
+        return None if hasattr(os, 'eventfd') else 'os.eventfd needs Linux and Python 3.10+'
+
+    def __init__(self):
+        self.ping_fd = os.eventfd(0)
+        self.pong_fd = os.eventfd(0)
+        self.aborted = False
+
+    def ping(self):
+        os.eventfd_write(self.ping_fd, 1)
+        os.eventfd_read(self.pong_fd)
+        if self.aborted:
+            raise TransportAborted('echo server timed out')
+
+    def pong(self):
+        os.eventfd_read(self.ping_fd)
+        os.eventfd_write(self.pong_fd, 1)
+
+    def abort(self):
+        self.aborted = True
+        os.eventfd_write(self.pong_fd, 1)
+
+    def close(self):
+        os.close(self.ping_fd)
+        os.close(self.pong_fd)
+
+
+class SharedMemorySpinTransport(Transport):
+    """Sequence numbers in shared memory, polled with sched_yield()"""
+
+    name = 'shm_spin'
+    # ping sequence, pong sequence, abort flag (uint32 each)
+    LAYOUT = struct.Struct('=I')
+
+    def __init__(self):
+        from multiprocessing import shared_memory
+        self.shm = shared_memory.SharedMemory(create=True, size=64)
+        self.shm.buf[:12] = bytes(12)
+        self.sequence = 0
+
+    def _get(self, offset):
+        return self.LAYOUT.unpack_from(self.shm.buf, offset)[0]
+
+    def _set(self, offset, value):
+        self.LAYOUT.pack_into(self.shm.buf, offset, value)
+
+    def _wait_for(self, offset, value):
+        while self._get(offset) != value:
+            if self._get(8):
+                raise TransportAborted('round trip abandoned')
+            os.sched_yield()
+
+    def ping(self):
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        self._set(0, self.sequence)
+        self._wait_for(4, self.sequence)
+
+    def pong(self):
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        self._wait_for(0, self.sequence)
+        self._set(4, self.sequence)
+
+    def abort(self):
+        self._set(8, 1)
+
+    def close(self):
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedMemoryFutexTransport(SharedMemorySpinTransport):
+    """Sequence numbers in shared memory, handed off with futex wait/wake"""
+
+    name = 'shm_futex'
+
+    @classmethod
+    def unavailable_reason(cls):
+        return futex_unavailable_reason()
+
+    def __init__(self):
+        super().__init__()
+        self.words = [ctypes.c_uint32.from_buffer(self.shm.buf, offset) for offset in (0, 4, 8)]
+
+    def _wait_for(self, index, value):
+        word = self.words[index]
+        while True:
+            current = word.value
+            if current == value:
+                return
+            if self.words[2].value:
+                raise TransportAborted('round trip abandoned')
+            # Sleeps only while the word still holds `current`
+            futex(word, FUTEX_WAIT, current)
+
+    def ping(self):
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        self.words[0].value = self.sequence
+        futex(self.words[0], FUTEX_WAKE, 1)
+        self._wait_for(1, self.sequence)
+
+    def pong(self):
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        self._wait_for(0, self.sequence)
+        self.words[1].value = self.sequence
+        futex(self.words[1], FUTEX_WAKE, 1)
+
+    def abort(self):
+        self.words[2].value = 1
+        self.words[1].value = 0xFFFFFFFF
+        futex(self.words[1], FUTEX_WAKE, 1)
+
+    def close(self):
+        # ctypes views must go before the mapping can be closed
+        self.words = []
+        super().close()
+
+
+TRANSPORTS = {transport.name: transport for transport in (
+    PipeTransport, SocketpairTransport, UdpTransport, EventfdTransport,
+    SharedMemorySpinTransport, SharedMemoryFutexTransport,
+)}
+
+
+def available_cpus():
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return list(range(os.cpu_count() or 1))
+
+
+def resolve_cpu(cpu, cpus):
+    """cpu if this process may run there, else the highest allowed CPU"""
+    return cpu if cpu in cpus else cpus[-1]
+
+
+def default_cpu_pair(cpus=None):
+    """(client, server) CPUs: the RT core and its neighbour when present"""
+    cpus = cpus or available_cpus()
+    client = resolve_cpu(RT_CORE, cpus)
+    others = [cpu for cpu in cpus if cpu != client]
+    return client, (others[-1] if others else client)
+
+
+def pin_to_cpu(cpu):
+    try:
+        if hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, {cpu})
+    except OSError:
+        pass
+
+
+def _echo_server(transport, iterations, cpu):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    pin_to_cpu(cpu)
+    transport.after_fork_server()
+    try:
+        for _ in range(iterations):
+            transport.pong()
+    except (TransportAborted, OSError):
+        pass
+
+
+def measure_round_trips(transport_name, iterations=DEFAULT_ITERATIONS, client_cpu=None, server_cpu=None,
+                        warmup=WARMUP_ITERATIONS):
+    """Round-trip latencies of one transport as a LatencyRecorder"""
+    transport = TRANSPORTS[transport_name]()
+    context = multiprocessing.get_context('fork')
+    server = context.Process(target=_echo_server, args=(transport, warmup + iterations, server_cpu),
+                             name=f'rtos-ipc-{transport_name}', daemon=True)
+    previous_affinity = available_cpus()
+    recorder = LatencyRecorder()
+    progress = {'last': time.monotonic(), 'done': False}
+
+    def watchdog():
+        while not progress['done']:
+            time.sleep(0.5)
+            if not progress['done'] and time.monotonic() - progress['last'] > WATCHDOG_TIMEOUT_S:
+                server.kill()
+                transport.abort()
+                return
+
+    try:
+        server.start()
+        transport.after_fork_client()
+        if client_cpu is not None:
+            pin_to_cpu(client_cpu)
+        threading.Thread(target=watchdog, daemon=True).start()
+
+        clock = time.perf_counter_ns
+        for index in range(warmup + iterations):
+            start = clock()
+            transport.ping()
+            elapsed = clock() - start
+            if index >= warmup:
+                recorder.add_ns(elapsed)
+            if index & 0xFF == 0:
+                progress['last'] = time.monotonic()
+    finally:
+        progress['done'] = True
+        server.join(WATCHDOG_TIMEOUT_S)
+        if server.is_alive():
+            server.kill()
+            server.join(1.0)
+        transport.close()
+        try:
+            if hasattr(os, 'sched_setaffinity'):
+                os.sched_setaffinity(0, previous_affinity)
+        except OSError:
+            pass
+    return recorder
+
+
+def run_ipc_suite(config=None, stop_event=None):
+    """Round-trip latency per transport under idle and loaded conditions
+
+    Returns {'success', 'latency': {transport: {condition: summary}},
+    'unavailable': {transport: reason}, ...}; summaries carry the same
+    keys as cyclictest results (µs).
+    """
+    config = config or {}
+    iterations = int(config.get('ipc_iterations', DEFAULT_ITERATIONS))
+    names = config.get('ipc_transports') or list(TRANSPORTS)
+    conditions = config.get('ipc_conditions') or CONDITIONS
+    load_name = config.get('ipc_load', 'cpu')
+    show_progress = config.get('show_progress', True)
+    client_cpu, server_cpu = default_cpu_pair()
+    if config.get('ipc_cpus'):
+        cpus = available_cpus()
+        client_cpu, server_cpu = (resolve_cpu(cpu, cpus) for cpu in config['ipc_cpus'])
+
+    unknown = [name for name in names if name not in TRANSPORTS]
+    if unknown:
+        return {'success': False,
+                'error': f"Unknown IPC transport(s): {', '.join(unknown)} (available: {', '.join(TRANSPORTS)})"}
+
+    results = {
+        'success': True,
+        'iterations': iterations,
+        'client_cpu': client_cpu,
+        'server_cpu': server_cpu,
+        'load': load_name,
+        'metric': 'round_trip',
+        'latency': {},
+        'unavailable': {},
+    }
+    runnable = []
+    for name in names:
+        reason = TRANSPORTS[name].unavailable_reason()
+        if reason:
+            results['unavailable'][name] = reason
+        else:
+            runnable.append(name)
+
+    for condition in conditions:
+        load = BackgroundLoad(load_name if condition == 'loaded' else 'none', config=config)
+        with load:
+            if load.processes:
+                time.sleep(0.5)  # Let the antagonists ramp up
+            for name in runnable:
+                if stop_event is not None and stop_event.is_set():
+                    results['cancelled'] = True
+                    return results
+                try:
+                    summary = measure_round_trips(name, iterations, client_cpu, server_cpu).summary()
+                except (TransportAborted, OSError) as e:
+                    summary = {'success': False, 'error': str(e)}
+                results['latency'].setdefault(name, {})[condition] = summary
+                if show_progress:
+                    if summary.get('success'):
+                        print(f"   ✅ {name} ({condition}): p50 {summary['percentiles_us']['p50']}μs, "
+                              f"p99 {summary['percentiles_us']['p99']}μs, max {summary['max_latency_us']}μs")
+                    else:
+                        print(f"   ⚠️  {name} ({condition}): {summary.get('error')}")
+
+    results['success'] = any(summary.get('success') for by_condition in results['latency'].values()
+                             for summary in by_condition.values())
+    if not results['success']:
+        results['error'] = 'No IPC transport could be measured'
+    return results
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+asyncio Event-Loop Lag
+======================
+
+This module measures scheduling jitter of an asyncio event loop, which
+is what asyncio-based board services see: periodic loop.call_at()
+callbacks and how late each one runs.
+
+Features:
+---------
+- Fixed-period call_at() callbacks on absolute deadlines; lateness per
+  callback, missed periods skipped and counted like a periodic RT task
+- Loop implementations: default asyncio and uvloop (when installed)
+- Loop thread at normal priority or SCHED_FIFO, pinned to the RT core
+- Competition: none, CPU-bound coroutines on the same loop, or CPU-bound
+  executor threads contending for the GIL
+- Summaries with the same keys as cyclictest results
+
+Usage:
+------
+    results = run_loop_lag_suite({'loop_lag_samples': 2000})
+    results['latency']['asyncio_fifo']['coroutines']['percentiles_us']
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .ipc_latency import available_cpus, default_cpu_pair, resolve_cpu
+from .multicore import MulticoreManager
+from .quantile_sketch import LatencyRecorder
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+DEFAULT_SAMPLES = 1000
+WARMUP_SAMPLES = 50
+DEFAULT_PERIOD_US = 1000
+# CPU time a competing coroutine takes before yielding to the loop
+DEFAULT_BURST_US = 1000
+DEFAULT_COMPETITORS = 2
+# A loaded loop misses most periods; stop after this many times the nominal run time
+MAX_DURATION_FACTOR = 3
+POLICIES = ('other', 'fifo')
+CONDITIONS = ('idle', 'coroutines', 'executor')
+
+LOOP_FACTORIES = {'asyncio': asyncio.new_event_loop}
+if uvloop is not None:
+    LOOP_FACTORIES['uvloop'] = uvloop.new_event_loop
+KNOWN_LOOPS = ('asyncio', 'uvloop')
+
+
+def _burn(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def _cpu_coroutine(stop, burst_s):
+    """CPU-bound coroutine that only yields every burst_s"""
+    while not stop.is_set():
+        _burn(burst_s)
+        await asyncio.sleep(0)
+
+
+def _cpu_thread(stop, end):
+    """CPU-bound executor job; competes with the loop thread for the GIL
+
+    It also stops on its own at end (time.monotonic()): at SCHED_FIFO,
+    spinning threads can keep the GIL away from the loop thread for good.
+    """
+    while not stop.is_set() and time.monotonic() < end:
+        sum(range(1000))
+
+
+async def sample_lag(samples, period_s, condition='idle', competitors=DEFAULT_COMPETITORS,
+                     burst_s=DEFAULT_BURST_US / 1e6, warmup=WARMUP_SAMPLES):
+    """(LatencyRecorder of callback lateness, missed periods) on the running loop
+
+    Sampling stops early after MAX_DURATION_FACTOR times the nominal run
+    time, so a starved loop reports fewer samples instead of running on.
+    """
+    loop = asyncio.get_running_loop()
+    recorder = LatencyRecorder()
+    done = loop.create_future()
+    stop = threading.Event()
+    state = {'deadline': loop.time() + period_s, 'count': 0, 'missed': 0}
+    duration = max(1.0, (warmup + samples) * period_s * MAX_DURATION_FACTOR)
+    end = loop.time() + duration
+
+    def tick():
+        now = loop.time()
+        if state['count'] >= warmup:
+            # asyncio may run a callback up to one clock resolution early
+            recorder.add_ns(max(now - state['deadline'], 0.0) * 1e9)
+        state['count'] += 1
+        if state['count'] >= warmup + samples or now >= end:
+            done.set_result(None)
+            return
+        deadline = state['deadline'] + period_s
+        if deadline <= now:
+            skipped = int((now - deadline) // period_s) + 1
+            state['missed'] += skipped
+            deadline += skipped * period_s
+        state['deadline'] = deadline
+        loop.call_at(deadline, tick)
+
+    loop.call_at(state['deadline'], tick)
+    tasks, executor = [], None
+    if condition == 'coroutines':
+        tasks = [loop.create_task(_cpu_coroutine(stop, burst_s)) for _ in range(competitors)]
+    elif condition == 'executor':
+        executor = ThreadPoolExecutor(max_workers=competitors, thread_name_prefix='rtos-loop-load')
+        for _ in range(competitors):
+            loop.run_in_executor(executor, _cpu_thread, stop, time.monotonic() + duration)
+    try:
+        await done
+    finally:
+        stop.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if executor is not None:
+            executor.shutdown(wait=True)
+    return recorder, state['missed']
+
+
+def measure_loop_lag(loop_name, policy='other', condition='idle', samples=DEFAULT_SAMPLES,
+                     period_us=DEFAULT_PERIOD_US, cpu=None, priority=98,
+                     competitors=DEFAULT_COMPETITORS, burst_us=DEFAULT_BURST_US):
+    """Lateness summary of one loop/policy/condition, run on a dedicated thread
+
+    Affinity and SCHED_FIFO are per-thread on Linux, so the caller's
+    scheduling is untouched; executor threads inherit the loop thread's.
+    """
+    outcome = {}
+
+    def runner():
+        manager = MulticoreManager()
+        if cpu is not None:
+            manager.set_process_affinity([cpu])
+        if policy == 'fifo':
+            success, message = manager.set_rt_scheduling(priority)
+            if not success:
+                outcome['error'] = message
+                return
+        loop = LOOP_FACTORIES[loop_name]()
+        try:
+            outcome['result'] = loop.run_until_complete(
+                sample_lag(samples, period_us / 1e6, condition, competitors, burst_us / 1e6))
+        except Exception as e:
+            outcome['error'] = f'{type(e).__name__}: {e}'
+        finally:
+            loop.close()
+
+    thread = threading.Thread(target=runner, name=f'rtos-loop-{loop_name}-{policy}')
+    thread.start()
+    thread.join()
+    if 'error' in outcome:
+        return {'success': False, 'error': outcome['error']}
+    recorder, missed = outcome['result']
+    summary = recorder.summary()
+    summary['missed_periods'] = missed
+    if not summary['success']:
+        # Real outcome, not a setup failure: e.g. FIFO executor threads holding the GIL
+        summary['error'] = f'Event loop starved: fewer than {WARMUP_SAMPLES + 1} callbacks ran'
+    return summary
+
+
+def fifo_unavailable_reason(priority=98):
+    """Why a thread cannot switch to SCHED_FIFO here, or None"""
+    outcome = {}
+
+    def probe():
+        success, message = MulticoreManager().set_rt_scheduling(priority)
+        if not success:
+            outcome['reason'] = message
+
+    thread = threading.Thread(target=probe, name='rtos-fifo-probe')
+    thread.start()
+    thread.join()
+    return outcome.get('reason')
+
+
+def run_loop_lag_suite(config=None, stop_event=None):
+    """Event-loop lag per loop and policy ('asyncio_fifo', ...) and per competition condition
+
+    Returns the workload latency shape: {'success', 'latency':
+    {series: {condition: summary}}, 'unavailable': {series: reason}, ...}.
+    """
+    config = config or {}
+    samples = int(config.get('loop_lag_samples', DEFAULT_SAMPLES))
+    period_us = config.get('loop_lag_period_us', DEFAULT_PERIOD_US)
+    loops = config.get('loop_lag_loops') or list(KNOWN_LOOPS)
+    policies = config.get('loop_lag_policies') or list(POLICIES)
+    conditions = config.get('loop_lag_conditions') or list(CONDITIONS)
+    competitors = config.get('loop_lag_competitors', DEFAULT_COMPETITORS)
+    priority = max(1, int(config.get('priority', 99)) - 1)
+    show_progress = config.get('show_progress', True)
+    cpu = default_cpu_pair()[0]
+    if config.get('loop_lag_cpu') is not None:
+        cpu = resolve_cpu(config['loop_lag_cpu'], available_cpus())
+
+    unknown = ([name for name in loops if name not in KNOWN_LOOPS] +
+               [name for name in policies if name not in POLICIES] +
+               [name for name in conditions if name not in CONDITIONS])
+    if unknown:
+        return {'success': False, 'error': f"Unknown loop lag option(s): {', '.join(unknown)}"}
+
+    results = {
+        'success': True,
+        'samples': samples,
+        'period_us': period_us,
+        'cpu': cpu,
+        'priority': priority,
+        'competitors': competitors,
+        'metric': 'loop_lag',
+        'latency': {},
+        'unavailable': {},
+    }
+    fifo_reason = fifo_unavailable_reason(priority) if 'fifo' in policies else None
+    for loop_name in loops:
+        for policy in policies:
+            series = f'{loop_name}_{policy}'
+            if loop_name not in LOOP_FACTORIES:
+                results['unavailable'][series] = f'{loop_name} is not installed'
+                continue
+            if policy == 'fifo' and fifo_reason:
+                results['unavailable'][series] = fifo_reason
+                continue
+            for condition in conditions:
+                if stop_event is not None and stop_event.is_set():
+                    results['cancelled'] = True
+                    return results
+                summary = measure_loop_lag(loop_name, policy, condition, samples, period_us, cpu, priority,
+                                           competitors, config.get('loop_lag_burst_us', DEFAULT_BURST_US))
+                results['latency'].setdefault(series, {})[condition] = summary
+                if show_progress:
+                    if summary.get('success'):
+                        print(f"   ✅ {series} ({condition}): p50 {summary['percentiles_us']['p50']}μs, "
+                              f"p99 {summary['percentiles_us']['p99']}μs, max {summary['max_latency_us']}μs")
+                    else:
+                        print(f"   ⚠️  {series} ({condition}): {summary.get('error')}")
+
+    results['success'] = any(summary.get('success') for by_condition in results['latency'].values()
+                             for summary in by_condition.values())
+    if not results['success']:
+        results['error'] = 'No event loop could be measured'
+    return results
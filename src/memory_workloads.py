@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Memory Bandwidth and Cache-Hierarchy Workloads
+==============================================
+
+This module measures the memory system and provides memory-bound
+antagonists. On boards like the Pi 5, latency spikes under load come
+mostly from memory-bus contention, which cpu_stress_worker (arithmetic
+that never leaves L1) does not produce.
+
+Features:
+---------
+- Sequential read, write and copy bandwidth over large buffers
+  (memchr / memset / memmove via ctypes, so the loop runs in C)
+- Pointer-chasing random-access latency across working-set sizes; one
+  pointer per cache line, single-cycle random permutation
+- Interpreter cost per step measured on the smallest working set and
+  reported separately, so the L1/L2/L3/DRAM steps stand out
+- Antagonists for background_loads: 'memory' (streaming copies) and
+  'cache_thrash' (strided writes over a buffer larger than the LLC)
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import ctypes
+import random
+import statistics
+import time
+from array import array
+
+DEFAULT_BUFFER_MB = 64
+DEFAULT_PASSES = 5
+# Working sets chosen to straddle typical L1 (32-64K), L2 (512K-1M),
+# L3 (2-8M) and DRAM on Cortex-A7x/x86 boards
+DEFAULT_WORKING_SETS_KB = (16, 64, 256, 1024, 4096, 16384, 65536)
+CHASE_STEPS = 200000
+CACHE_LINE = 64
+WORDS_PER_LINE = CACHE_LINE // 8
+MB = 1024 * 1024
+
+
+def _address(buffer):
+    return ctypes.addressof(ctypes.c_char.from_buffer(buffer))
+
+
+def _best_rate(operation, size, passes):
+    """(best GB/s, median GB/s) over passes of operation()"""
+    rates = []
+    for _ in range(passes):
+        start = time.perf_counter()
+        operation()
+        elapsed = time.perf_counter() - start
+        if elapsed > 0:
+            rates.append(size / elapsed / 1e9)
+    return round(max(rates), 2), round(statistics.median(rates), 2)
+
+
+def measure_bandwidth(buffer_mb=DEFAULT_BUFFER_MB, passes=DEFAULT_PASSES):
+    """Sequential read/write/copy bandwidth in GB/s (best and median pass)"""
+    size = int(buffer_mb * MB)
+    source = bytearray(size)
+    target = bytearray(size)
+    source_address, target_address = _address(source), _address(target)
+
+    operations = {
+        # memchr for a byte that is never there reads the whole buffer
+        'read': lambda: source.find(b'\xff'),
+        'write': lambda: ctypes.memset(target_address, 0x5a, size),
+        # memmove reads and writes size bytes each; counted once, like STREAM copy
+        'copy': lambda: ctypes.memmove(target_address, source_address, size),
+    }
+    operations['write']()  # Fault the pages in before timing
+    results = {'buffer_mb': buffer_mb, 'passes': passes, 'bandwidth_gbps': {}, 'median_gbps': {}}
+    for name, operation in operations.items():
+        best, median = _best_rate(operation, size, passes)
+        results['bandwidth_gbps'][name] = best
+        results['median_gbps'][name] = median
+    return results
+
+
+def build_chase(working_set_bytes, rng=None):
+    """array('q') holding a single random cycle through its cache lines
+
+    Slot line*8 holds the index of the next line's slot, so each step
+    touches a new cache line in an order the prefetcher cannot follow.
+    """
+    rng = rng or random.Random(0)
+    lines = max(2, working_set_bytes // CACHE_LINE)
+    order = list(range(lines))
+    # Sattolo's algorithm: a random permutation that is one cycle
+    for i in range(lines - 1, 0, -1):
+        j = rng.randrange(i)
+        order[i], order[j] = order[j], order[i]
+    chain = array('q', bytes(lines * CACHE_LINE))
+    for line in range(lines):
+        chain[line * WORDS_PER_LINE] = order[line] * WORDS_PER_LINE
+    return chain
+
+
+def chase(chain, steps=CHASE_STEPS):
+    """Nanoseconds per dependent load over the chain"""
+    index = 0
+    start = time.perf_counter_ns()
+    for _ in range(steps):
+        index = chain[index]
+    return (time.perf_counter_ns() - start) / steps
+
+
+def measure_access_latency(working_sets_kb=DEFAULT_WORKING_SETS_KB, steps=CHASE_STEPS, repeats=3):
+    """Random-access latency per working set (ns per access)
+
+    Python adds a fixed cost per step; it is estimated from the smallest
+    working set (L1-resident) and subtracted in 'extra_ns'.
+    """
+    latency = {}
+    for size_kb in working_sets_kb:
+        chain = build_chase(size_kb * 1024)
+        chase(chain, min(steps, len(chain) // WORDS_PER_LINE))  # Warm up and fault pages in
+        latency[size_kb] = round(min(chase(chain, steps) for _ in range(repeats)), 2)
+        del chain
+    overhead = latency[min(latency)]
+    return {
+        'steps': steps,
+        'latency_ns': {str(size_kb): value for size_kb, value in latency.items()},
+        'interpreter_overhead_ns': overhead,
+        'extra_ns': {str(size_kb): round(max(value - overhead, 0.0), 2) for size_kb, value in latency.items()},
+    }
+
+
+def run_memory_suite(config=None, stop_event=None):
+    """Bandwidth and access-latency results for the 'memory_hierarchy' phase"""
+    config = config or {}
+    show_progress = config.get('show_progress', True)
+    try:
+        results = {'success': True}
+        results.update(measure_bandwidth(config.get('memory_buffer_mb', DEFAULT_BUFFER_MB),
+                                         config.get('memory_passes', DEFAULT_PASSES)))
+        if show_progress:
+            bandwidth = results['bandwidth_gbps']
+            print(f"   ✅ Bandwidth: read {bandwidth['read']} GB/s, write {bandwidth['write']} GB/s, "
+                  f"copy {bandwidth['copy']} GB/s")
+        if stop_event is not None and stop_event.is_set():
+            results['cancelled'] = True
+            return results
+
+        working_sets = config.get('memory_working_sets_kb') or DEFAULT_WORKING_SETS_KB
+        results.update(measure_access_latency(working_sets, config.get('memory_chase_steps', CHASE_STEPS)))
+        if show_progress:
+            steps = ', '.join(f"{size}K {value}ns" for size, value in results['latency_ns'].items())
+            print(f"   ✅ Access latency: {steps}")
+        return results
+    except (MemoryError, OSError, ValueError) as e:
+        return {'success': False, 'error': f'Memory workload failed: {e}'}
+
+
+def memory_antagonist(stop_event, buffer_mb=DEFAULT_BUFFER_MB // 2):
+    """Streaming copies between two large buffers (memory-bus load)"""
+    size = int(buffer_mb * MB)
+    source, target = bytearray(size), bytearray(size)
+    source_address, target_address = _address(source), _address(target)
+    copies = 0
+    while not stop_event.is_set():
+        ctypes.memmove(target_address, source_address, size)
+        ctypes.memmove(source_address, target_address, size)
+        copies += 2
+    return copies
+
+
+def cache_thrash_antagonist(stop_event, buffer_mb=DEFAULT_BUFFER_MB // 2):
+    """One write per cache line across a buffer larger than the LLC"""
+    lines = max(1, int(buffer_mb * MB) // CACHE_LINE)
+    buffer = bytearray(lines * CACHE_LINE)
+    line_marks = bytes(lines)
+    passes = 0
+    while not stop_event.is_set():
+        # Extended-slice assignment runs in C: evicts the caches line by line
+        buffer[passes % CACHE_LINE::CACHE_LINE] = line_marks
+        passes += 1
+    return passes
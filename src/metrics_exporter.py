@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+OpenMetrics Textfile Exporter
+=============================
+
+This module turns benchmark results (and live soak statistics) into
+OpenMetrics text for node_exporter's textfile collector.
+
+Features:
+---------
+- Board/kernel fingerprint info metric and fingerprint labels on every sample
+- cyclictest latency gauges, percentiles and histogram buckets
+- Algorithm timings and multicore throughput as gauges
+- Live soak statistics (counters and gauges) when provided
+- Atomic writes (temp file in the same directory + rename)
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import math
+import os
+import time
+
+METRIC_PREFIX = 'rtos_bench'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(labels):
+    items = [(k, v) for k, v in labels.items() if v is not None]
+    if not items:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in items) + '}'
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)) and not math.isnan(value):
+        return value
+    return None
+
+
+def _format(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        return repr(value)
+    return str(value)
+
+
+class MetricFamily:
+    """One OpenMetrics metric family (TYPE/HELP/UNIT plus samples)"""
+
+    def __init__(self, name, metric_type, help_text, unit=None):
+        self.name = f'{METRIC_PREFIX}_{name}'
+        self.metric_type = metric_type
+        self.help_text = help_text
+        self.unit = unit
+        self.samples = []
+
+    def add(self, labels, value, suffix=''):
+        value = _number(value)
+        if value is not None:
+            self.samples.append((self.name + suffix, labels, value))
+
+    def render(self):
+        if not self.samples:
+            return []
+        lines = [f'# TYPE {self.name} {self.metric_type}']
+        if self.unit:
+            lines.append(f'# UNIT {self.name} {self.unit}')
+        lines.append(f'# HELP {self.name} {_escape(self.help_text)}')
+        lines.extend(f'{name}{_labels(labels)} {_format(value)}' for name, labels, value in self.samples)
+        return lines
+
+
+def _histogram_buckets(cyclictest):
+    """Cumulative (le_us, count) buckets plus sum/count, or None
+
+    cyclictest bucket b counts samples in [b, b+1) μs, so it is exported
+    as le=b+1 and contributes its midpoint to the sum.  Overflows past the
+    histogram range only reach +Inf and are summed at the reported max.
+    """
+    histogram = cyclictest.get('histogram_us')
+    if not isinstance(histogram, dict) or not histogram:
+        return None
+    counts = sorted((float(bucket), int(count)) for bucket, count in histogram.items())
+    running, buckets = 0, []
+    for bucket, count in counts:
+        running += count
+        buckets.append((bucket + 1, running))
+    total_us = sum((bucket + 0.5) * count for bucket, count in counts)
+    overflow = int(cyclictest.get('histogram_overflows', 0) or 0)
+    if overflow:
+        ceiling = max(buckets[-1][0], _number(cyclictest.get('max_latency_us')) or 0)
+        total_us += overflow * ceiling
+    return buckets, total_us, running + overflow
+
+
+def render_openmetrics(results, soak_stats=None, phase=None, extra_labels=None):
+    """Render a results dict (and optional soak stats) as OpenMetrics text"""
+    system_info = results.get('system_info', {}) or {}
+    base = {'fingerprint': system_info.get('fingerprint'),
+            'board': system_info.get('board_fingerprint')}
+    base.update(extra_labels or {})
+
+    families = []
+
+    # A gauge rather than the OpenMetrics 'info' type, which node_exporter's parser rejects
+    info = MetricFamily('board_info', 'gauge', 'Board and kernel identity of the benchmarked system')
+    info.add(dict(base, kernel_release=system_info.get('kernel_release'),
+                  preemption_model=system_info.get('preemption_model'),
+                  cpu=system_info.get('cpu_info'), machine=system_info.get('machine')), 1)
+    families.append(info)
+
+    last_phase = MetricFamily('last_phase_timestamp_seconds', 'gauge',
+                              'Unix time at which each benchmark phase last finished', unit='seconds')
+    if phase:
+        last_phase.add(dict(base, phase=phase), time.time())
+    families.append(last_phase)
+
+    cyclictest = results.get('cyclictest_results', {}) or {}
+    latency = MetricFamily('cyclictest_latency_microseconds', 'gauge',
+                           'cyclictest wakeup latency statistics', unit='microseconds')
+    for stat in ('min', 'avg', 'max'):
+        latency.add(dict(base, stat=stat), cyclictest.get(f'{stat}_latency_us'))
+    latency.add(dict(base, stat='jitter'), cyclictest.get('jitter_us'))
+    for quantile, value in (cyclictest.get('percentiles_us') or {}).items():
+        latency.add(dict(base, stat=f'p{quantile.lstrip("p")}'), value)
+    families.append(latency)
+
+    simulated = MetricFamily('cyclictest_simulated', 'gauge', '1 if latency numbers were simulated')
+    if cyclictest:
+        simulated.add(base, 1 if cyclictest.get('simulated') else 0)
+    families.append(simulated)
+
+    buckets = _histogram_buckets(cyclictest)
+    if buckets:
+        histogram = MetricFamily('cyclictest_latency_seconds', 'histogram',
+                                 'cyclictest wakeup latency distribution', unit='seconds')
+        bucket_list, total_us, count = buckets
+        for bound_us, cumulative in bucket_list:
+            histogram.add(dict(base, le=_format(bound_us / 1e6)), cumulative, '_bucket')
+        histogram.add(dict(base, le='+Inf'), count, '_bucket')
+        histogram.add(base, count, '_count')
+        histogram.add(base, total_us / 1e6, '_sum')
+        families.append(histogram)
+
+    algorithm = MetricFamily('algorithm_time_milliseconds', 'gauge',
+                             'Algorithm benchmark execution time', unit='milliseconds')
+    for name, data in (results.get('algorithm_results') or {}).items():
+        if isinstance(data, dict):
+            algorithm.add(dict(base, algorithm=name, stat='mean'), data.get('execution_time_ms'))
+            algorithm.add(dict(base, algorithm=name, stat='min'), data.get('min_time_ms'))
+            algorithm.add(dict(base, algorithm=name, stat='max'), data.get('max_time_ms'))
+    families.append(algorithm)
+
+    stress = results.get('multicore_stress', {}) or {}
+    throughput = MetricFamily('stress_operations', 'gauge', 'Multicore stress test operations')
+    throughput.add(dict(base, stat='total'), stress.get('total_operations'))
+    throughput.add(dict(base, stat='per_core'), stress.get('avg_ops_per_core'))
+    families.append(throughput)
+
+    score = results.get('composite_score')
+    score_value = score.get('composite_score') if isinstance(score, dict) else score
+    composite = MetricFamily('composite_score', 'gauge', 'Composite real-time performance score')
+    composite.add(dict(base, version=score.get('score_version') if isinstance(score, dict) else None),
+                  score_value)
+    families.append(composite)
+
+    environment = results.get('environment_info', {}) or {}
+    temperature = MetricFamily('cpu_temperature_celsius', 'gauge', 'CPU temperature at collection time',
+                               unit='celsius')
+    temperature.add(base, environment.get('cpu_temperature_c'))
+    families.append(temperature)
+
+    if soak_stats:
+        families.extend(_soak_families(soak_stats, base))
+
+    lines = []
+    for family in families:
+        lines.extend(family.render())
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+def _soak_families(soak_stats, base):
+    """Families for live soak statistics
+
+    Numeric entries become gauges, except '*_total' entries which are
+    counters; a nested 'latency_us' dict becomes stat-labelled gauges.
+    """
+    families = []
+    for key, value in sorted(soak_stats.items()):
+        if key == 'latency_us' and isinstance(value, dict):
+            family = MetricFamily('soak_latency_microseconds', 'gauge',
+                                  'Rolling soak latency statistics', unit='microseconds')
+            for stat, stat_value in value.items():
+                family.add(dict(base, stat=stat), stat_value)
+        elif key.endswith('_total'):
+            # node_exporter's text parser wants the TYPE line on the '_total' sample name
+            family = MetricFamily(f'soak_{key}', 'counter', f'Soak counter {key}')
+            family.add(base, value)
+        else:
+            family = MetricFamily(f'soak_{key}', 'gauge', f'Soak statistic {key}')
+            family.add(base, value)
+        families.append(family)
+    return families
+
+
+class OpenMetricsExporter:
+    """Writes OpenMetrics text files for the node_exporter textfile collector"""
+
+    def __init__(self, path, extra_labels=None):
+        """Initialize exporter for a target .prom path"""
+        self.path = path
+        self.extra_labels = extra_labels or {}
+
+    def write(self, results, phase=None, soak_stats=None):
+        """Atomically replace the textfile with the current metrics"""
+        try:
+            text = render_openmetrics(results, soak_stats=soak_stats, phase=phase,
+                                      extra_labels=self.extra_labels)
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = os.path.join(directory, f'.{os.path.basename(self.path)}.{os.getpid()}.tmp')
+            with open(tmp_path, 'w') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            return {'success': True, 'path': self.path, 'bytes': len(text)}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
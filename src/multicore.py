@@ -98,6 +98,18 @@ class MulticoreManager:
         except Exception:
             return None
     
+    def set_rt_scheduling(self, priority=99, policy=None):
+        """Switch the calling thread to SCHED_FIFO (or policy) at priority"""
+        if not hasattr(os, 'sched_setscheduler'):
+            return False, "sched_setscheduler not available"
+
+        policy = os.SCHED_FIFO if policy is None else policy
+        try:
+            os.sched_setscheduler(0, policy, os.sched_param(priority))
+            return True, f"Scheduling set to policy {policy}, priority {priority}"
+        except (OSError, ValueError) as e:
+            return False, f"Failed to set RT scheduling: {e}"
+
     def isolate_cpu_for_rt(self, cpu_id=None):
         """Attempt to isolate a CPU core for real-time tasks"""
         if cpu_id is None:
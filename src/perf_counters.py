@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Hardware and Software Performance Counters
+==========================================
+
+This module wraps the Linux ``perf_event_open`` system call with ctypes so
+timed regions can report what the CPU actually did, not just wall time.
+
+Features:
+---------
+- Counter group opened once and read with a single ``read()`` per snapshot
+- Cycles, instructions, cache and branch misses from the hardware PMU
+- Page faults and context switches from kernel software events
+- Automatic fallback to software-only counters (VMs, restricted PMUs)
+- Derived metrics: IPC, cache miss rate, branch miss rate
+
+Usage:
+------
+    counters = PerfCounterGroup()
+    before = counters.read()
+    run_workload()
+    after = counters.read()
+    print(counters.delta(before, after))
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import ctypes
+import errno
+import os
+import platform
+import struct
+from .platform_compat import platform_compat
+
+
+# perf_event_open syscall numbers per architecture
+PERF_EVENT_OPEN_SYSCALL = {
+    'x86_64': 298,
+    'i386': 336,
+    'i686': 336,
+    'aarch64': 241,
+    'arm64': 241,
+    'armv7l': 364,
+    'armv6l': 364,
+    'riscv64': 241,
+}
+
+# Event types
+PERF_TYPE_HARDWARE = 0
+PERF_TYPE_SOFTWARE = 1
+
+# Hardware event ids
+PERF_COUNT_HW_CPU_CYCLES = 0
+PERF_COUNT_HW_INSTRUCTIONS = 1
+PERF_COUNT_HW_CACHE_REFERENCES = 2
+PERF_COUNT_HW_CACHE_MISSES = 3
+PERF_COUNT_HW_BRANCH_INSTRUCTIONS = 4
+PERF_COUNT_HW_BRANCH_MISSES = 5
+
+# Software event ids
+PERF_COUNT_SW_TASK_CLOCK = 1
+PERF_COUNT_SW_PAGE_FAULTS = 2
+PERF_COUNT_SW_CONTEXT_SWITCHES = 3
+PERF_COUNT_SW_CPU_MIGRATIONS = 4
+
+# read_format flags
+PERF_FORMAT_TOTAL_TIME_ENABLED = 1 << 0
+PERF_FORMAT_TOTAL_TIME_RUNNING = 1 << 1
+PERF_FORMAT_GROUP = 1 << 3
+
+# perf_event_attr flag bits
+ATTR_FLAG_DISABLED = 1 << 0
+ATTR_FLAG_EXCLUDE_KERNEL = 1 << 5
+ATTR_FLAG_EXCLUDE_HV = 1 << 6
+
+# ioctl requests (_IO('$', n))
+PERF_EVENT_IOC_ENABLE = 0x2400
+PERF_EVENT_IOC_DISABLE = 0x2401
+PERF_EVENT_IOC_RESET = 0x2403
+PERF_IOC_FLAG_GROUP = 1
+
+PERF_FLAG_FD_CLOEXEC = 1 << 3
+
+# (name, type, config) - leader first
+HARDWARE_EVENTS = [
+    ('cycles', PERF_TYPE_HARDWARE, PERF_COUNT_HW_CPU_CYCLES),
+    ('instructions', PERF_TYPE_HARDWARE, PERF_COUNT_HW_INSTRUCTIONS),
+    ('cache_references', PERF_TYPE_HARDWARE, PERF_COUNT_HW_CACHE_REFERENCES),
+    ('cache_misses', PERF_TYPE_HARDWARE, PERF_COUNT_HW_CACHE_MISSES),
+    ('branch_instructions', PERF_TYPE_HARDWARE, PERF_COUNT_HW_BRANCH_INSTRUCTIONS),
+    ('branch_misses', PERF_TYPE_HARDWARE, PERF_COUNT_HW_BRANCH_MISSES),
+]
+
+SOFTWARE_EVENTS = [
+    ('task_clock_ns', PERF_TYPE_SOFTWARE, PERF_COUNT_SW_TASK_CLOCK),
+    ('page_faults', PERF_TYPE_SOFTWARE, PERF_COUNT_SW_PAGE_FAULTS),
+    ('context_switches', PERF_TYPE_SOFTWARE, PERF_COUNT_SW_CONTEXT_SWITCHES),
+    ('cpu_migrations', PERF_TYPE_SOFTWARE, PERF_COUNT_SW_CPU_MIGRATIONS),
+]
+
+
+class PerfEventAttr(ctypes.Structure):
+    """struct perf_event_attr (PERF_ATTR_SIZE_VER8 layout)"""
+    _fields_ = [
+        ('type', ctypes.c_uint32),
+        ('size', ctypes.c_uint32),
+        ('config', ctypes.c_uint64),
+        ('sample_period', ctypes.c_uint64),
+        ('sample_type', ctypes.c_uint64),
+        ('read_format', ctypes.c_uint64),
+        ('flags', ctypes.c_uint64),
+        ('wakeup_events', ctypes.c_uint32),
+        ('bp_type', ctypes.c_uint32),
+        ('config1', ctypes.c_uint64),
+        ('config2', ctypes.c_uint64),
+        ('branch_sample_type', ctypes.c_uint64),
+        ('sample_regs_user', ctypes.c_uint64),
+        ('sample_stack_user', ctypes.c_uint32),
+        ('clockid', ctypes.c_int32),
+        ('sample_regs_intr', ctypes.c_uint64),
+        ('aux_watermark', ctypes.c_uint32),
+        ('sample_max_stack', ctypes.c_uint16),
+        ('reserved_2', ctypes.c_uint16),
+        ('aux_sample_size', ctypes.c_uint32),
+        ('reserved_3', ctypes.c_uint32),
+        ('sig_data', ctypes.c_uint64),
+    ]
+
+
+class PerfCounterGroup:
+    """A perf_event counter group read atomically with one read() call"""
+
+    def __init__(self, events=None):
+        """Initialize counter group (counters are opened lazily)"""
+        self.requested_events = events
+        self.event_names = []
+        self.fds = []
+        self.mode = None
+        self.error = None
+        self.opened = False
+        self._read_size = 0
+
+    @staticmethod
+    def is_supported():
+        """Check whether perf_event_open can be attempted on this platform"""
+        return (platform_compat.is_linux and
+                platform.machine().lower() in PERF_EVENT_OPEN_SYSCALL)
+
+    def _perf_event_open(self, event_type, config, group_fd):
+        """Open a single counter, returning its file descriptor"""
+        attr = PerfEventAttr()
+        attr.type = event_type
+        attr.size = ctypes.sizeof(PerfEventAttr)
+        attr.config = config
+        attr.read_format = (PERF_FORMAT_GROUP |
+                            PERF_FORMAT_TOTAL_TIME_ENABLED |
+                            PERF_FORMAT_TOTAL_TIME_RUNNING)
+
+        flags = ATTR_FLAG_EXCLUDE_HV
+        if group_fd == -1:
+            # Only the leader starts disabled; members follow the leader
+            flags |= ATTR_FLAG_DISABLED
+        if not platform_compat.has_root_privileges():
+            # perf_event_paranoid >= 2 forbids kernel-side counting for users
+            flags |= ATTR_FLAG_EXCLUDE_KERNEL
+        attr.flags = flags
+
+        syscall_nr = PERF_EVENT_OPEN_SYSCALL[platform.machine().lower()]
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.syscall(ctypes.c_long(syscall_nr), ctypes.byref(attr),
+                          ctypes.c_int(0), ctypes.c_int(-1),
+                          ctypes.c_int(group_fd), ctypes.c_ulong(PERF_FLAG_FD_CLOEXEC))
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        return fd
+
+    def _open_group(self, events):
+        """Open events as one group; optional members that fail are skipped"""
+        leader_fd = -1
+        names = []
+        fds = []
+
+        try:
+            for name, event_type, config in events:
+                try:
+                    fd = self._perf_event_open(event_type, config, leader_fd)
+                except OSError:
+                    if leader_fd == -1:
+                        raise
+                    continue  # Member not supported by this PMU
+
+                if leader_fd == -1:
+                    leader_fd = fd
+                fds.append(fd)
+                names.append(name)
+        except OSError:
+            for fd in fds:
+                os.close(fd)
+            raise
+
+        return names, fds
+
+    @staticmethod
+    def _enable(leader_fd):
+        """Reset and start the whole group through its leader"""
+        import fcntl
+        fcntl.ioctl(leader_fd, PERF_EVENT_IOC_RESET, PERF_IOC_FLAG_GROUP)
+        fcntl.ioctl(leader_fd, PERF_EVENT_IOC_ENABLE, PERF_IOC_FLAG_GROUP)
+
+    def open(self):
+        """Open the counter group once; returns True if counters are live"""
+        if self.opened:
+            return True
+        if self.error:
+            return False
+
+        if not self.is_supported():
+            self.error = f'perf_event_open not supported on {platform_compat.system}'
+            return False
+
+        if self.requested_events is not None:
+            attempts = [('custom', self.requested_events)]
+        else:
+            attempts = [
+                ('hardware', HARDWARE_EVENTS + SOFTWARE_EVENTS),
+                ('software', SOFTWARE_EVENTS),
+            ]
+
+        last_error = None
+        for mode, events in attempts:
+            try:
+                names, fds = self._open_group(events)
+            except OSError as e:
+                last_error = e
+                continue
+
+            self.event_names = names
+            self.fds = fds
+            self.mode = mode
+            # nr, time_enabled, time_running, value per event
+            self._read_size = 8 * (3 + len(fds))
+
+            self._enable(fds[0])
+            self.opened = True
+            return True
+
+        if last_error is not None and last_error.errno in (errno.EACCES, errno.EPERM):
+            self.error = 'perf_event_open denied (check /proc/sys/kernel/perf_event_paranoid)'
+        else:
+            self.error = f'perf_event_open failed: {last_error}'
+        return False
+
+    def read(self):
+        """Read all counters with a single read() on the group leader
+
+        Returns a tuple of raw counts scaled for multiplexing,
+        or None when counters are unavailable.
+        """
+        if not self.opened and not self.open():
+            return None
+
+        data = os.read(self.fds[0], self._read_size)
+        values = struct.unpack(f'{len(data) // 8}Q', data)
+        nr, time_enabled, time_running = values[0], values[1], values[2]
+        counts = values[3:3 + nr]
+
+        if time_running and time_running < time_enabled:
+            # Group was multiplexed off the PMU for part of the time
+            scale = time_enabled / time_running
+            counts = tuple(int(c * scale) for c in counts)
+        return counts
+
+    def delta(self, before, after):
+        """Convert two read() snapshots into a dict of per-event deltas"""
+        if before is None or after is None:
+            return {}
+        return {name: after[i] - before[i] for i, name in enumerate(self.event_names)}
+
+    @staticmethod
+    def derive_metrics(counts):
+        """Compute IPC and miss rates from a counter delta dict"""
+        derived = {}
+
+        cycles = counts.get('cycles')
+        instructions = counts.get('instructions')
+        if cycles and instructions is not None:
+            derived['ipc'] = round(instructions / cycles, 3)
+
+        references = counts.get('cache_references')
+        misses = counts.get('cache_misses')
+        if references and misses is not None:
+            derived['cache_miss_rate'] = round(misses / references, 4)
+
+        branches = counts.get('branch_instructions')
+        branch_misses = counts.get('branch_misses')
+        if branches and branch_misses is not None:
+            derived['branch_miss_rate'] = round(branch_misses / branches, 4)
+
+        if instructions and misses is not None:
+            derived['cache_misses_per_kilo_instructions'] = round(misses * 1000 / instructions, 3)
+
+        return derived
+
+    @staticmethod
+    def accumulate(totals, delta):
+        """Add one delta() into running totals (memory stays constant)"""
+        for name, value in delta.items():
+            totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def summarize(self, totals, iterations):
+        """Summarize counter totals over `iterations` timed regions for results JSON"""
+        if not self.opened:
+            return {
+                'available': False,
+                'error': self.error or 'Counters not opened'
+            }
+
+        totals = {name: totals.get(name, 0) for name in self.event_names}
+        iterations = max(1, iterations)
+
+        return {
+            'available': True,
+            'mode': self.mode,
+            'events': list(self.event_names),
+            'iterations': iterations,
+            'totals': totals,
+            'mean_per_iteration': {name: round(total / iterations, 1)
+                                   for name, total in totals.items()},
+            'derived': self.derive_metrics(totals)
+        }
+
+    def close(self):
+        """Close all counter file descriptors"""
+        for fd in reversed(self.fds):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self.fds = []
+        self.event_names = []
+        self.opened = False
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
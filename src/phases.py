@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Benchmark Phase Scheduling
+==========================
+
+This module runs the benchmark as a DAG of named phases and checkpoints
+every phase's output as soon as it completes, so an interrupted or
+failed run can be resumed instead of started over.
+
+Features:
+---------
+- Named phases with declared dependencies (dependency-ordered execution)
+- --only / --skip selection (--only pulls in dependencies automatically)
+- Per-phase output persisted atomically under <checkpoint_dir>/<run_id>/
+- Resume from the last completed phase; failed phases are retried
+- Phases that hold process state (RT environment) re-run on resume
+- Optional deadline: phases that no longer fit are skipped, not overrun
+- Cooperative cancellation between phases
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+
+DEFAULT_CHECKPOINT_DIR = 'rtos_runs'
+STATE_FILE = 'state.json'
+
+
+def _atomic_write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class Phase:
+    """One named benchmark phase
+
+    ``run(results, config)`` returns a dict merged into the results.
+    ``enabled(config)`` decides whether the phase applies to this run.
+    ``unit_key`` names the config key the phase's cost scales with and
+    ``measure(output, config)`` the units it actually used (recorded so
+    later runs can learn the phase's cost).
+    """
+
+    def __init__(self, name, run, depends_on=(), description='', enabled=None, rerun_on_resume=False,
+                 unit_key=None, measure=None):
+        self.name = name
+        self.run = run
+        self.depends_on = tuple(depends_on)
+        self.description = description or name
+        self.enabled = enabled or (lambda config: True)
+        self.rerun_on_resume = rerun_on_resume
+        self.unit_key = unit_key
+        self.measure = measure or (lambda output, config: config.get(unit_key) if unit_key else None)
+
+
+class RunCheckpoint:
+    """On-disk state of one benchmark run"""
+
+    def __init__(self, run_dir, state):
+        self.run_dir = run_dir
+        self.state = state
+
+    @property
+    def run_id(self):
+        return self.state['run_id']
+
+    @classmethod
+    def create(cls, config, checkpoint_dir=DEFAULT_CHECKPOINT_DIR):
+        """Start a new run directory"""
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        run_dir = os.path.join(checkpoint_dir, run_id)
+        os.makedirs(run_dir, exist_ok=True)
+        checkpoint = cls(run_dir, {
+            'run_id': run_id,
+            'created': datetime.now().isoformat(),
+            'config': config,
+            'phases': {},
+            'status': 'running'
+        })
+        checkpoint.save()
+        return checkpoint
+
+    @classmethod
+    def load(cls, run_id, checkpoint_dir=DEFAULT_CHECKPOINT_DIR):
+        """Open an existing run (raises FileNotFoundError if unknown)"""
+        run_dir = os.path.join(checkpoint_dir, run_id)
+        with open(os.path.join(run_dir, STATE_FILE), 'r') as f:
+            return cls(run_dir, json.load(f))
+
+    def save(self):
+        _atomic_write_json(os.path.join(self.run_dir, STATE_FILE), self.state)
+
+    def phase_status(self, name):
+        return self.state['phases'].get(name, {}).get('status')
+
+    def record(self, name, status, output=None, error=None, duration=None, units=None):
+        """Persist a phase outcome (and its output, if completed)"""
+        if output is not None:
+            _atomic_write_json(os.path.join(self.run_dir, f"phase_{name}.json"), output)
+        self.state['phases'][name] = {
+            'status': status,
+            'finished': datetime.now().isoformat(),
+            'duration_s': round(duration, 3) if duration is not None else None,
+            'units': units,
+            'error': error
+        }
+        self.save()
+
+    def load_output(self, name):
+        path = os.path.join(self.run_dir, f"phase_{name}.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def finish(self, status, results_file=None):
+        self.state['status'] = status
+        if results_file:
+            self.state['results_file'] = results_file
+        self.save()
+
+
+class PhaseScheduler:
+    """Dependency-ordered phase runner with checkpointing"""
+
+    def __init__(self, phases):
+        """Register phases (declaration order breaks ordering ties)"""
+        self.phases = {phase.name: phase for phase in phases}
+        for phase in phases:
+            unknown = [dep for dep in phase.depends_on if dep not in self.phases]
+            if unknown:
+                raise ValueError(f"Phase {phase.name} depends on unknown phase(s): {', '.join(unknown)}")
+        self.order = self._topological_order(phases)
+
+    @staticmethod
+    def _topological_order(phases):
+        remaining = list(phases)
+        done, order = set(), []
+        while remaining:
+            ready = [p for p in remaining if all(dep in done for dep in p.depends_on)]
+            if not ready:
+                raise ValueError('Phase dependencies contain a cycle: ' +
+                                 ', '.join(p.name for p in remaining))
+            for phase in ready:
+                order.append(phase.name)
+                done.add(phase.name)
+            remaining = [p for p in remaining if p.name not in done]
+        return order
+
+    def _dependencies_of(self, name):
+        found = set()
+        stack = list(self.phases[name].depends_on)
+        while stack:
+            dep = stack.pop()
+            if dep not in found:
+                found.add(dep)
+                stack.extend(self.phases[dep].depends_on)
+        return found
+
+    def select(self, only=None, skip=None):
+        """Names of phases to run, in execution order
+
+        ``only`` implicitly adds the dependencies of the chosen phases.
+        """
+        for name in list(only or []) + list(skip or []):
+            if name not in self.phases:
+                raise ValueError(f"Unknown phase '{name}' (known: {', '.join(self.order)})")
+
+        selected = set(self.order)
+        if only:
+            selected = set(only)
+            for name in only:
+                selected |= self._dependencies_of(name)
+        selected -= set(skip or [])
+        return [name for name in self.order if name in selected]
+
+    def run(self, results, config, checkpoint, only=None, skip=None, on_phase_complete=None,
+            show_progress=True, deadline=None, min_cost=None, stop_event=None):
+        """Run the selected phases, skipping ones already completed
+
+        A phase whose dependency did not complete is skipped. With a
+        ``deadline`` (time.time() value), a phase whose ``min_cost(name)``
+        seconds no longer fit is skipped as 'skipped_budget' (and retried
+        on resume). Setting ``stop_event`` cancels the phases that have not
+        started yet. Returns a {phase: status} summary.
+        """
+        summary = {}
+        for name in self.select(only, skip):
+            phase = self.phases[name]
+            previous = checkpoint.phase_status(name)
+
+            if previous in ('completed', 'not_applicable') and not phase.rerun_on_resume:
+                results.update(checkpoint.load_output(name))
+                summary[name] = 'restored'
+                if show_progress:
+                    print(f"⏩ {phase.description}: restored from checkpoint")
+                continue
+
+            blocked = [dep for dep in phase.depends_on
+                       if checkpoint.phase_status(dep) not in ('completed', 'not_applicable')]
+            if blocked:
+                summary[name] = 'blocked'
+                checkpoint.record(name, 'blocked', error=f"dependencies not completed: {', '.join(blocked)}")
+                if show_progress:
+                    print(f"⏭️  {phase.description}: skipped (needs {', '.join(blocked)})")
+                continue
+
+            if not phase.enabled(config):
+                summary[name] = 'not_applicable'
+                checkpoint.record(name, 'not_applicable', output={})
+                continue
+
+            if stop_event is not None and stop_event.is_set():
+                summary[name] = 'cancelled'
+                checkpoint.record(name, 'cancelled', error='run stopped')
+                continue
+
+            if deadline and min_cost and time.time() + min_cost(name) > deadline:
+                summary[name] = 'skipped_budget'
+                checkpoint.record(name, 'skipped_budget', error='time budget exhausted')
+                if show_progress:
+                    print(f"⏭️  {phase.description}: skipped (time budget exhausted)")
+                continue
+
+            start = time.time()
+            try:
+                output = phase.run(results, config) or {}
+            except Exception as e:
+                summary[name] = 'failed'
+                checkpoint.record(name, 'failed', error=str(e), duration=time.time() - start)
+                print(f"❌ {phase.description} failed: {e}")
+                continue
+
+            results.update(output)
+            checkpoint.record(name, 'completed', output=output, duration=time.time() - start,
+                              units=phase.measure(output, config))
+            summary[name] = 'completed'
+            if on_phase_complete:
+                on_phase_complete(name)
+        return summary
@@ -18,158 +18,73 @@ Author: RTOS Benchmark Suite Team
 """
 
 import os
-import platform
-import subprocess
 import sys
-import multiprocessing
 
 
 class PlatformCompat:
-    """Cross-platform compatibility utilities for RTOS benchmarking"""
+    """Cross-platform compatibility utilities for RTOS benchmarking
+    
+    Probing is deferred: nothing is detected at import time, and each
+    probe (OS family, cyclictest, RT capabilities) runs once on first use.
+    """
     
     def __init__(self):
         """Initialize platform compatibility layer"""
-        self.system = platform.system().lower()
-        self.is_linux = self.system == 'linux'
-        self.is_windows = self.system == 'windows'
-        self.is_macos = self.system == 'darwin'
-        self.is_unix = self.is_linux or self.is_macos
-        
-    def get_system_info(self):
-        """Get comprehensive system information across platforms"""
-        system_info = {}
-        
-        # Operating System Information
-        try:
-            if self.is_unix:
-                # Unix/Linux: use uname -a
-                result = subprocess.run(['uname', '-a'], capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    system_info['os_info'] = result.stdout.strip()
-                    system_info['uname'] = result.stdout.strip()
-                else:
-                    system_info['os_info'] = f'{platform.system()} {platform.release()}'
-                    system_info['uname'] = f'{platform.system()} {platform.release()}'
-            else:
-                # Windows: use platform module
-                os_info = f'{platform.system()} {platform.release()} {platform.version()}'
-                system_info['os_info'] = os_info
-                system_info['uname'] = f'{os_info} {platform.machine()}'
-        except Exception as e:
-            system_info['os_info'] = f'{platform.system()} {platform.release()}'
-            system_info['uname'] = f'System info unavailable: {str(e)}'
-        
-        # CPU Information
-        try:
-            if self.is_linux:
-                # Try to get CPU info from /proc/cpuinfo
-                try:
-                    with open('/proc/cpuinfo', 'r') as f:
-                        cpuinfo = f.read()
-                        cpu_model = None
-                        hardware = None
-                        
-                        for line in cpuinfo.split('\n'):
-                            if line.startswith('model name'):
-                                cpu_model = line.split(':')[1].strip()
-                                break
-                            elif line.startswith('Hardware'):
-                                hardware = line.split(':')[1].strip()
-                            elif line.startswith('Model'):
-                                cpu_model = line.split(':')[1].strip()
-                        
-                        if cpu_model:
-                            system_info['cpu_info'] = cpu_model
-                        elif hardware:
-                            system_info['cpu_info'] = f"{hardware} ({platform.machine()})"
-                        else:
-                            system_info['cpu_info'] = f"{platform.machine()} ({multiprocessing.cpu_count()} cores)"
-                except:
-                    system_info['cpu_info'] = f"{platform.machine()} ({multiprocessing.cpu_count()} cores)"
-            else:
-                system_info['cpu_info'] = platform.processor() or platform.machine()
-            
-            if not system_info.get('cpu_info') or system_info['cpu_info'] == '':
-                system_info['cpu_info'] = f"{platform.machine()} ({multiprocessing.cpu_count()} cores)"
-        except:
-            system_info['cpu_info'] = 'Unknown CPU'
-        
-        # Memory Information
-        try:
-            if self.is_linux:
-                # Read from /proc/meminfo
-                with open('/proc/meminfo', 'r') as f:
-                    meminfo = f.read()
-                    for line in meminfo.split('\n'):
-                        if line.startswith('MemTotal:'):
-                            mem_kb = int(line.split()[1])
-                            system_info['memory_gb'] = round(mem_kb / 1024 / 1024, 1)
-                            break
-                    else:
-                        system_info['memory_gb'] = 'Unknown'
-            elif self.is_windows:
-                # Windows: try to get memory info
-                try:
-                    import ctypes
-                    kernel32 = ctypes.windll.kernel32
-                    c_ulong = ctypes.c_ulong
-                    class MEMORYSTATUSEX(ctypes.Structure):
-                        _fields_ = [
-                            ('dwLength', c_ulong),
-                            ('dwMemoryLoad', c_ulong),
-                            ('ullTotalPhys', ctypes.c_ulonglong),
-                            ('ullAvailPhys', ctypes.c_ulonglong),
-                            ('ullTotalPageFile', ctypes.c_ulonglong),
-                            ('ullAvailPageFile', ctypes.c_ulonglong),
-                            ('ullTotalVirtual', ctypes.c_ulonglong),
-                            ('ullAvailVirtual', ctypes.c_ulonglong),
-                            ('sullAvailExtendedVirtual', ctypes.c_ulonglong),
-                        ]
-                    
-                    memoryStatus = MEMORYSTATUSEX()
-                    memoryStatus.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
-                    kernel32.GlobalMemoryStatusEx(ctypes.byref(memoryStatus))
-                    system_info['memory_gb'] = round(memoryStatus.ullTotalPhys / 1024 / 1024 / 1024, 1)
-                except:
-                    system_info['memory_gb'] = 'Unknown'
-            else:
-                # macOS and others
-                system_info['memory_gb'] = 'Unknown'
-        except:
-            system_info['memory_gb'] = 'Unknown'
+        self._system = None
+        self._probe_cache = {}
+    
+    def _cached_probe(self, name, probe):
+        """Run a capability probe once and cache its result"""
+        if name not in self._probe_cache:
+            self._probe_cache[name] = probe()
+        return self._probe_cache[name]
+    
+    @property
+    def system(self):
+        """Lower-case OS name ('linux', 'darwin', 'windows', ...)"""
+        if self._system is None:
+            import platform
+            self._system = platform.system().lower()
+        return self._system
+    
+    @property
+    def is_linux(self):
+        return self.system == 'linux'
+    
+    @property
+    def is_windows(self):
+        return self.system == 'windows'
+    
+    @property
+    def is_macos(self):
+        return self.system == 'darwin'
+    
+    @property
+    def is_unix(self):
+        return self.is_linux or self.is_macos
         
-        # Cross-platform system details
-        try:
-            system_info['platform'] = platform.platform()
-            system_info['architecture'] = platform.architecture()[0]
-            system_info['processor'] = platform.processor() or platform.machine()
-        except:
-            pass
+    def get_system_fingerprint(self, refresh=False):
+        """Get the cached, immutable SystemFingerprint for this machine
         
-        # Python and CPU info
-        try:
-            system_info['python_version'] = sys.version
-        except:
-            system_info['python_version'] = 'Unknown'
+        The fingerprint is collected once per process; pass refresh=True
+        to re-read the system (e.g. after a kernel parameter change).
+        """
+        if refresh:
+            self._probe_cache.pop('fingerprint', None)
         
-        try:
-            system_info['cpu_count'] = multiprocessing.cpu_count()
-        except:
-            system_info['cpu_count'] = 'Unknown'
+        def collect():
+            from .system_fingerprint import SystemFingerprint
+            return SystemFingerprint.collect(self)
         
-        # RT kernel capability check (Linux only)
-        if self.is_linux:
-            try:
-                # Check for RT kernel features
-                with open('/proc/version', 'r') as f:
-                    version = f.read().lower()
-                    system_info['rt_kernel_capable'] = 'rt' in version or 'preempt' in version
-            except:
-                system_info['rt_kernel_capable'] = False
-        else:
-            system_info['rt_kernel_capable'] = False
+        return self._cached_probe('fingerprint', collect)
+    
+    def get_system_info(self):
+        """Get comprehensive system information across platforms
         
-        return system_info
+        Returns an independent dict copy of the cached fingerprint, so
+        callers may annotate it freely.
+        """
+        return self.get_system_fingerprint().to_dict()
     
     def get_cpu_temperature(self):
         """Get CPU temperature with platform-specific methods"""
@@ -189,6 +104,7 @@ class PlatformCompat:
             return None
         elif self.is_macos:
             # macOS: try using system_profiler or sensors (if available)
+            import subprocess
             try:
                 # Try powermetrics (requires sudo)
                 result = subprocess.run(['sudo', 'powermetrics', '-s', 'smc', '-n', '1', '--samplers', 'smc'],
@@ -207,9 +123,19 @@ class PlatformCompat:
             # Windows: temperature monitoring is complex, return None
             # Could potentially use WMI or other Windows APIs
             return None
-        
+
         return None
-    
+
+    def get_cpu_frequency_mhz(self, cpu=0):
+        """Current CPU clock in MHz (Linux cpufreq only)"""
+        if not self.is_linux:
+            return None
+        try:
+            with open(f'/sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_cur_freq', 'r') as f:
+                return int(f.read().strip()) / 1000.0
+        except (OSError, ValueError):
+            return None
+
     def sync_filesystem(self):
         """Sync filesystem buffers across platforms"""
         try:
@@ -257,6 +183,8 @@ class PlatformCompat:
         if not self.has_root_privileges():
             return False  # Need root permissions
         
+        import subprocess
+        
         try:
             # Method 1: Try using subprocess with proper shell execution
             result = subprocess.run(['sh', '-c', 'echo 3 > /proc/sys/vm/drop_caches'], 
@@ -284,6 +212,9 @@ class PlatformCompat:
     
     def has_rt_capabilities(self):
         """Check if system supports real-time scheduling"""
+        return self._cached_probe('rt_capabilities', self._probe_rt_capabilities)
+    
+    def _probe_rt_capabilities(self):
         if not self.is_unix:
             return False
         
@@ -296,6 +227,16 @@ class PlatformCompat:
     
     def has_cyclictest(self):
         """Check if cyclictest is available"""
+        return self._cached_probe('cyclictest', self._probe_cyclictest)
+    
+    def _probe_cyclictest(self):
+        import shutil
+        import subprocess
+        
+        # Skip spawning a process when the binary is not on PATH at all
+        if shutil.which('cyclictest') is None:
+            return False
+        
         try:
             result = subprocess.run(['cyclictest', '--help'], 
                                   capture_output=True, text=True, timeout=5)
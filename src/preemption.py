@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Kernel Preemption Model Detection
+=================================
+
+This module determines which preemption model the running kernel uses,
+instead of guessing from substrings of /proc/version.
+
+Models:
+-------
+- rt:        PREEMPT_RT (fully preemptible kernel, threaded IRQs)
+- full:      CONFIG_PREEMPT / preempt=full (low-latency desktop)
+- voluntary: CONFIG_PREEMPT_VOLUNTARY / preempt=voluntary
+- none:      CONFIG_PREEMPT_NONE / preempt=none (server)
+- unknown:   not enough evidence (e.g. non-Linux systems)
+
+Evidence, strongest first:
+--------------------------
+1. /sys/kernel/realtime (present and "1" only on PREEMPT_RT kernels)
+2. Kernel config (/proc/config.gz or /boot/config-*)
+3. PREEMPT_DYNAMIC runtime mode (debugfs sched/preempt, then preempt= on cmdline)
+4. Preemption tag in ``uname -v`` (PREEMPT_RT / PREEMPT_DYNAMIC / PREEMPT)
+
+Author: RTOS Benchmark Suite Team
+"""
+
+PREEMPTION_MODELS = ('rt', 'full', 'voluntary', 'none', 'unknown')
+
+# Composite-score system bonus per model (replaces the flat +20 RT bonus)
+PREEMPTION_SCORE_BONUS = {
+    'rt': 20,
+    'full': 10,
+    'voluntary': 5,
+    'none': 0,
+    'unknown': 0,
+}
+
+DEBUGFS_PREEMPT_PATH = '/sys/kernel/debug/sched/preempt'
+REALTIME_SYSFS_PATH = '/sys/kernel/realtime'
+
+
+def _read_text(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def parse_uname_preemption(version):
+    """Classify a ``uname -v`` string by its preemption tag
+
+    Returns (model, dynamic). Tags are matched as whole words, so build
+    strings such as "+rpt-rpi-2712" never count as RT.
+    """
+    tokens = (version or '').split()
+    if 'PREEMPT_RT' in tokens:
+        return 'rt', False
+    if 'PREEMPT_DYNAMIC' in tokens:
+        return 'unknown', True
+    if 'PREEMPT' in tokens or 'PREEMPT_LAZY' in tokens:
+        return 'full', False
+    if version:
+        # No tag: CONFIG_PREEMPT_NONE or CONFIG_PREEMPT_VOLUNTARY
+        return 'none', False
+    return 'unknown', False
+
+
+def parse_dynamic_preempt(text):
+    """Parse debugfs sched/preempt, e.g. "none voluntary (full) lazy" """
+    for token in (text or '').split():
+        if token.startswith('(') and token.endswith(')'):
+            mode = token[1:-1]
+            return 'full' if mode == 'lazy' else mode
+    return None
+
+
+def parse_cmdline_preempt(cmdline):
+    """Return the preempt= boot parameter, if any"""
+    for token in (cmdline or '').split():
+        if token.startswith('preempt='):
+            mode = token.split('=', 1)[1]
+            if mode == 'lazy':
+                return 'full'
+            if mode in ('none', 'voluntary', 'full'):
+                return mode
+    return None
+
+
+def _config_model(options):
+    """Static preemption model selected in the kernel config"""
+    if options.get('CONFIG_PREEMPT_RT') == 'y':
+        return 'rt'
+    if options.get('CONFIG_PREEMPT') == 'y' or options.get('CONFIG_PREEMPT_LAZY') == 'y':
+        return 'full'
+    if options.get('CONFIG_PREEMPT_VOLUNTARY') == 'y':
+        return 'voluntary'
+    if options.get('CONFIG_PREEMPT_NONE') == 'y':
+        return 'none'
+    return None
+
+
+def detect_preemption_model(kernel_version=None, kernel_config_options=None, cmdline=None,
+                            realtime_flag=None, dynamic_preempt=None):
+    """Combine all available evidence into a preemption model report
+
+    Every argument is optional; missing sysfs/debugfs values are read
+    from the running system.
+    """
+    options = kernel_config_options or {}
+    if realtime_flag is None:
+        realtime_flag = _read_text(REALTIME_SYSFS_PATH)
+    if dynamic_preempt is None:
+        dynamic_preempt = _read_text(DEBUGFS_PREEMPT_PATH)
+
+    uname_model, uname_dynamic = parse_uname_preemption(kernel_version)
+    config_model = _config_model(options)
+    dynamic = options.get('CONFIG_PREEMPT_DYNAMIC') == 'y' or uname_dynamic
+
+    evidence = {
+        'sys_kernel_realtime': realtime_flag,
+        'kernel_config': config_model,
+        'uname_tag': uname_model,
+        'dynamic_runtime': parse_dynamic_preempt(dynamic_preempt),
+        'cmdline_preempt': parse_cmdline_preempt(cmdline),
+    }
+
+    if realtime_flag == '1':
+        model, source = 'rt', REALTIME_SYSFS_PATH
+    elif config_model == 'rt':
+        model, source = 'rt', 'kernel_config'
+    elif uname_model == 'rt':
+        model, source = 'rt', 'uname'
+    elif dynamic and evidence['dynamic_runtime']:
+        model, source = evidence['dynamic_runtime'], DEBUGFS_PREEMPT_PATH
+    elif dynamic and evidence['cmdline_preempt']:
+        model, source = evidence['cmdline_preempt'], 'cmdline'
+    elif config_model:
+        # With PREEMPT_DYNAMIC this is the boot default
+        model, source = config_model, 'kernel_config'
+    else:
+        model, source = uname_model, 'uname'
+
+    return {
+        'model': model,
+        'source': source,
+        'dynamic': dynamic,
+        'evidence': evidence
+    }
+
+
+def preemption_model_of(results):
+    """Preemption model recorded in a results dict
+
+    Results saved before detection existed fall back to the uname tag
+    stored in their system_info.
+    """
+    system_info = results.get('system_info', {}) or {}
+    model = system_info.get('preemption_model')
+    if model in PREEMPTION_MODELS:
+        return model
+
+    version = system_info.get('kernel_version')
+    if not version:
+        # "Linux host 6.15.11-v8-16k+ #1 SMP PREEMPT_RT Sun Sep 28 ..." -> drop sysname/host/release
+        uname = system_info.get('uname') or system_info.get('os_info') or ''
+        version = ' '.join(uname.split()[3:])
+    return parse_uname_preemption(version)[0]
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Cross-Profile Comparison Matrix
+===============================
+
+This module scans the per-profile result snapshots under system-tests/
+and builds a metric-by-profile comparison matrix, replacing the hand
+assembled summary tables.
+
+Features:
+---------
+- Groups runs by profile (file name prefix, as in the results store) and
+  board+kernel fingerprint
+- min / median / max per metric across runs
+- Latency, jitter, algorithm times, stress throughput and composite score
+- Markdown and CSV output
+- Streams over the files one at a time (only scalar metrics are kept)
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import csv
+import glob
+import json
+import os
+import statistics
+
+from .results_store import RESULTS_FILE_PATTERN, extract_run_row, profile_from_path
+
+# (key, label) in display order; algorithm rows are appended per algorithm
+MATRIX_METRICS = (
+    ('min_latency_us', 'Min latency (μs)'),
+    ('avg_latency_us', 'Avg latency (μs)'),
+    ('max_latency_us', 'Max latency (μs)'),
+    ('jitter_us', 'Jitter (μs)'),
+    ('p99_latency_us', 'P99 latency (μs)'),
+    ('stress_ops_per_core', 'Stress ops/core'),
+    ('stress_total_ops', 'Stress total ops'),
+    ('composite_score', 'Composite score'),
+)
+
+CSV_FIELDS = ('profile', 'fingerprint', 'kernel_release', 'metric', 'runs', 'min', 'median', 'max')
+
+
+def iter_result_files(root):
+    """Yield (profile, path) for every snapshot under root/*/
+
+    The profile comes from the file name, as in the results store.
+    """
+    for profile_dir in sorted(glob.glob(os.path.join(root, '*'))):
+        if not os.path.isdir(profile_dir):
+            continue
+        for path in sorted(glob.glob(os.path.join(profile_dir, RESULTS_FILE_PATTERN))):
+            yield profile_from_path(path), path
+
+
+def run_metrics(results, path):
+    """Scalar metrics of one run (everything else in the file is dropped)"""
+    row = extract_run_row(results, path)
+    metrics = {key: row.get(key) for key, _ in MATRIX_METRICS if row.get(key) is not None}
+
+    total_ops = (results.get('multicore_stress') or {}).get('total_operations')
+    if isinstance(total_ops, (int, float)):
+        metrics['stress_total_ops'] = total_ops
+
+    for name, data in (results.get('algorithm_results') or {}).items():
+        if isinstance(data, dict) and isinstance(data.get('execution_time_ms'), (int, float)):
+            metrics[f'algorithm:{name}'] = data['execution_time_ms']
+    return row, metrics
+
+
+def build_matrix(root):
+    """Aggregate all snapshots under root into per-group statistics
+
+    Returns a list of groups, each {'profile', 'fingerprint',
+    'kernel_release', 'runs', 'metrics': {metric: {min, median, max, n}}}.
+    """
+    groups = {}
+    for profile, path in iter_result_files(root):
+        try:
+            with open(path, 'r') as f:
+                results = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Skipping {path}: {e}")
+            continue
+
+        row, metrics = run_metrics(results, path)
+        del results  # Keep only the scalars while streaming
+
+        group = groups.setdefault((profile, row['fingerprint']), {
+            'profile': profile,
+            'fingerprint': row['fingerprint'],
+            'kernel_release': row['kernel_release'],
+            'runs': 0,
+            'samples': {}
+        })
+        group['runs'] += 1
+        for key, value in metrics.items():
+            group['samples'].setdefault(key, []).append(value)
+
+    matrix = []
+    for group in groups.values():
+        samples = group.pop('samples')
+        group['metrics'] = {
+            key: {'min': min(values), 'median': statistics.median(values),
+                  'max': max(values), 'n': len(values)}
+            for key, values in samples.items()
+        }
+        matrix.append(group)
+    return matrix
+
+
+def _metric_rows(matrix):
+    algorithms = sorted({key for group in matrix for key in group['metrics'] if key.startswith('algorithm:')})
+    rows = list(MATRIX_METRICS)
+    rows += [(key, f"{key.split(':', 1)[1]} (ms)") for key in algorithms]
+    return [(key, label) for key, label in rows if any(key in group['metrics'] for group in matrix)]
+
+
+def _format_value(value):
+    if isinstance(value, float) and not value.is_integer():
+        return f"{value:,.3f}" if abs(value) < 1000 else f"{value:,.0f}"
+    return f"{int(value):,}"
+
+
+def _format_cell(stats):
+    if not stats:
+        return "—"
+    if stats['n'] == 1 or stats['min'] == stats['max']:
+        return _format_value(stats['median'])
+    return f"{_format_value(stats['median'])} ({_format_value(stats['min'])}–{_format_value(stats['max'])})"
+
+
+def render_markdown(matrix, title="Cross-Profile Comparison Matrix"):
+    """Markdown table: one row per metric, one column per group"""
+    lines = [f"# {title}", ""]
+    lines.append("Cells show median (min–max) across runs. Generated from the JSON snapshots "
+                 "by `python main.py --matrix`.")
+    lines.append("")
+
+    for group in matrix:
+        lines.append(f"- **{group['profile']}** `{group['fingerprint']}`: "
+                     f"kernel {group['kernel_release'] or 'unknown'}, {group['runs']} run(s)")
+    lines.append("")
+
+    header = "| Metric | " + " | ".join(f"{g['profile']} ({g['fingerprint'][:8]})" for g in matrix) + " |"
+    lines.append(header)
+    lines.append("|---|" + "---:|" * len(matrix))
+    for key, label in _metric_rows(matrix):
+        cells = [_format_cell(group['metrics'].get(key)) for group in matrix]
+        lines.append(f"| {label} | " + " | ".join(cells) + " |")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def write_csv(matrix, path):
+    """Long-format CSV: one row per group and metric"""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for group in matrix:
+            for key, _ in _metric_rows(matrix):
+                stats = group['metrics'].get(key)
+                if not stats:
+                    continue
+                writer.writerow({
+                    'profile': group['profile'],
+                    'fingerprint': group['fingerprint'],
+                    'kernel_release': group['kernel_release'],
+                    'metric': key,
+                    'runs': stats['n'],
+                    'min': stats['min'],
+                    'median': stats['median'],
+                    'max': stats['max'],
+                })
+
+
+def generate_matrix_report(root='system-tests', output_prefix=None):
+    """Scan root, then write <prefix>.md and <prefix>.csv
+
+    Returns {'success', 'groups', 'markdown_path', 'csv_path'}.
+    """
+    try:
+        matrix = build_matrix(root)
+        if not matrix:
+            return {'success': False, 'error': f'No result files found under {root}/*/'}
+
+        output_prefix = output_prefix or os.path.join(root, 'RESULTS_MATRIX')
+        markdown_path = f"{output_prefix}.md"
+        csv_path = f"{output_prefix}.csv"
+        with open(markdown_path, 'w') as f:
+            f.write(render_markdown(matrix))
+        write_csv(matrix, csv_path)
+
+        return {
+            'success': True,
+            'groups': len(matrix),
+            'markdown_path': markdown_path,
+            'csv_path': csv_path
+        }
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
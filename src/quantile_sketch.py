@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Mergeable Quantile Sketch
+=========================
+
+This module provides a pure-Python DDSketch: a bounded-memory summary of
+a latency or timing series whose quantiles carry a guaranteed relative
+error, and which can be merged across snapshots, runs and boards.
+
+Features:
+---------
+- Quantiles within ±relative_accuracy of the true value (default 1%)
+- Logarithmic buckets, so memory grows with log(max/min), not samples
+- Exact count, sum, min, max, mean and standard deviation
+- Lossless merge of sketches built with the same accuracy
+- Compact JSON serialisation for results files and the results store
+- Optional bucket cap that collapses the lowest buckets first, keeping
+  the tail (p99, p99.9) accurate
+- LatencyRecorder: histogram + sketch summaries shaped like cyclictest
+  results, shared by the latency workloads
+
+Usage:
+------
+    sketch = DDSketch()
+    sketch.update(times_ms)
+    sketch.percentiles((50, 99, 99.9))   # {'p50': ..., 'p99': ..., 'p99.9': ...}
+    results['timing_sketch'] = sketch.to_dict()
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import math
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+# 1% accuracy covers 1ns..1000s in about 2100 buckets
+DEFAULT_MAX_BUCKETS = 2048
+SKETCH_TYPE = 'ddsketch'
+
+
+class DDSketch:
+    """Relative-error quantile sketch for non-negative values"""
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY, max_buckets=DEFAULT_MAX_BUCKETS):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError('relative_accuracy must be between 0 and 1')
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, index):
+        # Bucket midpoint (in relative terms), within relative_accuracy of any value in it
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value, count=1):
+        """Record value (latencies and timings are >= 0; values <= 0 count as zero)"""
+        if count <= 0:
+            return self
+        if value > 0:
+            index = self._index(value)
+            self.bins[index] = self.bins.get(index, 0) + count
+            if len(self.bins) > self.max_buckets:
+                self._collapse()
+        else:
+            self.zero_count += count
+        self.count += count
+        self.sum += value * count
+        self.sum_sq += value * value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        return self
+
+    def update(self, values):
+        """Record every value of an iterable"""
+        for value in values:
+            self.add(value)
+        return self
+
+    def _collapse(self):
+        """Fold the lowest buckets together until the cap holds"""
+        indexes = sorted(self.bins)
+        excess = indexes[:len(indexes) - self.max_buckets + 1]
+        target = excess[-1]
+        self.bins[target] = sum(self.bins.pop(index) for index in excess[:-1]) + self.bins[target]
+
+    def merge(self, other):
+        """Add another sketch (same relative accuracy) into this one"""
+        if other.count == 0:
+            return self
+        if not math.isclose(other.relative_accuracy, self.relative_accuracy):
+            raise ValueError('Cannot merge sketches with different relative accuracy')
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        if len(self.bins) > self.max_buckets:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.sum_sq += other.sum_sq
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """Value at quantile q (0..1), or None for an empty sketch"""
+        if self.count == 0:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError('q must be between 0 and 1')
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return max(self.min, 0)
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    def percentiles(self, percentiles=(50, 99, 99.9), digits=3):
+        """{'p50': value, ...} in the style of histogram_percentiles()"""
+        if self.count == 0:
+            return {}
+        return {f"p{percentile:g}": round(self.quantile(percentile / 100), digits)
+                for percentile in percentiles}
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    @property
+    def stdev(self):
+        """Sample standard deviation (0 for fewer than two values)"""
+        if self.count < 2:
+            return 0
+        variance = (self.sum_sq - self.sum * self.sum / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def summary(self, percentiles=(50, 90, 99, 99.9), digits=3):
+        """count/min/max/mean/stdev plus percentiles, for reports"""
+        if self.count == 0:
+            return {'count': 0}
+        summary = {
+            'count': self.count,
+            'min': round(self.min, digits),
+            'max': round(self.max, digits),
+            'mean': round(self.mean, digits),
+            'stdev': round(self.stdev, digits),
+        }
+        summary.update(self.percentiles(percentiles, digits))
+        return summary
+
+    def to_dict(self):
+        """JSON-safe form (bucket indexes as string keys)"""
+        return {
+            'type': SKETCH_TYPE,
+            'relative_accuracy': self.relative_accuracy,
+            'count': self.count,
+            'sum': self.sum,
+            'sum_sq': self.sum_sq,
+            'min': self.min,
+            'max': self.max,
+            'zero_count': self.zero_count,
+            'bins': {str(index): count for index, count in sorted(self.bins.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data, max_buckets=DEFAULT_MAX_BUCKETS):
+        """Rebuild a sketch written by to_dict()"""
+        if not isinstance(data, dict) or data.get('type') != SKETCH_TYPE:
+            raise ValueError('Not a serialised DDSketch')
+        sketch = cls(data['relative_accuracy'], max_buckets)
+        sketch.bins = {int(index): count for index, count in data.get('bins', {}).items()}
+        sketch.zero_count = data.get('zero_count', 0)
+        sketch.count = data.get('count', 0)
+        sketch.sum = data.get('sum', 0.0)
+        sketch.sum_sq = data.get('sum_sq', 0.0)
+        sketch.min = data.get('min')
+        sketch.max = data.get('max')
+        return sketch
+
+    @classmethod
+    def from_histogram(cls, histogram, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        """Sketch of a {value: count} histogram (e.g. cyclictest -h buckets)"""
+        sketch = cls(relative_accuracy)
+        for value, count in histogram.items():
+            sketch.add(float(value), count)
+        return sketch
+
+
+def sketch_of(data):
+    """DDSketch from a serialised sketch, a histogram or a list of samples
+
+    Returns None when data holds none of these.
+    """
+    if isinstance(data, DDSketch):
+        return data
+    if isinstance(data, dict):
+        if data.get('type') == SKETCH_TYPE:
+            return DDSketch.from_dict(data)
+        if data and all(isinstance(count, (int, float)) for count in data.values()):
+            return DDSketch.from_histogram(data)
+        return None
+    if isinstance(data, (list, tuple)):
+        values = [value for value in data if isinstance(value, (int, float)) and not isinstance(value, bool)]
+        return DDSketch().update(values) if values else None
+    return None
+
+
+def merge_sketches(items):
+    """Merge sketches/histograms/sample lists into one DDSketch (None if empty)"""
+    merged = None
+    for item in items:
+        sketch = sketch_of(item)
+        if sketch is None:
+            continue
+        if merged is None:
+            merged = DDSketch(sketch.relative_accuracy)
+        merged.merge(sketch)
+    return merged
+
+
+class LatencyRecorder:
+    """Latency samples kept as a {us: count} histogram and a DDSketch
+
+    summary() has the same keys as cyclictest results, so workload
+    latencies go through the same reporting, scoring and store paths.
+    """
+
+    def __init__(self):
+        self.histogram = {}
+        self.sketch = DDSketch()
+
+    def add_ns(self, latency_ns):
+        """Record one latency in nanoseconds"""
+        latency_us = latency_ns / 1000
+        self.sketch.add(latency_us)
+        bucket = int(latency_us)
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def merge(self, other):
+        for bucket, count in other.histogram.items():
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + count
+        self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def count(self):
+        return self.sketch.count
+
+    def summary(self):
+        """cyclictest-shaped summary (latencies in µs)"""
+        sketch = self.sketch
+        if sketch.count == 0:
+            return {'success': False, 'samples': 0, 'error': 'No latency samples recorded'}
+        return {
+            'success': True,
+            'samples': sketch.count,
+            'min_latency_us': round(sketch.min, 2),
+            'avg_latency_us': round(sketch.mean, 2),
+            'max_latency_us': round(sketch.max, 2),
+            'jitter_us': round(sketch.max - sketch.min, 2),
+            'stdev_us': round(sketch.stdev, 2),
+            'percentiles_us': sketch.percentiles((50, 99, 99.9), digits=2),
+            'histogram_us': dict(sorted(self.histogram.items())),
+            'latency_sketch': sketch.to_dict(),
+        }
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Performance Regression Detection
+================================
+
+This module watches the results history of every profile and finds the
+run where a metric stepped to a new level.
+
+Features:
+---------
+- CUSUM changepoint detection with permutation significance testing
+- Binary segmentation to find several steps in one series
+- Direction-aware: flags only steps that make a metric worse as regressions
+- Attributes each step to the kernel change and git commit that introduced it
+- Works from the SQLite results store (result files are ingested first)
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import os
+import random
+import subprocess
+
+from .results_store import RUN_METRICS
+
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_MIN_CHANGE = 0.05      # Ignore steps smaller than 5% of the prior level
+PERMUTATIONS = 1000
+MIN_SEGMENT = 2
+
+# Metrics where a higher value is better; everything else is lower-is-better
+HIGHER_IS_BETTER = ('stress_ops_per_core', 'composite_score')
+
+
+def _cusum_peak(values):
+    """Split index where the CUSUM of deviations from the mean peaks"""
+    mean = sum(values) / len(values)
+    running, best_index, best_abs = 0.0, None, 0.0
+    for i, value in enumerate(values[:-1]):
+        running += value - mean
+        if i + 1 >= MIN_SEGMENT and len(values) - (i + 1) >= MIN_SEGMENT and abs(running) > best_abs:
+            best_abs, best_index = abs(running), i + 1
+    return best_index
+
+
+def _cusum_range(values):
+    mean = sum(values) / len(values)
+    running = low = high = 0.0
+    for value in values:
+        running += value - mean
+        low, high = min(low, running), max(high, running)
+    return high - low
+
+
+def find_changepoint(values, permutations=PERMUTATIONS, seed=0):
+    """Most likely single changepoint in a series
+
+    Returns (index, p_value) where index is the first value of the new
+    level, or (None, 1.0) if the series is too short. Significance is the
+    share of random reorderings whose CUSUM range is at least as large.
+    """
+    if len(values) < 2 * MIN_SEGMENT:
+        return None, 1.0
+
+    index = _cusum_peak(values)
+    observed = _cusum_range(values)
+    if index is None or observed == 0:
+        return None, 1.0
+
+    rng = random.Random(seed)
+    shuffled = list(values)
+    exceed = 0
+    for _ in range(permutations):
+        rng.shuffle(shuffled)
+        if _cusum_range(shuffled) >= observed:
+            exceed += 1
+    return index, (exceed + 1) / (permutations + 1)
+
+
+def detect_changepoints(values, confidence=DEFAULT_CONFIDENCE, permutations=PERMUTATIONS):
+    """All significant changepoints (binary segmentation), sorted"""
+    alpha = 1 - confidence
+    found = []
+    segments = [(0, len(values))]
+    while segments:
+        start, end = segments.pop()
+        index, p_value = find_changepoint(values[start:end], permutations)
+        if index is None or p_value >= alpha:
+            continue
+        found.append((start + index, p_value))
+        segments.append((start, start + index))
+        segments.append((start + index, end))
+    return sorted(found)
+
+
+def _median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def introducing_commit(path):
+    """Git commit that added a results file (None outside a git checkout)"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        result = subprocess.run(
+            ['git', 'log', '--diff-filter=A', '--format=%h %s', '-1', '--', os.path.basename(path)],
+            cwd=os.path.dirname(os.path.abspath(path)), capture_output=True, text=True, timeout=10)
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def analyze_series(series, metric, confidence=DEFAULT_CONFIDENCE, min_change=DEFAULT_MIN_CHANGE):
+    """Changepoints of one (timestamp, value, run_id) series"""
+    values = [value for _, value, _ in series]
+    higher_is_better = metric in HIGHER_IS_BETTER
+    steps = []
+
+    p_values = dict(detect_changepoints(values, confidence))
+    boundaries = [0] + sorted(p_values) + [len(values)]
+    for k in range(1, len(boundaries) - 1):
+        before = values[boundaries[k - 1]:boundaries[k]]
+        after = values[boundaries[k]:boundaries[k + 1]]
+        level_before, level_after = _median(before), _median(after)
+        delta = level_after - level_before
+        relative = delta / abs(level_before) if level_before else float('inf') if delta else 0.0
+        if abs(relative) < min_change:
+            continue
+
+        worse = delta < 0 if higher_is_better else delta > 0
+        index = boundaries[k]
+        steps.append({
+            'metric': metric,
+            'index': index,
+            'timestamp': series[index][0],
+            'run_id': series[index][2],
+            'previous_run_id': series[index - 1][2],
+            'before': level_before,
+            'after': level_after,
+            'delta': delta,
+            'relative_change': relative,
+            'p_value': p_values[index],
+            'regression': worse
+        })
+    return steps
+
+
+def detect_regressions(store, profiles=None, metrics=None, confidence=DEFAULT_CONFIDENCE,
+                       min_change=DEFAULT_MIN_CHANGE):
+    """Run changepoint detection on every metric of every profile
+
+    Returns {'profiles': {profile: [step, ...]}, 'regressions': count}.
+    Each step is annotated with the kernel release before/after and the
+    git commit that added the first run of the new level.
+    """
+    if metrics is None:
+        metrics = list(RUN_METRICS) + [f"algorithm:{row['algorithm']}" for row in store.algorithm_summary()]
+    profiles = profiles or store.profiles()
+
+    report = {'profiles': {}, 'regressions': 0, 'confidence': confidence, 'min_change': min_change}
+    for profile in profiles:
+        steps = []
+        for metric in metrics:
+            series = store.history(metric, profile=profile)
+            for step in analyze_series(series, metric, confidence, min_change):
+                run = store.get_run(step['run_id']) or {}
+                previous = store.get_run(step['previous_run_id']) or {}
+                step['source_path'] = run.get('source_path')
+                step['kernel_before'] = previous.get('system_info', {}).get('kernel_release')
+                step['kernel_after'] = run.get('system_info', {}).get('kernel_release')
+                step['commit'] = introducing_commit(run.get('source_path'))
+                steps.append(step)
+        report['profiles'][profile] = steps
+        report['regressions'] += sum(1 for step in steps if step['regression'])
+    return report
+
+
+def format_regression_report(report):
+    """Human-readable report of detected steps"""
+    lines = []
+    lines.append("📉 Performance Regression Report")
+    lines.append("=" * 50)
+    lines.append(f"Confidence: {report['confidence']:.0%} | Minimum step: {report['min_change']:.0%}")
+
+    for profile, steps in report['profiles'].items():
+        lines.append("")
+        lines.append(f"📁 {profile}")
+        if not steps:
+            lines.append("   No significant steps detected")
+            continue
+        for step in steps:
+            icon = "🔴" if step['regression'] else "🟢"
+            lines.append(f"   {icon} {step['metric']}: {step['before']:.2f} → {step['after']:.2f} "
+                         f"({step['relative_change']:+.1%}, p={step['p_value']:.3f}) at {step['timestamp']}")
+            if step['kernel_before'] != step['kernel_after']:
+                lines.append(f"      Kernel: {step['kernel_before']} → {step['kernel_after']}")
+            if step['commit']:
+                lines.append(f"      Commit: {step['commit']}")
+            if step['source_path']:
+                lines.append(f"      Run: {step['source_path']}")
+
+    lines.append("")
+    if report['regressions']:
+        lines.append(f"❌ {report['regressions']} regression(s) detected")
+    else:
+        lines.append("✅ No regressions detected")
+    return "\n".join(lines)
@@ -20,6 +20,16 @@ import json
 import os
 from datetime import datetime
 from .platform_compat import platform_compat
+from .preemption import PREEMPTION_MODELS, preemption_model_of
+from .scoring import board_class_of, score_version_of
+
+# Latency workloads shown in reports: results key -> section title
+WORKLOAD_SECTIONS = (
+    ('ipc_latency', '📡 IPC Round-Trip Latency'),
+    ('wakeup_latency', '⏰ Wake-to-Run Latency'),
+    ('io_latency', '💾 Storage I/O Latency'),
+    ('loop_lag', '🌀 asyncio Event-Loop Lag'),
+)
 
 
 class ResultsBoard:
@@ -29,19 +39,35 @@ class ResultsBoard:
         """Initialize results board"""
         self.results_history = []
     
-    def load_results_from_file(self, filename):
-        """Load results from JSON file"""
+    def load_results_from_file(self, filename, load_series=False):
+        """Load results from JSON file
+
+        With load_series=True, pointers into the sidecar series archive
+        are replaced by the stored samples (as plain lists).
+        """
         try:
             if os.path.exists(filename):
                 with open(filename, 'r') as f:
-                    return json.load(f)
+                    results = json.load(f)
+                if load_series:
+                    from .series_archive import resolve_series
+                    results = resolve_series(results, os.path.dirname(os.path.abspath(filename)))
+                return results
         except Exception as e:
             print(f"⚠️  Error loading results from {filename}: {e}")
         return None
-    
+
     def save_results_to_file(self, results, filename):
-        """Save results to JSON file"""
+        """Save results to JSON file
+
+        Long numeric series go to a sidecar .rtsa archive; the JSON keeps
+        their summaries and a pointer.
+        """
         try:
+            from .series_archive import ARCHIVE_EXTENSION, externalize_series
+            archive_path = os.path.splitext(filename)[0] + ARCHIVE_EXTENSION
+            results = externalize_series(results, archive_path)
+
             with open(filename, 'w') as f:
                 json.dump(results, f, indent=2)
             print(f"✅ Results saved to {filename}")
@@ -50,48 +76,81 @@ class ResultsBoard:
             print(f"❌ Error saving results to {filename}: {e}")
             return False
     
+    @staticmethod
+    def get_score_value(result):
+        """Extract the numeric composite score from a results dict"""
+        score = result.get('composite_score')
+        if isinstance(score, dict):
+            score = score.get('composite_score')
+        return score if isinstance(score, (int, float)) else None
+    
     def generate_leaderboard(self, results_list, show_top=10):
-        """Generate ASCII leaderboard from results list"""
+        """Generate ASCII leaderboard from results list
+        
+        Runs are only ranked against like runs: same board class, same
+        score formula version and same kernel preemption model. Each
+        score is also shown normalised to the best run of its group.
+        """
         if not results_list:
             return "No results available for leaderboard."
         
-        # Sort by composite score (lower is better for RT systems)
-        sorted_results = sorted(results_list, 
-                              key=lambda x: x.get('composite_score', float('inf')))
+        groups = {}
+        for result in results_list:
+            key = (board_class_of(result), score_version_of(result), preemption_model_of(result))
+            groups.setdefault(key, []).append(result)
         
         leaderboard = []
         leaderboard.append("🏆 RTOS Performance Leaderboard 🏆")
         leaderboard.append("=" * 50)
-        leaderboard.append("")
         
-        for i, result in enumerate(sorted_results[:show_top], 1):
-            system_info = result.get('system_info', {})
-            os_info = system_info.get('os_info', 'Unknown OS')
-            cpu_info = system_info.get('cpu_info', 'Unknown CPU')
-            
-            # Truncate long CPU names for display
-            if len(cpu_info) > 40:
-                cpu_info = cpu_info[:37] + "..."
-            
-            cyclictest = result.get('cyclictest_results', {})
-            max_lat = cyclictest.get('max_latency_us', 'N/A')
-            avg_lat = cyclictest.get('avg_latency_us', 'N/A')
-            
-            score = result.get('composite_score', 'N/A')
-            timestamp = result.get('timestamp', 'Unknown')
+        model_order = {model: i for i, model in enumerate(PREEMPTION_MODELS)}
+        for key in sorted(groups, key=lambda k: (k[0], k[1], model_order.get(k[2], len(model_order)))):
+            board_class, score_version, model = key
+            group = groups[key]
             
-            # Format timestamp
-            try:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                time_str = dt.strftime('%Y-%m-%d %H:%M')
-            except:
-                time_str = timestamp[:16] if len(timestamp) > 16 else timestamp
+            # Composite score: higher is better
+            sorted_results = sorted(group,
+                                  key=lambda x: self.get_score_value(x) or 0, reverse=True)
+            best_score = self.get_score_value(sorted_results[0]) or 0
             
-            leaderboard.append(f"#{i:2d} | Score: {score:6.2f} | Max: {max_lat:3}μs | Avg: {avg_lat:3}μs")
-            leaderboard.append(f"     | {os_info}")
-            leaderboard.append(f"     | {cpu_info}")
-            leaderboard.append(f"     | {time_str}")
+            leaderboard.append("")
+            leaderboard.append(f"🖥️  {board_class} | ⚙️  {model.upper()} | Score {score_version} ({len(group)} runs)")
             leaderboard.append("-" * 50)
+            
+            for i, result in enumerate(sorted_results[:show_top], 1):
+                system_info = result.get('system_info', {})
+                os_info = system_info.get('os_info', 'Unknown OS')
+                cpu_info = system_info.get('cpu_info', 'Unknown CPU')
+                
+                # Truncate long CPU names for display
+                if len(cpu_info) > 40:
+                    cpu_info = cpu_info[:37] + "..."
+                
+                cyclictest = result.get('cyclictest_results', {})
+                max_lat = cyclictest.get('max_latency_us', 'N/A')
+                avg_lat = cyclictest.get('avg_latency_us', 'N/A')
+                
+                score = self.get_score_value(result)
+                timestamp = result.get('timestamp', 'Unknown')
+                
+                # Format timestamp
+                try:
+                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                    time_str = dt.strftime('%Y-%m-%d %H:%M')
+                except:
+                    time_str = timestamp[:16] if len(timestamp) > 16 else timestamp
+                
+                if score is not None:
+                    relative = score / best_score * 100 if best_score else 0
+                    score_str = f"{score:6.2f} ({relative:5.1f}% of best)"
+                else:
+                    score_str = "   N/A"
+                
+                leaderboard.append(f"#{i:2d} | Score: {score_str} | Max: {max_lat:3}μs | Avg: {avg_lat:3}μs")
+                leaderboard.append(f"     | {os_info}")
+                leaderboard.append(f"     | {cpu_info}")
+                leaderboard.append(f"     | {time_str}")
+                leaderboard.append("-" * 50)
         
         return "\n".join(leaderboard)
     
@@ -133,7 +192,24 @@ class ResultsBoard:
         # Architecture
         arch = system_info.get('architecture', 'Unknown')
         info_lines.append(f"Architecture: {arch}")
-        
+
+        # Kernel configuration (if the config was readable)
+        kernel_config = system_info.get('kernel_config', {})
+        if kernel_config.get('available'):
+            nohz = 'full' if kernel_config.get('no_hz_full') else ('idle' if kernel_config.get('no_hz_idle') else 'off')
+            info_lines.append(f"Kernel Config: PREEMPT_RT={'y' if kernel_config.get('preempt_rt') else 'n'}, "
+                              f"HZ={kernel_config.get('hz', '?')}, NO_HZ={nohz}")
+
+        # Detected preemption model
+        preemption = system_info.get('preemption')
+        if preemption:
+            info_lines.append(f"Preemption Model: {preemption.get('model')} (from {preemption.get('source')})")
+
+        # Board+kernel fingerprint for grouping results
+        fingerprint = system_info.get('fingerprint')
+        if fingerprint:
+            info_lines.append(f"Fingerprint: {fingerprint}")
+
         return "\n".join(info_lines)
     
     def format_test_results(self, results):
@@ -199,15 +275,49 @@ class ResultsBoard:
                     exec_time = alg_results.get('execution_time_ms', 'N/A')
                     iterations = alg_results.get('iterations', 'N/A')
                     output_lines.append(f"{alg_name}: {exec_time} ms ({iterations} iterations)")
+
+                    derived = alg_results.get('perf_counters', {}).get('derived', {})
+                    if derived:
+                        metrics = []
+                        if 'ipc' in derived:
+                            metrics.append(f"IPC {derived['ipc']}")
+                        if 'cache_miss_rate' in derived:
+                            metrics.append(f"cache miss {derived['cache_miss_rate'] * 100:.2f}%")
+                        if 'branch_miss_rate' in derived:
+                            metrics.append(f"branch miss {derived['branch_miss_rate'] * 100:.2f}%")
+                        output_lines.append(f"   └─ {', '.join(metrics)}")
+            output_lines.append("")
+        
+        # Latency workloads ({series: {condition: latency summary}})
+        for key, title in WORKLOAD_SECTIONS:
+            if results.get(key):
+                output_lines.append(self.format_workload_latency(title, results[key]))
+                output_lines.append("")
+        
+        if results.get('memory_hierarchy'):
+            output_lines.append(self.format_memory_hierarchy(results['memory_hierarchy']))
+            output_lines.append("")
+        
+        if results.get('syscall_bench'):
+            output_lines.append(self.format_syscall_bench(results['syscall_bench']))
+            output_lines.append("")
+        
+        if results.get('rt_task_set'):
+            output_lines.append(self.format_task_set(results['rt_task_set']))
             output_lines.append("")
         
         # Performance Scores
-        composite_score = results.get('composite_score')
+        composite_score = self.get_score_value(results)
         if composite_score:
             output_lines.append("🏆 Performance Score")
             output_lines.append("=" * 30)
             output_lines.append(f"Composite Score: {composite_score:.2f}")
-            output_lines.append("(Lower scores indicate better real-time performance)")
+            score = results.get('composite_score', {})
+            output_lines.append(f"Score Version: {score_version_of(results)}")
+            if isinstance(score, dict) and score.get('board_class'):
+                output_lines.append(f"Board Class: {score['board_class']} (reference: {score.get('baseline', 'unknown')})")
+            output_lines.append(f"Preemption Model: {preemption_model_of(results)}")
+            output_lines.append("(Higher scores indicate better real-time performance)")
             output_lines.append("")
         
         # Environment Information
@@ -226,36 +336,120 @@ class ResultsBoard:
             
             rt_capable = env_info.get('rt_kernel_capable', False)
             output_lines.append(f"RT Kernel: {'Yes' if rt_capable else 'No'}")
+            output_lines.append(f"Preemption Model: {preemption_model_of({'system_info': env_info})}")
             output_lines.append("")
         
         return "\n".join(output_lines)
     
-    def compare_results(self, result1, result2):
-        """Compare two test results"""
+    def format_workload_latency(self, title, workload):
+        """One line per series and condition: p50 / p99 / max in μs"""
+        return "\n".join([title, "=" * 30] + self._workload_latency_lines(workload))
+    
+    def _workload_latency_lines(self, workload):
+        lines = []
+        if not workload.get('success') and workload.get('error'):
+            lines.append(f"⚠️  {workload['error']}")
+        for series, by_condition in workload.get('latency', {}).items():
+            for condition, summary in by_condition.items():
+                if summary.get('success'):
+                    percentiles = summary.get('percentiles_us', {})
+                    lines.append(f"{series} ({condition}): p50 {percentiles.get('p50', 'N/A')} μs, "
+                                 f"p99 {percentiles.get('p99', 'N/A')} μs, max {summary.get('max_latency_us', 'N/A')} μs")
+                else:
+                    lines.append(f"{series} ({condition}): ⚠️  {summary.get('error', 'failed')}")
+        for series, reason in workload.get('unavailable', {}).items():
+            lines.append(f"{series}: not available ({reason})")
+        return lines
+    
+    def format_memory_hierarchy(self, memory):
+        """Bandwidth per operation and access latency per working set"""
+        lines = ["🧠 Memory Hierarchy", "=" * 30]
+        if not memory.get('success'):
+            lines.append(f"⚠️  {memory.get('error', 'failed')}")
+            return "\n".join(lines)
+        bandwidth = memory.get('bandwidth_gbps', {})
+        lines.append(f"Bandwidth ({memory.get('buffer_mb')} MB): " +
+                     ", ".join(f"{name} {value} GB/s" for name, value in bandwidth.items()))
+        extra = memory.get('extra_ns', {})
+        for size_kb, latency_ns in memory.get('latency_ns', {}).items():
+            lines.append(f"{size_kb} KB working set: {latency_ns} ns/access (+{extra.get(size_kb, 0)} ns)")
+        return "\n".join(lines)
+    
+    def format_syscall_bench(self, bench):
+        """ns per call with its CI, then nanosleep oversleep per duration"""
+        lines = ["🔁 Syscall & Timer Costs", "=" * 30]
+        calls = dict(bench.get('calls', {}))
+        calls.update({f"clock_gettime({name})": result for name, result in bench.get('clocks', {}).items()})
+        for name, result in calls.items():
+            low, high = result.get('ci_ns', ['N/A', 'N/A'])
+            lines.append(f"{name}: {result['ns_per_call']} ns/call (CI {low} to {high})")
+        if bench.get('timer_overhead_ns') is not None:
+            lines.append(f"Timer bracket overhead: {bench['timer_overhead_ns']} ns")
+        # The oversleep part has the workload latency shape
+        lines.extend(self._workload_latency_lines(bench))
+        return "\n".join(lines)
+    
+    def format_task_set(self, task_set):
+        """Per task: misses, overruns, response p99/max and the RTA bound"""
+        lines = ["📋 Periodic RT Task Set", "=" * 30]
+        if not task_set.get('success'):
+            lines.append(f"⚠️  {task_set.get('error', 'failed')}")
+            return "\n".join(lines)
+        for core, analysis in task_set.get('analysis', {}).items():
+            lines.append(f"CPU {core}: U={analysis['utilization']:.2f} "
+                         f"(Liu & Layland bound {analysis['liu_layland_bound']:.2f})")
+        for name, task in task_set.get('tasks', {}).items():
+            response = task_set.get('latency', {}).get(name, {}).get('response', {})
+            p99 = response.get('percentiles_us', {}).get('p99', 'N/A')
+            rta = f"{task['predicted_response_ms']} ms" if task['predicted_response_ms'] is not None else '> deadline'
+            lines.append(f"{name} (T={task['period_ms']:g}ms C={task['wcet_ms']:g}ms prio {task['priority']}): "
+                         f"{task['jobs']} jobs, {task['deadline_misses']} misses, {task['overruns']} overruns, "
+                         f"response p99 {p99} μs, max {task['max_response_ms']} ms, "
+                         f"RTA {rta}")
+        predicted = 'schedulable' if task_set.get('predicted_schedulable') else 'not schedulable'
+        observed = 'all deadlines met' if task_set.get('observed_schedulable') else 'deadlines missed'
+        lines.append(f"Rate-monotonic analysis: {predicted} | Observed: {observed}")
+        return "\n".join(lines)
+    
+    def compare_results(self, result1, result2, confidence=None):
+        """Compare two test results
+
+        Either side may be a single results dict or a list of runs. Each
+        metric is tested for significance (Mann-Whitney U, bootstrap CI,
+        KS on latency distributions) and classified as improved,
+        regressed or no-change at the given confidence.
+        """
+        from .significance import DEFAULT_CONFIDENCE, compare_runs
+
+        runs1 = [result1] if isinstance(result1, dict) else list(result1)
+        runs2 = [result2] if isinstance(result2, dict) else list(result2)
+        report = compare_runs(runs1, runs2, confidence or DEFAULT_CONFIDENCE)
+
         comparison = []
         comparison.append("🔍 Results Comparison")
         comparison.append("=" * 30)
+        comparison.append(f"Baseline runs: {report['baseline_runs']} | "
+                          f"Candidate runs: {report['candidate_runs']} | "
+                          f"Confidence: {report['confidence']:.0%}")
         comparison.append("")
-        
-        # Compare latency
-        c1_lat = result1.get('cyclictest_results', {}).get('max_latency_us', 0)
-        c2_lat = result2.get('cyclictest_results', {}).get('max_latency_us', 0)
-        
-        if c1_lat and c2_lat:
-            diff = c2_lat - c1_lat
-            comparison.append(f"Max Latency: {c1_lat}μs vs {c2_lat}μs (Δ{diff:+}μs)")
-        
-        # Compare scores
-        score1 = result1.get('composite_score', 0)
-        score2 = result2.get('composite_score', 0)
-        
-        if score1 and score2:
-            diff = score2 - score1
-            comparison.append(f"Composite Score: {score1:.2f} vs {score2:.2f} (Δ{diff:+.2f})")
-        
+
+        icons = {'improved': '🟢', 'regressed': '🔴', 'no-change': '⚪', 'insufficient-data': '❔'}
+        for metric in report['metrics'].values():
+            line = f"{icons[metric['classification']]} {metric['label']}: "
+            if 'baseline_median' in metric:
+                line += (f"{metric['baseline_median']:.2f} vs {metric['candidate_median']:.2f} "
+                         f"(Δ{metric['delta']:+.2f})")
+            else:
+                line += f"n={metric['baseline_n']} vs n={metric['candidate_n']}"
+            if metric['p_value'] is not None:
+                line += f" p={metric['p_value']:.3f}"
+            if metric.get('ci'):
+                line += f" CI[{metric['ci'][0]:+.2f}, {metric['ci'][1]:+.2f}]"
+            comparison.append(f"{line} → {metric['classification']}")
+
         # System comparison
-        sys1 = result1.get('system_info', {}).get('os_info', 'Unknown')
-        sys2 = result2.get('system_info', {}).get('os_info', 'Unknown')
+        sys1 = runs1[0].get('system_info', {}).get('os_info', 'Unknown') if runs1 else 'Unknown'
+        sys2 = runs2[0].get('system_info', {}).get('os_info', 'Unknown') if runs2 else 'Unknown'
         
         comparison.append("")
         comparison.append(f"System 1: {sys1}")
@@ -286,6 +480,8 @@ class ResultsBoard:
             performance = "❓ Unknown Performance"
         
         system = results.get('system_info', {}).get('os_info', 'Unknown System')
-        score = results.get('composite_score', 'N/A')
+        score = self.get_score_value(results)
+        if score is None:
+            score = 'N/A'
         
         return f"{performance} | Score: {score} | {system}"
\ No newline at end of file
@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+Indexed Results Store
+=====================
+
+This module keeps an SQLite index of benchmark result files so that
+leaderboards, comparisons and history queries no longer glob and parse
+every JSON file on each call.
+
+Features:
+---------
+- Incremental ingestion keyed by file mtime/size, then content hash
+- One row per run with fingerprint, kernel, preemption model and scores
+- Per-algorithm timing table
+- Mergeable DDSketch per run for latency and algorithm timings
+- Indexed SQL queries for leaderboard, recent runs and metric history
+- Lightweight result dicts compatible with ResultsBoard
+
+Usage:
+------
+    store = ResultsStore('rtos_results.db')
+    store.ingest_paths(['system-tests'], recursive=True)
+    print(ResultsBoard().generate_leaderboard(store.leaderboard()))
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+from .preemption import preemption_model_of
+from .quantile_sketch import merge_sketches, sketch_of
+from .series_archive import resolve_series
+from .system_fingerprint import fingerprint_of
+
+DEFAULT_STORE_PATH = 'rtos_results.db'
+RESULTS_FILE_PATTERN = '*rtos_full_board_results_*.json'
+SCHEMA_VERSION = 3
+# Profile of result files without a '<profile>_' prefix (local runs)
+DEFAULT_PROFILE = 'default'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    source_path TEXT NOT NULL UNIQUE REFERENCES files(path) ON DELETE CASCADE,
+    sha256 TEXT NOT NULL,
+    profile TEXT,
+    timestamp TEXT,
+    fingerprint TEXT,
+    board_fingerprint TEXT,
+    kernel_release TEXT,
+    os_info TEXT,
+    cpu_info TEXT,
+    cpu_count INTEGER,
+    memory_gb REAL,
+    preemption_model TEXT,
+    simulated INTEGER,
+    min_latency_us NUMERIC,
+    avg_latency_us NUMERIC,
+    max_latency_us NUMERIC,
+    jitter_us NUMERIC,
+    p50_latency_us NUMERIC,
+    p99_latency_us NUMERIC,
+    p999_latency_us NUMERIC,
+    stress_ops_per_core REAL,
+    composite_score REAL,
+    score_version TEXT
+);
+CREATE TABLE IF NOT EXISTS algorithm_times (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    algorithm TEXT NOT NULL,
+    execution_time_ms REAL,
+    min_time_ms REAL,
+    max_time_ms REAL,
+    iterations INTEGER,
+    PRIMARY KEY (run_id, algorithm)
+);
+CREATE TABLE IF NOT EXISTS run_sketches (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    metric TEXT NOT NULL,
+    sketch TEXT NOT NULL,
+    PRIMARY KEY (run_id, metric)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs(timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_fingerprint ON runs(fingerprint, timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_model_score ON runs(preemption_model, composite_score);
+CREATE INDEX IF NOT EXISTS idx_runs_profile ON runs(profile, timestamp);
+CREATE INDEX IF NOT EXISTS idx_algorithm_times_algorithm ON algorithm_times(algorithm, execution_time_ms);
+"""
+
+# Metrics that history() may query, mapped to their SQL column
+RUN_METRICS = (
+    'min_latency_us', 'avg_latency_us', 'max_latency_us', 'jitter_us',
+    'p50_latency_us', 'p99_latency_us', 'p999_latency_us',
+    'stress_ops_per_core', 'composite_score',
+)
+
+# RUN_METRICS measured by cyclictest; simulated runs carry random values for these
+LATENCY_METRICS = (
+    'min_latency_us', 'avg_latency_us', 'max_latency_us', 'jitter_us',
+    'p50_latency_us', 'p99_latency_us', 'p999_latency_us',
+)
+
+
+def _file_sha256(path):
+    """Content hash of a results file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def profile_from_path(path):
+    """Profile name from '<profile>_rtos_full_board_results_*.json'
+
+    The prefix is spelled like the system-tests/<profile>/ directories
+    ('pi_debian_rt' -> 'pi-debian-rt'); unprefixed files are DEFAULT_PROFILE.
+    """
+    name = os.path.basename(path)
+    prefix = name.split('rtos_full_board_results_')[0].rstrip('_')
+    return prefix.replace('_', '-') or DEFAULT_PROFILE
+
+
+def extract_run_row(results, path):
+    """Flatten a results dict into the columns of the runs table"""
+    system_info = results.get('system_info', {}) or {}
+    cyclictest = results.get('cyclictest_results', {}) or {}
+    stress = results.get('multicore_stress', {}) or {}
+    score = results.get('composite_score')
+    score_version = None
+    if isinstance(score, dict):
+        score_version = score.get('score_version')
+        score = score.get('composite_score')
+
+    percentiles = cyclictest.get('percentiles_us', {}) or {}
+    memory_gb = system_info.get('memory_gb')
+    uname = system_info.get('uname') or system_info.get('os_info') or ''
+    uname_parts = uname.split()
+
+    return {
+        'profile': profile_from_path(path),
+        'timestamp': results.get('timestamp'),
+        'fingerprint': fingerprint_of(results),
+        'board_fingerprint': system_info.get('board_fingerprint'),
+        'kernel_release': system_info.get('kernel_release') or (uname_parts[2] if len(uname_parts) > 2 else None),
+        'os_info': system_info.get('os_info'),
+        'cpu_info': system_info.get('cpu_info'),
+        'cpu_count': _number(system_info.get('cpu_count')),
+        'memory_gb': _number(memory_gb),
+        'preemption_model': preemption_model_of(results),
+        'simulated': 1 if cyclictest.get('simulated') else 0,
+        'min_latency_us': _number(cyclictest.get('min_latency_us')),
+        'avg_latency_us': _number(cyclictest.get('avg_latency_us')),
+        'max_latency_us': _number(cyclictest.get('max_latency_us')),
+        'jitter_us': _number(cyclictest.get('jitter_us')),
+        'p50_latency_us': _number(percentiles.get('p50')),
+        'p99_latency_us': _number(percentiles.get('p99')),
+        'p999_latency_us': _number(percentiles.get('p99.9')),
+        'stress_ops_per_core': _number(stress.get('avg_ops_per_core')),
+        'composite_score': _number(score),
+        'score_version': score_version,
+    }
+
+
+def extract_run_sketches(results):
+    """Serialised DDSketches of a run: 'latency_us' and 'algorithm:<name>'
+
+    Uses the stored sketch where the run has one, otherwise builds it from
+    the latency histogram or the raw sample/timing lists.
+    """
+    sketches = {}
+    cyclictest = results.get('cyclictest_results', {}) or {}
+    if not cyclictest.get('simulated'):
+        latency = sketch_of(cyclictest.get('latency_sketch') or cyclictest.get('histogram_us')
+                            or cyclictest.get('latency_samples_us'))
+        if latency is not None:
+            sketches['latency_us'] = latency.to_dict()
+    for name, data in (results.get('algorithm_results') or {}).items():
+        if isinstance(data, dict) and data.get('success', True):
+            timing = sketch_of(data.get('timing_sketch') or data.get('all_times'))
+            if timing is not None:
+                sketches[f'algorithm:{name}'] = timing.to_dict()
+    return sketches
+
+
+class ResultsStore:
+    """SQLite-backed index of benchmark result files"""
+
+    def __init__(self, db_path=DEFAULT_STORE_PATH):
+        """Open (or create) the results store"""
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR IGNORE INTO meta(key, value) VALUES ('schema_version', ?)",
+                          (str(SCHEMA_VERSION),))
+        version = int(self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()[0])
+        if version < 2:
+            # Older stores have no sketches: make the next ingest re-read every file
+            self.conn.execute("UPDATE files SET mtime_ns = -1, sha256 = ''")
+        if version < 3:
+            # Profiles were the raw filename prefix, with NULL for unprefixed files
+            self.conn.execute("UPDATE runs SET profile = COALESCE(REPLACE(profile, '_', '-'), ?)",
+                              (DEFAULT_PROFILE,))
+        if version < SCHEMA_VERSION:
+            self.conn.execute("UPDATE meta SET value = ? WHERE key = 'schema_version'", (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def ingest_file(self, path, results=None):
+        """Ingest one results file; returns 'added', 'updated' or 'skipped'
+
+        Files whose mtime and size are unchanged are skipped without being
+        read; a changed mtime with identical content only refreshes the
+        file record.  Series moved to a sidecar archive are read back so
+        their sketches are stored.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        known = self.conn.execute('SELECT mtime_ns, size, sha256 FROM files WHERE path = ?',
+                                  (path,)).fetchone()
+        if known and known['mtime_ns'] == stat.st_mtime_ns and known['size'] == stat.st_size:
+            return 'skipped'
+
+        sha256 = _file_sha256(path)
+        if known and known['sha256'] == sha256:
+            self.conn.execute('UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?',
+                              (stat.st_mtime_ns, stat.st_size, path))
+            self.conn.commit()
+            return 'skipped'
+
+        if results is None:
+            with open(path, 'r') as f:
+                results = json.load(f)
+            if results.get('series_archive'):
+                try:
+                    results = resolve_series(results, os.path.dirname(path))
+                except (OSError, ValueError):
+                    pass  # Sidecar missing or unreadable: the JSON summaries still count
+
+        row = extract_run_row(results, path)
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO files(path, mtime_ns, size, sha256) VALUES (?, ?, ?, ?)',
+                              (path, stat.st_mtime_ns, stat.st_size, sha256))
+            self.conn.execute('DELETE FROM runs WHERE source_path = ?', (path,))
+            columns = ['source_path', 'sha256'] + list(row)
+            cursor = self.conn.execute(
+                f"INSERT INTO runs({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [path, sha256] + list(row.values()))
+            run_id = cursor.lastrowid
+
+            for algorithm, alg_result in (results.get('algorithm_results') or {}).items():
+                if not isinstance(alg_result, dict) or not alg_result.get('success'):
+                    continue
+                self.conn.execute(
+                    'INSERT INTO algorithm_times(run_id, algorithm, execution_time_ms, min_time_ms, '
+                    'max_time_ms, iterations) VALUES (?, ?, ?, ?, ?, ?)',
+                    (run_id, algorithm, _number(alg_result.get('execution_time_ms')),
+                     _number(alg_result.get('min_time_ms')), _number(alg_result.get('max_time_ms')),
+                     _number(alg_result.get('iterations'))))
+
+            self.conn.executemany('INSERT INTO run_sketches(run_id, metric, sketch) VALUES (?, ?, ?)',
+                                  [(run_id, metric, json.dumps(sketch))
+                                   for metric, sketch in extract_run_sketches(results).items()])
+
+        return 'updated' if known else 'added'
+
+    def ingest_paths(self, paths, pattern=RESULTS_FILE_PATTERN, recursive=False):
+        """Ingest result files from files and/or directories
+
+        Returns counts of added, updated, skipped and failed files.
+        """
+        summary = {'added': 0, 'updated': 0, 'skipped': 0, 'failed': 0}
+
+        for path in paths:
+            if os.path.isdir(path):
+                search = os.path.join(path, '**', pattern) if recursive else os.path.join(path, pattern)
+                files = glob.glob(search, recursive=recursive)
+            else:
+                files = [path]
+
+            for filename in files:
+                try:
+                    summary[self.ingest_file(filename)] += 1
+                except (OSError, ValueError) as e:
+                    summary['failed'] += 1
+                    print(f"⚠️  Could not ingest {filename}: {e}")
+
+        return summary
+
+    def prune_missing(self):
+        """Drop runs whose source files no longer exist"""
+        missing = [row['path'] for row in self.conn.execute('SELECT path FROM files')
+                   if not os.path.exists(row['path'])]
+        with self.conn:
+            self.conn.executemany('DELETE FROM files WHERE path = ?', [(p,) for p in missing])
+        return len(missing)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _algorithms_for(self, run_ids):
+        """Algorithm timings for a set of runs, keyed by run id"""
+        timings = {run_id: {} for run_id in run_ids}
+        if not run_ids:
+            return timings
+        placeholders = ', '.join('?' * len(run_ids))
+        for row in self.conn.execute(
+                f'SELECT * FROM algorithm_times WHERE run_id IN ({placeholders})', list(run_ids)):
+            timings[row['run_id']][row['algorithm']] = {
+                'execution_time_ms': row['execution_time_ms'],
+                'min_time_ms': row['min_time_ms'],
+                'max_time_ms': row['max_time_ms'],
+                'iterations': row['iterations'],
+                'success': True
+            }
+        return timings
+
+    def _sketches_for(self, run_ids):
+        """Serialised sketches for a set of runs, keyed by run id and metric"""
+        sketches = {run_id: {} for run_id in run_ids}
+        if not run_ids:
+            return sketches
+        placeholders = ', '.join('?' * len(run_ids))
+        for row in self.conn.execute(
+                f'SELECT * FROM run_sketches WHERE run_id IN ({placeholders})', list(run_ids)):
+            sketches[row['run_id']][row['metric']] = json.loads(row['sketch'])
+        return sketches
+
+    def _rows_to_results(self, rows, include_sketches=False):
+        """Rebuild ResultsBoard-compatible result dicts from run rows"""
+        rows = list(rows)
+        timings = self._algorithms_for([row['id'] for row in rows])
+        sketches = self._sketches_for([row['id'] for row in rows]) if include_sketches else {}
+        results = []
+
+        for row in rows:
+            percentiles = {key: row[column] for key, column in
+                           (('p50', 'p50_latency_us'), ('p99', 'p99_latency_us'), ('p99.9', 'p999_latency_us'))
+                           if row[column] is not None}
+            results.append({
+                'run_id': row['id'],
+                'source_path': row['source_path'],
+                'profile': row['profile'],
+                'timestamp': row['timestamp'],
+                'system_info': {
+                    'os_info': row['os_info'],
+                    'cpu_info': row['cpu_info'],
+                    'cpu_count': row['cpu_count'],
+                    'memory_gb': row['memory_gb'],
+                    'kernel_release': row['kernel_release'],
+                    'preemption_model': row['preemption_model'],
+                    'fingerprint': row['fingerprint'],
+                    'board_fingerprint': row['board_fingerprint'],
+                },
+                'cyclictest_results': {
+                    'min_latency_us': row['min_latency_us'],
+                    'avg_latency_us': row['avg_latency_us'],
+                    'max_latency_us': row['max_latency_us'],
+                    'jitter_us': row['jitter_us'],
+                    'percentiles_us': percentiles,
+                    'simulated': bool(row['simulated']),
+                    'success': row['max_latency_us'] is not None,
+                },
+                'algorithm_results': timings.get(row['id'], {}),
+                'multicore_stress': {'avg_ops_per_core': row['stress_ops_per_core']},
+                'composite_score': {
+                    'composite_score': row['composite_score'],
+                    'score_version': row['score_version'],
+                },
+            })
+            for metric, sketch in sketches.get(row['id'], {}).items():
+                if metric == 'latency_us':
+                    results[-1]['cyclictest_results']['latency_sketch'] = sketch
+                elif metric.startswith('algorithm:'):
+                    algorithm = results[-1]['algorithm_results'].setdefault(metric[len('algorithm:'):], {})
+                    algorithm['timing_sketch'] = sketch
+        return results
+
+    def recent(self, limit=5, profile=None):
+        """Most recent runs by timestamp"""
+        if profile:
+            rows = self.conn.execute('SELECT * FROM runs WHERE profile = ? ORDER BY timestamp DESC LIMIT ?',
+                                     (profile, limit))
+        else:
+            rows = self.conn.execute('SELECT * FROM runs ORDER BY timestamp DESC LIMIT ?', (limit,))
+        return self._rows_to_results(rows)
+
+    def iter_runs(self, batch_size=500):
+        """Every run (with its sketches) in id order, fetched in batches to bound memory"""
+        last_id = 0
+        while True:
+            rows = self.conn.execute('SELECT * FROM runs WHERE id > ? ORDER BY id LIMIT ?',
+                                     (last_id, batch_size)).fetchall()
+            if not rows:
+                return
+            yield from self._rows_to_results(rows, include_sketches=True)
+            last_id = rows[-1]['id']
+
+    def leaderboard(self, limit=10, preemption_model=None):
+        """Best runs by composite score (per preemption model if given)"""
+        if preemption_model:
+            rows = self.conn.execute(
+                'SELECT * FROM runs WHERE preemption_model = ? AND composite_score IS NOT NULL '
+                'ORDER BY composite_score DESC LIMIT ?', (preemption_model, limit))
+        else:
+            rows = self.conn.execute(
+                'SELECT * FROM runs WHERE composite_score IS NOT NULL '
+                'ORDER BY composite_score DESC LIMIT ?', (limit,))
+        return self._rows_to_results(rows)
+
+    def get_run(self, run_id):
+        """Single run by id, or None"""
+        results = self._rows_to_results(self.conn.execute('SELECT * FROM runs WHERE id = ?', (run_id,)))
+        return results[0] if results else None
+
+    def history(self, metric, fingerprint=None, profile=None):
+        """Time-ordered (timestamp, value, run_id) series for one metric
+
+        ``metric`` is a runs column (see RUN_METRICS) or 'algorithm:<name>'
+        for an algorithm's mean execution time.  Latency metrics skip
+        simulated runs.
+        """
+        conditions = []
+        params = []
+        if fingerprint:
+            conditions.append('r.fingerprint = ?')
+            params.append(fingerprint)
+        if profile:
+            conditions.append('r.profile = ?')
+            params.append(profile)
+
+        if metric.startswith('algorithm:'):
+            conditions.append('a.algorithm = ?')
+            params.append(metric.split(':', 1)[1])
+            sql = ('SELECT r.timestamp, a.execution_time_ms AS value, r.id AS run_id '
+                   'FROM runs r JOIN algorithm_times a ON a.run_id = r.id')
+        elif metric in RUN_METRICS:
+            conditions.append(f'r.{metric} IS NOT NULL')
+            if metric in LATENCY_METRICS:
+                conditions.append('COALESCE(r.simulated, 0) = 0')
+            sql = f'SELECT r.timestamp, r.{metric} AS value, r.id AS run_id FROM runs r'
+        else:
+            raise ValueError(f'Unknown metric: {metric}')
+
+        sql += ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+        sql += ' ORDER BY r.timestamp'
+        return [(row['timestamp'], row['value'], row['run_id']) for row in self.conn.execute(sql, params)]
+
+    def merged_sketch(self, metric, fingerprint=None, profile=None):
+        """One DDSketch merged over every matching run's sketch for metric
+
+        metric is 'latency_us' or 'algorithm:<name>'; returns None when no
+        run carries that sketch.
+        """
+        query = ('SELECT s.sketch FROM run_sketches s JOIN runs r ON r.id = s.run_id '
+                 'WHERE s.metric = ?')
+        params = [metric]
+        if fingerprint:
+            query += ' AND r.fingerprint = ?'
+            params.append(fingerprint)
+        if profile:
+            query += ' AND r.profile = ?'
+            params.append(profile)
+        return merge_sketches(json.loads(row['sketch']) for row in self.conn.execute(query, params))
+
+    def fingerprints(self):
+        """Known fingerprints with run counts and descriptive fields"""
+        rows = self.conn.execute(
+            'SELECT fingerprint, cpu_info, kernel_release, preemption_model, COUNT(*) AS runs, '
+            'MIN(timestamp) AS first_run, MAX(timestamp) AS last_run '
+            'FROM runs GROUP BY fingerprint ORDER BY last_run DESC')
+        return [dict(row) for row in rows]
+
+    def profiles(self):
+        """Distinct profile names present in the store"""
+        return [row['profile'] for row in self.conn.execute(
+            'SELECT DISTINCT profile FROM runs ORDER BY profile')]
+
+    def algorithm_summary(self, fingerprint=None):
+        """Per-algorithm min/avg/max execution time across runs"""
+        sql = ('SELECT a.algorithm, COUNT(*) AS runs, MIN(a.execution_time_ms) AS best_ms, '
+               'AVG(a.execution_time_ms) AS mean_ms, MAX(a.execution_time_ms) AS worst_ms '
+               'FROM algorithm_times a JOIN runs r ON r.id = a.run_id')
+        params = []
+        if fingerprint:
+            sql += ' WHERE r.fingerprint = ?'
+            params.append(fingerprint)
+        sql += ' GROUP BY a.algorithm ORDER BY a.algorithm'
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def count(self):
+        """Number of runs in the store"""
+        return self.conn.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
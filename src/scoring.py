@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Versioned Composite Scoring
+===========================
+
+This module computes the composite performance score. Every score
+records the version of the formula that produced it, so scores from
+different versions are never ranked against each other.
+
+Versions:
+---------
+- v1: legacy weighted average (latency 40%, algorithms 30%, system 20%,
+      environment 10%); awards points for core count and RAM
+- v2: weighted geometric mean of ratios to a reference run of the same
+      board class (100 = reference): p99.9 latency (when both runs have a
+      histogram), max latency, iteration-time CoV and algorithm/stress
+      throughput
+
+Reference runs:
+---------------
+Built-in references come from the committed system-tests snapshots.
+``python main.py --set-score-baseline FILE`` stores a run as the
+reference for its board class in rtos_score_baselines.json.
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import json
+import math
+import os
+import re
+import statistics
+
+from .preemption import PREEMPTION_SCORE_BONUS, preemption_model_of
+
+SCORE_VERSIONS = ('v1', 'v2')
+DEFAULT_SCORE_VERSION = 'v2'
+DEFAULT_BASELINES_PATH = 'rtos_score_baselines.json'
+
+# v2 component weights (renormalised over the components a run provides)
+V2_WEIGHTS = {
+    'tail_latency': 0.30,
+    'max_latency': 0.20,
+    'determinism': 0.20,
+    'algorithm_throughput': 0.15,
+    'stress_throughput': 0.15,
+}
+
+# Ratios to the reference are clamped so one outlier cannot dominate
+RATIO_LIMITS = (0.05, 5.0)
+MIN_COV = 0.001
+
+# Fallback reference for board classes without a stored run
+GENERIC_BASELINE = {
+    'source': 'builtin:generic',
+    'max_latency_us': 50,
+    'iteration_cov': 0.05,
+    'algorithm_times_ms': {'quick_sort': 1.5, 'merge_sort': 2.5,
+                           'matrix_multiplication': 20.0, 'fft_simulation': 150.0},
+    'stress_ops_per_core': 10000000,
+}
+
+# Reference runs derived from the committed system-tests snapshots; they
+# predate histogram recording, so they carry no p99.9 reference
+BUILTIN_BASELINES = {
+    'raspberry-pi-5-model-b-4c': {
+        'source': 'builtin:system-tests/pi-debian-rt/pi_debian_rt_rtos_full_board_results_20251015_232256.json',
+        'max_latency_us': 12,
+        'iteration_cov': 0.0135,
+        'algorithm_times_ms': {'quick_sort': 1.242, 'merge_sort': 1.961,
+                               'matrix_multiplication': 16.208, 'fft_simulation': 132.944},
+        'stress_ops_per_core': 9570000.0,
+    },
+    'amd-ryzen-7-7700x-8-core-16c': {
+        'source': 'builtin:system-tests/ubuntu-rt/ubuntu_rt_rtos_full_board_results_20250928_143445.json',
+        'max_latency_us': 13,
+        'iteration_cov': 0.0439,
+        'algorithm_times_ms': {'quick_sort': 0.567, 'merge_sort': 0.775,
+                               'matrix_multiplication': 6.288, 'fft_simulation': 50.225},
+        'stress_ops_per_core': 25095000.0,
+    },
+}
+
+
+def _slug(text):
+    return re.sub(r'[^a-z0-9.]+', '-', text.lower()).strip('-')
+
+
+def board_class_of(results):
+    """Board class used to pick the reference run, e.g. 'raspberry-pi-5-model-b-4c'
+
+    Derived from the board model (or CPU name) without revision or
+    'Processor' noise, plus the core count.
+    """
+    system_info = results.get('system_info', {}) or {}
+    name = system_info.get('board_model') or system_info.get('cpu_info') or 'unknown'
+    name = re.sub(r'\b(rev\s*[\w.]+|processor|cpu|\(r\)|\(tm\))', ' ', name, flags=re.IGNORECASE)
+    name = re.sub(r'@.*$', '', name)
+    return f"{_slug(name) or 'unknown'}-{system_info.get('cpu_count') or 0}c"
+
+
+def score_version_of(results):
+    """Score version of a results dict (runs scored before versioning are v1)"""
+    score = results.get('composite_score')
+    if isinstance(score, dict):
+        return score.get('score_version') or 'v1'
+    return 'v1'
+
+
+def iteration_cov(results):
+    """Mean coefficient of variation of per-iteration algorithm times"""
+    covs = []
+    for data in (results.get('algorithm_results') or {}).values():
+        times = data.get('all_times') if isinstance(data, dict) else None
+        if isinstance(times, (list, tuple)) and len(times) >= 2:
+            mean = statistics.mean(times)
+            if mean > 0:
+                covs.append(statistics.stdev(times) / mean)
+    return statistics.mean(covs) if covs else None
+
+
+def tail_latency_of(cyclictest):
+    """p99.9 latency from the run's histogram, or None without one
+
+    Falling back to the maximum would count max latency twice.
+    """
+    percentiles = cyclictest.get('percentiles_us') or {}
+    return percentiles.get('p99.9')
+
+
+def reference_from_results(results, source=None):
+    """Reference-run metrics of a results dict (for the baselines file)"""
+    cyclictest = results.get('cyclictest_results', {}) or {}
+    cov = iteration_cov(results)
+    return {
+        'source': source or results.get('timestamp'),
+        'tail_latency_us': tail_latency_of(cyclictest),
+        'max_latency_us': cyclictest.get('max_latency_us'),
+        'iteration_cov': round(cov, 4) if cov is not None else None,
+        'algorithm_times_ms': {name: data['execution_time_ms']
+                               for name, data in (results.get('algorithm_results') or {}).items()
+                               if isinstance(data, dict) and data.get('execution_time_ms')},
+        'stress_ops_per_core': (results.get('multicore_stress') or {}).get('avg_ops_per_core'),
+    }
+
+
+def load_baselines(path=DEFAULT_BASELINES_PATH):
+    """Built-in references overlaid with the stored baselines file"""
+    baselines = dict(BUILTIN_BASELINES)
+    if path and os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                baselines.update(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring score baselines in {path}: {e}")
+    return baselines
+
+
+def save_baseline(results, path=DEFAULT_BASELINES_PATH, source=None):
+    """Store a run as the reference for its board class"""
+    stored = {}
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            stored = json.load(f)
+    board_class = board_class_of(results)
+    stored[board_class] = reference_from_results(results, source)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(stored, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+    return board_class
+
+
+def _ratio(reference, value, lower_is_better=True):
+    if not reference or not value or reference <= 0 or value <= 0:
+        return None
+    ratio = reference / value if lower_is_better else value / reference
+    return min(max(ratio, RATIO_LIMITS[0]), RATIO_LIMITS[1])
+
+
+def score_v1(results):
+    """Legacy composite score (kept so old runs can be re-scored identically)"""
+    score_components = {}
+    total_score = 0
+    weight_sum = 0
+
+    # Real-time latency score (40% weight)
+    cyclictest = results.get('cyclictest_results', {})
+    if cyclictest.get('success') and cyclictest.get('max_latency_us'):
+        max_latency = cyclictest['max_latency_us']
+        avg_latency = cyclictest.get('avg_latency_us', max_latency)
+        latency_score = 100 / (1 + max_latency / 10 + avg_latency / 20)
+        score_components['latency'] = latency_score
+        total_score += latency_score * 0.4
+        weight_sum += 0.4
+
+    # Algorithm performance score (30% weight)
+    alg_scores = []
+    for alg_result in (results.get('algorithm_results', {}) or {}).values():
+        if alg_result.get('success') and alg_result.get('execution_time_ms'):
+            alg_scores.append(100 / (1 + alg_result['execution_time_ms'] / 50))
+    if alg_scores:
+        avg_alg_score = sum(alg_scores) / len(alg_scores)
+        score_components['algorithms'] = avg_alg_score
+        total_score += avg_alg_score * 0.3
+        weight_sum += 0.3
+
+    # System capability score (20% weight)
+    system_info = results.get('system_info', {})
+    system_score = 50 + PREEMPTION_SCORE_BONUS.get(preemption_model_of(results), 0)
+    system_score += min(20, system_info.get('cpu_count', 1) * 2)
+    system_score += min(10, system_info.get('memory_gb', 0))
+    score_components['system'] = system_score
+    total_score += system_score * 0.2
+    weight_sum += 0.2
+
+    # Environment score (10% weight)
+    env_score = 50
+    temp = results.get('environment_info', {}).get('cpu_temperature_c')
+    if temp:
+        if temp > 80:
+            env_score -= 20
+        elif temp > 70:
+            env_score -= 10
+        elif temp < 50:
+            env_score += 10
+    score_components['environment'] = env_score
+    total_score += env_score * 0.1
+    weight_sum += 0.1
+
+    return {
+        'composite_score': round(total_score / weight_sum if weight_sum else 50, 2),
+        'components': score_components,
+        'methodology': 'Weighted average: Latency(40%) + Algorithms(30%) + System(20%) + Environment(10%)'
+    }
+
+
+def score_v2(results, baselines=None):
+    """Percentile/determinism score relative to the board-class reference"""
+    board_class = board_class_of(results)
+    baselines = baselines if baselines is not None else load_baselines()
+    reference = baselines.get(board_class) or GENERIC_BASELINE
+
+    ratios = {}
+    notes = []
+    cyclictest = results.get('cyclictest_results', {}) or {}
+    if cyclictest.get('simulated'):
+        notes.append('latency simulated - excluded from score')
+    elif cyclictest.get('success', True):
+        ratios['tail_latency'] = _ratio(reference.get('tail_latency_us'), tail_latency_of(cyclictest))
+        ratios['max_latency'] = _ratio(reference.get('max_latency_us'), cyclictest.get('max_latency_us'))
+
+    cov = iteration_cov(results)
+    if cov is not None:
+        ratios['determinism'] = _ratio(max(reference.get('iteration_cov') or 0, MIN_COV), max(cov, MIN_COV))
+
+    algorithm_ratios = []
+    for name, data in (results.get('algorithm_results') or {}).items():
+        if isinstance(data, dict) and data.get('success', True):
+            ratio = _ratio((reference.get('algorithm_times_ms') or {}).get(name), data.get('execution_time_ms'))
+            if ratio:
+                algorithm_ratios.append(ratio)
+    if algorithm_ratios:
+        ratios['algorithm_throughput'] = math.exp(sum(map(math.log, algorithm_ratios)) / len(algorithm_ratios))
+
+    ratios['stress_throughput'] = _ratio(reference.get('stress_ops_per_core'),
+                                         (results.get('multicore_stress') or {}).get('avg_ops_per_core'),
+                                         lower_is_better=False)
+
+    ratios = {key: value for key, value in ratios.items() if value}
+    weight_sum = sum(V2_WEIGHTS[key] for key in ratios)
+    if weight_sum:
+        log_score = sum(V2_WEIGHTS[key] * math.log(value) for key, value in ratios.items()) / weight_sum
+        composite = 100 * math.exp(log_score)
+    else:
+        composite = 0
+
+    return {
+        'composite_score': round(composite, 2),
+        'components': {key: round(100 * value, 2) for key, value in ratios.items()},
+        'board_class': board_class,
+        'baseline': reference.get('source', 'unknown'),
+        'notes': notes,
+        'methodology': ('Weighted geometric mean of ratios to the board-class reference run (100 = reference): '
+                        'TailLatency p99.9(30%, when recorded) + MaxLatency(20%) + IterationCoV(20%) + '
+                        'AlgorithmThroughput(15%) + StressThroughput(15%)')
+    }
+
+
+def compute_score(results, version=DEFAULT_SCORE_VERSION, baselines=None):
+    """Score a results dict with the requested formula version"""
+    if version not in SCORE_VERSIONS:
+        raise ValueError(f'Unknown score version: {version}')
+    score = score_v1(results) if version == 'v1' else score_v2(results, baselines)
+    score['score_version'] = version
+    score['preemption_model'] = preemption_model_of(results)
+    return score
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Columnar Series Archive
+=======================
+
+This module stores bulk numeric series (latency samples, per-iteration
+times) in a compact binary archive next to the results JSON, which keeps
+only summaries and a pointer.  Only flat numeric lists are moved:
+cyclictest histograms ({latency_us: count}) and thermal traces (lists of
+dicts) stay in the JSON.
+
+Features:
+---------
+- Typed arrays (array module typecodes) stored column by column
+- Zigzag delta + LEB128 varint encoding for integer series
+- Optional zlib or lzma compression per series
+- Raw uncompressed series aligned for zero-copy reads through mmap
+- Atomic writes (temp file + rename)
+
+File Layout:
+------------
+    header   b'RTSA' | u16 version | u16 flags | u64 index offset | u64 index length
+    blocks   one 64-byte aligned block per series
+    index    UTF-8 JSON describing every series (name, dtype, encoding, offset, ...)
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import array
+import json
+import lzma
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+ARCHIVE_MAGIC = b'RTSA'
+ARCHIVE_VERSION = 1
+ARCHIVE_EXTENSION = '.rtsa'
+HEADER_FORMAT = '<4sHHQQ'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+BLOCK_ALIGNMENT = 64
+
+ENCODINGS = ('raw', 'delta-varint')
+COMPRESSIONS = ('none', 'zlib', 'lzma')
+
+# Numeric lists at least this long are moved out of the results JSON
+EXTERNALIZE_MIN_LENGTH = 64
+
+# Keys marking bulk sample series that should stay mmap-able (raw, uncompressed)
+ZERO_COPY_KEY_MARKERS = ('samples',)
+
+
+def _zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value):
+    return value // 2 if not value & 1 else -(value + 1) // 2
+
+
+def encode_delta_varint(values):
+    """Encode integers as zigzag deltas in LEB128 varint form"""
+    out = bytearray()
+    previous = 0
+    for value in values:
+        delta = _zigzag(int(value) - previous)
+        previous = int(value)
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_delta_varint(data, count, typecode='q'):
+    """Decode zigzag delta varints back into an array"""
+    values = array.array(typecode)
+    previous = 0
+    shift = 0
+    accumulator = 0
+    for byte in data:
+        accumulator |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += _unzigzag(accumulator)
+        values.append(previous)
+        accumulator = 0
+        shift = 0
+    if len(values) != count:
+        raise ValueError(f'Decoded {len(values)} values, expected {count}')
+    return values
+
+
+def _compress(data, compression):
+    if compression == 'zlib':
+        return zlib.compress(data, 6)
+    if compression == 'lzma':
+        return lzma.compress(data, preset=6)
+    return data
+
+
+def _decompress(data, compression):
+    if compression == 'zlib':
+        return zlib.decompress(data)
+    if compression == 'lzma':
+        return lzma.decompress(data)
+    return bytes(data)
+
+
+class SeriesArchiveWriter:
+    """Write named numeric series into a single archive file"""
+
+    def __init__(self, path):
+        """Start a new archive (written atomically on close)"""
+        self.path = path
+        self.tmp_path = f'{path}.tmp{os.getpid()}'
+        self.file = open(self.tmp_path, 'wb')
+        self.file.write(b'\0' * HEADER_SIZE)
+        self.index = []
+        self.closed = False
+
+    def add_series(self, name, values, typecode='q', encoding='delta-varint',
+                   compression='zlib', scale=None, metadata=None):
+        """Append a series
+
+        ``scale`` stores floats as integers (value * scale) so they can use
+        delta-varint encoding; readers divide it back out.
+        """
+        if encoding not in ENCODINGS:
+            raise ValueError(f'Unknown encoding: {encoding}')
+        if compression not in COMPRESSIONS:
+            raise ValueError(f'Unknown compression: {compression}')
+
+        if scale:
+            values = [round(v * scale) for v in values]
+
+        if encoding == 'delta-varint':
+            if typecode in ('f', 'd'):
+                raise ValueError('delta-varint needs an integer typecode (use scale for floats)')
+            payload = encode_delta_varint(values)
+        else:
+            typed = values if isinstance(values, array.array) else array.array(typecode, values)
+            typecode = typed.typecode
+            if sys.byteorder != 'little':
+                typed = array.array(typecode, typed)
+                typed.byteswap()
+            payload = typed.tobytes()
+
+        payload = _compress(payload, compression)
+
+        # Align every block so raw series can be cast in place
+        position = self.file.tell()
+        padding = -position % BLOCK_ALIGNMENT
+        self.file.write(b'\0' * padding)
+        offset = position + padding
+        self.file.write(payload)
+
+        self.index.append({
+            'name': name,
+            'typecode': typecode,
+            'encoding': encoding,
+            'compression': compression,
+            'offset': offset,
+            'length': len(payload),
+            'count': len(values),
+            'scale': scale,
+            'metadata': metadata or {}
+        })
+
+    def close(self):
+        """Write the index and header, then move the archive into place"""
+        if self.closed:
+            return
+        index_bytes = json.dumps({'series': self.index}).encode()
+        index_offset = self.file.tell()
+        self.file.write(index_bytes)
+        self.file.seek(0)
+        self.file.write(struct.pack(HEADER_FORMAT, ARCHIVE_MAGIC, ARCHIVE_VERSION, 0,
+                                    index_offset, len(index_bytes)))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+        self.closed = True
+
+    def abort(self):
+        """Discard a partially written archive"""
+        if not self.closed:
+            self.file.close()
+            os.unlink(self.tmp_path)
+            self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class SeriesArchive:
+    """Memory-mapped reader for series archives"""
+
+    def __init__(self, path):
+        """Map the archive and parse its index"""
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _flags, index_offset, index_length = struct.unpack_from(HEADER_FORMAT, self._map, 0)
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError(f'{path} is not a series archive')
+        if version > ARCHIVE_VERSION:
+            raise ValueError(f'Unsupported archive version {version}')
+
+        index = json.loads(self._map[index_offset:index_offset + index_length].decode())
+        self.series = {entry['name']: entry for entry in index['series']}
+
+    def names(self):
+        """Names of all stored series"""
+        return list(self.series)
+
+    def info(self, name):
+        """Index entry of one series"""
+        return dict(self.series[name])
+
+    def is_zero_copy(self, name):
+        """True if get() returns a view into the mapping instead of a copy"""
+        entry = self.series[name]
+        return (entry['encoding'] == 'raw' and entry['compression'] == 'none'
+                and not entry['scale'] and sys.byteorder == 'little')
+
+    def get(self, name):
+        """Return a series
+
+        Raw uncompressed series come back as a memoryview over the mmap
+        (zero-copy); everything else is decoded into an array or list.
+        """
+        entry = self.series[name]
+        start = entry['offset']
+        view = memoryview(self._map)[start:start + entry['length']]
+
+        if self.is_zero_copy(name):
+            return view.cast(entry['typecode'])
+
+        data = _decompress(view, entry['compression'])
+        view.release()
+
+        if entry['encoding'] == 'delta-varint':
+            values = decode_delta_varint(data, entry['count'], entry['typecode'])
+        else:
+            values = array.array(entry['typecode'])
+            values.frombytes(data)
+            if sys.byteorder != 'little':
+                values.byteswap()
+
+        if entry['scale']:
+            return [v / entry['scale'] for v in values]
+        return values
+
+    def close(self):
+        """Unmap the archive (release views returned by get() first)"""
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # Zero-copy views still alive; the mapping goes with them
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _is_numeric_list(value):
+    return (isinstance(value, list) and len(value) >= EXTERNALIZE_MIN_LENGTH and
+            all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value))
+
+
+def externalize_series(results, archive_path):
+    """Move long numeric lists out of a results dict into an archive
+
+    Returns a copy of ``results`` where each moved list is replaced by a
+    pointer with summary statistics, or the original dict if nothing
+    qualified.
+    """
+    moved = []
+
+    def walk(node, path):
+        if isinstance(node, dict):
+            return {key: walk(value, f'{path}/{key}' if path else str(key)) for key, value in node.items()}
+        if _is_numeric_list(node):
+            moved.append((path, node))
+            return {
+                '$series': path,
+                'archive': os.path.basename(archive_path),
+                'count': len(node),
+                'min': min(node),
+                'max': max(node),
+                'mean': sum(node) / len(node)
+            }
+        return node
+
+    slim = walk(results, '')
+    if not moved:
+        return results
+
+    with SeriesArchiveWriter(archive_path) as writer:
+        for path, values in moved:
+            is_integer = all(isinstance(v, int) for v in values)
+            if any(marker in path.rsplit('/', 1)[-1] for marker in ZERO_COPY_KEY_MARKERS):
+                # Bulk samples: raw and uncompressed so readers can mmap them
+                writer.add_series(path, values, typecode='q' if is_integer else 'd',
+                                  encoding='raw', compression='none')
+            elif is_integer:
+                writer.add_series(path, values, typecode='q', encoding='delta-varint', compression='zlib')
+            else:
+                writer.add_series(path, values, typecode='d', encoding='raw', compression='zlib')
+
+    slim['series_archive'] = os.path.basename(archive_path)
+    return slim
+
+
+def resolve_series(results, base_dir, zero_copy=False):
+    """Replace archive pointers in a results dict with the stored series
+
+    Series come back as plain lists, so the dict can be dumped to JSON
+    again.  With zero_copy=True raw sample series stay memoryviews over
+    the mapped archive; call .tolist() on them before serialising.
+    """
+    archive_name = results.get('series_archive')
+    if not archive_name:
+        return results
+
+    archive = SeriesArchive(os.path.join(base_dir, archive_name))
+
+    def walk(node):
+        if isinstance(node, dict):
+            if '$series' in node and node['$series'] in archive.series:
+                values = archive.get(node['$series'])
+                if zero_copy and archive.is_zero_copy(node['$series']):
+                    return values
+                return values.tolist() if hasattr(values, 'tolist') else list(values)
+            return {key: walk(value) for key, value in node.items()}
+        return node
+
+    resolved = walk(results)
+    if not zero_copy:
+        archive.close()
+    # Otherwise the archive stays mapped while zero-copy views are referenced
+    return resolved
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Statistical Significance Testing
+================================
+
+This module compares two groups of benchmark runs metric by metric and
+decides whether a difference is a real change or noise.
+
+Features:
+---------
+- Mann-Whitney U test (normal approximation with tie correction)
+- Bootstrap confidence intervals for the difference in medians
+- Two-sample Kolmogorov-Smirnov test on cyclictest latency histograms
+  (or raw latency samples when a run carries them)
+- Per-run max/p99 latency and per-CPU max latency (one cyclictest thread
+  per CPU) compared with Mann-Whitney U
+- improved / regressed / no-change classification at a chosen confidence
+- Works on N runs per side (samples are pooled per metric)
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import bisect
+import math
+import random
+import statistics
+
+DEFAULT_CONFIDENCE = 0.95
+BOOTSTRAP_ITERATIONS = 2000
+BOOTSTRAP_MAX_SAMPLES = 2000
+MIN_SAMPLES = 3
+
+# (label, lower_is_better)
+RUN_METRICS = {
+    'composite_score': ('Composite Score', False),
+    'max_latency_us': ('Max Latency (μs)', True),
+    'avg_latency_us': ('Avg Latency (μs)', True),
+    'p99_latency_us': ('p99 Latency (μs)', True),
+    'avg_ops_per_core': ('Multicore Ops/Core', False),
+}
+
+LATENCY_SAMPLE_KEYS = ('latency_samples_us', 'samples_us')
+LATENCY_HISTOGRAM_KEY = 'histogram_us'
+# Pooled per-thread maxima; a single run per side still gives one sample per CPU
+PER_CPU_MAX_KEY = 'per_cpu_max_latency_us'
+
+
+def _normal_sf(z):
+    """Upper tail of the standard normal distribution"""
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def mann_whitney_u(a, b):
+    """Two-sided Mann-Whitney U test
+
+    Returns {'u', 'p_value', 'effect_size'} where effect_size is the
+    rank-biserial correlation (positive when b tends to be larger).
+    """
+    n1, n2 = len(a), len(b)
+    if not n1 or not n2:
+        return {'u': None, 'p_value': 1.0, 'effect_size': 0.0}
+
+    combined = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        for k in range(i, j + 1):
+            ranks[k] = average_rank
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+
+    rank_sum_a = sum(rank for rank, (_, side) in zip(ranks, combined) if side == 0)
+    u1 = rank_sum_a - n1 * (n1 + 1) / 2
+    u2 = n1 * n2 - u1
+
+    n = n1 + n2
+    mean_u = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0
+    if variance <= 0:
+        p_value = 1.0
+    else:
+        z = (abs(u1 - mean_u) - 0.5) / math.sqrt(variance)
+        p_value = min(1.0, 2 * _normal_sf(max(z, 0.0)))
+
+    return {
+        'u': min(u1, u2),
+        'p_value': p_value,
+        'effect_size': (u2 - u1) / (n1 * n2)
+    }
+
+
+def bootstrap_ci(a, b, statistic=statistics.median, confidence=DEFAULT_CONFIDENCE,
+                 iterations=BOOTSTRAP_ITERATIONS, seed=0):
+    """Percentile bootstrap CI for statistic(b) - statistic(a)"""
+    if not a or not b:
+        return None
+    rng = random.Random(seed)
+    # Long sample sets (e.g. raw latency samples) are thinned to keep this fast
+    if len(a) > BOOTSTRAP_MAX_SAMPLES:
+        a = rng.sample(list(a), BOOTSTRAP_MAX_SAMPLES)
+    if len(b) > BOOTSTRAP_MAX_SAMPLES:
+        b = rng.sample(list(b), BOOTSTRAP_MAX_SAMPLES)
+    diffs = []
+    for _ in range(iterations):
+        sample_a = rng.choices(a, k=len(a))
+        sample_b = rng.choices(b, k=len(b))
+        diffs.append(statistic(sample_b) - statistic(sample_a))
+    diffs.sort()
+    tail = (1 - confidence) / 2
+    low = diffs[int(tail * (iterations - 1))]
+    high = diffs[int(math.ceil((1 - tail) * (iterations - 1)))]
+    return (low, high)
+
+
+def _kolmogorov_sf(x):
+    """Asymptotic Kolmogorov distribution tail P(K > x)"""
+    if x <= 0:
+        return 1.0
+    total = 0.0
+    for k in range(1, 101):
+        term = 2 * (-1) ** (k - 1) * math.exp(-2 * k * k * x * x)
+        total += term
+        if abs(term) < 1e-12:
+            break
+    return min(1.0, max(0.0, total))
+
+
+def _ks_from_cdfs(points, cdf_a, cdf_b, n1, n2):
+    statistic = max((abs(cdf_a(x) - cdf_b(x)) for x in points), default=0.0)
+    effective_n = math.sqrt(n1 * n2 / (n1 + n2))
+    p_value = _kolmogorov_sf((effective_n + 0.12 + 0.11 / effective_n) * statistic)
+    return {'statistic': statistic, 'p_value': p_value}
+
+
+def ks_two_sample(a, b):
+    """Two-sample Kolmogorov-Smirnov test on raw samples"""
+    if not a or not b:
+        return {'statistic': None, 'p_value': 1.0}
+    sorted_a, sorted_b = sorted(a), sorted(b)
+
+    def ecdf(values):
+        return lambda x: bisect.bisect_right(values, x) / len(values)
+
+    return _ks_from_cdfs(sorted(set(sorted_a + sorted_b)), ecdf(sorted_a), ecdf(sorted_b),
+                         len(a), len(b))
+
+
+def ks_histograms(hist_a, hist_b):
+    """Two-sample KS test on latency histograms ({latency_us: count})"""
+    hist_a = {float(k): int(v) for k, v in hist_a.items()}
+    hist_b = {float(k): int(v) for k, v in hist_b.items()}
+    n1, n2 = sum(hist_a.values()), sum(hist_b.values())
+    if not n1 or not n2:
+        return {'statistic': None, 'p_value': 1.0}
+
+    points = sorted(set(hist_a) | set(hist_b))
+
+    def cumulative(hist, total):
+        running, cdf = 0, {}
+        for x in points:
+            running += hist.get(x, 0)
+            cdf[x] = running / total
+        return cdf.get
+
+    return _ks_from_cdfs(points, cumulative(hist_a, n1), cumulative(hist_b, n2), n1, n2)
+
+
+def classify(p_value, ci, median_delta, lower_is_better, confidence=DEFAULT_CONFIDENCE):
+    """Label a change as improved, regressed or no-change"""
+    alpha = 1 - confidence
+    if p_value >= alpha:
+        return 'no-change'
+    if ci is not None and ci[0] <= 0 <= ci[1]:
+        return 'no-change'
+    if median_delta == 0:
+        return 'no-change'
+    better = median_delta < 0 if lower_is_better else median_delta > 0
+    return 'improved' if better else 'regressed'
+
+
+def _as_run_list(runs):
+    if isinstance(runs, dict):
+        return [runs]
+    return [r for r in (runs or []) if r]
+
+
+def _numeric_list(value):
+    # Archive pointers ({'$series': ...}) that were not resolved are skipped
+    if isinstance(value, (list, tuple)) or hasattr(value, 'tolist'):
+        return [v for v in value if isinstance(v, (int, float))]
+    return []
+
+
+def _run_metric(result, key):
+    if key == 'composite_score':
+        score = result.get('composite_score')
+        if isinstance(score, dict):
+            score = score.get('composite_score')
+        return score
+    if key == 'avg_ops_per_core':
+        return (result.get('multicore_stress') or {}).get(key)
+    if key == 'p99_latency_us':
+        return ((result.get('cyclictest_results') or {}).get('percentiles_us') or {}).get('p99')
+    return (result.get('cyclictest_results') or {}).get(key)
+
+
+def collect_samples(runs):
+    """Pool per-metric samples from a list of results dicts"""
+    samples = {}
+    histograms = {}
+
+    for result in runs:
+        simulated = (result.get('cyclictest_results') or {}).get('simulated')
+        for key in RUN_METRICS:
+            if simulated and key.endswith('_latency_us'):
+                continue  # Random numbers, not a measurement
+            value = _run_metric(result, key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                samples.setdefault(key, []).append(value)
+
+        for name, data in (result.get('algorithm_results') or {}).items():
+            if isinstance(data, dict):
+                times = _numeric_list(data.get('all_times'))
+                if times:
+                    samples.setdefault(f'algorithm:{name}', []).extend(times)
+
+        cyclictest = result.get('cyclictest_results') or {}
+        if not simulated:
+            for thread in cyclictest.get('per_thread') or []:
+                if isinstance(thread, dict) and isinstance(thread.get('max_latency_us'), (int, float)):
+                    samples.setdefault(PER_CPU_MAX_KEY, []).append(thread['max_latency_us'])
+        for key in LATENCY_SAMPLE_KEYS:
+            values = _numeric_list(cyclictest.get(key))
+            if values:
+                samples.setdefault('latency_samples', []).extend(values)
+        histogram = cyclictest.get(LATENCY_HISTOGRAM_KEY)
+        if isinstance(histogram, dict):
+            merged = histograms.setdefault('latency_histogram', {})
+            for bucket, count in histogram.items():
+                merged[float(bucket)] = merged.get(float(bucket), 0) + count
+
+    return samples, histograms
+
+
+def compare_runs(baseline_runs, candidate_runs, confidence=DEFAULT_CONFIDENCE):
+    """Compare baseline runs against candidate runs
+
+    Returns {'confidence', 'baseline_runs', 'candidate_runs', 'metrics'}
+    where every metric entry carries medians, the median delta, test
+    p-values, the bootstrap CI and its classification.
+    """
+    baseline_runs = _as_run_list(baseline_runs)
+    candidate_runs = _as_run_list(candidate_runs)
+    base_samples, base_hists = collect_samples(baseline_runs)
+    cand_samples, cand_hists = collect_samples(candidate_runs)
+
+    metrics = {}
+    for key in sorted(set(base_samples) & set(cand_samples)):
+        a, b = base_samples[key], cand_samples[key]
+        if key in RUN_METRICS:
+            label, lower_is_better = RUN_METRICS[key]
+        elif key == 'latency_samples':
+            label, lower_is_better = 'Latency Samples (μs)', True
+        elif key == PER_CPU_MAX_KEY:
+            label, lower_is_better = 'Per-CPU Max Latency (μs)', True
+        else:
+            label, lower_is_better = f"{key.split(':', 1)[1]} time (ms)", True
+
+        entry = {
+            'label': label,
+            'lower_is_better': lower_is_better,
+            'baseline_n': len(a),
+            'candidate_n': len(b),
+            'baseline_median': statistics.median(a),
+            'candidate_median': statistics.median(b),
+        }
+        entry['delta'] = entry['candidate_median'] - entry['baseline_median']
+
+        if len(a) < MIN_SAMPLES or len(b) < MIN_SAMPLES:
+            entry.update({'p_value': None, 'ci': None, 'classification': 'insufficient-data'})
+        else:
+            mwu = mann_whitney_u(a, b)
+            ci = bootstrap_ci(a, b, confidence=confidence)
+            p_value = mwu['p_value']
+            if key == 'latency_samples':
+                ks = ks_two_sample(a, b)
+                entry['ks'] = ks
+                p_value = min(p_value, ks['p_value'])
+            entry.update({
+                'p_value': p_value,
+                'mann_whitney': mwu,
+                'ci': ci,
+                'classification': classify(p_value, ci, entry['delta'], lower_is_better, confidence)
+            })
+        metrics[key] = entry
+
+    for key in sorted(set(base_hists) & set(cand_hists)):
+        ks = ks_histograms(base_hists[key], cand_hists[key])
+        classification = 'no-change'
+        if ks['p_value'] < 1 - confidence:
+            # A shifted distribution: compare the upper tail to get the direction
+            shift = _histogram_quantile(cand_hists[key], 0.99) - _histogram_quantile(base_hists[key], 0.99)
+            classification = 'improved' if shift < 0 else 'regressed' if shift > 0 else 'no-change'
+        metrics[key] = {
+            'label': 'Latency Histogram (KS)',
+            'lower_is_better': True,
+            'baseline_n': sum(base_hists[key].values()),
+            'candidate_n': sum(cand_hists[key].values()),
+            'p_value': ks['p_value'],
+            'ks': ks,
+            'ci': None,
+            'classification': classification
+        }
+
+    return {
+        'confidence': confidence,
+        'baseline_runs': len(baseline_runs),
+        'candidate_runs': len(candidate_runs),
+        'metrics': metrics
+    }
+
+
+def _histogram_quantile(hist, q):
+    total = sum(hist.values())
+    running = 0
+    for bucket in sorted(hist):
+        running += hist[bucket]
+        if running >= q * total:
+            return bucket
+    return 0
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Long-Running Soak Mode
+======================
+
+This module keeps a latency probe running for hours or weeks and writes
+a compact snapshot every few minutes, so rare spikes that one-shot runs
+never see are caught with their thermal and interrupt context.
+
+Features:
+---------
+- cyclictest in histogram mode, back to back, or a Python timer probe
+- Optional background loads rotated per snapshot (see background_loads)
+- Per-snapshot histogram deltas, max/percentiles, thermal and IRQ deltas
+- Results-shaped soak_summary.json (cumulative histogram, thermal_trace)
+- Snapshot rotation bounded by disk usage
+- SIGTERM/SIGINT flush and stop, SIGHUP flushes a snapshot early;
+  the RT environment is always restored
+
+Layout:
+-------
+    <soak_dir>/<run_id>/snapshot_000001.json ...   (oldest rotated out)
+    <soak_dir>/<run_id>/soak_summary.json
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import json
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+
+from .background_loads import BackgroundLoad
+from .cyclictest import (CyclicTestIntegration, DEFAULT_HISTOGRAM_MAX_US, histogram_percentiles,
+                         merge_histograms)
+from .platform_compat import platform_compat
+
+DEFAULT_SOAK_DIR = 'rtos_soak'
+DEFAULT_SNAPSHOT_INTERVAL_S = 300
+DEFAULT_MAX_DISK_MB = 50
+DEFAULT_PROBE_INTERVAL_US = 1000
+THERMAL_SAMPLE_INTERVAL_S = 10
+# Snapshot-level thermal points kept in the summary (one week at 5 min)
+MAX_SUMMARY_TRACE_POINTS = 2016
+SUMMARY_FILE = 'soak_summary.json'
+SNAPSHOT_PREFIX = 'snapshot_'
+
+
+def _write_json(path, data, compact=False):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        if compact:
+            json.dump(data, f, separators=(',', ':'), default=str)
+        else:
+            json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def read_interrupt_counts(path='/proc/interrupts'):
+    """{'per_cpu': [count, ...], 'sources': {name: count}} or None"""
+    try:
+        with open(path, 'r') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    if not lines:
+        return None
+
+    cpu_count = len(lines[0].split())
+    per_cpu = [0] * cpu_count
+    sources = {}
+    for line in lines[1:]:
+        label, _, rest = line.partition(':')
+        fields = rest.split()
+        counts = []
+        for field in fields[:cpu_count]:
+            if not field.isdigit():
+                break
+            counts.append(int(field))
+        if not counts:
+            continue
+        label = label.strip()
+        description = fields[len(counts):]
+        name = f"{label}:{description[-1]}" if label.isdigit() and description else label
+        sources[name] = sum(counts)
+        for cpu, count in enumerate(counts):
+            per_cpu[cpu] += count
+    return {'per_cpu': per_cpu, 'sources': sources}
+
+
+def interrupt_delta(before, after, top=5):
+    """Interrupts taken between two read_interrupt_counts() readings"""
+    if not before or not after:
+        return None
+    per_cpu = [a - b for a, b in zip(after['per_cpu'], before['per_cpu'])]
+    sources = {name: count - before['sources'].get(name, 0) for name, count in after['sources'].items()}
+    busiest = sorted(((name, count) for name, count in sources.items() if count > 0),
+                     key=lambda item: item[1], reverse=True)[:top]
+    return {'total': sum(per_cpu), 'per_cpu': per_cpu, 'top_sources': dict(busiest)}
+
+
+def _latency_summary(histogram, samples=None, overflows=0, max_latency_us=None,
+                     histogram_max_us=DEFAULT_HISTOGRAM_MAX_US):
+    """min/avg/max/percentiles of a {latency_us: count} histogram
+
+    Latencies past histogram_max_us only arrive as an overflow count and
+    the probe's own max_latency_us. Overflows are counted at the histogram
+    limit, so with any of them the average and percentiles are lower
+    bounds ('percentiles_lower_bound').
+    """
+    counts = {int(us): count for us, count in histogram.items() if count}
+    if overflows:
+        counts[histogram_max_us] = counts.get(histogram_max_us, 0) + overflows
+    total = sum(counts.values())
+    if not total:
+        return {'samples': 0}
+    summary = {
+        'min_latency_us': min(counts),
+        'avg_latency_us': round(sum(us * count for us, count in counts.items()) / total, 1),
+        'max_latency_us': max(max(counts), max_latency_us or 0),
+        'samples': samples if samples is not None else total,
+        'percentiles_us': histogram_percentiles(counts)
+    }
+    if overflows:
+        summary['overflows'] = overflows
+        summary['percentiles_lower_bound'] = True
+    return summary
+
+
+class ThermalSampler:
+    """CPU temperature and frequency sampled on a background thread
+
+    Points are {'elapsed_s', 'temperature_c', 'frequency_mhz'}; take()
+    hands over the points collected since the previous call.
+    """
+
+    def __init__(self, interval_s=THERMAL_SAMPLE_INTERVAL_S, started=None):
+        self.interval_s = interval_s
+        self.started = started
+        self._points = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.started is None:
+            self.started = time.time()
+        self._thread = threading.Thread(target=self._run, name='rtos-thermal', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            self.sample()
+            if self._stop.wait(self.interval_s):
+                return
+
+    def sample(self):
+        """Record one point now"""
+        point = {
+            'elapsed_s': round(time.time() - (self.started or time.time()), 1),
+            'temperature_c': platform_compat.get_cpu_temperature(),
+            'frequency_mhz': platform_compat.get_cpu_frequency_mhz()
+        }
+        with self._lock:
+            self._points.append(point)
+        return point
+
+    def take(self):
+        """Points recorded since the last take()"""
+        with self._lock:
+            points, self._points = self._points, []
+        return points
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(1.0)
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+
+class PythonLatencyProbe:
+    """Periodic timer-wakeup latency measured from Python
+
+    Used when cyclictest is unavailable. Each period the probe sleeps
+    until an absolute CLOCK_MONOTONIC target and records how late it woke.
+    """
+
+    def __init__(self, interval_us=DEFAULT_PROBE_INTERVAL_US):
+        """Initialize probe with its wakeup period"""
+        self.interval_ns = interval_us * 1000
+
+    def run(self, duration, stop_event=None):
+        """Measure for `duration` seconds (or until stop_event is set)"""
+        histogram = {}
+        missed = 0
+        now = time.monotonic_ns()
+        end = now + int(duration * 1e9)
+        target = now + self.interval_ns
+        checks = 0
+
+        while target < end:
+            delay = target - time.monotonic_ns()
+            if delay > 0:
+                time.sleep(delay / 1e9)
+            woke = time.monotonic_ns()
+            late_us = (woke - target) // 1000
+            histogram[late_us] = histogram.get(late_us, 0) + 1
+
+            target += self.interval_ns
+            if woke > target:
+                # Periods that passed while we were late are not measured
+                skipped = (woke - target) // self.interval_ns + 1
+                missed += skipped
+                target += skipped * self.interval_ns
+
+            checks += 1
+            if stop_event is not None and checks % 100 == 0 and stop_event.is_set():
+                break
+
+        results = _latency_summary(histogram)
+        results.update({
+            'histogram_us': histogram,
+            'missed_periods': missed,
+            'duration': round((time.monotonic_ns() - now) / 1e9, 3),
+            'success': bool(histogram),
+            'probe': 'python'
+        })
+        return results
+
+
+class SoakRunner:
+    """Continuous latency measurement with periodic snapshots"""
+
+    DEFAULTS = {
+        'soak_duration_s': None,
+        'snapshot_interval_s': DEFAULT_SNAPSHOT_INTERVAL_S,
+        'soak_dir': DEFAULT_SOAK_DIR,
+        'soak_max_mb': DEFAULT_MAX_DISK_MB,
+        'soak_loads': ['none'],
+        'soak_probe': 'auto',
+        'priority': 99,
+        'histogram_max_us': DEFAULT_HISTOGRAM_MAX_US,
+        'metrics_textfile': None,
+        'show_progress': True,
+    }
+
+    def __init__(self, config=None):
+        """Initialize from a soak config (see DEFAULTS)"""
+        self.config = dict(self.DEFAULTS)
+        self.config.update({key: value for key, value in (config or {}).items() if value is not None})
+        self.interrupt = threading.Event()
+        self.stopping = False
+        self.probe = self._select_probe(self.config['soak_probe'])
+        self.run_id = None
+        self.run_dir = None
+        self.summary = None
+        self.thermal = None
+
+    @staticmethod
+    def _select_probe(probe):
+        if probe == 'auto':
+            return 'cyclictest' if platform_compat.is_linux and platform_compat.has_cyclictest() else 'python'
+        if probe not in ('cyclictest', 'python'):
+            raise ValueError(f"Unknown soak probe '{probe}' (use auto, cyclictest or python)")
+        return probe
+
+    def request_stop(self, *_):
+        """Flush the current snapshot and end the soak (SIGTERM/SIGINT)"""
+        self.stopping = True
+        self.interrupt.set()
+
+    def request_flush(self, *_):
+        """End the current snapshot early and keep going (SIGHUP)"""
+        self.interrupt.set()
+
+    def _install_signal_handlers(self):
+        previous = {}
+        if threading.current_thread() is not threading.main_thread():
+            return previous
+        handlers = {'SIGTERM': self.request_stop, 'SIGINT': self.request_stop, 'SIGHUP': self.request_flush}
+        for name, handler in handlers.items():
+            signum = getattr(signal, name, None)
+            if signum is not None:
+                previous[signum] = signal.signal(signum, handler)
+        return previous
+
+    def _take_thermal(self):
+        points = self.thermal.take()
+        summary = {}
+        for key in ('temperature_c', 'frequency_mhz'):
+            values = [p[key] for p in points if p.get(key) is not None]
+            if values:
+                summary[key] = {'min': min(values), 'max': max(values), 'last': values[-1]}
+        return summary
+
+    def _measure(self, seconds):
+        if self.probe == 'cyclictest':
+            return CyclicTestIntegration.run_cyclictest_histogram(
+                seconds, priority=self.config['priority'],
+                histogram_max_us=self.config['histogram_max_us'], stop_event=self.interrupt)
+        return PythonLatencyProbe().run(seconds, stop_event=self.interrupt)
+
+    def rotate(self):
+        """Delete the oldest snapshots until the run fits its disk budget"""
+        max_bytes = self.config['soak_max_mb'] * 1024 * 1024
+        snapshots = sorted(name for name in os.listdir(self.run_dir) if name.startswith(SNAPSHOT_PREFIX))
+        sizes = {name: os.path.getsize(os.path.join(self.run_dir, name)) for name in snapshots}
+        total = sum(sizes.values())
+        summary_path = os.path.join(self.run_dir, SUMMARY_FILE)
+        if os.path.exists(summary_path):
+            total += os.path.getsize(summary_path)
+        removed = 0
+        while total > max_bytes and len(snapshots) > 1:
+            oldest = snapshots.pop(0)
+            os.remove(os.path.join(self.run_dir, oldest))
+            total -= sizes[oldest]
+            removed += 1
+        return removed
+
+    def _export_metrics(self, summary, snapshot):
+        if not self.config.get('metrics_textfile'):
+            return
+        from .metrics_exporter import OpenMetricsExporter
+        latency = snapshot['latency']
+        soak_stats = {
+            'snapshots_total': summary['soak']['snapshots'],
+            'samples_total': summary['cyclictest_results'].get('samples', 0),
+            'elapsed_seconds': summary['soak']['elapsed_s'],
+            'latency_us': {'snapshot_max': latency.get('max_latency_us'),
+                           'snapshot_p99': (latency.get('percentiles_us') or {}).get('p99'),
+                           'max': summary['cyclictest_results'].get('max_latency_us')}
+        }
+        if snapshot.get('irq'):
+            soak_stats['interrupts_total'] = summary['soak']['interrupts']
+        export = OpenMetricsExporter(self.config['metrics_textfile']).write(summary, phase='soak',
+                                                                             soak_stats=soak_stats)
+        if not export['success']:
+            print(f"⚠️  Could not write metrics: {export['error']}")
+
+    def run(self):
+        """Soak until the duration elapses or a stop signal arrives"""
+        from .rtos_env import RTOSEnvironment
+
+        config = self.config
+        loads = config['soak_loads'] or ['none']
+        for name in loads:
+            BackgroundLoad(name)  # Validate names before touching the system
+
+        started = time.time()
+        self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.run_dir = os.path.join(config['soak_dir'], self.run_id)
+        os.makedirs(self.run_dir, exist_ok=True)
+
+        summary = {
+            'timestamp': datetime.now().isoformat(),
+            'test_config': config,
+            'system_info': platform_compat.get_system_info(),
+            'cyclictest_results': {'success': True, 'probe': self.probe, 'samples': 0},
+            'environment_info': {'thermal_trace': []},
+            'soak': {'run_id': self.run_id, 'status': 'running', 'probe': self.probe, 'snapshots': 0,
+                     'elapsed_s': 0, 'interrupts': 0, 'rotated_out': 0, 'per_load': {}, 'worst_snapshot': None}
+        }
+        self.summary = summary
+        histogram = {}
+        summary_path = os.path.join(self.run_dir, SUMMARY_FILE)
+
+        rt_env = RTOSEnvironment()
+        previous_handlers = self._install_signal_handlers()
+        self.thermal = ThermalSampler(started=started)
+
+        if config['show_progress']:
+            limit = f"{config['soak_duration_s']:.0f}s" if config['soak_duration_s'] else 'until stopped'
+            print(f"🔁 Soak {self.run_id}: probe={self.probe}, snapshot every {config['snapshot_interval_s']:.0f}s, "
+                  f"{limit}, loads={','.join(loads)}")
+            print(f"   Writing to {self.run_dir} (SIGTERM/Ctrl+C to stop, SIGHUP to flush)")
+
+        try:
+            rt_env.setup_rt_environment(target_priority=config['priority'])
+            self.thermal.start()
+            seq = 0
+            while not self.stopping:
+                remaining = None
+                if config['soak_duration_s']:
+                    remaining = config['soak_duration_s'] - (time.time() - started)
+                    if remaining <= 0:
+                        break
+                seconds = min(config['snapshot_interval_s'], remaining or config['snapshot_interval_s'])
+
+                load_name = loads[seq % len(loads)]
+                snapshot_start = time.time()
+                with BackgroundLoad(load_name, config=config):
+                    irq_before = read_interrupt_counts()
+                    measurement = self._measure(seconds)
+                    irq_after = read_interrupt_counts()
+                self.interrupt.clear()
+                seq += 1
+
+                delta = {int(us): count for us, count in (measurement.get('histogram_us') or {}).items()}
+                snapshot = {
+                    'seq': seq,
+                    'start': datetime.fromtimestamp(snapshot_start).isoformat(),
+                    'elapsed_s': round(time.time() - started, 1),
+                    'duration_s': measurement.get('duration'),
+                    'load': load_name,
+                    'probe': self.probe,
+                    'latency': _latency_summary(delta, measurement.get('samples'),
+                                                measurement.get('histogram_overflows', 0),
+                                                measurement.get('max_latency_us'), config['histogram_max_us']),
+                    'histogram_us': delta,
+                    'overflows': measurement.get('histogram_overflows', 0),
+                    'thermal': self._take_thermal(),
+                    'irq': interrupt_delta(irq_before, irq_after)
+                }
+                if not measurement.get('success'):
+                    snapshot['error'] = measurement.get('error', 'measurement failed')
+                _write_json(os.path.join(self.run_dir, f"{SNAPSHOT_PREFIX}{seq:06d}.json"), snapshot, compact=True)
+
+                # Cumulative view (survives snapshot rotation)
+                merge_histograms(histogram, delta)
+                previous = summary['cyclictest_results']
+                overflows = previous.get('histogram_overflows', 0) + snapshot['overflows']
+                cumulative = _latency_summary(histogram, overflows=overflows,
+                                              max_latency_us=max(previous.get('max_latency_us') or 0,
+                                                                 snapshot['latency'].get('max_latency_us') or 0),
+                                              histogram_max_us=config['histogram_max_us'])
+                cumulative.update({'success': True, 'probe': self.probe, 'histogram_us': histogram,
+                                   'histogram_overflows': overflows})
+                if cumulative.get('max_latency_us') is not None:
+                    cumulative['jitter_us'] = cumulative['max_latency_us'] - cumulative['min_latency_us']
+                summary['cyclictest_results'] = cumulative
+
+                soak = summary['soak']
+                soak['snapshots'] = seq
+                soak['elapsed_s'] = snapshot['elapsed_s']
+                soak['interrupts'] += (snapshot['irq'] or {}).get('total', 0)
+                snapshot_max = snapshot['latency'].get('max_latency_us')
+                worst = soak['worst_snapshot']
+                if snapshot_max is not None and (worst is None or snapshot_max > worst['max_latency_us']):
+                    soak['worst_snapshot'] = {'seq': seq, 'start': snapshot['start'], 'load': load_name,
+                                              'max_latency_us': snapshot_max, 'thermal': snapshot['thermal']}
+                per_load = soak['per_load'].setdefault(load_name, {'snapshots': 0, 'samples': 0,
+                                                                   'max_latency_us': None})
+                per_load['snapshots'] += 1
+                per_load['samples'] += snapshot['latency'].get('samples', 0)
+                if snapshot_max is not None:
+                    per_load['max_latency_us'] = max(per_load['max_latency_us'] or 0, snapshot_max)
+
+                trace = summary['environment_info']['thermal_trace']
+                thermal = snapshot['thermal']
+                trace.append({'elapsed_s': snapshot['elapsed_s'],
+                              'temperature_c': (thermal.get('temperature_c') or {}).get('max'),
+                              'frequency_mhz': (thermal.get('frequency_mhz') or {}).get('min')})
+                del trace[:-MAX_SUMMARY_TRACE_POINTS]
+
+                _write_json(summary_path, summary)
+                soak['rotated_out'] += self.rotate()
+                self._export_metrics(summary, snapshot)
+
+                if config['show_progress']:
+                    temperature = (thermal.get('temperature_c') or {}).get('max')
+                    print(f"📸 #{seq} [{load_name}] max {snapshot_max}μs, "
+                          f"p99 {(snapshot['latency'].get('percentiles_us') or {}).get('p99')}μs, "
+                          f"overall max {cumulative.get('max_latency_us')}μs"
+                          + (f", {temperature}°C" if temperature is not None else ''))
+
+            summary['soak']['status'] = 'stopped' if self.stopping else 'completed'
+            return {'success': True, 'summary_file': summary_path, 'run_dir': self.run_dir, 'results': summary}
+
+        except Exception as e:
+            summary['soak']['status'] = 'failed'
+            summary['soak']['error'] = str(e)
+            return {'success': False, 'error': f'Soak failed: {e}', 'run_dir': self.run_dir}
+
+        finally:
+            self.stopping = True
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            rt_env.cleanup_rt_environment()
+            summary['soak']['finished'] = datetime.now().isoformat()
+            _write_json(summary_path, summary)
+            self.thermal.stop()
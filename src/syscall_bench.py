@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Syscall and Timer Microbenchmarks
+=================================
+
+This module measures the cost of the OS primitives RT code leans on:
+clock reads, null syscalls, sched_yield, pipe reads and nanosleep.
+
+Features:
+---------
+- Batched calls with per-batch loop-overhead subtraction: each batch is
+  paired with a batch of a no-op C builtin of the same arity
+- ns per call with a confidence interval over batches
+- clock_gettime cost, clock_getres and observed granularity per clock id
+- nanosleep oversleep per requested duration (cyclictest-shaped summaries)
+- timer_overhead_s(): calibrated cost of a perf_counter() bracket, used by
+  AlgorithmBenchmark.benchmark_algorithm
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import functools
+import operator
+import os
+import statistics
+import sys
+import time
+from itertools import repeat
+
+from .quantile_sketch import LatencyRecorder
+
+DEFAULT_BATCH = 100000
+DEFAULT_BATCHES = 10
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_SLEEP_US = (1, 10, 100, 1000, 10000)
+SLEEP_SAMPLES = 200
+# Per requested duration, stop sampling after this much sleeping
+SLEEP_BUDGET_S = 1.0
+GRANULARITY_READS = 10000
+PIPE_SIZE = 1024 * 1024
+
+# Same-arity C builtins that do no work: the loop-overhead baseline
+NULL_CALLS = {0: sys.getrecursionlimit, 1: id, 2: operator.is_}
+
+CLOCK_IDS = {
+    'realtime': getattr(time, 'CLOCK_REALTIME', None),
+    'monotonic': getattr(time, 'CLOCK_MONOTONIC', None),
+    'monotonic_raw': getattr(time, 'CLOCK_MONOTONIC_RAW', None),
+    'boottime': getattr(time, 'CLOCK_BOOTTIME', None),
+    'tai': getattr(time, 'CLOCK_TAI', None),
+    'process_cputime': getattr(time, 'CLOCK_PROCESS_CPUTIME_ID', None),
+    'thread_cputime': getattr(time, 'CLOCK_THREAD_CPUTIME_ID', None),
+    # Not exported by the time module; Linux clock ids 5 and 6
+    'realtime_coarse': 5 if sys.platform.startswith('linux') else None,
+    'monotonic_coarse': 6 if sys.platform.startswith('linux') else None,
+}
+
+
+def _z_value(confidence):
+    return statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def _time_loop(func, args, count):
+    start = time.perf_counter_ns()
+    for _ in repeat(None, count):
+        func(*args)
+    return time.perf_counter_ns() - start
+
+
+def measure_call(func, args=(), batch=DEFAULT_BATCH, batches=DEFAULT_BATCHES,
+                 confidence=DEFAULT_CONFIDENCE, prepare=None):
+    """ns per call of func(*args) with loop overhead subtracted
+
+    prepare(), when given, runs before every timed batch (e.g. to refill
+    a pipe) and is not timed.
+    """
+    null_call = NULL_CALLS[len(args)]
+    per_call = []
+    if prepare:
+        prepare()
+    _time_loop(func, args, min(batch, 1000))  # Warm up
+    for _ in range(batches):
+        if prepare:
+            prepare()
+        elapsed = _time_loop(func, args, batch)
+        baseline = _time_loop(null_call, args, batch)
+        per_call.append((elapsed - baseline) / batch)
+
+    mean = statistics.fmean(per_call)
+    stdev = statistics.stdev(per_call) if len(per_call) > 1 else 0.0
+    # Normal approximation over batch means
+    half_width = _z_value(confidence) * stdev / len(per_call) ** 0.5
+    return {
+        'ns_per_call': round(mean, 2),
+        'ci_ns': [round(mean - half_width, 2), round(mean + half_width, 2)],
+        'stdev_ns': round(stdev, 2),
+        'min_ns': round(min(per_call), 2),
+        'batch': batch,
+        'batches': batches,
+        'confidence': confidence,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def timer_overhead_s(reads=20000):
+    """Smallest interval two back-to-back perf_counter() calls can report
+
+    This is the fixed cost inside every start/end bracket; the minimum is
+    used so preemptions during calibration do not inflate it.
+    """
+    perf_counter = time.perf_counter
+    best = float('inf')
+    for _ in range(reads):
+        start = perf_counter()
+        end = perf_counter()
+        if end - start < best:
+            best = end - start
+    return max(best, 0.0)
+
+
+def clock_granularity_ns(clock_id, reads=GRANULARITY_READS):
+    """Smallest non-zero step seen between consecutive clock reads"""
+    read = time.clock_gettime_ns
+    smallest = None
+    previous = read(clock_id)
+    for _ in range(reads):
+        current = read(clock_id)
+        step = current - previous
+        if step > 0 and (smallest is None or step < smallest):
+            smallest = step
+        previous = current
+    return smallest
+
+
+def measure_clocks(batch=DEFAULT_BATCH, batches=DEFAULT_BATCHES, confidence=DEFAULT_CONFIDENCE):
+    """clock_gettime cost, resolution and granularity per clock id"""
+    clocks, unavailable = {}, {}
+    for name, clock_id in CLOCK_IDS.items():
+        if clock_id is None:
+            unavailable[name] = 'clock id not available on this platform'
+            continue
+        try:
+            resolution_ns = round(time.clock_getres(clock_id) * 1e9)
+        except OSError as e:
+            unavailable[name] = f'clock_getres failed: {e}'
+            continue
+        result = measure_call(time.clock_gettime_ns, (clock_id,), batch, batches, confidence)
+        result['resolution_ns'] = resolution_ns
+        result['granularity_ns'] = clock_granularity_ns(clock_id)
+        clocks[name] = result
+    return clocks, unavailable
+
+
+class _FilledPipe:
+    """Pipe kept full enough for one batch of 1-byte reads"""
+
+    def __init__(self):
+        self.read_fd, self.write_fd = os.pipe()
+        self.capacity = 65536
+        if hasattr(os, 'set_blocking'):
+            os.set_blocking(self.write_fd, False)
+        try:
+            import fcntl
+            self.capacity = fcntl.fcntl(self.write_fd, getattr(fcntl, 'F_SETPIPE_SZ', 1031), PIPE_SIZE)
+        except (ImportError, OSError):
+            pass
+
+    def fill(self):
+        chunk = b'x' * self.capacity
+        try:
+            while chunk:
+                chunk = chunk[os.write(self.write_fd, chunk):]
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+
+def measure_syscalls(batch=DEFAULT_BATCH, batches=DEFAULT_BATCHES, confidence=DEFAULT_CONFIDENCE):
+    """ns per call for the timer functions and null-class syscalls"""
+    calls = {
+        'perf_counter_ns': measure_call(time.perf_counter_ns, (), batch, batches, confidence),
+        'perf_counter': measure_call(time.perf_counter, (), batch, batches, confidence),
+        'monotonic_ns': measure_call(time.monotonic_ns, (), batch, batches, confidence),
+        'getpid': measure_call(os.getpid, (), batch, batches, confidence),
+    }
+    unavailable = {}
+    if hasattr(os, 'sched_yield'):
+        calls['sched_yield'] = measure_call(os.sched_yield, (), batch, batches, confidence)
+    else:
+        unavailable['sched_yield'] = 'os.sched_yield not available'
+
+    pipe = _FilledPipe()
+    try:
+        read_batch = min(batch, pipe.capacity)
+        calls['pipe_read_1b'] = measure_call(os.read, (pipe.read_fd, 1), read_batch, batches,
+                                             confidence, prepare=pipe.fill)
+    finally:
+        pipe.close()
+    return calls, unavailable
+
+
+def measure_oversleep(sleep_us=DEFAULT_SLEEP_US, samples=SLEEP_SAMPLES, stop_event=None):
+    """time.sleep oversleep (actual - requested) per requested duration"""
+    oversleep = {}
+    clock = time.perf_counter_ns
+    for requested_us in sleep_us:
+        requested_s = requested_us / 1e6
+        count = max(10, min(samples, int(SLEEP_BUDGET_S / requested_s)))
+        recorder = LatencyRecorder()
+        for _ in range(count):
+            if stop_event is not None and stop_event.is_set():
+                break
+            start = clock()
+            time.sleep(requested_s)
+            recorder.add_ns(max(clock() - start - requested_us * 1000, 0))
+        summary = recorder.summary()
+        summary['requested_us'] = requested_us
+        oversleep[f'{requested_us}us'] = summary
+    return oversleep
+
+
+def run_syscall_suite(config=None, stop_event=None):
+    """Results for the 'syscall_bench' phase"""
+    config = config or {}
+    show_progress = config.get('show_progress', True)
+    batch = config.get('syscall_batch', DEFAULT_BATCH)
+    batches = config.get('syscall_batches', DEFAULT_BATCHES)
+    confidence = config.get('syscall_confidence', DEFAULT_CONFIDENCE)
+
+    try:
+        calls, unavailable = measure_syscalls(batch, batches, confidence)
+        if show_progress:
+            for name, result in calls.items():
+                print(f"   ✅ {name}: {result['ns_per_call']} ns/call")
+        clocks, clock_unavailable = measure_clocks(batch, batches, confidence)
+        unavailable.update({f'clock_{name}': reason for name, reason in clock_unavailable.items()})
+        if show_progress:
+            for name, result in clocks.items():
+                print(f"   ✅ clock_gettime({name}): {result['ns_per_call']} ns/call, "
+                      f"resolution {result['resolution_ns']} ns")
+        oversleep = measure_oversleep(config.get('syscall_sleep_us') or DEFAULT_SLEEP_US,
+                                      config.get('syscall_sleep_samples', SLEEP_SAMPLES), stop_event)
+    except OSError as e:
+        return {'success': False, 'error': f'Syscall benchmark failed: {e}'}
+
+    if show_progress:
+        for name, summary in oversleep.items():
+            if summary.get('success'):
+                print(f"   ✅ sleep({name}): oversleep p99 {summary['percentiles_us'].get('p99')} μs")
+    return {
+        'success': True,
+        'calls': calls,
+        'clocks': clocks,
+        'timer_overhead_ns': round(timer_overhead_s() * 1e9, 2),
+        # Same shape as the other workloads, so the latency section renders it
+        'latency': {'nanosleep_oversleep': oversleep},
+        'unavailable': unavailable,
+        'metric': 'oversleep',
+        'cancelled': bool(stop_event is not None and stop_event.is_set()),
+    }
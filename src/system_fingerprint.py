@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+System Fingerprinting
+=====================
+
+This module builds an immutable, cached description of the board and
+kernel a benchmark runs on, plus a stable hash for grouping results.
+
+Features:
+---------
+- OS identity from os.uname() (no ``uname -a`` subprocess)
+- One pass over /proc/cpuinfo, /proc/meminfo and /proc/cmdline
+- Preemption model (none/voluntary/full/rt) from sysfs, config and uname
+- Kernel configuration (/proc/config.gz or /boot/config-*): PREEMPT_RT, HZ, NO_HZ
+- CPU cache topology from sysfs
+- Independent sources collected concurrently
+- Stable board and board+kernel fingerprint hashes
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import copy
+import gzip
+import hashlib
+import json
+import os
+import struct
+import sys
+from .preemption import DEBUGFS_PREEMPT_PATH, REALTIME_SYSFS_PATH, detect_preemption_model
+
+# Kernel config options that matter for real-time behaviour
+KERNEL_CONFIG_OPTIONS = (
+    'CONFIG_PREEMPT_RT',
+    'CONFIG_PREEMPT',
+    'CONFIG_PREEMPT_VOLUNTARY',
+    'CONFIG_PREEMPT_NONE',
+    'CONFIG_PREEMPT_DYNAMIC',
+    'CONFIG_PREEMPT_LAZY',
+    'CONFIG_HZ',
+    'CONFIG_NO_HZ',
+    'CONFIG_NO_HZ_IDLE',
+    'CONFIG_NO_HZ_FULL',
+    'CONFIG_HIGH_RES_TIMERS',
+    'CONFIG_CPU_FREQ_DEFAULT_GOV_PERFORMANCE',
+    'CONFIG_CPU_FREQ_DEFAULT_GOV_SCHEDUTIL',
+    'CONFIG_CPU_FREQ_DEFAULT_GOV_ONDEMAND',
+)
+
+# Keys that identify the hardware (board class)
+BOARD_IDENTITY_KEYS = ('cpu_info', 'board_model', 'machine', 'cpu_count', 'memory_class_gb', 'cache_topology')
+
+# Keys that identify the kernel build running on the board
+KERNEL_IDENTITY_KEYS = ('kernel_release', 'kernel_version', 'kernel_config', 'preemption_model')
+
+
+def _read_text(path):
+    """Read a small text file, returning None if unavailable"""
+    try:
+        with open(path, 'r') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _stable_hash(values):
+    """Short SHA-256 over a JSON-canonicalised structure"""
+    encoded = json.dumps(values, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def parse_cpuinfo(text):
+    """Single pass over /proc/cpuinfo keeping the first value of each key"""
+    fields = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition(':')
+        if not sep:
+            continue
+        key = key.strip()
+        if key and key not in fields:
+            fields[key] = value.strip()
+    return fields
+
+
+def parse_meminfo(text):
+    """Single pass over /proc/meminfo returning values in kB"""
+    meminfo = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and parts[1].isdigit():
+            meminfo[parts[0].rstrip(':')] = int(parts[1])
+    return meminfo
+
+
+def parse_kernel_config(text):
+    """Extract the RT-relevant options from a kernel .config"""
+    options = {}
+    wanted = set(KERNEL_CONFIG_OPTIONS)
+    for line in text.splitlines():
+        if line.startswith('CONFIG_'):
+            key, _, value = line.partition('=')
+            if key in wanted:
+                options[key] = value.strip('"')
+        elif line.startswith('# CONFIG_') and line.endswith(' is not set'):
+            key = line[2:-len(' is not set')]
+            if key in wanted:
+                options[key] = 'n'
+    return options
+
+
+def read_kernel_config(release):
+    """Load the running kernel's config from /proc/config.gz or /boot"""
+    try:
+        with gzip.open('/proc/config.gz', 'rt') as f:
+            return '/proc/config.gz', parse_kernel_config(f.read())
+    except (OSError, EOFError):
+        pass
+
+    for path in (f'/boot/config-{release}', f'/lib/modules/{release}/build/.config'):
+        text = _read_text(path)
+        if text is not None:
+            return path, parse_kernel_config(text)
+
+    return None, {}
+
+
+def summarize_kernel_config(source, options):
+    """Normalise kernel config options into typed fields"""
+    if not source:
+        return {'available': False}
+
+    def enabled(name):
+        return options.get(name) == 'y'
+
+    hz = options.get('CONFIG_HZ')
+    return {
+        'available': True,
+        'source': source,
+        'preempt_rt': enabled('CONFIG_PREEMPT_RT'),
+        'preempt': enabled('CONFIG_PREEMPT'),
+        'preempt_voluntary': enabled('CONFIG_PREEMPT_VOLUNTARY'),
+        'preempt_none': enabled('CONFIG_PREEMPT_NONE'),
+        'preempt_dynamic': enabled('CONFIG_PREEMPT_DYNAMIC'),
+        'hz': int(hz) if hz and hz.isdigit() else None,
+        'no_hz_full': enabled('CONFIG_NO_HZ_FULL'),
+        'no_hz_idle': enabled('CONFIG_NO_HZ_IDLE') or enabled('CONFIG_NO_HZ'),
+        'high_res_timers': enabled('CONFIG_HIGH_RES_TIMERS'),
+        'options': dict(sorted(options.items()))
+    }
+
+
+def read_cache_topology(cpu=0):
+    """Describe the cache hierarchy seen by one CPU via sysfs"""
+    base = f'/sys/devices/system/cpu/cpu{cpu}/cache'
+    caches = []
+    try:
+        entries = sorted(e for e in os.listdir(base) if e.startswith('index'))
+    except OSError:
+        return caches
+
+    for entry in entries:
+        fields = {}
+        for name in ('level', 'type', 'size', 'coherency_line_size',
+                     'ways_of_associativity', 'shared_cpu_list'):
+            value = _read_text(os.path.join(base, entry, name))
+            if value is not None:
+                fields[name] = value.strip()
+        if fields:
+            caches.append(fields)
+    return caches
+
+
+class SystemFingerprint:
+    """Immutable snapshot of board and kernel identity"""
+
+    __slots__ = ('_info', 'fingerprint', 'board_fingerprint')
+
+    def __init__(self, info):
+        """Freeze collected system info and derive its identity hashes"""
+        info = copy.deepcopy(info)
+        board = {key: info.get(key) for key in BOARD_IDENTITY_KEYS}
+        kernel = {key: info.get(key) for key in KERNEL_IDENTITY_KEYS}
+        board_fingerprint = _stable_hash(board)
+        fingerprint = _stable_hash({'board': board, 'kernel': kernel})
+
+        info['board_fingerprint'] = board_fingerprint
+        info['fingerprint'] = fingerprint
+
+        object.__setattr__(self, '_info', info)
+        object.__setattr__(self, 'board_fingerprint', board_fingerprint)
+        object.__setattr__(self, 'fingerprint', fingerprint)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('SystemFingerprint is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('SystemFingerprint is immutable')
+
+    def __getitem__(self, key):
+        return copy.deepcopy(self._info[key])
+
+    def __contains__(self, key):
+        return key in self._info
+
+    def __eq__(self, other):
+        return isinstance(other, SystemFingerprint) and other.fingerprint == self.fingerprint
+
+    def __hash__(self):
+        return hash(self.fingerprint)
+
+    def __repr__(self):
+        return f"SystemFingerprint({self.fingerprint}, {self._info.get('cpu_info')!r})"
+
+    def get(self, key, default=None):
+        """dict-style access returning a copy of the value"""
+        if key in self._info:
+            return copy.deepcopy(self._info[key])
+        return default
+
+    def to_dict(self):
+        """Independent dict copy, compatible with the legacy system_info layout"""
+        return copy.deepcopy(self._info)
+
+    @classmethod
+    def collect(cls, compat):
+        """Collect a fingerprint for the running system
+
+        ``compat`` is the PlatformCompat instance used for OS detection.
+        """
+        import platform
+
+        info = {}
+
+        # OS identity straight from the uname(2) syscall
+        if hasattr(os, 'uname'):
+            uts = os.uname()
+            sysname, nodename, release, version, machine = uts
+            uname = f'{sysname} {nodename} {release} {version} {machine}'
+            if compat.is_linux:
+                uname += ' GNU/Linux'  # Match historical `uname -a` strings
+        else:
+            sysname, nodename = platform.system(), platform.node()
+            release, version, machine = platform.release(), platform.version(), platform.machine()
+            uname = f'{sysname} {release} {version} {machine}'
+
+        info['os_info'] = uname if compat.is_unix else f'{sysname} {release} {version}'
+        info['uname'] = uname
+        info['kernel_release'] = release
+        info['kernel_version'] = version
+        info['kernel_info'] = release
+        info['machine'] = machine
+        info['cpu_count'] = os.cpu_count() or 1
+        info['architecture'] = f'{struct.calcsize("P") * 8}bit'
+        info['python_version'] = sys.version
+
+        if compat.is_linux:
+            info.update(cls._collect_linux(release, version, machine))
+        else:
+            info['cpu_info'] = platform.processor() or machine
+            info['memory_gb'] = cls._windows_memory_gb() if compat.is_windows else 'Unknown'
+            info['kernel_config'] = {'available': False}
+            info['cache_topology'] = []
+            info['kernel_cmdline'] = None
+            info['board_model'] = None
+            info['preemption'] = detect_preemption_model(realtime_flag='', dynamic_preempt='')
+            info['preemption_model'] = 'unknown'
+            info['rt_kernel_capable'] = False
+
+        if not info.get('cpu_info'):
+            info['cpu_info'] = f"{machine} ({info['cpu_count']} cores)"
+
+        try:
+            info['platform'] = platform.platform()
+        except Exception:
+            info['platform'] = f'{sysname}-{release}-{machine}'
+        info['processor'] = platform.processor() or machine
+
+        memory_gb = info.get('memory_gb')
+        info['memory_class_gb'] = round(memory_gb) if isinstance(memory_gb, (int, float)) else None
+
+        return cls(info)
+
+    @staticmethod
+    def _collect_linux(release, version, machine):
+        """Read each Linux source once, independent sources concurrently"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        jobs = {
+            'cpuinfo': lambda: _read_text('/proc/cpuinfo'),
+            'meminfo': lambda: _read_text('/proc/meminfo'),
+            'cmdline': lambda: _read_text('/proc/cmdline'),
+            'model': lambda: _read_text('/proc/device-tree/model'),
+            'realtime': lambda: _read_text(REALTIME_SYSFS_PATH),
+            'dynamic_preempt': lambda: _read_text(DEBUGFS_PREEMPT_PATH),
+            'kernel_config': lambda: read_kernel_config(release),
+            'cache_topology': read_cache_topology,
+        }
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = {name: executor.submit(job) for name, job in jobs.items()}
+            raw = {name: future.result() for name, future in futures.items()}
+
+        info = {}
+
+        cpuinfo = parse_cpuinfo(raw['cpuinfo'] or '')
+        hardware = cpuinfo.get('Hardware')
+        cpu_model = cpuinfo.get('model name') or cpuinfo.get('Model')
+        if cpu_model:
+            info['cpu_info'] = cpu_model
+        elif hardware:
+            info['cpu_info'] = f'{hardware} ({machine})'
+        if cpuinfo.get('CPU part'):
+            info['cpu_part'] = f"{cpuinfo.get('CPU implementer', '?')}:{cpuinfo['CPU part']}"
+
+        meminfo = parse_meminfo(raw['meminfo'] or '')
+        if 'MemTotal' in meminfo:
+            info['memory_gb'] = round(meminfo['MemTotal'] / 1024 / 1024, 1)
+        else:
+            info['memory_gb'] = 'Unknown'
+
+        board_model = (raw['model'] or '').rstrip('\x00').strip()
+        info['board_model'] = board_model or cpuinfo.get('Model')
+
+        info['kernel_cmdline'] = (raw['cmdline'] or '').strip() or None
+        source, options = raw['kernel_config']
+        info['kernel_config'] = summarize_kernel_config(source, options)
+        info['cache_topology'] = raw['cache_topology']
+
+        preemption = detect_preemption_model(
+            kernel_version=version,
+            kernel_config_options=options,
+            cmdline=info['kernel_cmdline'],
+            realtime_flag=(raw['realtime'] or '').strip(),
+            dynamic_preempt=raw['dynamic_preempt'] or ''
+        )
+        info['preemption'] = preemption
+        info['preemption_model'] = preemption['model']
+        info['rt_kernel_capable'] = preemption['model'] == 'rt'
+
+        return info
+
+    @staticmethod
+    def _windows_memory_gb():
+        """Total physical memory on Windows via GlobalMemoryStatusEx"""
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            c_ulong = ctypes.c_ulong
+
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [
+                    ('dwLength', c_ulong),
+                    ('dwMemoryLoad', c_ulong),
+                    ('ullTotalPhys', ctypes.c_ulonglong),
+                    ('ullAvailPhys', ctypes.c_ulonglong),
+                    ('ullTotalPageFile', ctypes.c_ulonglong),
+                    ('ullAvailPageFile', ctypes.c_ulonglong),
+                    ('ullTotalVirtual', ctypes.c_ulonglong),
+                    ('ullAvailVirtual', ctypes.c_ulonglong),
+                    ('sullAvailExtendedVirtual', ctypes.c_ulonglong),
+                ]
+
+            memory_status = MEMORYSTATUSEX()
+            memory_status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            kernel32.GlobalMemoryStatusEx(ctypes.byref(memory_status))
+            return round(memory_status.ullTotalPhys / 1024 / 1024 / 1024, 1)
+        except Exception:
+            return 'Unknown'
+
+
+def fingerprint_of(results):
+    """Board+kernel fingerprint recorded in a results dict
+
+    Results saved before fingerprinting existed get an equivalent hash
+    derived from the system_info fields they do carry.
+    """
+    system_info = results.get('system_info', {}) or {}
+    if system_info.get('fingerprint'):
+        return system_info['fingerprint']
+
+    uname = system_info.get('uname') or system_info.get('os_info') or ''
+    parts = uname.split()
+    memory_gb = system_info.get('memory_gb')
+    legacy_identity = {
+        'cpu_info': system_info.get('cpu_info'),
+        'cpu_count': system_info.get('cpu_count'),
+        'memory_class_gb': round(memory_gb) if isinstance(memory_gb, (int, float)) else None,
+        'kernel_release': parts[2] if len(parts) > 2 else None,
+        'kernel_version': ' '.join(parts[3:]) if len(parts) > 3 else None,
+    }
+    return _stable_hash(legacy_identity)
+
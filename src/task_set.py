@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Periodic RT Task-Set Simulator
+==============================
+
+This module runs a periodic task set and checks whether it meets its
+deadlines. cyclictest shows wakeup latency; this shows whether a
+realistic set of control tasks is schedulable on the board.
+
+Features:
+---------
+- Task set from config or a JSON file: period, WCET, deadline, priority,
+  core and the algorithm used as busy work (sized to the WCET)
+- Rate-monotonic priorities when a task gives none
+- Each task a pinned SCHED_FIFO process (or thread) releasing jobs on
+  absolute deadlines with clock_nanosleep(TIMER_ABSTIME)
+- Response time, execution time, deadline misses and WCET overruns per
+  job in a shared-memory ring buffer per task
+- Rate-monotonic analysis (Liu & Layland bound and exact response-time
+  analysis) compared with the observed schedulability
+
+Usage:
+------
+    python main.py --task-set tasks.json
+    # tasks.json: [{"name": "control", "period_ms": 5, "wcet_ms": 1,
+    #               "algorithm": "quicksort", "priority": 90, "cpu": 3}, ...]
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import ctypes
+import ctypes.util
+import json
+import math
+import multiprocessing
+import random
+import signal
+import statistics
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+from .algorithms import RTOSSortingAlgorithms
+from .ipc_latency import available_cpus, default_cpu_pair, resolve_cpu
+from .multicore import MulticoreManager
+from .quantile_sketch import LatencyRecorder
+
+DEFAULT_TASK_SET = (
+    {'name': 'control', 'period_ms': 5, 'wcet_ms': 1, 'algorithm': 'quicksort'},
+    {'name': 'sensor_fusion', 'period_ms': 10, 'wcet_ms': 2, 'algorithm': 'merge_sort'},
+    {'name': 'telemetry', 'period_ms': 20, 'wcet_ms': 4, 'algorithm': 'heap_sort'},
+)
+DEFAULT_DURATION_S = 5
+MODES = ('process', 'thread')
+RING_SIZE = 4096
+# Busy work is sized to this fraction of the WCET, so an overrun means the
+# job took noticeably longer than it did during calibration
+LOAD_FACTOR = 0.8
+WORK_DATA_SIZE = 64
+CALIBRATION_CALLS = 21
+# Time for every task to start and switch policy before the first release
+START_DELAY_S = 0.3
+
+# Ring header: jobs, deadline misses, overruns, max response (ns), RT policy set
+HEADER = struct.Struct('=QQQqq')
+# Ring record: release (ns), response time (ns), execution time (ns), flags
+RECORD = struct.Struct('=qqqI4x')
+MISSED, OVERRAN = 1, 2
+
+CLOCK_MONOTONIC = getattr(time, 'CLOCK_MONOTONIC', 1)
+TIMER_ABSTIME = 1
+EINTR = 4
+
+
+class _Timespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+
+_clock_nanosleep = None
+
+
+def monotonic_ns():
+    return time.clock_gettime_ns(CLOCK_MONOTONIC)
+
+
+def sleep_until_ns(deadline_ns):
+    """Sleep until CLOCK_MONOTONIC reaches deadline_ns (absolute, no drift)"""
+    global _clock_nanosleep
+    if _clock_nanosleep is None:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'))
+        _clock_nanosleep = getattr(libc, 'clock_nanosleep', False)
+    if not _clock_nanosleep:
+        time.sleep(max(0, deadline_ns - monotonic_ns()) / 1e9)
+        return
+    request = _Timespec(deadline_ns // 1_000_000_000, deadline_ns % 1_000_000_000)
+    # Returns the error number itself; retry when a signal interrupts it
+    while _clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, ctypes.byref(request), None) == EINTR:
+        pass
+
+
+class TaskRing:
+    """Per-task ring of job records in shared memory (single writer)"""
+
+    def __init__(self, capacity=RING_SIZE):
+        self.capacity = capacity
+        self.shm = shared_memory.SharedMemory(create=True, size=HEADER.size + capacity * RECORD.size)
+        self.shm.buf[:HEADER.size] = HEADER.pack(0, 0, 0, 0, 0)
+
+    def counters(self):
+        jobs, misses, overruns, max_response_ns, rt_policy = HEADER.unpack_from(self.shm.buf, 0)
+        return {'jobs': jobs, 'misses': misses, 'overruns': overruns,
+                'max_response_ns': max_response_ns, 'rt_policy': bool(rt_policy)}
+
+    def set_rt_policy(self, enabled):
+        counters = self.counters()
+        HEADER.pack_into(self.shm.buf, 0, counters['jobs'], counters['misses'], counters['overruns'],
+                         counters['max_response_ns'], int(enabled))
+
+    def record(self, release_ns, response_ns, exec_ns, missed, overran):
+        """Append one job; the record is written before the header counts it"""
+        jobs, misses, overruns, max_response_ns, rt_policy = HEADER.unpack_from(self.shm.buf, 0)
+        flags = (MISSED if missed else 0) | (OVERRAN if overran else 0)
+        RECORD.pack_into(self.shm.buf, HEADER.size + (jobs % self.capacity) * RECORD.size,
+                         release_ns, response_ns, exec_ns, flags)
+        HEADER.pack_into(self.shm.buf, 0, jobs + 1, misses + bool(missed), overruns + bool(overran),
+                         max(max_response_ns, response_ns), rt_policy)
+
+    def records(self):
+        """Job records still in the ring, oldest first"""
+        jobs = self.counters()['jobs']
+        kept = min(jobs, self.capacity)
+        return [RECORD.unpack_from(self.shm.buf, HEADER.size + (index % self.capacity) * RECORD.size)
+                for index in range(jobs - kept, jobs)]
+
+    def close(self):
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def normalize_task_set(tasks, base_priority=98, default_cpu=None):
+    """Validated task dicts (ms units) with rate-monotonic priorities filled in"""
+    algorithms = RTOSSortingAlgorithms().get_all_algorithms()
+    normalized = []
+    for index, task in enumerate(tasks):
+        name = task.get('name', f'task{index}')
+        try:
+            period_ms = float(task['period_ms'])
+            wcet_ms = float(task['wcet_ms'])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Task '{name}' needs numeric period_ms and wcet_ms")
+        deadline_ms = float(task.get('deadline_ms', period_ms))
+        if period_ms <= 0 or wcet_ms <= 0 or deadline_ms <= 0:
+            raise ValueError(f"Task '{name}' needs positive period_ms, wcet_ms and deadline_ms")
+        algorithm = task.get('algorithm', 'quicksort')
+        if algorithm not in algorithms:
+            raise ValueError(f"Task '{name}' uses unknown algorithm '{algorithm}' "
+                             f"(available: {', '.join(algorithms)})")
+        normalized.append({
+            'name': name,
+            'period_ms': period_ms,
+            'wcet_ms': wcet_ms,
+            'deadline_ms': deadline_ms,
+            'offset_ms': float(task.get('offset_ms', 0)),
+            'priority': task.get('priority'),
+            'cpu': task.get('cpu', default_cpu),
+            'algorithm': algorithm,
+        })
+    if len({task['name'] for task in normalized}) != len(normalized):
+        raise ValueError('Task names must be unique')
+
+    # Rate monotonic: shorter period, higher SCHED_FIFO priority
+    for rank, task in enumerate(sorted(normalized, key=lambda task: task['period_ms'])):
+        if task['priority'] is None:
+            task['priority'] = max(1, base_priority - rank)
+    return normalized
+
+
+def load_task_set(path):
+    """Task list from a JSON file (a list, or {'tasks': [...]})"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return data.get('tasks', []) if isinstance(data, dict) else data
+
+
+def response_time_analysis(tasks, wcet_key='wcet_ms'):
+    """Rate-monotonic analysis per core
+
+    Returns {cpu: {'utilization', 'liu_layland_bound', 'bound_test',
+    'response_ms': {task: worst-case response or None if > deadline}}}.
+    Tasks of equal priority count as interfering with each other.
+    """
+    analysis = {}
+    by_cpu = {}
+    for task in tasks:
+        by_cpu.setdefault(task['cpu'], []).append(task)
+    for cpu, group in by_cpu.items():
+        count = len(group)
+        utilization = sum(task[wcet_key] / task['period_ms'] for task in group)
+        bound = count * (2 ** (1 / count) - 1)
+        response = {}
+        for task in group:
+            interferers = [other for other in group
+                           if other is not task and other['priority'] >= task['priority']]
+            current = task[wcet_key]
+            while True:
+                following = task[wcet_key] + sum(math.ceil(current / other['period_ms']) * other[wcet_key]
+                                                 for other in interferers)
+                if following > task['deadline_ms']:
+                    current = None
+                    break
+                if math.isclose(following, current):
+                    break
+                current = following
+            response[task['name']] = round(current, 3) if current is not None else None
+        analysis[str(cpu)] = {
+            'tasks': [task['name'] for task in group],
+            'utilization': round(utilization, 4),
+            'liu_layland_bound': round(bound, 4),
+            'bound_test': utilization <= bound,
+            'response_ms': response,
+        }
+    return analysis
+
+
+def calibrate_work(task, load_factor=LOAD_FACTOR):
+    """(algorithm, data, repetitions) so one job takes about load_factor * WCET"""
+    algorithm = RTOSSortingAlgorithms().get_all_algorithms()[task['algorithm']]
+    data = [random.Random(0).randint(1, WORK_DATA_SIZE * 10) for _ in range(WORK_DATA_SIZE)]
+    for _ in range(3):
+        algorithm(list(data))  # Warm up caches and the allocator
+    timings = []
+    for _ in range(CALIBRATION_CALLS):
+        start = time.thread_time_ns()
+        algorithm(list(data))
+        timings.append(time.thread_time_ns() - start)
+    per_call_ms = max(statistics.median(timings), 1) / 1e6
+    return algorithm, data, max(1, round(task['wcet_ms'] * load_factor / per_call_ms))
+
+
+def _task_main(task, ring, work, start_ns, end_ns, forked):
+    if forked:
+        # Ctrl-C goes to the whole process group; the parent stops the run
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    manager = MulticoreManager()
+    # Both calls affect only the calling thread on Linux
+    if task['cpu'] is not None:
+        manager.set_process_affinity([task['cpu']])
+    rt_policy, _ = manager.set_rt_scheduling(task['priority'])
+    ring.set_rt_policy(rt_policy)
+
+    algorithm, data, repetitions = work
+    period_ns = int(task['period_ms'] * 1e6)
+    deadline_ns = int(task['deadline_ms'] * 1e6)
+    wcet_ns = int(task['wcet_ms'] * 1e6)
+    release_ns = start_ns + int(task['offset_ms'] * 1e6)
+    while release_ns < end_ns:
+        sleep_until_ns(release_ns)
+        exec_start = time.thread_time_ns()
+        for _ in range(repetitions):
+            algorithm(list(data))
+        exec_ns = time.thread_time_ns() - exec_start
+        response_ns = monotonic_ns() - release_ns
+        ring.record(release_ns, response_ns, exec_ns, response_ns > deadline_ns, exec_ns > wcet_ns)
+        # A late job does not shift later releases (strictly periodic model)
+        release_ns += period_ns
+
+
+def _summarize_task(task, ring, repetitions):
+    counters = ring.counters()
+    response = LatencyRecorder()
+    exec_max_ns = 0
+    for _, response_ns, exec_ns, _ in ring.records():
+        response.add_ns(response_ns)
+        exec_max_ns = max(exec_max_ns, exec_ns)
+    jobs = counters['jobs']
+    return {
+        'period_ms': task['period_ms'],
+        'wcet_ms': task['wcet_ms'],
+        'deadline_ms': task['deadline_ms'],
+        'priority': task['priority'],
+        'cpu': task['cpu'],
+        'algorithm': task['algorithm'],
+        'work_repetitions': repetitions,
+        'rt_policy': counters['rt_policy'],
+        'jobs': jobs,
+        'deadline_misses': counters['misses'],
+        'overruns': counters['overruns'],
+        'miss_ratio': round(counters['misses'] / jobs, 4) if jobs else None,
+        'max_response_ms': round(counters['max_response_ns'] / 1e6, 3),
+        'max_exec_ms': round(exec_max_ns / 1e6, 3),
+        'observed_schedulable': jobs > 0 and counters['misses'] == 0,
+    }, response.summary()
+
+
+def run_task_set(tasks, duration_s=DEFAULT_DURATION_S, mode='process', ring_size=RING_SIZE,
+                 load_factor=LOAD_FACTOR):
+    """Run normalized tasks for duration_s; per-task results and response summaries"""
+    rings = {task['name']: TaskRing(ring_size) for task in tasks}
+    try:
+        work = {task['name']: calibrate_work(task, load_factor) for task in tasks}
+        start_ns = monotonic_ns() + int(START_DELAY_S * 1e9)
+        end_ns = start_ns + int(duration_s * 1e9)
+        runners = []
+        for task in tasks:
+            args = (task, rings[task['name']], work[task['name']], start_ns, end_ns, mode == 'process')
+            if mode == 'process':
+                runner = multiprocessing.get_context('fork').Process(target=_task_main, args=args,
+                                                                     name=f"rtos-task-{task['name']}", daemon=True)
+            else:
+                runner = threading.Thread(target=_task_main, args=args, name=f"rtos-task-{task['name']}",
+                                          daemon=True)
+            runner.start()
+            runners.append(runner)
+
+        # A job released just before the end may still be running
+        grace_s = START_DELAY_S + max(task['period_ms'] + task['wcet_ms'] for task in tasks) / 1e3 + 5
+        for runner in runners:
+            runner.join(max(0.0, (end_ns - monotonic_ns()) / 1e9) + grace_s)
+            if mode == 'process' and runner.is_alive():
+                runner.kill()
+                runner.join(1.0)
+
+        per_task, latency = {}, {}
+        for task in tasks:
+            per_task[task['name']], summary = _summarize_task(task, rings[task['name']], work[task['name']][2])
+            latency[task['name']] = {'response': summary}
+        return per_task, latency
+    finally:
+        for ring in rings.values():
+            ring.close()
+
+
+def run_task_set_suite(config=None, stop_event=None):
+    """Results for the 'rt_task_set' phase: observed vs rate-monotonic prediction"""
+    config = config or {}
+    show_progress = config.get('show_progress', True)
+    duration_s = config.get('rt_task_set_duration', DEFAULT_DURATION_S)
+    mode = config.get('rt_task_set_mode', 'process')
+    if mode not in MODES:
+        return {'success': False, 'error': f"Unknown task-set mode '{mode}' (available: {', '.join(MODES)})"}
+
+    cpu = default_cpu_pair()[0]
+    try:
+        raw_tasks = config.get('rt_task_set_tasks')
+        if not raw_tasks and config.get('rt_task_set_file'):
+            raw_tasks = load_task_set(config['rt_task_set_file'])
+        tasks = normalize_task_set(raw_tasks or DEFAULT_TASK_SET,
+                                   max(1, int(config.get('priority', 99)) - 1), cpu)
+        cpus = available_cpus()
+        for task in tasks:
+            task['cpu'] = resolve_cpu(task['cpu'], cpus)
+    except (OSError, ValueError) as e:
+        return {'success': False, 'error': f'Invalid task set: {e}'}
+    if not tasks:
+        return {'success': False, 'error': 'Task set is empty'}
+    if stop_event is not None and stop_event.is_set():
+        return {'success': False, 'cancelled': True, 'error': 'Cancelled before start'}
+
+    analysis = response_time_analysis(tasks)
+    if show_progress:
+        for core, core_analysis in analysis.items():
+            print(f"   📐 CPU {core}: U={core_analysis['utilization']:.2f} "
+                  f"(Liu & Layland bound {core_analysis['liu_layland_bound']:.2f})")
+    try:
+        per_task, latency = run_task_set(tasks, duration_s, mode, config.get('rt_task_set_ring_size', RING_SIZE),
+                                         config.get('rt_task_set_load_factor', LOAD_FACTOR))
+    except (OSError, ValueError) as e:
+        return {'success': False, 'error': f'Task set failed: {e}'}
+
+    # The same analysis with the largest execution time each task actually took
+    measured = [dict(task, wcet_ms=max(per_task[task['name']]['max_exec_ms'], 1e-3)) for task in tasks]
+    measured_analysis = response_time_analysis(measured)
+    for task in tasks:
+        result = per_task[task['name']]
+        core = str(task['cpu'])
+        result['predicted_response_ms'] = analysis[core]['response_ms'][task['name']]
+        result['predicted_schedulable'] = result['predicted_response_ms'] is not None
+        result['measured_wcet_response_ms'] = measured_analysis[core]['response_ms'][task['name']]
+        if show_progress:
+            icon = '✅' if result['observed_schedulable'] else '⚠️ '
+            print(f"   {icon} {task['name']}: {result['jobs']} jobs, {result['deadline_misses']} misses, "
+                  f"{result['overruns']} overruns, max response {result['max_response_ms']} ms "
+                  f"(RTA {result['predicted_response_ms']} ms)")
+
+    predicted = all(result['predicted_schedulable'] for result in per_task.values())
+    observed = all(result['observed_schedulable'] for result in per_task.values())
+    return {
+        'success': any(result['jobs'] for result in per_task.values()),
+        'mode': mode,
+        'duration_s': duration_s,
+        'tasks': per_task,
+        'analysis': analysis,
+        'predicted_schedulable': predicted,
+        'observed_schedulable': observed,
+        'agreement': predicted == observed,
+        'metric': 'response_time',
+        'latency': latency,
+        'unavailable': {},
+    }
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Wakeup Latency Between Pinned Processes
+=======================================
+
+This module measures how long a blocked RT task takes to run after
+another core wakes it, which is what control loops fed by a driver or
+a producer thread actually pay (cyclictest only covers timer wakeups).
+
+Features:
+---------
+- Sleeper on the RT core, SCHED_FIFO waker on another core
+- Wake mechanisms: pipe, eventfd, raw futex, multiprocessing.Condition
+  (process to process) and threading.Event (thread to thread)
+- Wake-to-run latency from CLOCK_MONOTONIC stamps the waker writes to
+  shared memory just before signalling
+- Idle and loaded conditions, warm-up wakeups discarded
+- Per-mechanism histogram, percentiles and mergeable sketch
+
+Usage:
+------
+    results = run_wakeup_suite({'wakeup_iterations': 2000})
+    results['latency']['futex']['idle']['percentiles_us']
+
+Author: RTOS Benchmark Suite Team
+"""
+
+import ctypes
+import multiprocessing
+import os
+import signal
+import struct
+import threading
+import time
+
+from .background_loads import BackgroundLoad
+from .ipc_latency import (FUTEX_WAIT, FUTEX_WAKE, WATCHDOG_TIMEOUT_S, available_cpus, default_cpu_pair,
+                          futex, futex_unavailable_reason, resolve_cpu)
+from .multicore import MulticoreManager
+from .quantile_sketch import LatencyRecorder
+
+DEFAULT_ITERATIONS = 1000
+WARMUP_ITERATIONS = 50
+# Gap between wakeups, long enough for the sleeper to block again
+DEFAULT_INTERVAL_US = 1000
+CONDITIONS = ('idle', 'loaded')
+# Shared block: wake stamp (int64 ns), then uint32 wake sequence, abort flag
+# and the count of wakeups the sleeper has consumed
+STAMP = struct.Struct('=q')
+COUNTER = struct.Struct('=I')
+STAMP_OFFSET, SEQUENCE_OFFSET, ABORT_OFFSET, ACK_OFFSET = 0, 8, 12, 16
+
+
+def monotonic_ns():
+    return time.clock_gettime_ns(time.CLOCK_MONOTONIC)
+
+
+class WakeAborted(Exception):
+    """The waker died or timed out before the next wakeup"""
+
+
+class Wakeup:
+    """One wake mechanism sharing a stamp block with the waker"""
+
+    name = None
+    # Waker runs as a thread of this process instead of a forked process
+    in_process = False
+
+    @classmethod
+    def unavailable_reason(cls):
+        return None
+
+    def __init__(self):
+        from multiprocessing import shared_memory
+        self.shm = shared_memory.SharedMemory(create=True, size=64)
+        self.shm.buf[:20] = bytes(20)
+
+    @property
+    def aborted(self):
+        return self.shm.buf[ABORT_OFFSET] != 0
+
+    def stamp(self):
+        """Waker: record the wake time just before signalling"""
+        STAMP.pack_into(self.shm.buf, STAMP_OFFSET, monotonic_ns())
+
+    def read_stamp(self):
+        return STAMP.unpack_from(self.shm.buf, STAMP_OFFSET)[0]
+
+    def acknowledge(self, count):
+        """Sleeper: wakeup number `count` has been measured"""
+        COUNTER.pack_into(self.shm.buf, ACK_OFFSET, count)
+
+    def acknowledged(self):
+        return COUNTER.unpack_from(self.shm.buf, ACK_OFFSET)[0]
+
+    def after_fork_sleeper(self):
+        """Close the waker's ends in the sleeper"""
+
+    def after_fork_waker(self):
+        """Close the sleeper's ends in the waker"""
+
+    def wait(self):
+        raise NotImplementedError
+
+    def wake(self):
+        raise NotImplementedError
+
+    def abort(self):
+        """Unblock the sleeper so it can give up"""
+        self.shm.buf[ABORT_OFFSET] = 1
+
+    def close(self):
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class PipeWakeup(Wakeup):
+    name = 'pipe'
+
+    def __init__(self):
+        super().__init__()
+        self.read_fd, self.write_fd = os.pipe()
+
+    def after_fork_sleeper(self):
+        os.close(self.write_fd)
+        self.write_fd = None
+
+    def after_fork_waker(self):
+        os.close(self.read_fd)
+        self.read_fd = None
+
+    def wait(self):
+        if not os.read(self.read_fd, 1):
+            raise WakeAborted('waker closed the pipe')
+
+    def wake(self):
+        self.stamp()
+        os.write(self.write_fd, b'x')
+
+    def close(self):
+        for fd in (self.read_fd, self.write_fd):
+            if fd is not None:
+                os.close(fd)
+        super().close()
+
+
+class EventfdWakeup(Wakeup):
+    name = 'eventfd'
+
+    @classmethod
+    def unavailable_reason(cls):
+        return None if hasattr(os, 'eventfd') else 'os.eventfd needs Linux and Python 3.10+'
+
+    def __init__(self):
+        super().__init__()
+        self.fd = os.eventfd(0)
+
+    def wait(self):
+        os.eventfd_read(self.fd)
+        if self.aborted:
+            raise WakeAborted('waker timed out')
+
+    def wake(self):
+        self.stamp()
+        os.eventfd_write(self.fd, 1)
+
+    def abort(self):
+        super().abort()
+        os.eventfd_write(self.fd, 1)
+
+    def close(self):
+        os.close(self.fd)
+        super().close()
+
+
+class FutexWakeup(Wakeup):
+    name = 'futex'
+
+    @classmethod
+    def unavailable_reason(cls):
+        return futex_unavailable_reason()
+
+    def __init__(self):
+        super().__init__()
+        self.word = ctypes.c_uint32.from_buffer(self.shm.buf, SEQUENCE_OFFSET)
+        self.seen = 0
+
+    def wait(self):
+        while True:
+            current = self.word.value
+            if current != self.seen:
+                self.seen = current
+                return
+            if self.aborted:
+                raise WakeAborted('waker timed out')
+            futex(self.word, FUTEX_WAIT, current)
+
+    def wake(self):
+        self.stamp()
+        self.word.value = (self.word.value + 1) & 0xFFFFFFFF
+        futex(self.word, FUTEX_WAKE, 1)
+
+    def abort(self):
+        super().abort()
+        futex(self.word, FUTEX_WAKE, 1)
+
+    def close(self):
+        # The ctypes view must go before the mapping can be closed
+        self.word = None
+        super().close()
+
+
+class ConditionWakeup(Wakeup):
+    """multiprocessing.Condition (a futex-backed semaphore underneath)"""
+
+    name = 'mp_condition'
+
+    def __init__(self):
+        super().__init__()
+        self.condition = multiprocessing.get_context('fork').Condition()
+        self.seen = 0
+
+    def _sequence(self):
+        return COUNTER.unpack_from(self.shm.buf, SEQUENCE_OFFSET)[0]
+
+    def wait(self):
+        with self.condition:
+            while self._sequence() == self.seen:
+                if self.aborted:
+                    raise WakeAborted('waker timed out')
+                self.condition.wait(1.0)
+            self.seen = self._sequence()
+
+    def wake(self):
+        with self.condition:
+            COUNTER.pack_into(self.shm.buf, SEQUENCE_OFFSET, (self._sequence() + 1) & 0xFFFFFFFF)
+            self.stamp()
+            self.condition.notify()
+
+
+class ThreadEventWakeup(Wakeup):
+    """threading.Event between two threads of this process (includes the GIL handoff)"""
+
+    name = 'thread_event'
+    in_process = True
+
+    def __init__(self):
+        super().__init__()
+        self.event = threading.Event()
+
+    def wait(self):
+        while not self.event.wait(1.0):
+            if self.aborted:
+                raise WakeAborted('waker timed out')
+        self.event.clear()
+
+    def wake(self):
+        self.stamp()
+        self.event.set()
+
+
+MECHANISMS = {mechanism.name: mechanism for mechanism in (
+    PipeWakeup, EventfdWakeup, FutexWakeup, ConditionWakeup, ThreadEventWakeup,
+)}
+
+
+def _waker_main(mechanism, wakeups, cpu, priority, interval_s, in_process=False):
+    manager = MulticoreManager()
+    if not in_process:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        mechanism.after_fork_waker()
+    # Both calls affect only the calling thread on Linux
+    manager.set_process_affinity([cpu])
+    manager.set_rt_scheduling(priority)
+    try:
+        for sent in range(wakeups):
+            # One wakeup at a time: wakes sent before the sleeper has
+            # blocked again would be coalesced or measure a running task
+            time.sleep(interval_s)
+            while mechanism.acknowledged() < sent:
+                if mechanism.aborted:
+                    return
+                time.sleep(interval_s / 4)
+            if mechanism.aborted:
+                return
+            mechanism.wake()
+    except OSError:
+        pass
+
+
+def measure_wakeups(name, iterations=DEFAULT_ITERATIONS, sleeper_cpu=None, waker_cpu=None,
+                    waker_priority=98, interval_us=DEFAULT_INTERVAL_US, warmup=WARMUP_ITERATIONS):
+    """Wake-to-run latencies of one mechanism as a LatencyRecorder"""
+    mechanism = MECHANISMS[name]()
+    manager = MulticoreManager()
+    args = (mechanism, warmup + iterations, waker_cpu, waker_priority, interval_us / 1e6)
+    if mechanism.in_process:
+        waker = threading.Thread(target=_waker_main, args=args + (True,), name=f'rtos-waker-{name}', daemon=True)
+    else:
+        waker = multiprocessing.get_context('fork').Process(target=_waker_main, args=args,
+                                                            name=f'rtos-waker-{name}', daemon=True)
+    previous_affinity = manager.get_process_affinity()
+    recorder = LatencyRecorder()
+    progress = {'last': time.monotonic(), 'done': False}
+
+    def watchdog():
+        while not progress['done']:
+            time.sleep(0.5)
+            if not progress['done'] and time.monotonic() - progress['last'] > WATCHDOG_TIMEOUT_S:
+                if not mechanism.in_process:
+                    waker.kill()
+                mechanism.abort()
+                return
+
+    try:
+        waker.start()
+        if not mechanism.in_process:
+            mechanism.after_fork_sleeper()
+        if sleeper_cpu is not None:
+            manager.set_process_affinity([sleeper_cpu])
+        threading.Thread(target=watchdog, daemon=True).start()
+
+        for index in range(warmup + iterations):
+            mechanism.wait()
+            latency = monotonic_ns() - mechanism.read_stamp()
+            mechanism.acknowledge(index + 1)
+            if index >= warmup:
+                recorder.add_ns(latency)
+            progress['last'] = time.monotonic()
+    finally:
+        progress['done'] = True
+        mechanism.abort()
+        waker.join(WATCHDOG_TIMEOUT_S)
+        if not mechanism.in_process and waker.is_alive():
+            waker.kill()
+            waker.join(1.0)
+        mechanism.close()
+        if previous_affinity:
+            manager.set_process_affinity(previous_affinity)
+    return recorder
+
+
+def _scheduling_of_this_thread():
+    try:
+        policy = os.sched_getscheduler(0)
+        return {os.SCHED_FIFO: 'SCHED_FIFO', os.SCHED_RR: 'SCHED_RR'}.get(policy, 'SCHED_OTHER')
+    except (AttributeError, OSError):
+        return None
+
+
+def run_wakeup_suite(config=None, stop_event=None):
+    """Wake-to-run latency per mechanism under idle and loaded conditions
+
+    Returns {'success', 'latency': {mechanism: {condition: summary}},
+    'unavailable': {mechanism: reason}, ...}; summaries carry the same
+    keys as cyclictest results (µs).
+    """
+    config = config or {}
+    iterations = int(config.get('wakeup_iterations', DEFAULT_ITERATIONS))
+    interval_us = config.get('wakeup_interval_us', DEFAULT_INTERVAL_US)
+    names = config.get('wakeup_mechanisms') or list(MECHANISMS)
+    conditions = config.get('wakeup_conditions') or CONDITIONS
+    load_name = config.get('wakeup_load', 'cpu')
+    waker_priority = max(1, int(config.get('priority', 99)) - 1)
+    show_progress = config.get('show_progress', True)
+    sleeper_cpu, waker_cpu = default_cpu_pair()
+    if config.get('wakeup_cpus'):
+        cpus = available_cpus()
+        sleeper_cpu, waker_cpu = (resolve_cpu(cpu, cpus) for cpu in config['wakeup_cpus'])
+
+    unknown = [name for name in names if name not in MECHANISMS]
+    if unknown:
+        return {'success': False,
+                'error': f"Unknown wake mechanism(s): {', '.join(unknown)} (available: {', '.join(MECHANISMS)})"}
+
+    results = {
+        'success': True,
+        'iterations': iterations,
+        'interval_us': interval_us,
+        'sleeper_cpu': sleeper_cpu,
+        'waker_cpu': waker_cpu,
+        'sleeper_policy': _scheduling_of_this_thread(),
+        'waker_priority': waker_priority,
+        'load': load_name,
+        'metric': 'wake_to_run',
+        'latency': {},
+        'unavailable': {},
+    }
+    runnable = []
+    for name in names:
+        reason = MECHANISMS[name].unavailable_reason()
+        if reason:
+            results['unavailable'][name] = reason
+        else:
+            runnable.append(name)
+
+    for condition in conditions:
+        load = BackgroundLoad(load_name if condition == 'loaded' else 'none', config=config)
+        with load:
+            if load.processes:
+                time.sleep(0.5)  # Let the antagonists ramp up
+            for name in runnable:
+                if stop_event is not None and stop_event.is_set():
+                    results['cancelled'] = True
+                    return results
+                try:
+                    summary = measure_wakeups(name, iterations, sleeper_cpu, waker_cpu, waker_priority,
+                                              interval_us).summary()
+                except (WakeAborted, OSError) as e:
+                    summary = {'success': False, 'error': str(e)}
+                results['latency'].setdefault(name, {})[condition] = summary
+                if show_progress:
+                    if summary.get('success'):
+                        print(f"   ✅ {name} ({condition}): p50 {summary['percentiles_us']['p50']}μs, "
+                              f"p99 {summary['percentiles_us']['p99']}μs, max {summary['max_latency_us']}μs")
+                    else:
+                        print(f"   ⚠️  {name} ({condition}): {summary.get('error')}")
+
+    results['success'] = any(summary.get('success') for by_condition in results['latency'].values()
+                             for summary in by_condition.values())
+    if not results['success']:
+        results['error'] = 'No wake mechanism could be measured'
+    return results
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Time-Budget Planner Tests
+=========================
+
+Checks budget parsing, cost fitting and that plans fit their budget.
+"""
+
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.budget import DEFAULT_PHASE_COSTS, fit_cost_model, parse_budget, plan_budget
+from src.phases import Phase
+
+
+def _phases():
+    noop = lambda results, config: {}
+    return [
+        Phase('env_setup', noop),
+        Phase('baseline_latency', noop, ('env_setup',), unit_key='duration'),
+        Phase('algorithms', noop, ('env_setup',), unit_key='algorithm_iterations'),
+        Phase('loaded_latency', noop, ('baseline_latency',), unit_key='duration'),
+        Phase('stress', noop, ('env_setup',), unit_key='stress_duration'),
+    ]
+
+
+def _costs():
+    return {name: {'overhead_s': cost[0], 'per_unit_s': cost[1], 'samples': 0}
+            for name, cost in DEFAULT_PHASE_COSTS.items()}
+
+
+def test_parse_budget():
+    assert parse_budget('5m') == 300
+    assert parse_budget('1h30m') == 5400
+    assert parse_budget('90s') == 90
+    assert parse_budget('2') == 120
+
+
+def test_fit_cost_model():
+    overhead, per_unit = fit_cost_model([(5, 6.0), (10, 11.0), (20, 21.0)])
+    assert abs(overhead - 1.0) < 1e-9 and abs(per_unit - 1.0) < 1e-9
+
+
+def test_plan_fits_budget():
+    plan = plan_budget(300, _phases(), _costs(), {})
+    assert plan['success'] and not plan['dropped']
+    assert plan['estimated_s'] <= 300
+    assert plan['overrides']['duration'] > 1 and plan['overrides']['algorithm_iterations'] > 3
+
+    tight = plan_budget(8, _phases(), _costs(), {})
+    assert tight['success'] and 'loaded_latency' in tight['overrides']['phases_skip']
+    assert not plan_budget(2, _phases(), _costs(), {})['success']
+
+
+def test_workloads_scaled_to_deadline():
+    import time
+    from src.benchmark_orchestrator import RTOSBenchmarkOrchestrator
+
+    orchestrator = RTOSBenchmarkOrchestrator()
+    orchestrator.phase_costs = _costs()
+    seen = {}
+
+    def suite(config, stop_event):
+        seen.update(config=config, stopped=stop_event.is_set())
+        return {'success': True}
+
+    # ipc_latency is estimated at 10s; with 2.5s left it gets a quarter of its iterations
+    orchestrator.deadline = time.time() + 2.5
+    orchestrator._run_workload('ipc_latency', suite, {'ipc_iterations': 4000})
+    assert 800 <= seen['config']['ipc_iterations'] <= 1000 and not seen['stopped']
+
+    # Past the deadline: floor units, and the suite sees a stop request
+    orchestrator.deadline = time.time() - 1
+    orchestrator._run_workload('rt_task_set', suite, {'rt_task_set_duration': 5.0})
+    assert seen['config']['rt_task_set_duration'] == 1.0 and seen['stopped']
+
+    orchestrator.deadline = None
+    orchestrator._run_workload('loop_lag', suite, {'loop_lag_samples': 1000})
+    assert seen['config']['loop_lag_samples'] == 1000
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Control API Tests
+=================
+
+Drives a ControlServer on a temporary Unix socket through ControlClient.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.control_server import INVALID_PARAMS, METHOD_NOT_FOUND, RUN_ACTIVE, SERVER_ERROR, ControlClient, ControlServer, RpcError
+
+
+def _start_server(tmp):
+    socket_path = os.path.join(tmp, 'api.sock')
+    server = ControlServer(socket_path, store_path=os.path.join(tmp, 'store.db'), base_config={'soak_dir': tmp})
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        ready.set()
+        loop.run_until_complete(server.shutdown_event.wait())
+        loop.run_until_complete(server.close())
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    ready.wait(10)
+    return server, loop, thread, ControlClient(socket_path, timeout=30)
+
+
+def test_soak_run_lifecycle():
+    with tempfile.TemporaryDirectory() as tmp:
+        server, loop, thread, client = _start_server(tmp)
+        try:
+            assert client.call('ping')['pong']
+            try:
+                client.call('no_such_method')
+                assert False, 'expected an error'
+            except RpcError as e:
+                assert e.code == METHOD_NOT_FOUND
+            try:
+                client.call('ping', verbose=True)
+                assert False, 'expected an error'
+            except RpcError as e:
+                assert e.code == INVALID_PARAMS
+            # A TypeError inside the method is the server's, not the caller's
+            try:
+                client.call('recent_results', limit=None)
+                assert False, 'expected an error'
+            except RpcError as e:
+                assert e.code == SERVER_ERROR
+
+            # Paths come from the server's base config only
+            try:
+                client.call('start_run', kind='full', config={'duration': 1, 'checkpoint_dir': '/'})
+                assert False, 'expected the path key to be rejected'
+            except RpcError as e:
+                assert e.code == INVALID_PARAMS and 'checkpoint_dir' in e.message
+            assert client.call('status')['active_run'] is None
+
+            config = {'soak_duration_s': 30, 'snapshot_interval_s': 1, 'soak_probe': 'python',
+                      'show_progress': False}
+            run_id = client.call('start_run', kind='soak', config=config)['run_id']
+            try:
+                client.call('start_run', kind='quick')
+                assert False, 'expected the active run to be reported'
+            except RpcError as e:
+                assert e.code == RUN_ACTIVE and e.data['active_run_id'] == run_id
+            assert client.call('start_run', kind='quick', join_active=True)['run_id'] == run_id
+
+            # A pending join must not block other requests
+            joined = {}
+            joiner = threading.Thread(target=lambda: joined.update(client.call('join', run_id=run_id)))
+            joiner.start()
+            assert client.call('status')['active_run']['run_id'] == run_id
+            client.call('join', run_id=run_id, timeout=1.5)
+            assert client.call('live_stats')['soak']['snapshots'] >= 1
+
+            client.call('stop_run')
+            joiner.join(30)
+            assert joined['state'] == 'stopped'
+            assert joined['summary']['soak']['status'] == 'stopped'
+        finally:
+            loop.call_soon_threadsafe(server.request_shutdown)
+            thread.join(10)
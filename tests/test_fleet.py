@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Fleet Aggregation Tests
+=======================
+
+Merges the same runs from a directory, a tarball and a results store.
+"""
+
+import json
+import os
+import sys
+import tarfile
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.fleet import FleetAggregator, render_fleet_markdown
+from src.results_store import ResultsStore
+
+
+def _results(board, timestamp, histogram, score):
+    return {
+        'timestamp': timestamp,
+        'system_info': {'cpu_info': board, 'cpu_count': 4, 'kernel_release': '6.6.0-rt',
+                        'preemption_model': 'PREEMPT_RT'},
+        'cyclictest_results': {'min_latency_us': min(histogram), 'avg_latency_us': 10,
+                               'max_latency_us': max(histogram), 'histogram_us': histogram,
+                               'simulated': False},
+        'algorithm_results': {'quick_sort': {'execution_time_ms': 2.0 * score}},
+        'composite_score': {'composite_score': score, 'score_version': 'v2'},
+    }
+
+
+def test_aggregate_directory_tarball_and_store():
+    with tempfile.TemporaryDirectory() as tmp:
+        boards = os.path.join(tmp, 'boards')
+        os.makedirs(os.path.join(boards, 'pi5'))
+        runs = [_results('Cortex-A76', '2026-01-0%dT00:00:00' % day, {5: 900, 20: 99, 150 + day: 1}, day)
+                for day in range(1, 4)]
+        runs.append(_results('Cortex-A53', '2026-01-01T00:00:00', {30: 1000}, 1.0))
+        paths = []
+        for index, results in enumerate(runs):
+            paths.append(os.path.join(boards, 'pi5', f'full_rtos_full_board_results_{index}.json'))
+            with open(paths[-1], 'w') as f:
+                json.dump(results, f)
+        with open(os.path.join(boards, 'full_rtos_full_board_results_bad.json'), 'w') as f:
+            f.write('{truncated')
+
+        # The same runs again via a tarball and a store count only once
+        archive = os.path.join(tmp, 'fleet.tar.gz')
+        with tarfile.open(archive, 'w:gz') as tar:
+            tar.add(boards, arcname='boards')
+        store_path = os.path.join(tmp, 'store.db')
+        with ResultsStore(store_path) as store:
+            store.ingest_file(paths[3])
+
+        summary = FleetAggregator().ingest([boards, archive, store_path], workers=2).summary()
+        assert summary['runs'] == 4 and summary['fingerprints'] == 2
+        assert summary['duplicates_skipped'] == 5
+        assert len(summary['errors']) == 2
+
+        a76 = summary['groups'][0]
+        assert a76['runs'] == 3 and a76['cpu_info'] == 'Cortex-A76'
+        assert a76['latency_histogram']['samples'] == 3000
+        assert a76['latency_histogram']['percentiles_us']['p99.9'] == 151
+        latency = a76['latency_distribution']
+        assert latency['samples'] == 3000 and latency['max_us'] == 153
+        assert abs(latency['percentiles_us']['p50'] - 5) <= 0.05
+        assert abs(latency['percentiles_us']['p99'] - 20) <= 0.2
+        assert abs(a76['metrics']['composite_score']['p50'] - 2) <= 0.02
+        assert a76['metrics']['algorithm:quick_sort']['max'] == 6.0
+        assert '| 3 |' in render_fleet_markdown(summary)
+
+
+def test_aggregate_archived_samples_from_directory_and_tarball():
+    from src.results_board import ResultsBoard
+
+    with tempfile.TemporaryDirectory() as tmp:
+        boards = os.path.join(tmp, 'boards')
+        os.makedirs(boards)
+        results = _results('Cortex-A76', '2026-02-01T00:00:00', {1: 1}, 1.0)
+        cyclictest = results['cyclictest_results']
+        del cyclictest['histogram_us']
+        cyclictest['latency_samples_us'] = [5] * 190 + [20] * 9 + [150]
+        assert ResultsBoard().save_results_to_file(
+            results, os.path.join(boards, 'full_rtos_full_board_results_0.json'))
+        assert any(name.endswith('.rtsa') for name in os.listdir(boards))
+
+        summary = FleetAggregator().ingest([boards], workers=1).summary()
+        assert summary['runs'] == 1 and not summary['errors']
+        histogram = summary['groups'][0]['latency_histogram']
+        assert histogram['samples'] == 200 and histogram['percentiles_us']['p99.9'] == 150
+
+        archive = os.path.join(tmp, 'fleet.tar.gz')
+        with tarfile.open(archive, 'w:gz') as tar:
+            tar.add(boards, arcname='boards')
+        summary = FleetAggregator().ingest([archive], workers=1).summary()
+        assert summary['runs'] == 1 and not summary['errors']
+        assert summary['groups'][0]['latency_histogram']['samples'] == 200
+        assert summary['groups'][0]['latency_distribution']['max_us'] == 150
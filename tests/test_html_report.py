@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+HTML Report Tests
+=================
+
+Renders a synthetic results dict and checks the inline SVG plots, and
+renders the output of a real baseline latency phase.
+"""
+
+import os
+import re
+import stat
+import sys
+import xml.dom.minidom
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.benchmark_orchestrator import RTOSBenchmarkOrchestrator
+from src.html_report import render_html_report
+from src.platform_compat import platform_compat
+
+# Stand-in for the cyclictest binary: prints what cyclictest -q prints, and
+# fails like an old cyclictest would if asked for no histogram or pinning
+FAKE_CYCLICTEST = """#!{python}
+import sys
+args = sys.argv[1:]
+if '--help' in args:
+    sys.exit(0)
+if '-h' not in args or '-S' not in args:
+    sys.exit(2)
+limit = int(args[args.index('-h') + 1])
+loops = int(args[args.index('-l') + 1])
+counts = {{2: loops - 12, 3: 10, 47: 2}}
+print('# Histogram')
+for us in range(limit):
+    print('%06d %06d\t%06d' % (us, counts.get(us, 0), counts.get(us, 0) // 2))
+print('# Total: %09d %09d' % (loops, loops // 2))
+print('# Min Latencies: 00002 00002')
+print('# Avg Latencies: 00002 00002')
+print('# Max Latencies: 00047 00047')
+print('# Histogram Overflows: 00000 00000')
+print('T: 0 ( 4242) P:99 I:100 C: %7d Min:      2 Act:    2 Avg:    2 Max:      47' % loops)
+print('T: 1 ( 4243) P:99 I:100 C: %7d Min:      2 Act:    2 Avg:    2 Max:      31' % (loops // 2))
+"""
+
+
+def test_report_contains_valid_svg_plots():
+    results = {
+        'timestamp': '2025-10-18T12:00:00',
+        'system_info': {'os_info': 'Linux <board>', 'fingerprint': 'abc'},
+        'cyclictest_results': {
+            'max_latency_us': 40, 'histogram_us': {'1': 9000, '2': 800, '5': 30, '40': 1},
+            'per_thread': [{'thread': 0, 'avg_latency_us': 2, 'max_latency_us': 40},
+                           {'thread': 1, 'avg_latency_us': 3, 'max_latency_us': 22}]
+        },
+        'algorithm_results': {'quick_sort': {'execution_time_ms': 1.2, 'all_times': [1.1, 1.3, 1.2]}},
+        'environment_info': {'thermal_trace': [
+            {'elapsed_s': 0, 'temperature_c': 45.0, 'frequency_mhz': 2400},
+            {'elapsed_s': 60, 'temperature_c': 61.5, 'frequency_mhz': 1800}]},
+        'composite_score': {'composite_score': 61.4}
+    }
+
+    page = render_html_report(results)
+    svgs = re.findall(r'<svg.*?</svg>', page, re.S)
+    assert len(svgs) == 5  # histogram, per-thread, quick_sort, temperature, frequency
+    for svg in svgs:
+        xml.dom.minidom.parseString(svg)
+    assert 'Linux &lt;board&gt;' in page
+    assert 'Samples (log)' in page
+
+
+def test_report_from_baseline_phase_output(tmp_path):
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    script = bin_dir / 'cyclictest'
+    script.write_text(FAKE_CYCLICTEST.format(python=sys.executable))
+    script.chmod(script.stat().st_mode | stat.S_IXUSR)
+
+    path = os.environ['PATH']
+    os.environ['PATH'] = f"{bin_dir}{os.pathsep}{path}"
+    platform_compat._probe_cache.pop('cyclictest', None)
+    try:
+        orchestrator = RTOSBenchmarkOrchestrator()
+        config = dict(orchestrator.default_config, duration=1, phases_only=['baseline_latency'],
+                      save_results=False, results_store=None, checkpoint_dir=str(tmp_path / 'runs'),
+                      show_progress=False)
+        results = orchestrator.run_comprehensive_benchmark(config)
+    finally:
+        os.environ['PATH'] = path
+        platform_compat._probe_cache.pop('cyclictest', None)
+
+    cyclictest = results['cyclictest_results']
+    assert not cyclictest.get('simulated')
+    assert cyclictest['max_latency_us'] == 47 and cyclictest['percentiles_us']['p99.9'] == 47
+    assert len(cyclictest['per_thread']) == 2
+    assert results['environment_info']['thermal_trace'][0]['elapsed_s'] >= 0
+
+    page = render_html_report(results)
+    assert 'Samples (log)' in page and 'Thread / CPU' in page
+    assert 'No latency distribution' not in page and 'No per-core data' not in page
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+IPC Latency Tests
+=================
+
+Short ping-pong runs over a few transports between two real processes.
+"""
+
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.ipc_latency import TRANSPORTS, run_ipc_suite
+
+
+def test_round_trips_per_transport():
+    names = [name for name in ('pipe', 'socketpair', 'eventfd', 'shm_futex')
+             if TRANSPORTS[name].unavailable_reason() is None]
+    results = run_ipc_suite({'ipc_iterations': 300, 'ipc_transports': names,
+                             'ipc_conditions': ['idle'], 'show_progress': False})
+    assert results['success']
+    for name in names:
+        summary = results['latency'][name]['idle']
+        assert summary['success'] and summary['samples'] == 300
+        assert sum(summary['histogram_us'].values()) == 300
+        assert 0 < summary['min_latency_us'] <= summary['percentiles_us']['p50'] <= summary['max_latency_us']
+
+
+def test_unknown_transport():
+    results = run_ipc_suite({'ipc_transports': ['carrier_pigeon'], 'show_progress': False})
+    assert not results['success'] and 'carrier_pigeon' in results['error']
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Event-Loop Lag Tests
+====================
+
+Short loop-lag runs at normal priority, idle and with competing coroutines.
+"""
+
+import asyncio
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.loop_lag import LOOP_FACTORIES, run_loop_lag_suite, sample_lag
+
+
+def test_sample_lag_counts_every_period():
+    recorder, missed = asyncio.run(sample_lag(50, 0.002, warmup=5))
+    assert recorder.count == 50 and missed >= 0
+
+
+def test_loop_lag_suite_reports_each_condition():
+    results = run_loop_lag_suite({'loop_lag_samples': 40, 'loop_lag_policies': ['other'],
+                                  'loop_lag_conditions': ['idle', 'coroutines'],
+                                  'show_progress': False})
+    assert results['success'] and results['metric'] == 'loop_lag'
+    for condition in ('idle', 'coroutines'):
+        summary = results['latency']['asyncio_other'][condition]
+        assert summary['success'] and summary['samples'] == 40
+        assert summary['min_latency_us'] >= 0
+    if 'uvloop' not in LOOP_FACTORIES:
+        assert 'uvloop_other' in results['unavailable']
+
+
+def test_unknown_option_is_an_error():
+    results = run_loop_lag_suite({'loop_lag_conditions': ['gpu'], 'show_progress': False})
+    assert not results['success'] and 'gpu' in results['error']
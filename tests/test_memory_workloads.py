@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Memory Workload Tests
+=====================
+
+Small-buffer bandwidth and pointer-chasing runs, plus the memory
+antagonists as background loads.
+"""
+
+import os
+import sys
+import threading
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.background_loads import BackgroundLoad
+from src.memory_workloads import WORDS_PER_LINE, build_chase, cache_thrash_antagonist, run_memory_suite
+
+
+def test_chase_is_one_cycle_through_every_line():
+    chain = build_chase(64 * 1024)
+    lines = len(chain) // WORDS_PER_LINE
+    seen, index = set(), 0
+    for _ in range(lines):
+        seen.add(index)
+        index = chain[index]
+    assert index == 0 and len(seen) == lines
+
+
+def test_memory_suite_reports_bandwidth_and_latency():
+    results = run_memory_suite({'memory_buffer_mb': 4, 'memory_passes': 2,
+                                'memory_working_sets_kb': [16, 256], 'memory_chase_steps': 5000,
+                                'show_progress': False})
+    assert results['success']
+    assert all(results['bandwidth_gbps'][name] > 0 for name in ('read', 'write', 'copy'))
+    assert set(results['latency_ns']) == {'16', '256'}
+    assert results['extra_ns']['16'] == 0.0
+
+
+def test_memory_antagonists_run_as_background_loads():
+    stop_event = threading.Event()
+    stop_event.set()
+    assert cache_thrash_antagonist(stop_event, buffer_mb=1) == 0
+    with BackgroundLoad('cache_thrash', workers=1) as load:
+        assert load.running
+    assert not load.running
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Metrics Exporter Tests
+======================
+
+Renders OpenMetrics text from a committed snapshot and a synthetic
+cyclictest histogram, and checks the atomic textfile write.
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.metrics_exporter import OpenMetricsExporter, render_openmetrics
+
+SNAPSHOT = os.path.join(REPO_ROOT, 'system-tests', 'ubuntu-rt',
+                        'ubuntu_rt_rtos_full_board_results_20250928_143445.json')
+
+
+def test_render_snapshot_and_histogram():
+    with open(SNAPSHOT) as f:
+        results = json.load(f)
+    results['system_info']['fingerprint'] = 'abc123'
+    # bucket b holds [b, b+1) μs; one sample overflowed the histogram range
+    results['cyclictest_results'].update({'histogram_us': {1: 1, 3: 2, 9: 1, 40: 1},
+                                          'histogram_overflows': 1, 'max_latency_us': 2500})
+
+    text = render_openmetrics(results, soak_stats={'iterations_total': 10, 'latency_us': {'max': 40}},
+                              phase='cyclictest')
+    assert text.endswith('# EOF\n')
+    assert 'rtos_bench_cyclictest_latency_microseconds{fingerprint="abc123",stat="max"} 2500' in text
+    assert 'rtos_bench_algorithm_time_milliseconds{fingerprint="abc123",algorithm="quick_sort",stat="mean"} 0.567' in text
+    assert 'rtos_bench_cyclictest_latency_seconds_bucket{fingerprint="abc123",le="4e-06"} 3' in text
+    assert 'rtos_bench_cyclictest_latency_seconds_bucket{fingerprint="abc123",le="1e-05"} 4' in text
+    assert 'rtos_bench_cyclictest_latency_seconds_bucket{fingerprint="abc123",le="4.1e-05"} 5' in text
+    assert 'rtos_bench_cyclictest_latency_seconds_bucket{fingerprint="abc123",le="+Inf"} 6' in text
+    assert 'rtos_bench_cyclictest_latency_seconds_count{fingerprint="abc123"} 6' in text
+    sums = [line for line in text.splitlines() if line.startswith('rtos_bench_cyclictest_latency_seconds_sum')]
+    assert abs(float(sums[0].split()[-1]) - (1.5 + 7 + 9.5 + 40.5 + 2500) / 1e6) < 1e-12
+
+    # Counters carry TYPE on the '_total' sample name, as node_exporter expects
+    assert '# TYPE rtos_bench_soak_iterations_total counter' in text
+    assert 'rtos_bench_soak_iterations_total{fingerprint="abc123"} 10' in text
+
+    # OpenMetrics: a family with a UNIT must carry it as a name suffix
+    units = [line.split()[2:4] for line in text.splitlines() if line.startswith('# UNIT ')]
+    assert ['rtos_bench_last_phase_timestamp_seconds', 'seconds'] in units
+    assert all(name.endswith(f'_{unit}') for name, unit in units)
+
+
+def test_atomic_write():
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'textfile', 'rtos.prom')
+        exporter = OpenMetricsExporter(path, extra_labels={'profile': 'test'})
+        assert exporter.write({'composite_score': {'composite_score': 50.0}}, phase='scoring')['success']
+        with open(path) as f:
+            text = f.read()
+        assert 'rtos_bench_composite_score{profile="test"} 50.0' in text
+        assert 'rtos_bench_last_phase_timestamp_seconds{profile="test",phase="scoring"} ' in text
+        assert os.listdir(os.path.dirname(path)) == ['rtos.prom']
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Performance Counter Tests
+=========================
+
+Feeds perf_event group reads through a pipe to check multiplexing
+scaling, deltas, summaries and the software-only fallback.
+"""
+
+import errno
+import os
+import struct
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.perf_counters import PERF_TYPE_HARDWARE, SOFTWARE_EVENTS, PerfCounterGroup
+
+
+class PipeCounterGroup(PerfCounterGroup):
+    """Counter group whose 'counters' are pipes; hardware events are refused"""
+
+    def __init__(self, events=None):
+        super().__init__(events)
+        self.writers = []
+
+    @staticmethod
+    def is_supported():
+        return True
+
+    def _perf_event_open(self, event_type, config, group_fd):
+        if event_type == PERF_TYPE_HARDWARE:
+            raise OSError(errno.ENOENT, os.strerror(errno.ENOENT))
+        read_fd, write_fd = os.pipe()
+        self.writers.append(write_fd)
+        return read_fd
+
+    @staticmethod
+    def _enable(leader_fd):
+        pass
+
+    def feed(self, time_enabled, time_running, counts):
+        """Queue one PERF_FORMAT_GROUP read for the leader"""
+        os.write(self.writers[0], struct.pack(f'{3 + len(counts)}Q', len(counts), time_enabled,
+                                              time_running, *counts))
+
+    def close(self):
+        super().close()
+        for fd in self.writers:
+            os.close(fd)
+        self.writers = []
+
+
+def test_software_fallback_and_group_read_scaling():
+    counters = PipeCounterGroup()
+    try:
+        assert counters.open()
+        assert counters.mode == 'software'
+        assert counters.event_names == [name for name, _, _ in SOFTWARE_EVENTS]
+
+        # Counted the whole time: raw values
+        counters.feed(1000, 1000, [500, 2, 1, 0])
+        assert counters.read() == (500, 2, 1, 0)
+        # Multiplexed onto the PMU half the time: values scaled by enabled/running
+        counters.feed(2000, 1000, [500, 2, 1, 0])
+        assert counters.read() == (1000, 4, 2, 0)
+    finally:
+        counters.close()
+
+
+def test_delta_and_bounded_summary():
+    counters = PipeCounterGroup()
+    try:
+        assert counters.open()
+        assert counters.delta(None, (1, 2, 3, 4)) == {}
+        delta = counters.delta((100, 1, 0, 0), (400, 3, 1, 0))
+        assert delta == {'task_clock_ns': 300, 'page_faults': 2, 'context_switches': 1, 'cpu_migrations': 0}
+
+        totals = {}
+        for _ in range(5000):
+            counters.accumulate(totals, delta)
+        summary = counters.summarize(totals, 5000)
+        assert summary['available'] and summary['iterations'] == 5000
+        assert 'per_iteration' not in summary
+        assert summary['totals']['task_clock_ns'] == 1500000
+        assert summary['mean_per_iteration']['page_faults'] == 2.0
+    finally:
+        counters.close()
+
+
+def test_unavailable_counters_summary():
+    counters = PerfCounterGroup(events=[])
+    counters.error = 'perf_event_open denied'
+    assert not counters.open()
+    assert counters.read() is None
+    assert counters.summarize({}, 3) == {'available': False, 'error': 'perf_event_open denied'}
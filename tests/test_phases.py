@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Phase Scheduler Tests
+=====================
+
+Checks dependency ordering, --only/--skip selection and resume.
+"""
+
+import os
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.phases import Phase, PhaseScheduler, RunCheckpoint
+
+
+def _phases(calls, fail=()):
+    def make(name):
+        def run(results, config):
+            calls.append(name)
+            if name in fail:
+                raise RuntimeError('boom')
+            return {name: True}
+        return run
+    return [
+        Phase('setup', make('setup'), rerun_on_resume=True),
+        Phase('latency', make('latency'), ('setup',)),
+        Phase('loaded', make('loaded'), ('latency',)),
+        Phase('monitor', make('monitor')),
+    ]
+
+
+def test_order_and_selection():
+    scheduler = PhaseScheduler(_phases([]))
+    assert scheduler.order == ['setup', 'monitor', 'latency', 'loaded']
+    assert scheduler.select(only=['loaded']) == ['setup', 'latency', 'loaded']
+    assert scheduler.select(skip=['loaded', 'monitor']) == ['setup', 'latency']
+
+
+def test_resume_restores_completed_phases():
+    with tempfile.TemporaryDirectory() as tmp:
+        calls = []
+        checkpoint = RunCheckpoint.create({'duration': 1}, tmp)
+        summary = PhaseScheduler(_phases(calls, fail=('latency',))).run({}, {}, checkpoint, show_progress=False)
+        assert summary == {'setup': 'completed', 'monitor': 'completed',
+                           'latency': 'failed', 'loaded': 'blocked'}
+
+        calls.clear()
+        resumed = RunCheckpoint.load(checkpoint.run_id, tmp)
+        results = {}
+        summary = PhaseScheduler(_phases(calls)).run(results, {}, resumed, show_progress=False)
+        assert calls == ['setup', 'latency', 'loaded']
+        assert summary['monitor'] == 'restored'
+        assert results == {'setup': True, 'monitor': True, 'latency': True, 'loaded': True}
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Preemption Model Detection Tests
+================================
+
+Kernels from the committed system-tests snapshots must be classified by
+their actual preemption model, not by substring matches.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.preemption import detect_preemption_model, parse_uname_preemption, preemption_model_of
+
+
+def test_uname_tags():
+    assert parse_uname_preemption('#1 SMP PREEMPT_RT Sun Sep 28 23:54:45 BST 2025')[0] == 'rt'
+    # Pi OS Lite: "rpt" build string and plain PREEMPT are not RT
+    assert parse_uname_preemption('#1 SMP PREEMPT Debian 1:6.12.25-1+rpt1 (2025-04-30)')[0] == 'full'
+    assert parse_uname_preemption('#1 SMP PREEMPT_DYNAMIC Fri Jan 1') == ('unknown', True)
+    assert parse_uname_preemption('#1 SMP Debian 6.1.0')[0] == 'none'
+
+
+def test_evidence_precedence():
+    # /sys/kernel/realtime wins over everything else
+    report = detect_preemption_model('#1 SMP', {}, '', realtime_flag='1', dynamic_preempt='')
+    assert report['model'] == 'rt'
+
+    # PREEMPT_DYNAMIC: runtime mode beats the config default
+    options = {'CONFIG_PREEMPT_DYNAMIC': 'y', 'CONFIG_PREEMPT_VOLUNTARY': 'y'}
+    report = detect_preemption_model('#1 SMP PREEMPT_DYNAMIC', options, 'quiet preempt=none',
+                                     realtime_flag='', dynamic_preempt='none voluntary (full) lazy')
+    assert report['model'] == 'full'
+
+    report = detect_preemption_model('#1 SMP PREEMPT_DYNAMIC', options, 'quiet preempt=none',
+                                     realtime_flag='', dynamic_preempt='')
+    assert report['model'] == 'none'
+
+    report = detect_preemption_model('#1 SMP PREEMPT_DYNAMIC', options, 'quiet',
+                                     realtime_flag='', dynamic_preempt='')
+    assert report['model'] == 'voluntary'
+
+
+def test_legacy_results_fallback():
+    legacy = {'system_info': {
+        'uname': 'Linux pilite 6.12.25+rpt-rpi-2712 #1 SMP PREEMPT Debian 1:6.12.25-1+rpt1 (2025-04-30) aarch64 GNU/Linux',
+        'rt_kernel_capable': True}}
+    assert preemption_model_of(legacy) == 'full'
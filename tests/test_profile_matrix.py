@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Profile Matrix Tests
+====================
+
+Builds the comparison matrix from the committed system-tests snapshots.
+"""
+
+import csv
+import os
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.profile_matrix import build_matrix, generate_matrix_report
+
+
+def test_matrix_from_snapshots():
+    matrix = {group['profile']: group for group in build_matrix(os.path.join(REPO_ROOT, 'system-tests'))}
+    assert {'pi-debian-rt', 'pi-os-lite', 'ubuntu-rt'} <= set(matrix)
+
+    ubuntu = matrix['ubuntu-rt']
+    assert ubuntu['runs'] == 3
+    latency = ubuntu['metrics']['max_latency_us']
+    assert latency['min'] <= latency['median'] <= latency['max']
+    assert 'algorithm:quick_sort' in ubuntu['metrics']
+
+    with tempfile.TemporaryDirectory() as workdir:
+        report = generate_matrix_report(os.path.join(REPO_ROOT, 'system-tests'), os.path.join(workdir, 'matrix'))
+        assert report['success']
+        with open(report['markdown_path']) as f:
+            assert '| Max latency (μs) |' in f.read()
+        with open(report['csv_path']) as f:
+            rows = list(csv.DictReader(f))
+        assert any(row['profile'] == 'pi-os-lite' and row['metric'] == 'composite_score' for row in rows)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Quantile Sketch Tests
+=====================
+
+Checks DDSketch relative error, merging, serialisation and the bucket cap.
+"""
+
+import json
+import os
+import random
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.quantile_sketch import DDSketch, merge_sketches
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_relative_error_and_merge():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(3, 1.2) for _ in range(20000)]
+    whole = DDSketch().update(values)
+    parts = [DDSketch().update(values[i::4]) for i in range(4)]
+    merged = merge_sketches(parts)
+
+    for q in (0.01, 0.5, 0.9, 0.99, 0.999):
+        exact = _exact(values, q)
+        assert abs(whole.quantile(q) - exact) <= 0.01 * exact
+        assert merged.quantile(q) == whole.quantile(q)
+    assert merged.count == 20000 and merged.max == max(values)
+    assert abs(merged.mean - sum(values) / len(values)) < 1e-6 * merged.mean
+    assert len(whole.bins) < 1000
+
+
+def test_serialisation_histogram_and_cap():
+    sketch = DDSketch.from_histogram({'0': 3, '4': 90, '20': 6, '150': 1})
+    restored = DDSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+    assert restored.percentiles() == sketch.percentiles()
+    assert restored.quantile(0) == 0 and restored.quantile(1) == 150
+    assert abs(restored.quantile(0.5) - 4) <= 0.04
+
+    capped = DDSketch(max_buckets=50).update(range(1, 100001))
+    assert len(capped.bins) <= 50
+    assert abs(capped.quantile(0.999) - 99900) <= 0.01 * 99900
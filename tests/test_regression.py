@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Regression Detector Tests
+=========================
+
+Builds a synthetic results history with a latency step after a kernel
+upgrade and checks that the changepoint and its attribution are found.
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.regression import detect_changepoints, detect_regressions
+from src.results_store import ResultsStore
+
+
+def test_changepoint_on_step_series():
+    flat = [20, 21, 19, 20, 22, 21, 20, 19]
+    assert detect_changepoints(flat) == []
+    stepped = flat + [35, 36, 34, 35, 37, 36, 35, 34]
+    assert [index for index, _ in detect_changepoints(stepped)] == [8]
+
+
+def test_detects_latency_regression_with_kernel_change():
+    with tempfile.TemporaryDirectory() as workdir:
+        for i in range(12):
+            kernel = '6.6.1-rt' if i < 6 else '6.6.2-rt'
+            results = {
+                'timestamp': f'2025-10-{i + 1:02d}T12:00:00',
+                'system_info': {'kernel_release': kernel, 'preemption_model': 'rt'},
+                'cyclictest_results': {'max_latency_us': (20 if i < 6 else 45) + i % 2},
+                'composite_score': {'composite_score': 60.0},
+            }
+            path = os.path.join(workdir, f'board_rtos_full_board_results_202510{i + 1:02d}.json')
+            with open(path, 'w') as f:
+                json.dump(results, f)
+
+        with ResultsStore(os.path.join(workdir, 'results.db')) as store:
+            store.ingest_paths([workdir])
+            report = detect_regressions(store)
+
+    steps = report['profiles']['board']
+    assert report['regressions'] == 1
+    assert steps[0]['metric'] == 'max_latency_us'
+    assert (steps[0]['kernel_before'], steps[0]['kernel_after']) == ('6.6.1-rt', '6.6.2-rt')
+
+
+def test_unprefixed_local_runs_form_default_profile():
+    with tempfile.TemporaryDirectory() as workdir:
+        for i in range(12):
+            for prefix, latency in (('board_', 20), ('', 20 if i < 6 else 45)):
+                results = {
+                    'timestamp': f'2025-10-{i + 1:02d}T12:00:00',
+                    'system_info': {'kernel_release': '6.6.1-rt', 'preemption_model': 'rt'},
+                    'cyclictest_results': {'max_latency_us': latency + i % 2},
+                }
+                path = os.path.join(workdir, f'{prefix}rtos_full_board_results_202510{i + 1:02d}.json')
+                with open(path, 'w') as f:
+                    json.dump(results, f)
+
+        with ResultsStore(os.path.join(workdir, 'results.db')) as store:
+            store.ingest_paths([workdir])
+            assert store.profiles() == ['board', 'default']
+            report = detect_regressions(store, metrics=['max_latency_us'])
+
+    assert report['profiles']['board'] == []
+    assert [step['metric'] for step in report['profiles']['default']] == ['max_latency_us']
+    assert report['regressions'] == 1
+
+
+def test_simulated_runs_stay_out_of_latency_history():
+    with tempfile.TemporaryDirectory() as workdir:
+        for i in range(12):
+            simulated = i in (7, 9)
+            results = {
+                'timestamp': f'2025-10-{i + 1:02d}T12:00:00',
+                'system_info': {'kernel_release': '6.6.1-rt', 'preemption_model': 'rt'},
+                'cyclictest_results': {'max_latency_us': 53 if simulated else 20 + i % 2,
+                                       'simulated': simulated},
+                'composite_score': {'composite_score': 60.0},
+            }
+            path = os.path.join(workdir, f'board_rtos_full_board_results_202510{i + 1:02d}.json')
+            with open(path, 'w') as f:
+                json.dump(results, f)
+
+        with ResultsStore(os.path.join(workdir, 'results.db')) as store:
+            store.ingest_paths([workdir])
+            latency = store.history('max_latency_us', profile='board')
+            scores = store.history('composite_score', profile='board')
+            report = detect_regressions(store, metrics=['max_latency_us'])
+
+    assert len(latency) == 10 and max(value for _, value, _ in latency) == 21
+    assert len(scores) == 12
+    assert report['regressions'] == 0
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Results Store Tests
+===================
+
+Ingests the committed system-tests snapshots into a temporary SQLite
+store and checks incremental re-ingest and the SQL queries.
+"""
+
+import glob
+import os
+import shutil
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.results_board import ResultsBoard
+from src.results_store import ResultsStore
+
+SNAPSHOTS = sorted(glob.glob(os.path.join(REPO_ROOT, 'system-tests', '*', '*rtos_full_board_results_*.json')))
+
+
+def test_incremental_ingest_and_queries():
+    with tempfile.TemporaryDirectory() as workdir:
+        for snapshot in SNAPSHOTS:
+            shutil.copy(snapshot, workdir)
+
+        with ResultsStore(os.path.join(workdir, 'results.db')) as store:
+            first = store.ingest_paths([workdir])
+            assert first['added'] == len(SNAPSHOTS)
+
+            # Unchanged files are not re-read
+            second = store.ingest_paths([workdir])
+            assert second['skipped'] == len(SNAPSHOTS) and second['added'] == 0
+
+            assert store.count() == len(SNAPSHOTS)
+            assert set(store.profiles()) == {'pi-debian-rt', 'pi-os-lite', 'ubuntu-rt'}
+
+            # Pi OS Lite runs a PREEMPT (full) kernel, not RT
+            rt_runs = store.leaderboard(limit=100, preemption_model='rt')
+            assert all(run['profile'] != 'pi-os-lite' for run in rt_runs)
+
+            history = store.history('algorithm:quick_sort', profile='pi-debian-rt')
+            assert [h[0] for h in history] == sorted(h[0] for h in history)
+            assert len(history) == 3
+
+
+def test_disk_ingest_reads_sidecar_series():
+    results = {
+        'timestamp': '2025-10-20T12:00:00',
+        'cyclictest_results': {'max_latency_us': 90, 'latency_samples_us': [5] * 190 + [20] * 9 + [90]},
+        'algorithm_results': {'quick_sort': {'success': True, 'execution_time_ms': 1.2,
+                                             'all_times': [1.2 + 0.01 * (i % 5) for i in range(100)]}},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        filename = os.path.join(workdir, 'board_rtos_full_board_results_20251020_120000.json')
+        assert ResultsBoard().save_results_to_file(results, filename)
+        with open(filename) as f:
+            assert '$series' in f.read()
+
+        with ResultsStore(os.path.join(workdir, 'results.db')) as store:
+            assert store.ingest_paths([workdir])['added'] == 1
+            latency = store.merged_sketch('latency_us')
+            timing = store.merged_sketch('algorithm:quick_sort')
+
+    assert latency is not None and latency.count == 200
+    assert timing is not None and timing.count == 100
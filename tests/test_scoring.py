@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Scoring Tests
+=============
+
+Checks the versioned composite score against the committed snapshots.
+"""
+
+import glob
+import json
+import os
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.scoring import board_class_of, compute_score, load_baselines, save_baseline
+
+SNAPSHOT_DIR = os.path.join(REPO_ROOT, 'system-tests')
+
+
+def _load(profile, stamp):
+    path = glob.glob(os.path.join(SNAPSHOT_DIR, profile, f'*{stamp}.json'))[0]
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_reference_run_scores_100_and_version_recorded():
+    reference = _load('pi-debian-rt', '20251015_232256')
+    assert board_class_of(reference) == 'raspberry-pi-5-model-b-4c'
+    score = compute_score(reference, baselines=load_baselines(None))
+    assert score['score_version'] == 'v2'
+    assert abs(score['composite_score'] - 100) < 0.1
+    assert 'system' not in score['components']
+
+    # v1 reproduces the stored legacy score
+    assert compute_score(reference, 'v1')['composite_score'] == reference['composite_score']['composite_score']
+
+
+def test_worse_tail_latency_lowers_v2_score_and_baseline_override():
+    reference = _load('pi-debian-rt', '20251015_232256')
+    outlier = _load('pi-debian-rt', '20251015_233712')
+    baselines = load_baselines(None)
+    assert compute_score(outlier, baselines=baselines)['composite_score'] < 100
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'baselines.json')
+        assert save_baseline(outlier, path) == 'raspberry-pi-5-model-b-4c'
+        rebased = compute_score(reference, baselines=load_baselines(path))
+        assert rebased['composite_score'] > 100
+
+
+def test_tail_component_needs_recorded_p999():
+    reference = _load('pi-debian-rt', '20251015_232256')
+    score = compute_score(reference, baselines=load_baselines(None))
+    assert 'tail_latency' not in score['components']
+    assert 'max_latency' in score['components']
+
+    calm = json.loads(json.dumps(reference))
+    calm['cyclictest_results']['percentiles_us'] = {'p50': 4, 'p99': 6, 'p99.9': 8}
+    spiky = json.loads(json.dumps(calm))
+    spiky['cyclictest_results']['percentiles_us']['p99.9'] = 11
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'baselines.json')
+        save_baseline(calm, path)
+        with open(path) as f:
+            assert json.load(f)['raspberry-pi-5-model-b-4c']['tail_latency_us'] == 8
+        baselines = load_baselines(path)
+        calm_score = compute_score(calm, baselines=baselines)
+        spiky_score = compute_score(spiky, baselines=baselines)
+
+    assert calm_score['components']['tail_latency'] == 100
+    assert abs(spiky_score['components']['tail_latency'] - 100 * 8 / 11) < 0.01
+    assert spiky_score['composite_score'] < calm_score['composite_score']
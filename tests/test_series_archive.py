@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Series Archive Tests
+====================
+
+Round-trips series through the columnar archive and the results
+save/load path.
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.series_archive import SeriesArchive, SeriesArchiveWriter, resolve_series
+from src.results_board import ResultsBoard
+
+
+def test_encodings_round_trip():
+    latencies = [12, 15, 11, 300, -4] * 200
+    times = [0.25 * i for i in range(500)]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'series.rtsa')
+        with SeriesArchiveWriter(path) as writer:
+            writer.add_series('varint', latencies)
+            writer.add_series('lzma', latencies, compression='lzma')
+            writer.add_series('scaled', times, scale=1000)
+            writer.add_series('raw_samples', latencies, encoding='raw', compression='none')
+
+        with SeriesArchive(path) as archive:
+            assert list(archive.get('varint')) == latencies
+            assert list(archive.get('lzma')) == latencies
+            assert archive.get('scaled') == times
+            assert archive.is_zero_copy('raw_samples')
+            view = archive.get('raw_samples')
+            assert view.tolist() == latencies
+            view.release()
+            assert archive.info('varint')['length'] < len(latencies)
+
+
+def test_results_keep_summary_and_pointer():
+    samples = list(range(1000))
+    results = {
+        'cyclictest_results': {'max_latency_us': 999, 'latency_samples_us': samples},
+        'algorithm_results': {'quick_sort': {'all_times': [1.0, 2.0]}}
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        filename = os.path.join(workdir, 'rtos_full_board_results_test.json')
+        board = ResultsBoard()
+        assert board.save_results_to_file(results, filename)
+
+        with open(filename) as f:
+            saved = json.load(f)
+        pointer = saved['cyclictest_results']['latency_samples_us']
+        assert pointer['$series'] == 'cyclictest_results/latency_samples_us'
+        assert pointer['count'] == 1000 and pointer['max'] == 999
+        assert saved['algorithm_results']['quick_sort']['all_times'] == [1.0, 2.0]
+        assert os.path.exists(os.path.join(workdir, saved['series_archive']))
+
+        loaded = board.load_results_from_file(filename, load_series=True)
+        assert loaded['cyclictest_results']['latency_samples_us'] == samples
+
+        # Loaded results serialise and save again without conversion
+        assert json.loads(json.dumps(loaded))['cyclictest_results']['latency_samples_us'] == samples
+        resaved = os.path.join(workdir, 'rtos_full_board_results_resaved.json')
+        assert board.save_results_to_file(loaded, resaved)
+        again = board.load_results_from_file(resaved, load_series=True)
+        assert again['cyclictest_results']['latency_samples_us'] == samples
+
+        # Zero-copy views are an explicit opt-in
+        view = resolve_series(saved, workdir, zero_copy=True)['cyclictest_results']['latency_samples_us']
+        assert isinstance(view, memoryview) and view.tolist() == samples
+        view.release()
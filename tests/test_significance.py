@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Significance Testing Tests
+==========================
+
+Checks the rank/KS tests and the improved/regressed/no-change
+classification on synthetic run sets and on parsed cyclictest output.
+"""
+
+import os
+import random
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.cyclictest import CyclicTestIntegration
+from src.significance import compare_runs, ks_histograms, ks_two_sample, mann_whitney_u
+
+
+def _runs(seed, sort_ms, latency_us):
+    rng = random.Random(seed)
+    runs = []
+    for _ in range(5):
+        runs.append({
+            'composite_score': {'composite_score': 60 + rng.random()},
+            'cyclictest_results': {'max_latency_us': latency_us + rng.randint(0, 3),
+                                   'latency_samples_us': [latency_us + rng.gauss(0, 2) for _ in range(200)]},
+            'algorithm_results': {'quick_sort': {'all_times': [sort_ms + rng.gauss(0, 0.05) for _ in range(5)]}}
+        })
+    return runs
+
+
+def _cyclictest_run(seed, spike_us):
+    """Results dict from cyclictest -q -h output with one pinned thread per CPU"""
+    rng = random.Random(seed)
+    maxima = [spike_us - rng.randint(0, 3) for _ in range(4)]
+    counts = {1: 40000, 2: 9000, spike_us // 2: 500}
+    lines = ['# Histogram']
+    for us in sorted(counts):
+        lines.append('%06d' % us + ''.join('\t%06d' % (counts[us] // 4) for _ in maxima))
+    for us in maxima:
+        lines.append('%06d' % us + ''.join('\t%06d' % (1 if m == us else 0) for m in maxima))
+    lines.append('# Max Latencies:' + ''.join(' %05d' % m for m in maxima))
+    lines += ['T: %d (%d) P:99 I:100 C: 100000 Min: 1 Act: 2 Avg: 2 Max: %d' % (cpu, 4000 + cpu, m)
+              for cpu, m in enumerate(maxima)]
+    return {'cyclictest_results': CyclicTestIntegration.parse_cyclictest_output('\n'.join(lines))}
+
+
+def test_tests_detect_shift_and_accept_noise():
+    rng = random.Random(1)
+    a = [rng.gauss(10, 1) for _ in range(100)]
+    b = [rng.gauss(12, 1) for _ in range(100)]
+    assert mann_whitney_u(a, b)['p_value'] < 0.001
+    assert ks_two_sample(a, b)['p_value'] < 0.001
+    assert mann_whitney_u(a, list(a))['p_value'] > 0.9
+    assert ks_histograms({'10': 500, '11': 500}, {10: 500, 11: 500})['p_value'] > 0.9
+
+
+def test_compare_runs_classification():
+    baseline = _runs(1, sort_ms=2.0, latency_us=20)
+    faster = _runs(2, sort_ms=1.5, latency_us=20)
+    report = compare_runs(baseline, faster)
+    metrics = report['metrics']
+    assert metrics['algorithm:quick_sort']['classification'] == 'improved'
+    assert metrics['latency_samples']['classification'] == 'no-change'
+
+    slower = _runs(3, sort_ms=2.0, latency_us=40)
+    assert compare_runs(baseline, slower)['metrics']['latency_samples']['classification'] == 'regressed'
+
+    single = compare_runs(baseline[0], faster[0])
+    assert single['metrics']['max_latency_us']['classification'] == 'insufficient-data'
+
+
+def test_latency_from_cyclictest_runs():
+    calm = [_cyclictest_run(seed, 12) for seed in range(4)]
+    spiky = [_cyclictest_run(seed, 35) for seed in range(4, 8)]
+    metrics = compare_runs(calm, spiky)['metrics']
+    for key in ('max_latency_us', 'p99_latency_us', 'per_cpu_max_latency_us', 'latency_histogram'):
+        assert metrics[key]['classification'] == 'regressed', key
+    assert compare_runs(calm, [_cyclictest_run(seed, 12) for seed in range(8, 12)])[
+        'metrics']['max_latency_us']['classification'] == 'no-change'
+
+    # One run per side: the per-CPU maxima still give a verdict
+    single = compare_runs(calm[0], spiky[0])['metrics']
+    assert single['max_latency_us']['classification'] == 'insufficient-data'
+    assert single['per_cpu_max_latency_us']['classification'] == 'regressed'
+    assert single['latency_histogram']['classification'] == 'regressed'
+
+    simulated = dict(spiky[0], cyclictest_results=dict(spiky[0]['cyclictest_results'], simulated=True))
+    assert 'per_cpu_max_latency_us' not in compare_runs(calm[0], simulated)['metrics']
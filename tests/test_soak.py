@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Soak Mode Tests
+===============
+
+Checks cyclictest histogram parsing and a short Python-probe soak.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.cyclictest import CyclicTestIntegration
+from src.soak import SUMMARY_FILE, SoakRunner
+
+HISTOGRAM_OUTPUT = """# /dev/cpu_dma_latency set to 0us
+000000 000000
+000003 000010
+000004 000980
+000020 000009
+000090 000001
+# Total: 000001000
+# Min Latencies: 00003
+# Avg Latencies: 00004
+# Max Latencies: 00090
+# Histogram Overflows: 00000
+"""
+
+
+def test_parse_histogram_output():
+    parsed = CyclicTestIntegration.parse_cyclictest_output(HISTOGRAM_OUTPUT)
+    assert parsed['success']
+    assert parsed['histogram_us'] == {3: 10, 4: 980, 20: 9, 90: 1}
+    assert parsed['max_latency_us'] == 90 and parsed['min_latency_us'] == 3
+    assert parsed['percentiles_us'] == {'p50': 4, 'p99': 4, 'p99.9': 90}
+
+OVERFLOW_OUTPUT = HISTOGRAM_OUTPUT.replace('# Max Latencies: 00090', '# Max Latencies: 02500').replace(
+    '# Histogram Overflows: 00000', '# Histogram Overflows: 00001')
+
+
+class ReplayedSoak(SoakRunner):
+    """Soak whose cyclictest measurements replay captured output"""
+
+    def _measure(self, seconds):
+        time.sleep(seconds)
+        result = CyclicTestIntegration.parse_cyclictest_output(OVERFLOW_OUTPUT)
+        result['duration'] = seconds
+        return result
+
+
+def test_overflowing_spike_reaches_snapshot_and_summary():
+    with tempfile.TemporaryDirectory() as tmp:
+        result = ReplayedSoak({'soak_duration_s': 2, 'snapshot_interval_s': 1, 'soak_dir': tmp,
+                               'soak_probe': 'cyclictest', 'histogram_max_us': 100,
+                               'show_progress': False}).run()
+        assert result['success']
+        with open(os.path.join(result['run_dir'], 'snapshot_000001.json')) as f:
+            snapshot = json.load(f)
+        summary = result['results']
+
+    latency = snapshot['latency']
+    assert latency['max_latency_us'] == 2500 and latency['samples'] == 1001
+    assert latency['percentiles_lower_bound'] and latency['percentiles_us']['p99.9'] == 90
+    assert summary['soak']['worst_snapshot']['max_latency_us'] == 2500
+    assert summary['soak']['per_load']['none']['max_latency_us'] == 2500
+    cumulative = summary['cyclictest_results']
+    assert cumulative['max_latency_us'] == 2500 and cumulative['histogram_overflows'] == 2
+    assert cumulative['percentiles_lower_bound']
+
+
+def test_short_python_soak():
+    with tempfile.TemporaryDirectory() as tmp:
+        result = SoakRunner({'soak_duration_s': 2, 'snapshot_interval_s': 1, 'soak_dir': tmp,
+                             'soak_probe': 'python', 'show_progress': False}).run()
+        assert result['success']
+        names = os.listdir(result['run_dir'])
+        assert SUMMARY_FILE in names
+        assert len([name for name in names if name.startswith('snapshot_')]) == 2
+
+        with open(os.path.join(result['run_dir'], SUMMARY_FILE)) as f:
+            summary = json.load(f)
+        assert summary['soak']['status'] == 'completed'
+        assert summary['soak']['snapshots'] == 2
+        assert summary['cyclictest_results']['samples'] > 100
+        assert len(summary['environment_info']['thermal_trace']) == 2
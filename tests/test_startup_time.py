@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Startup Time Regression Test
+============================
+
+Runs the package import and the fast CLI paths under ``python -X importtime``
+and checks that heavy benchmark modules stay unloaded and that the import
+cost of the ``src`` package stays within a time budget.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import budget for the src package (microseconds). Generous
+# enough for a Raspberry Pi, tight enough to catch eager imports creeping back.
+SRC_IMPORT_BUDGET_US = 150_000
+
+# Modules that must not be loaded by "import src" or "main.py --results"
+HEAVY_MODULES = [
+    'src.benchmark_orchestrator',
+    'src.algorithms',
+    'src.cyclictest',
+    'src.multicore',
+    'src.rtos_env',
+]
+
+
+def _import_profile(args, cwd=REPO_ROOT):
+    """Run python -X importtime and return {module: cumulative_us}"""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + args,
+                            capture_output=True, text=True, cwd=cwd, env=env, timeout=60)
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        profile[parts[2].strip()] = int(parts[1].strip())
+    return result, profile
+
+
+def test_package_import_is_lazy():
+    """import src loads only the lightweight platform layer"""
+    result, profile = _import_profile(['-c', 'import src'])
+    assert result.returncode == 0, result.stderr
+
+    for module in HEAVY_MODULES:
+        assert module not in profile, f"{module} imported eagerly by 'import src'"
+
+    assert profile.get('src', 0) < SRC_IMPORT_BUDGET_US, \
+        f"import src took {profile.get('src')}us (budget {SRC_IMPORT_BUDGET_US}us)"
+
+
+def test_results_command_startup():
+    """main.py --results never loads the benchmark orchestrator"""
+    with tempfile.TemporaryDirectory() as workdir:
+        result, profile = _import_profile(
+            [os.path.join(REPO_ROOT, 'main.py'), '--results', '--no-banner'], cwd=workdir)
+
+    assert result.returncode == 0, result.stderr
+    for module in HEAVY_MODULES:
+        assert module not in profile, f"{module} imported by main.py --results"
+    assert profile.get('src', 0) < SRC_IMPORT_BUDGET_US
+
+
+if __name__ == "__main__":
+    test_package_import_is_lazy()
+    test_results_command_startup()
+    print("✅ Startup time within budget")
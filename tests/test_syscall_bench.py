@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Syscall Benchmark Tests
+=======================
+
+Small-batch runs of the syscall suite and the timer-overhead calibration.
+"""
+
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.results_board import ResultsBoard
+from src.syscall_bench import measure_call, run_syscall_suite, timer_overhead_s
+
+
+def test_measure_call_reports_ci_around_mean():
+    result = measure_call(os.getpid, batch=2000, batches=5)
+    low, high = result['ci_ns']
+    assert low <= result['ns_per_call'] <= high
+    assert result['batches'] == 5 and result['stdev_ns'] >= 0
+
+
+def test_syscall_suite_covers_calls_clocks_and_oversleep():
+    results = run_syscall_suite({'syscall_batch': 2000, 'syscall_batches': 3,
+                                 'syscall_sleep_us': [100], 'syscall_sleep_samples': 10,
+                                 'show_progress': False})
+    assert results['success']
+    assert {'perf_counter_ns', 'getpid', 'pipe_read_1b'} <= set(results['calls'])
+    assert results['clocks']['monotonic']['resolution_ns'] >= 1
+    oversleep = results['latency']['nanosleep_oversleep']['100us']
+    assert oversleep['success'] and oversleep['samples'] == 10
+    assert 'Syscall & Timer Costs' in ResultsBoard().format_syscall_bench(results)
+
+
+def test_timer_overhead_is_small_and_cached():
+    overhead = timer_overhead_s()
+    assert 0 <= overhead < 1e-3
+    assert timer_overhead_s() == overhead
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+System Fingerprint Tests
+========================
+
+Checks kernel config parsing, fingerprint immutability and hash stability.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.system_fingerprint import SystemFingerprint, parse_kernel_config, summarize_kernel_config
+from src.platform_compat import platform_compat
+
+RT_CONFIG = """
+CONFIG_PREEMPT_RT=y
+# CONFIG_PREEMPT_VOLUNTARY is not set
+CONFIG_HZ_1000=y
+CONFIG_HZ=1000
+CONFIG_NO_HZ_FULL=y
+CONFIG_UNRELATED=m
+"""
+
+
+def test_kernel_config_parsing():
+    options = parse_kernel_config(RT_CONFIG)
+    assert options['CONFIG_PREEMPT_RT'] == 'y'
+    assert options['CONFIG_PREEMPT_VOLUNTARY'] == 'n'
+    assert 'CONFIG_UNRELATED' not in options
+
+    summary = summarize_kernel_config('/boot/config-test', options)
+    assert summary['preempt_rt'] is True
+    assert summary['hz'] == 1000
+    assert summary['no_hz_full'] is True
+
+
+def test_fingerprint_is_immutable_and_stable():
+    info = {'cpu_info': 'Raspberry Pi 5 Model B Rev 1.0', 'cpu_count': 4,
+            'memory_class_gb': 4, 'kernel_release': '6.15.11-v8-16k+',
+            'python_version': '3.11.2'}
+    first = SystemFingerprint(info)
+    second = SystemFingerprint(dict(info, python_version='3.12.0', os_info='other host'))
+    other_kernel = SystemFingerprint(dict(info, kernel_release='6.12.25+rpt-rpi-2712'))
+
+    # Only board and kernel identity feed the hash
+    assert first.fingerprint == second.fingerprint
+    assert first.fingerprint != other_kernel.fingerprint
+    assert first.board_fingerprint == other_kernel.board_fingerprint
+
+    try:
+        first.fingerprint = 'tampered'
+        assert False, "fingerprint should be immutable"
+    except AttributeError:
+        pass
+
+    exported = first.to_dict()
+    exported['cpu_info'] = 'changed'
+    assert first.get('cpu_info') == 'Raspberry Pi 5 Model B Rev 1.0'
+
+
+def test_system_info_is_cached():
+    assert platform_compat.get_system_fingerprint() is platform_compat.get_system_fingerprint()
+    info = platform_compat.get_system_info()
+    assert info['fingerprint'] == platform_compat.get_system_fingerprint().fingerprint
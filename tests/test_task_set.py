@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+RT Task-Set Tests
+=================
+
+Rate-monotonic analysis, the shared-memory ring and a short task-set run.
+"""
+
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.results_board import ResultsBoard
+from src.task_set import TaskRing, normalize_task_set, response_time_analysis, run_task_set_suite
+
+
+def test_rate_monotonic_priorities_and_response_times():
+    tasks = normalize_task_set([
+        {'name': 'slow', 'period_ms': 20, 'wcet_ms': 5},
+        {'name': 'fast', 'period_ms': 5, 'wcet_ms': 1},
+        {'name': 'mid', 'period_ms': 10, 'wcet_ms': 2},
+    ], base_priority=90, default_cpu=0)
+    priorities = {task['name']: task['priority'] for task in tasks}
+    assert priorities == {'fast': 90, 'mid': 89, 'slow': 88}
+
+    analysis = response_time_analysis(tasks)['0']
+    assert analysis['utilization'] == 0.65 and analysis['bound_test']
+    # slow converges at R = 5 + ceil(9/5)*1 + ceil(9/10)*2 = 9
+    assert analysis['response_ms'] == {'fast': 1.0, 'mid': 3.0, 'slow': 9.0}
+
+
+def test_overloaded_core_is_predicted_unschedulable():
+    tasks = normalize_task_set([{'name': 'a', 'period_ms': 4, 'wcet_ms': 3},
+                                {'name': 'b', 'period_ms': 6, 'wcet_ms': 3}], default_cpu=0)
+    assert response_time_analysis(tasks)['0']['response_ms']['b'] is None
+
+
+def test_ring_keeps_counters_past_wraparound():
+    ring = TaskRing(capacity=4)
+    try:
+        for job in range(6):
+            ring.record(job, 100 + job, 50, missed=job == 5, overran=False)
+        counters = ring.counters()
+        assert counters['jobs'] == 6 and counters['misses'] == 1 and counters['max_response_ns'] == 105
+        assert [record[0] for record in ring.records()] == [2, 3, 4, 5]
+    finally:
+        ring.close()
+
+
+def test_short_task_set_run_in_threads():
+    results = run_task_set_suite({'rt_task_set_tasks': [{'name': 'tick', 'period_ms': 10, 'wcet_ms': 1}],
+                                  'rt_task_set_duration': 0.3, 'rt_task_set_mode': 'thread',
+                                  'show_progress': False})
+    assert results['success'] and results['predicted_schedulable']
+    task = results['tasks']['tick']
+    assert task['jobs'] == 30 and task['predicted_response_ms'] == 1.0
+    assert results['latency']['tick']['response']['samples'] == 30
+    assert 'Periodic RT Task Set' in ResultsBoard().format_task_set(results)
+
+
+def test_invalid_task_set_is_an_error():
+    results = run_task_set_suite({'rt_task_set_tasks': [{'name': 'x', 'period_ms': 0, 'wcet_ms': 1}],
+                                  'show_progress': False})
+    assert not results['success'] and 'Invalid task set' in results['error']
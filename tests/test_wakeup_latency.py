@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Wakeup Latency Tests
+====================
+
+Short wake-to-run runs between processes and between threads.
+"""
+
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.wakeup_latency import MECHANISMS, run_wakeup_suite
+
+
+def test_every_wakeup_is_measured_once():
+    names = [name for name in ('pipe', 'futex', 'mp_condition', 'thread_event')
+             if MECHANISMS[name].unavailable_reason() is None]
+    results = run_wakeup_suite({'wakeup_iterations': 100, 'wakeup_interval_us': 500,
+                                'wakeup_mechanisms': names, 'wakeup_conditions': ['idle'],
+                                'show_progress': False})
+    assert results['success'] and results['metric'] == 'wake_to_run'
+    for name in names:
+        summary = results['latency'][name]['idle']
+        assert summary['success'] and summary['samples'] == 100
+        assert 0 < summary['min_latency_us'] <= summary['max_latency_us'] < 1e6